@@ -1,5 +1,5 @@
-from .base import CacheBase
+from .base import CacheBase, CacheStatistics
 from .file import FileSystemCache
 from .memory import InMemoryCache
 
-__all__ = ["CacheBase", "FileSystemCache", "InMemoryCache"]
+__all__ = ["CacheBase", "CacheStatistics", "FileSystemCache", "InMemoryCache"]
@@ -1,6 +1,27 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Mapping
+
+
+class CacheStatistics(TypedDict):
+    """DTO for cache statistics."""
+
+    hits: int
+    """The number of lookups that found a value."""
+    misses: int
+    """The number of lookups that did not find a value."""
+    evictions: int
+    """The number of entries evicted to stay within the cache limits."""
+    expirations: int
+    """The number of entries dropped because their time to live passed."""
+    entries: int
+    """The current number of entries."""
+    size_bytes: int
+    """The current total size of the cached values in bytes."""
 
 
 class CacheBase(ABC):
@@ -58,3 +79,54 @@ class CacheBase(ABC):
             True if the key exists, else False.
         """
         ...
+
+    @abstractmethod
+    def iter_keys(self) -> AsyncIterator[str]:
+        """Iterate the keys in the cache.
+
+        Returns:
+            An async iterator over the keys.
+        """
+        ...
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Get multiple values from the cache.
+
+        Notes:
+            - Implementations should override this method when they can fetch multiple values more efficiently.
+
+        Args:
+            keys: The keys to retrieve the values for.
+
+        Returns:
+            A dictionary mapping the keys that exist to their values.
+        """
+        values: dict[str, str] = {}
+        for key in keys:
+            if (value := await self.get(key)) is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set multiple values in the cache.
+
+        Args:
+            items: A mapping of keys to the values to store under them.
+
+        Returns:
+            None
+        """
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete multiple values from the cache.
+
+        Args:
+            keys: The keys to delete the values for.
+
+        Returns:
+            None
+        """
+        for key in keys:
+            await self.delete(key)
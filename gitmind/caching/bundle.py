@@ -0,0 +1,124 @@
+"""Portable cache bundles, for copying cached analyses between machines and cache backends."""
+
+from __future__ import annotations
+
+from itertools import islice
+from time import time
+from typing import TYPE_CHECKING, Any, Final, TypedDict
+
+from msgspec import DecodeError, ValidationError
+from msgspec.msgpack import decode, encode
+
+from gitmind.exceptions import CacheBundleError
+from gitmind.utils.compression import compress, decompress
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from gitmind.caching.base import CacheBase
+    from gitmind.utils.compression import Compression
+
+BUNDLE_MAGIC: Final[bytes] = b"GITMIND-CACHE\n"
+"""The leading bytes of a bundle file."""
+BUNDLE_VERSION: Final[int] = 1
+"""The version of the bundle format. Bundles with a different version are rejected."""
+BUNDLE_CHUNK_SIZE: Final[int] = 1000
+"""The number of entries read or written per bulk cache operation."""
+
+
+class CacheBundle(TypedDict):
+    """DTO for cache bundles."""
+
+    version: int
+    """The version of the bundle format."""
+    created_at: int
+    """The unix UTC timestamp of when the bundle was created."""
+    entries: dict[str, str]
+    """The cache entries."""
+
+
+def _chunked(keys: Iterable[str]) -> Iterable[list[str]]:
+    iterator = iter(keys)
+    while chunk := list(islice(iterator, BUNDLE_CHUNK_SIZE)):
+        yield chunk
+
+
+async def create_bundle(*, cache: CacheBase, keys: Iterable[str] | None = None) -> CacheBundle:
+    """Create a bundle of cache entries.
+
+    Args:
+        cache: The cache to export.
+        keys: The keys to export. Defaults to all keys in the cache. Keys that are not cached are skipped.
+
+    Returns:
+        The bundle.
+    """
+    if keys is None:
+        keys = [key async for key in cache.iter_keys()]
+
+    entries: dict[str, str] = {}
+    for chunk in _chunked(keys):
+        entries |= await cache.get_many(chunk)
+
+    return CacheBundle(version=BUNDLE_VERSION, created_at=int(time()), entries=entries)
+
+
+def encode_bundle(bundle: CacheBundle, compression: Compression = "zlib") -> bytes:
+    """Encode a bundle as msgpack.
+
+    Args:
+        bundle: The bundle.
+        compression: The compression to use.
+
+    Returns:
+        The encoded bundle.
+    """
+    return BUNDLE_MAGIC + compress(encode(bundle), compression)
+
+
+def decode_bundle(data: bytes) -> CacheBundle:
+    """Decode a bundle.
+
+    Args:
+        data: The encoded bundle.
+
+    Raises:
+        CacheBundleError: If the data is not a bundle, or the bundle has an unsupported version.
+
+    Returns:
+        The bundle content.
+    """
+    if not data.startswith(BUNDLE_MAGIC):
+        raise CacheBundleError("The file is not a gitmind cache bundle")
+
+    try:
+        payload = decompress(data[len(BUNDLE_MAGIC) :])
+        version = decode(payload, type=dict[str, Any]).get("version")
+    except Exception as e:  # zlib and zstandard errors share no base class ~keep
+        raise CacheBundleError("The cache bundle is corrupt", context=str(e)) from e
+
+    if version != BUNDLE_VERSION:
+        raise CacheBundleError(
+            f"Unsupported cache bundle version {version}, expected version {BUNDLE_VERSION}", context=version
+        )
+
+    try:
+        return decode(payload, type=CacheBundle)
+    except (DecodeError, ValidationError) as e:
+        raise CacheBundleError("The cache bundle is corrupt", context=str(e)) from e
+
+
+async def import_bundle(*, cache: CacheBase, bundle: CacheBundle) -> int:
+    """Import the entries of a bundle into a cache.
+
+    Args:
+        cache: The cache to import the entries into.
+        bundle: The bundle.
+
+    Returns:
+        The number of imported entries.
+    """
+    entries = bundle["entries"]
+    for chunk in _chunked(entries):
+        await cache.set_many({key: entries[key] for key in chunk})
+    return len(entries)
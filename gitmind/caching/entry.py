@@ -0,0 +1,106 @@
+"""Metadata of cached analyses, used to detect and invalidate stale entries."""
+
+from __future__ import annotations
+
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Final, TypedDict
+
+from msgspec import DecodeError, ValidationError
+from msgspec.json import decode
+from typing_extensions import NotRequired
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from gitmind.caching.base import CacheBase
+
+CACHE_SCHEMA_VERSION: Final[int] = 1
+"""The version of the cache entry format. Entries with a different version are treated as stale."""
+INVALIDATION_CHUNK_SIZE: Final[int] = 1000
+"""The number of entries read or deleted per bulk cache operation during invalidation."""
+
+
+class CacheEntryMetadata(TypedDict):
+    """DTO for the metadata of a cached analysis."""
+
+    handler: str
+    """The name of the prompt handler that created the entry."""
+    model: str | None
+    """The model that generated the result."""
+    model_tier: NotRequired[str]
+    """The routing tier of the model, e.g. ``triage`` or ``strong``. Only set for results of routed analyses."""
+    prompt_hash: str
+    """The hash of the prompt template, excluding the commit data and the grading rules."""
+    rule_hashes: dict[str, str]
+    """The hashes of the grading rules the result covers, by rule name."""
+    gitmind_version: str
+    """The gitmind version that created the entry."""
+    schema_version: int
+    """The version of the cache entry format."""
+    created_at: int
+    """The unix UTC timestamp of when the entry was created."""
+
+
+class CacheEntry(TypedDict):
+    """DTO for a cached analysis."""
+
+    metadata: CacheEntryMetadata
+    """The metadata of the entry."""
+    result: Any
+    """The analysis result."""
+
+
+@cache
+def get_gitmind_version() -> str:
+    """Get the installed gitmind version.
+
+    Returns:
+        The version, or "unknown" if gitmind is not installed as a package.
+    """
+    try:
+        return version("gitmind")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def decode_entry(value: str | bytes) -> CacheEntry | None:
+    """Decode a cache entry.
+
+    Args:
+        value: The cached value.
+
+    Returns:
+        The cache entry, or None if the value is not a cache entry of the current schema version.
+    """
+    try:
+        entry = decode(value, type=CacheEntry)
+    except (DecodeError, ValidationError):
+        return None
+    return entry if entry["metadata"]["schema_version"] == CACHE_SCHEMA_VERSION else None
+
+
+async def invalidate_entries(*, cache: CacheBase, predicate: Callable[[CacheEntryMetadata | None], bool]) -> int:
+    """Delete the cache entries matching a predicate.
+
+    Args:
+        cache: The cache.
+        predicate: A function receiving the metadata of an entry, or None for values that are not cache entries of the
+            current schema version, and returning whether to delete it.
+
+    Returns:
+        The number of deleted entries.
+    """
+    keys = [key async for key in cache.iter_keys()]
+    deleted = 0
+    for start in range(0, len(keys), INVALIDATION_CHUNK_SIZE):
+        values = await cache.get_many(islice(keys, start, start + INVALIDATION_CHUNK_SIZE))
+        stale_keys = [
+            key
+            for key, value in values.items()
+            if predicate(entry["metadata"] if (entry := decode_entry(value)) is not None else None)
+        ]
+        await cache.delete_many(stale_keys)
+        deleted += len(stale_keys)
+    return deleted
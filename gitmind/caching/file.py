@@ -1,17 +1,49 @@
 from __future__ import annotations
 
+import os
+import re
+from functools import partial
+from hashlib import sha256
 from pathlib import Path as SyncPath
 from pathlib import PurePath
-from typing import TYPE_CHECKING, Final
+from secrets import token_hex
+from stat import S_ISREG
+from time import time_ns
+from typing import TYPE_CHECKING, Final, NamedTuple
 
+from anyio import CapacityLimiter, create_task_group, to_thread
 from anyio import Path as AsyncPath
 
-from gitmind.caching.base import CacheBase
+from gitmind.caching.base import CacheBase, CacheStatistics
+from gitmind.utils.compression import compress, decompress, ensure_compression_available
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
     from os import PathLike
 
+    from gitmind.utils.compression import Compression
+
 DEFAULT_FOLDER_NAME: Final[str] = ".gitmind"
+SHARD_PREFIX_LENGTH: Final[int] = 2
+"""The number of hex characters of the key hash used to name a shard directory, i.e. 256 shards."""
+DEFAULT_MAX_CONCURRENCY: Final[int] = 16
+"""The default number of concurrent file operations of bulk cache operations."""
+PRUNE_TARGET_RATIO: Final[float] = 0.9
+"""Pruning frees space down to this share of the size cap, so that eviction is not triggered by every write."""
+
+_SHARD_PATTERN: Final[re.Pattern[str]] = re.compile(rf"[0-9a-f]{{{SHARD_PREFIX_LENGTH}}}")
+_FLAT_ENTRY_PATTERN: Final[re.Pattern[str]] = re.compile(r"[A-Za-z]\w*-(?:[a-z]+-)?[0-9a-f]{64}")
+"""The names of the entries written to the root of the cache directory before entries were sharded. The cache
+directory holds other state too, e.g. journals and cloned repositories, so only these names are migrated."""
+
+
+class _EntryInfo(NamedTuple):
+    path: SyncPath
+    """The path of the entry file."""
+    size: int
+    """The size of the entry file in bytes."""
+    accessed_at: int
+    """The last access time of the entry file in nanoseconds."""
 
 
 def get_or_create_cache_dir(cache_dir: str | PathLike[str] | SyncPath | None = None) -> AsyncPath:
@@ -32,18 +64,185 @@ def get_or_create_cache_dir(cache_dir: str | PathLike[str] | SyncPath | None = N
     return AsyncPath(dir_path)
 
 
+def _read_entry(path: SyncPath) -> bytes | None:
+    """Read an entry file and mark it as accessed.
+
+    Notes:
+        - The access time is set explicitly, since most file systems are mounted with ``relatime`` or ``noatime``.
+
+    Args:
+        path: The path of the entry file.
+
+    Returns:
+        The file content, or None if the file does not exist.
+    """
+    try:
+        with path.open("rb") as f:
+            data = f.read()
+            modified_at = os.fstat(f.fileno()).st_mtime_ns
+        os.utime(path, ns=(time_ns(), modified_at))
+    except FileNotFoundError:
+        return None
+    return data
+
+
+def _write_entry(path: SyncPath, data: bytes) -> None:
+    """Write an entry file atomically.
+
+    Notes:
+        - The data is written to a temporary file in the same directory, which then replaces the entry file. Readers
+            therefore see either the old or the new entry, never a partial one.
+
+    Args:
+        path: The path of the entry file.
+        data: The data to write.
+    """
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{token_hex(4)}.tmp")
+    try:
+        temp_path.write_bytes(data)
+        temp_path.replace(path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _iter_entries(cache_dir: SyncPath) -> Iterator[_EntryInfo]:
+    """Iterate the entry files of a cache directory.
+
+    Notes:
+        - Only regular files in shard directories are entries. Other state in the cache directory, e.g. journals,
+            batch files and cloned repositories, is never listed, and therefore never evicted.
+
+    Args:
+        cache_dir: The cache directory.
+
+    Yields:
+        The entry files, skipping temporary files of in-flight writes.
+    """
+    for shard in cache_dir.iterdir():
+        if not _SHARD_PATTERN.fullmatch(shard.name) or not shard.is_dir():
+            continue
+        for path in shard.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if S_ISREG(stat.st_mode):
+                yield _EntryInfo(path=path, size=stat.st_size, accessed_at=stat.st_atime_ns)
+
+
+def _migrate_flat_entries(cache_dir: SyncPath, compression: Compression) -> int:
+    """Move the entries written to the root of a cache directory before sharding into their shards.
+
+    Notes:
+        - Flat entries were stored as plain text, so they are rewritten with a compression header.
+
+    Args:
+        cache_dir: The cache directory.
+        compression: The compression to rewrite the entries with.
+
+    Returns:
+        The number of migrated entries.
+    """
+    migrated = 0
+    for path in cache_dir.iterdir():
+        if not _FLAT_ENTRY_PATTERN.fullmatch(path.name) or not path.is_file():
+            continue
+        shard = sha256(path.name.encode()).hexdigest()[:SHARD_PREFIX_LENGTH]
+        _write_entry(cache_dir / shard / path.name, compress(path.read_bytes(), compression))
+        path.unlink()
+        migrated += 1
+    return migrated
+
+
+def _prune_entries(cache_dir: SyncPath, max_bytes: int) -> tuple[int, int]:
+    """Delete the least recently accessed entries until the cache is within a size limit.
+
+    Args:
+        cache_dir: The cache directory.
+        max_bytes: The size limit in bytes.
+
+    Returns:
+        A tuple of the number of deleted entries and the remaining size in bytes.
+    """
+    entries = sorted(_iter_entries(cache_dir), key=lambda entry: entry.accessed_at)
+    size = sum(entry.size for entry in entries)
+    deleted = 0
+    for entry in entries:
+        if size <= max_bytes:
+            break
+        entry.path.unlink(missing_ok=True)
+        size -= entry.size
+        deleted += 1
+    return deleted, size
+
+
 class FileSystemCache(CacheBase):
     """File system cache implementation.
 
+    Notes:
+        - Entries are sharded into subdirectories named after a prefix of the hash of their key, so that no single
+            directory grows too large.
+        - When ``max_bytes`` is set, the least recently accessed entries are evicted once the cache exceeds it. The
+            cache size is scanned once per process and tracked approximately afterwards.
+        - Entries written to the root of the cache directory before entries were sharded are migrated into their
+            shards when the cache is created.
+
     Args:
         cache_dir: The name of the cache directory.
+        max_bytes: The maximum size of the cache in bytes.
+        compression: The compression to use for new entries. Entries are readable regardless of this setting.
+        max_concurrency: The maximum number of concurrent file operations of bulk operations.
     """
 
     _cache_dir: AsyncPath
+    _size: int | None
 
-    def __init__(self, cache_dir: str | PathLike[str] | PurePath | None = None) -> None:
+    def __init__(
+        self,
+        cache_dir: str | PathLike[str] | PurePath | None = None,
+        max_bytes: int | None = None,
+        compression: Compression = "zlib",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
         super().__init__()
+        ensure_compression_available(compression)
+
         self._cache_dir = get_or_create_cache_dir(cache_dir=cache_dir)
+        _migrate_flat_entries(SyncPath(self._cache_dir), compression)
+        self._max_bytes = max_bytes
+        self._compression = compression
+        self._max_concurrency = max_concurrency
+        self._size = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _get_path(self, key: str) -> SyncPath:
+        shard = sha256(key.encode()).hexdigest()[:SHARD_PREFIX_LENGTH]
+        return SyncPath(self._cache_dir) / shard / key
+
+    def _decode(self, data: bytes | None) -> str | None:
+        if data is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return decompress(data).decode()
+
+    async def _track_size(self, written: int) -> None:
+        if self._max_bytes is None:
+            return
+
+        if self._size is None:
+            self._size = (await self.get_statistics())["size_bytes"]
+        else:
+            self._size += written
+        if self._size > self._max_bytes:
+            await self.prune()
 
     async def get(self, key: str) -> str | None:
         """Get a value from the cache.
@@ -54,11 +253,7 @@ class FileSystemCache(CacheBase):
         Returns:
             The cached value or None if the key does not exist.
         """
-        cache_file = self._cache_dir / key
-        try:
-            return await cache_file.read_text()
-        except FileNotFoundError:
-            return None
+        return self._decode(await to_thread.run_sync(_read_entry, self._get_path(key)))
 
     async def set(self, key: str, value: str | bytes) -> None:
         """Set a value in the cache.
@@ -70,8 +265,9 @@ class FileSystemCache(CacheBase):
         Returns:
             None
         """
-        cache_file = self._cache_dir / key
-        await cache_file.write_text(value if not isinstance(value, bytes) else value.decode())
+        data = compress(value if isinstance(value, bytes) else value.encode(), self._compression)
+        await to_thread.run_sync(_write_entry, self._get_path(key), data)
+        await self._track_size(len(data))
 
     async def delete(self, key: str) -> None:
         """Delete a value from the cache.
@@ -82,8 +278,7 @@ class FileSystemCache(CacheBase):
         Returns:
             None
         """
-        cache_file = self._cache_dir / key
-        await cache_file.unlink(missing_ok=True)
+        await AsyncPath(self._get_path(key)).unlink(missing_ok=True)
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in the cache.
@@ -94,5 +289,109 @@ class FileSystemCache(CacheBase):
         Returns:
             True if the key exists, else False.
         """
-        cache_file = self._cache_dir / key
-        return await cache_file.exists()
+        return await AsyncPath(self._get_path(key)).exists()
+
+    async def iter_keys(self) -> AsyncIterator[str]:
+        """Iterate the keys in the cache.
+
+        Yields:
+            The keys in the cache.
+        """
+        entries = await to_thread.run_sync(lambda: list(_iter_entries(SyncPath(self._cache_dir))))
+        for entry in entries:
+            yield entry.path.name
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Get multiple values from the cache, reading the entry files concurrently.
+
+        Args:
+            keys: The keys to retrieve the values for.
+
+        Returns:
+            A dictionary mapping the keys that exist to their values.
+        """
+        limiter = CapacityLimiter(self._max_concurrency)
+        entries: dict[str, bytes | None] = {}
+
+        async def read(key: str) -> None:
+            entries[key] = await to_thread.run_sync(_read_entry, self._get_path(key), limiter=limiter)
+
+        async with create_task_group() as tg:
+            for key in dict.fromkeys(keys):
+                tg.start_soon(read, key)
+
+        return {key: value for key, data in entries.items() if (value := self._decode(data)) is not None}
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set multiple values in the cache, writing the entry files concurrently.
+
+        Args:
+            items: A mapping of keys to the values to store under them.
+
+        Returns:
+            None
+        """
+        limiter = CapacityLimiter(self._max_concurrency)
+        entries = {key: compress(value.encode(), self._compression) for key, value in items.items()}
+
+        async with create_task_group() as tg:
+            for key, data in entries.items():
+                tg.start_soon(partial(to_thread.run_sync, _write_entry, self._get_path(key), data, limiter=limiter))
+
+        await self._track_size(sum(len(data) for data in entries.values()))
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete multiple values from the cache, deleting the entry files concurrently.
+
+        Args:
+            keys: The keys to delete the values for.
+
+        Returns:
+            None
+        """
+        limiter = CapacityLimiter(self._max_concurrency)
+
+        async with create_task_group() as tg:
+            for key in dict.fromkeys(keys):
+                path = self._get_path(key)
+                tg.start_soon(partial(to_thread.run_sync, partial(path.unlink, missing_ok=True), limiter=limiter))
+
+    async def get_statistics(self) -> CacheStatistics:
+        """Get the cache statistics.
+
+        Notes:
+            - The number of entries and their size are read from disk. The counters only cover this process.
+
+        Returns:
+            The cache statistics.
+        """
+        entries = await to_thread.run_sync(lambda: list(_iter_entries(SyncPath(self._cache_dir))))
+        return CacheStatistics(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=0,
+            entries=len(entries),
+            size_bytes=sum(entry.size for entry in entries),
+        )
+
+    async def prune(self, max_bytes: int | None = None) -> int:
+        """Evict the least recently accessed entries.
+
+        Args:
+            max_bytes: The size to prune the cache to. Defaults to a share of the cache's ``max_bytes``.
+
+        Raises:
+            ValueError: If neither ``max_bytes`` nor the cache's ``max_bytes`` is set.
+
+        Returns:
+            The number of evicted entries.
+        """
+        if max_bytes is None:
+            if self._max_bytes is None:
+                raise ValueError("max_bytes is required for a cache without a size limit")
+            max_bytes = int(self._max_bytes * PRUNE_TARGET_RATIO)
+
+        deleted, self._size = await to_thread.run_sync(_prune_entries, SyncPath(self._cache_dir), max_bytes)
+        self._evictions += deleted
+        return deleted
@@ -1,33 +1,132 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from time import monotonic
+from typing import TYPE_CHECKING, NamedTuple
+
 from anyio import Lock
 
-from gitmind.caching.base import CacheBase
+from gitmind.caching.base import CacheBase, CacheStatistics
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Mapping
 
-class InMemoryCache(CacheBase):
-    """In-memory cache implementation."""
 
-    _store: dict[str, str]
+class _CacheEntry(NamedTuple):
+    value: str
+    """The cached value."""
+    size: int
+    """The size of the value in bytes."""
+    expires_at: float | None
+    """The monotonic time at which the entry expires, if any."""
+
+
+class InMemoryCache(CacheBase):
+    """In-memory cache implementation with LRU eviction.
+
+    Notes:
+        - Reads do not take the lock. They never await, so they cannot interleave with a write.
+
+    Args:
+        max_entries: The maximum number of entries to keep. Least recently used entries are evicted first.
+        max_bytes: The maximum total size of the cached values in bytes.
+        ttl: The default time to live of entries in seconds.
+    """
+
+    __slots__ = (
+        "_evictions",
+        "_expirations",
+        "_hits",
+        "_lock",
+        "_max_bytes",
+        "_max_entries",
+        "_misses",
+        "_size",
+        "_store",
+        "_ttl",
+    )
+
+    _store: OrderedDict[str, _CacheEntry]
     _lock: Lock
 
-    def __init__(self) -> None:
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None, ttl: float | None = None) -> None:
         super().__init__()
-        self._store: dict[str, str] = {}
+        self._store = OrderedDict()
         self._lock = Lock()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """Get the cache statistics.
 
-    async def set(self, key: str, value: str) -> None:
+        Returns:
+            The hit, miss and eviction counters, and the current number of entries and their total size.
+        """
+        return CacheStatistics(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            entries=len(self._store),
+            size_bytes=self._size,
+        )
+
+    def _pop(self, key: str) -> _CacheEntry | None:
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+        return entry
+
+    def _get_live_entry(self, key: str) -> _CacheEntry | None:
+        entry = self._store.get(key)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= monotonic():
+            self._pop(key)
+            self._expirations += 1
+            return None
+        return entry
+
+    def _set(self, key: str, value: str, ttl: float | None) -> None:
+        self._pop(key)
+        size = len(value.encode())
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+
+        ttl = ttl if ttl is not None else self._ttl
+        self._store[key] = _CacheEntry(value=value, size=size, expires_at=monotonic() + ttl if ttl else None)
+        self._size += size
+
+    def _evict(self) -> None:
+        while (self._max_entries is not None and len(self._store) > self._max_entries) or (
+            self._max_bytes is not None and self._size > self._max_bytes
+        ):
+            _, evicted = self._store.popitem(last=False)
+            self._size -= evicted.size
+            self._evictions += 1
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
         """Set a value.
 
+        Notes:
+            - Values larger than ``max_bytes`` are not cached.
+
         Args:
             key: The key to associate with the value
             value: The value to store
+            ttl: The time to live of the entry in seconds. Defaults to the cache's ttl.
 
         Returns:
             None
         """
         async with self._lock:
-            self._store[key] = value
+            self._set(key, value, ttl)
+            self._evict()
 
     async def get(self, key: str) -> str | None:
         """Get a value.
@@ -38,8 +137,73 @@ class InMemoryCache(CacheBase):
         Returns:
             The cached value or None if the key does not exist
         """
+        entry = self._get_live_entry(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._store.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    async def iter_keys(self) -> AsyncIterator[str]:
+        """Iterate the keys in the cache.
+
+        Yields:
+            The keys of the entries that have not expired.
+        """
+        for key in list(self._store):
+            if self._get_live_entry(key) is not None:
+                yield key
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Get multiple values.
+
+        Args:
+            keys: The keys to retrieve the values for.
+
+        Returns:
+            A dictionary mapping the keys that exist to their values.
+        """
+        values: dict[str, str] = {}
+        for key in keys:
+            entry = self._get_live_entry(key)
+            if entry is None:
+                self._misses += 1
+                continue
+
+            self._store.move_to_end(key)
+            self._hits += 1
+            values[key] = entry.value
+        return values
+
+    async def set_many(self, items: Mapping[str, str], ttl: float | None = None) -> None:
+        """Set multiple values.
+
+        Args:
+            items: A mapping of keys to the values to store under them.
+            ttl: The time to live of the entries in seconds. Defaults to the cache's ttl.
+
+        Returns:
+            None
+        """
+        async with self._lock:
+            for key, value in items.items():
+                self._set(key, value, ttl)
+            self._evict()
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete multiple values.
+
+        Args:
+            keys: The keys to delete the values for.
+
+        Returns:
+            None
+        """
         async with self._lock:
-            return self._store.get(key)
+            for key in keys:
+                self._pop(key)
 
     async def delete(self, key: str) -> None:
         """Delete a value.
@@ -51,7 +215,7 @@ class InMemoryCache(CacheBase):
             None
         """
         async with self._lock:
-            self._store.pop(key, None)
+            self._pop(key)
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in the cache.
@@ -62,4 +226,4 @@ class InMemoryCache(CacheBase):
         Returns:
             True if the key exists, else False.
         """
-        return key in self._store
+        return self._get_live_entry(key) is not None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from gitmind.caching.base import CacheBase
+from gitmind.exceptions import MissingDependencyError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Mapping
+
+try:
+    from redis.asyncio import BlockingConnectionPool, Redis
+except ImportError as e:
+    raise MissingDependencyError("redis is not installed") from e
+
+__all__ = ["RedisCache"]
+
+DEFAULT_URL: Final[str] = "redis://localhost:6379/0"
+DEFAULT_KEY_PREFIX: Final[str] = "gitmind:"
+DEFAULT_MAX_CONNECTIONS: Final[int] = 16
+
+
+class RedisCache(CacheBase):
+    """Redis cache implementation, for sharing a cache between machines.
+
+    Notes:
+        - Connections are pooled. When all connections are in use, callers wait for one to be released.
+        - Bulk operations take a single round trip.
+
+    Args:
+        url: The URL of the redis server.
+        ttl: The default time to live of entries in seconds.
+        key_prefix: A prefix for the keys, to namespace the cache on a shared server.
+        max_connections: The maximum number of pooled connections.
+        client: An optional redis client to use instead of creating one from the URL.
+    """
+
+    __slots__ = ("_client", "_key_prefix", "_ttl")
+
+    _client: Redis
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        ttl: float | None = None,
+        key_prefix: str = DEFAULT_KEY_PREFIX,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        client: Redis | None = None,
+    ) -> None:
+        super().__init__()
+        self._client = client or Redis(
+            connection_pool=BlockingConnectionPool.from_url(url, max_connections=max_connections, decode_responses=True)
+        )
+        self._ttl = ttl
+        self._key_prefix = key_prefix
+
+    def _get_ttl_ms(self, ttl: float | None) -> int | None:
+        ttl = ttl if ttl is not None else self._ttl
+        return int(ttl * 1000) if ttl else None
+
+    async def get(self, key: str) -> str | None:
+        """Get a value from the cache.
+
+        Args:
+            key: The key to retrieve the value for.
+
+        Returns:
+            The cached value or None if the key does not exist.
+        """
+        value = await self._client.get(self._key_prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """Set a value in the cache.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to store.
+            ttl: The time to live of the entry in seconds. Defaults to the cache's ttl.
+
+        Returns:
+            None
+        """
+        await self._client.set(self._key_prefix + key, value, px=self._get_ttl_ms(ttl))
+
+    async def delete(self, key: str) -> None:
+        """Delete a value from the cache.
+
+        Args:
+            key: The key to delete the value for.
+
+        Returns:
+            None
+        """
+        await self._client.delete(self._key_prefix + key)
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in the cache.
+
+        Args:
+            key: The key to check the existence of.
+
+        Returns:
+            True if the key exists, else False.
+        """
+        return bool(await self._client.exists(self._key_prefix + key))
+
+    async def iter_keys(self) -> AsyncIterator[str]:
+        """Iterate the keys in the cache.
+
+        Notes:
+            - Keys are scanned incrementally, so that the server is not blocked on large databases.
+
+        Yields:
+            The keys in the cache, without the key prefix.
+        """
+        async for key in self._client.scan_iter(match=f"{self._key_prefix}*"):
+            yield (key.decode() if isinstance(key, bytes) else key)[len(self._key_prefix) :]
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Get multiple values from the cache in a single round trip.
+
+        Args:
+            keys: The keys to retrieve the values for.
+
+        Returns:
+            A dictionary mapping the keys that exist to their values.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        values = await self._client.mget([self._key_prefix + key for key in keys])
+        return {
+            key: value.decode() if isinstance(value, bytes) else value
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def set_many(self, items: Mapping[str, str], ttl: float | None = None) -> None:
+        """Set multiple values in the cache in a single pipelined round trip.
+
+        Args:
+            items: A mapping of keys to the values to store under them.
+            ttl: The time to live of the entries in seconds. Defaults to the cache's ttl.
+
+        Returns:
+            None
+        """
+        if not items:
+            return
+
+        ttl_ms = self._get_ttl_ms(ttl)
+        async with self._client.pipeline(transaction=False) as pipeline:
+            for key, value in items.items():
+                pipeline.set(self._key_prefix + key, value, px=ttl_ms)
+            await pipeline.execute()
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete multiple values from the cache in a single round trip.
+
+        Args:
+            keys: The keys to delete the values for.
+
+        Returns:
+            None
+        """
+        if prefixed_keys := [self._key_prefix + key for key in keys]:
+            await self._client.delete(*prefixed_keys)
+
+    async def aclose(self) -> None:
+        """Close the connection pool.
+
+        Returns:
+            None
+        """
+        await self._client.aclose()
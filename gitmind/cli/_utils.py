@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from importlib import import_module
 from typing import (  # type: ignore[attr-defined]
     TYPE_CHECKING,
     Any,
@@ -10,19 +11,21 @@ from typing import (  # type: ignore[attr-defined]
 )
 
 from pydantic import ValidationError
-from rich_click import Choice, Context, UsageError, echo, option
+from rich_click import Choice, Context, RichGroup, UsageError, echo, option
 from typing_extensions import NotRequired, ParamSpec
 
-from gitmind.config import GitMindSettings
+from gitmind.config import GitMindSettings, load_settings
 from gitmind.utils.repository import get_or_clone_repository
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from pathlib import Path
 
+    from click import Command
     from pygit2 import Repository
 
     from gitmind.prompts.describe_commit import CommitDescriptionResult
+    from gitmind.reporting.rollups import RollupStore
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -39,6 +42,54 @@ class CLIContext(TypedDict):
     """The commit hash."""
     commit_description: NotRequired[CommitDescriptionResult]
     """The commit description result, if any."""
+    rollups: NotRequired[RollupStore]
+    """The rollups store, opened when grades are first recorded or reported."""
+
+
+class LazyGroup(RichGroup):
+    """A command group that imports its subcommands only when they are needed.
+
+    Notes:
+        - Command modules import the analysis dependencies, e.g. the prompt handlers and the cache backends, so
+            importing them lazily keeps the startup of unrelated commands fast. Listing the commands, e.g. for the
+            help text, still imports all of them.
+
+    Args:
+        *args: The group arguments.
+        lazy_subcommands: A mapping of command names to import paths of the form ``module:attribute``.
+        **kwargs: The group keyword arguments.
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: dict[str, str] | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: Context) -> list[str]:
+        """List the names of the subcommands.
+
+        Args:
+            ctx: The click context.
+
+        Returns:
+            The sorted command names.
+        """
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        """Get a subcommand, importing it if it is lazy.
+
+        Args:
+            ctx: The click context.
+            cmd_name: The command name.
+
+        Returns:
+            The command, or None if there is no such command.
+        """
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        module_name, _, attribute = self.lazy_subcommands[cmd_name].partition(":")
+        return cast("Command", getattr(import_module(module_name), attribute))
 
 
 def get_or_set_cli_context(ctx: Context, **kwargs: Any) -> CLIContext:
@@ -56,7 +107,7 @@ def get_or_set_cli_context(ctx: Context, **kwargs: Any) -> CLIContext:
     """
     try:
         if ctx.obj is None:
-            settings = GitMindSettings(**{k: v for k, v in kwargs.items() if v is not None})
+            settings = load_settings(**{k: v for k, v in kwargs.items() if v is not None})
 
             target_repo = cast("Path | str", settings.target_repo)
             ctx.obj = CLIContext(settings=settings, repo=get_or_clone_repository(target_repo))
@@ -1,3 +0,0 @@
-from .commit import commit
-
-__all__ = ["commit"]
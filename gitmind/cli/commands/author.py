@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from json import dumps
+from typing import TYPE_CHECKING, TypedDict
+
+from click import FloatRange, IntRange, option
+from rich_click import Context, command, echo, pass_context
+
+from gitmind.cli._utils import debug_echo, get_or_set_cli_context
+from gitmind.cli.commands.commit import get_commit_data, grade_commit_data, run_command
+from gitmind.cli.commands.report import get_rollup_store, record_rollups
+from gitmind.exceptions import SkippedCommitError
+from gitmind.reporting.sampling import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_MIN_SAMPLE_SIZE,
+    DEFAULT_SAMPLE_RATE,
+    SampleCommit,
+    estimate_mean,
+    get_sample_size,
+    select_sample,
+    stratify,
+)
+from gitmind.utils.commit import iter_commits
+from gitmind.utils.sync import run_sync
+
+if TYPE_CHECKING:
+    from gitmind.cli._utils import CLIContext
+    from gitmind.reporting.sampling import MeanEstimate, Stratum
+
+
+class AuthorProfile(TypedDict):
+    """DTO for the estimated grades of the commits of an author."""
+
+    author: str
+    """The email of the author, or the name if the commits have no email."""
+    commits: int
+    """The number of commits of the author."""
+    sampled: int
+    """The number of sampled commits the estimates are based on."""
+    graded: int
+    """The number of sampled commits that had no recorded grades and were graded."""
+    rules: dict[str, MeanEstimate]
+    """The estimated mean grade and its confidence interval by rule name."""
+
+
+async def grade_sampled_commit(cli_ctx: CLIContext, commit_hash: str) -> dict[str, int] | None:
+    """Grade a sampled commit and record its grades in the rollups.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_hash: The commit hash.
+
+    Returns:
+        The evaluated grades by rule name, or None if the commit is skipped.
+    """
+    try:
+        _, commit_metadata, diff = await get_commit_data(cli_ctx, commit_hash)
+    except SkippedCommitError:
+        return None
+    results = await grade_commit_data(cli_ctx, commit_metadata, diff)
+    return (await record_rollups(cli_ctx, commit_metadata, diff, results))["grades"]
+
+
+async def profile_author(
+    cli_ctx: CLIContext,
+    author: str,
+    commits: list[SampleCommit],
+    recorded: dict[str, dict[str, int]],
+    *,
+    sample_rate: float,
+    min_sample_size: int,
+    confidence: float,
+    seed: int,
+) -> AuthorProfile:
+    """Estimate the grades of the commits of an author from a stratified sample.
+
+    Args:
+        cli_ctx: The CLI context.
+        author: The author.
+        commits: The commits of the author.
+        recorded: The grades recorded in the rollups by commit hash. Graded commits are added to it.
+        sample_rate: The share of the commits to sample.
+        min_sample_size: The minimum number of commits to sample.
+        confidence: The confidence level of the intervals.
+        seed: The seed of the sample.
+
+    Returns:
+        The author profile.
+    """
+    strata = stratify(commits)
+    sample = select_sample(
+        strata,
+        get_sample_size(len(commits), sample_rate=sample_rate, min_sample_size=min_sample_size),
+        graded=recorded,
+        seed=seed,
+    )
+
+    sampled = graded = 0
+    grades: defaultdict[str, defaultdict[Stratum, list[int]]] = defaultdict(lambda: defaultdict(list))
+    for stratum, commit_hashes in sample.items():
+        for commit_hash in commit_hashes:
+            if (commit_grades := recorded.get(commit_hash)) is None:
+                if (commit_grades := await grade_sampled_commit(cli_ctx, commit_hash)) is None:
+                    continue
+                recorded[commit_hash] = commit_grades
+                graded += 1
+            sampled += 1
+            for rule, grade in commit_grades.items():
+                grades[rule][stratum].append(grade)
+
+    populations = {stratum: len(stratum_commits) for stratum, stratum_commits in strata.items()}
+    return AuthorProfile(
+        author=author,
+        commits=len(commits),
+        sampled=sampled,
+        graded=graded,
+        rules={
+            rule: estimate
+            for rule, rule_grades in sorted(grades.items())
+            if (estimate := estimate_mean(rule_grades, populations, confidence=confidence)) is not None
+        },
+    )
+
+
+async def handle_author(
+    ctx: Context,
+    revspec: str,
+    authors: tuple[str, ...],
+    sample_rate: float,
+    min_sample_size: int,
+    confidence: float,
+    seed: int,
+) -> list[AuthorProfile]:
+    """Profile the authors of a repository by grading a stratified sample of the commits of each.
+
+    Notes:
+        - The commits of each author are stratified by time and by the number of changed files. See
+            ``gitmind.reporting.sampling``.
+        - The grades recorded in the rollups of the report command are used first: recorded commits are always part
+            of the sample. Sampled commits that are not recorded are graded and recorded, so that later runs reuse them.
+
+    Args:
+        ctx: The click context.
+        revspec: The revision range to walk.
+        authors: The names or emails of the authors to profile. Defaults to all authors.
+        sample_rate: The share of the commits of each author to sample.
+        min_sample_size: The minimum number of commits to sample per author.
+        confidence: The confidence level of the intervals.
+        seed: The seed of the samples.
+
+    Returns:
+        The author profiles, most active author first.
+    """
+    cli_ctx = get_or_set_cli_context(ctx)
+    populations: dict[str, list[SampleCommit]] = {}
+    for record in iter_commits(repo=cli_ctx["repo"], revspec=revspec, authors=authors or None):
+        populations.setdefault(record.author_email or record.author_name or "unknown", []).append(
+            SampleCommit(commit_hash=record.hex, timestamp=record.timestamp, changed_files=record.count_changed_files())
+        )
+
+    store = get_rollup_store(cli_ctx)
+    recorded = await run_sync(
+        store.get_recorded_grades, [commit["commit_hash"] for commits in populations.values() for commit in commits]
+    )
+    debug_echo(cli_ctx, f"Found {len(recorded)} commits of {len(populations)} authors with recorded grades")
+
+    return [
+        await profile_author(
+            cli_ctx,
+            author,
+            commits,
+            recorded,
+            sample_rate=sample_rate,
+            min_sample_size=min_sample_size,
+            confidence=confidence,
+            seed=seed,
+        )
+        for author, commits in sorted(populations.items(), key=lambda item: (-len(item[1]), item[0]))
+    ]
+
+
+@command()
+@option("--revspec", type=str, default="HEAD", help="The revision range to walk, e.g. 'main'.")
+@option(
+    "--author",
+    "authors",
+    type=str,
+    multiple=True,
+    help="The name or email of an author to profile. Can be given multiple times. Defaults to all authors.",
+)
+@option(
+    "--sample-rate",
+    type=FloatRange(0, 1, min_open=True),
+    default=DEFAULT_SAMPLE_RATE,
+    show_default=True,
+    help="The share of the commits of each author to sample.",
+)
+@option(
+    "--min-samples",
+    "min_sample_size",
+    type=IntRange(min=1),
+    default=DEFAULT_MIN_SAMPLE_SIZE,
+    show_default=True,
+    help="The minimum number of commits to sample per author. Authors with fewer commits are graded completely.",
+)
+@option(
+    "--confidence",
+    type=FloatRange(0, 1, min_open=True, max_open=True),
+    default=DEFAULT_CONFIDENCE,
+    show_default=True,
+    help="The confidence level of the intervals.",
+)
+@option("--seed", type=int, default=0, show_default=True, help="The seed of the samples.")
+@pass_context
+def author(
+    ctx: Context,
+    revspec: str,
+    authors: tuple[str, ...],
+    sample_rate: float,
+    min_sample_size: int,
+    confidence: float,
+    seed: int,
+) -> None:
+    """Profile the commit quality of the authors of the repository. Outputs a JSON object per author per line.
+
+    Each author's grades are estimated from a sample of their commits, stratified by time and size, with confidence
+    intervals. Grades recorded in the rollups of the report command are used first, and the sampled commits are
+    recorded in them.
+    """
+    for profile in run_command(handle_author)(ctx, revspec, authors, sample_rate, min_sample_size, confidence, seed):
+        echo(dumps(profile))
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from json import dumps
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Final, TypeVar
+
+from click import ClickException, option
+from click import Path as ClickPath
+from rich_click import Context, echo, group, pass_context
+
+from gitmind.caching.file import DEFAULT_FOLDER_NAME
+from gitmind.cli._utils import debug_echo, get_or_set_cli_context
+from gitmind.cli.commands.cache import get_persistent_cache
+from gitmind.cli.commands.commit import get_commit_data, path_options, resume_option, route_commit, run_command
+from gitmind.exceptions import LLMClientError, SkippedCommitError
+from gitmind.utils.commit import iter_commits
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.cli.commands.commit import Analysis
+    from gitmind.llm.base import LLMClient
+    from gitmind.prompts.batch import BatchEntry, BatchSummary
+    from gitmind.utils.journal import Journal
+
+T = TypeVar("T")
+
+BATCH_FOLDER_NAME: Final[str] = "batches"
+"""The folder of batch files in the cache directory."""
+DEFAULT_BATCH_GROUP: Final[str] = "default"
+"""The name of the batch of the provider model when model routing is disabled."""
+
+
+class BatchGroup:
+    """The entries of a batch, submitted with the same LLM client, and the cache keys of their commits' prompts.
+
+    Args:
+        client: The LLM client.
+    """
+
+    __slots__ = ("client", "commits", "entries")
+
+    def __init__(self, client: LLMClient) -> None:
+        self.client = client
+        self.commits: dict[str, str] = {}
+        self.entries: dict[str, BatchEntry] = {}
+
+    def get_entries(self, commits: list[str]) -> dict[str, BatchEntry]:
+        """Get the entries of some of the commits of the group.
+
+        Args:
+            commits: The commit hashes.
+
+        Returns:
+            The batch entries of the commits, by the cache keys of their prompts.
+        """
+        return {self.commits[commit_hash]: self.entries[self.commits[commit_hash]] for commit_hash in commits}
+
+
+async def collect_batch_groups(
+    cli_ctx: CLIContext, analysis: Analysis, revspec: str, paths: tuple[str, ...], exclude_paths: tuple[str, ...]
+) -> tuple[dict[str, BatchGroup], int]:
+    """Collect the prompts of the commits in a range that are not analysed yet.
+
+    Notes:
+        - The prompts are the ones the regular analysis of each commit would send, routed and pre-graded as
+            configured, so that it finds the batch results in the cache.
+        - Commits are grouped by model tier, since a batch is submitted with a single model.
+
+    Args:
+        cli_ctx: The CLI context.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        A tuple of the batch groups by model tier, and the number of commits that need no request.
+    """
+    from gitmind.prompts.batch import BatchEntry
+    from gitmind.prompts.describe_commit import DescribeCommitHandler
+    from gitmind.prompts.grade_commit import GradeCommitHandler
+    from gitmind.prompts.heuristics import pre_grade
+    from gitmind.rules import DEFAULT_GRADING_RULES
+
+    settings = cli_ctx["settings"]
+    groups: dict[str, BatchGroup] = {}
+    analysed = 0
+    for record in iter_commits(repo=cli_ctx["repo"], revspec=revspec, paths=paths, exclude_paths=exclude_paths):
+        try:
+            statistics, metadata, diff = await get_commit_data(cli_ctx, record.hex, paths, exclude_paths)
+        except SkippedCommitError:
+            continue
+
+        client, model_tier = await route_commit(cli_ctx, metadata, diff)
+        if analysis == "describe":
+            describe_handler = DescribeCommitHandler(client=client, cache=settings.cache, model_tier=model_tier)
+            entry = BatchEntry(
+                describe_handler,
+                describe_handler.create_batch_prompt(statistics=statistics, metadata=metadata, diff=diff),
+            )
+        else:
+            pre_grading = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode=settings.heuristic_grading)
+            if not pre_grading["remaining_rules"]:
+                analysed += 1
+                continue
+            grade_handler = GradeCommitHandler(client=client, cache=settings.cache, model_tier=model_tier)
+            entry = BatchEntry(
+                grade_handler,
+                grade_handler.create_batch_prompt(
+                    metadata=metadata,
+                    diff=diff,
+                    grading_rules=pre_grading["remaining_rules"],
+                    signals=pre_grading["signals"],
+                ),
+            )
+
+        prompt = entry.prompt
+        cached = await entry.handler.get_cached_result(
+            prompt.cache_key, response_type=prompt.response_type, schema=prompt.schema, rules=prompt.rules
+        )
+        if cached is not None:
+            analysed += 1
+            continue
+        batch_group = groups.setdefault(model_tier or DEFAULT_BATCH_GROUP, BatchGroup(client))
+        batch_group.entries[prompt.cache_key] = entry
+        batch_group.commits[record.hex] = prompt.cache_key
+
+    return groups, analysed
+
+
+def get_submitted_batches(journal: Journal, stage: str, commits: list[str]) -> tuple[dict[str, list[str]], list[str]]:
+    """Split pending commits by the batch that an interrupted run submitted for them.
+
+    Notes:
+        - Commits whose results were cached since are not pending, so only part of a submitted batch may be pending.
+            Its pending commits still resume it, since the batch is paid for already.
+
+    Args:
+        journal: The journal of the interrupted run.
+        stage: The journal stage of the batch command.
+        commits: The pending commits.
+
+    Returns:
+        A tuple of the pending commits by the ID of the batch they were submitted in, and the commits that were not
+        submitted.
+    """
+    submitted: dict[str, list[str]] = {}
+    unsubmitted: list[str] = []
+    for commit_hash in commits:
+        record = journal.get(commit_hash, stage)
+        if record is not None and record["status"] == "submitted" and isinstance(batch_id := record.get("result"), str):
+            submitted.setdefault(batch_id, []).append(commit_hash)
+        else:
+            unsubmitted.append(commit_hash)
+    return submitted, unsubmitted
+
+
+async def handle_batch(
+    ctx: Context,
+    analysis: Analysis,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    batch_dir: Path | None,
+    poll_interval: float | None,
+    resume: bool = False,
+) -> list[BatchSummary]:
+    """Analyse the commits in a range through the batch API of the provider.
+
+    Notes:
+        - The submitted batches are recorded in a journal in the cache directory, which is removed once the run is
+            done. Resuming an interrupted run waits for the batches it submitted for the commits that are still
+            pending, instead of submitting them again, and only submits the commits it had not submitted yet.
+
+    Args:
+        ctx: The click context.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+        batch_dir: The directory to write the batch files to. Defaults to 'batches' in the cache directory.
+        poll_interval: The number of seconds between polls of the batch state.
+        resume: Whether to resume an interrupted run from its journal.
+
+    Returns:
+        The summary of each submitted batch.
+    """
+    from gitmind.prompts.batch import DEFAULT_POLL_INTERVAL, complete_batch, submit_batch
+    from gitmind.utils.journal import Journal, JournalRecord, get_journal_path
+
+    cli_ctx = get_or_set_cli_context(ctx)
+    get_persistent_cache(ctx)
+    settings = cli_ctx["settings"]
+    batch_dir = batch_dir or Path(settings.cache_dir or DEFAULT_FOLDER_NAME) / BATCH_FOLDER_NAME
+
+    groups, analysed = await collect_batch_groups(cli_ctx, analysis, revspec, paths, exclude_paths)
+    debug_echo(cli_ctx, f"{analysed} commits in {revspec} need no batch request")
+
+    stage = f"batch-{analysis}"
+    journal_path = get_journal_path(settings.cache_dir, stage, settings.target_repo, revspec, paths, exclude_paths)
+    summaries: list[BatchSummary] = []
+    async with Journal(journal_path, resume=resume) as journal:
+        for group_name, batch_group in groups.items():
+            batches, unsubmitted = get_submitted_batches(journal, stage, list(batch_group.commits))
+            for batch_id, commits in batches.items():
+                debug_echo(cli_ctx, f"Resuming batch {batch_id} for {len(commits)} pending commits")
+            if unsubmitted:
+                batch_id = await submit_batch(
+                    client=batch_group.client,
+                    entries=batch_group.get_entries(unsubmitted),
+                    batch_file=batch_dir / f"{analysis}-{group_name}-{int(time())}.jsonl",
+                )
+                for commit_hash in unsubmitted:
+                    await journal.append(
+                        JournalRecord(commit_hash=commit_hash, stage=stage, status="submitted", result=batch_id)
+                    )
+                # a batch is paid for once submitted, so its record must survive a crash ~keep
+                await journal.sync()
+                batches[batch_id] = unsubmitted
+
+            for batch_id, commits in batches.items():
+                summaries.append(
+                    await complete_batch(
+                        batch_group.client,
+                        batch_id,
+                        entries=batch_group.get_entries(commits),
+                        poll_interval=poll_interval if poll_interval is not None else DEFAULT_POLL_INTERVAL,
+                    )
+                )
+                for commit_hash in commits:
+                    await journal.append(
+                        JournalRecord(commit_hash=commit_hash, stage=stage, status="completed", result=batch_id)
+                    )
+        await journal.remove()
+    return summaries
+
+
+def batch_options(fn: Callable[..., T]) -> Callable[..., T]:
+    """Add the options shared by the batch commands to a command.
+
+    Args:
+        fn: The command function.
+
+    Returns:
+        The decorated command function.
+    """
+    fn = option(
+        "--poll-interval",
+        type=float,
+        default=None,
+        help="The number of seconds between polls of the batch state. Defaults to a minute.",
+    )(fn)
+    fn = option(
+        "--batch-dir",
+        type=ClickPath(file_okay=False, path_type=Path),
+        default=None,
+        help="The directory to write the batch files to. Defaults to 'batches' in the cache directory.",
+    )(fn)
+    fn = resume_option(fn)
+    fn = path_options(fn)
+    return option("--revspec", required=True, type=str, help="The revision range to analyse, e.g. 'main..feature'.")(fn)
+
+
+def run_batch_command(
+    ctx: Context,
+    analysis: Analysis,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    batch_dir: Path | None,
+    poll_interval: float | None,
+    resume: bool,
+) -> None:
+    """Run a batch command, echoing a JSON object per submitted batch.
+
+    Args:
+        ctx: The click context.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+        batch_dir: The directory to write the batch files to.
+        poll_interval: The number of seconds between polls of the batch state.
+        resume: Whether to resume an interrupted run from its journal.
+
+    Raises:
+        ClickException: If the LLM client does not support batches or the batch API fails.
+    """
+    try:
+        summaries = run_command(handle_batch)(
+            ctx, analysis, revspec, paths, exclude_paths, batch_dir, poll_interval, resume
+        )
+    except LLMClientError as e:
+        raise ClickException(f"{e}: {e.context}" if e.context else str(e)) from e
+    for summary in summaries:
+        echo(dumps(summary))
+
+
+@group()
+def batch() -> None:
+    """Batch commands, analysing many commits through the batch API of the provider.
+
+    Batches are cheaper than regular requests and not rate limited, but take up to a day. The results are stored in
+    the cache, where the regular commands find them. A persistent cache is required.
+    """
+
+
+@batch.command("describe")
+@batch_options
+@pass_context
+def describe_batch(
+    ctx: Context,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    batch_dir: Path | None,
+    poll_interval: float | None,
+    resume: bool,
+) -> None:
+    """Describe every commit in a range through the batch API."""
+    run_batch_command(ctx, "describe", revspec, paths, exclude_paths, batch_dir, poll_interval, resume)
+
+
+@batch.command("grade")
+@batch_options
+@pass_context
+def grade_batch(
+    ctx: Context,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    batch_dir: Path | None,
+    poll_interval: float | None,
+    resume: bool,
+) -> None:
+    """Grade every commit in a range through the batch API."""
+    run_batch_command(ctx, "grade", revspec, paths, exclude_paths, batch_dir, poll_interval, resume)
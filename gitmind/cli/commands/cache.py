@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+from json import dumps
+from typing import TYPE_CHECKING
+
+from anyio import Path as AsyncPath
+from click import Choice, option
+from click import Path as PathType
+from rich_click import Context, UsageError, echo, group, pass_context
+
+from gitmind.caching import FileSystemCache, InMemoryCache
+from gitmind.caching.bundle import create_bundle, decode_bundle, encode_bundle, import_bundle
+from gitmind.caching.entry import invalidate_entries
+from gitmind.cli._utils import get_or_set_cli_context
+from gitmind.cli.commands.commit import get_commit_data
+from gitmind.exceptions import CacheBundleError, SkippedCommitError
+from gitmind.utils.commit import iter_commits
+from gitmind.utils.sync import run_as_sync
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from gitmind.caching import CacheBase
+    from gitmind.caching.entry import CacheEntryMetadata
+    from gitmind.config import GitMindSettings
+    from gitmind.prompts.base import AbstractPromptHandler
+    from gitmind.utils.compression import Compression
+
+
+@group()
+def cache() -> None:
+    """Cache commands."""
+
+
+def get_file_cache(ctx: Context) -> FileSystemCache:
+    """Get the file cache from the CLI context.
+
+    Args:
+        ctx: The click context.
+
+    Raises:
+        UsageError: If the configured cache is not a file cache.
+
+    Returns:
+        The file cache.
+    """
+    settings = get_or_set_cli_context(ctx)["settings"]
+    if not isinstance(settings.cache, FileSystemCache):
+        raise UsageError("Cache commands require the file cache. Set --cache-type=file.")
+    return settings.cache
+
+
+def get_persistent_cache(ctx: Context) -> CacheBase:
+    """Get a cache that outlives the CLI process from the CLI context.
+
+    Args:
+        ctx: The click context.
+
+    Raises:
+        UsageError: If the configured cache is an in-memory cache.
+
+    Returns:
+        The cache.
+    """
+    settings = get_or_set_cli_context(ctx)["settings"]
+    if isinstance(settings.cache, InMemoryCache):
+        raise UsageError("This command requires a persistent cache. Set --cache-type=file or --cache-type=redis.")
+    return settings.cache
+
+
+def get_prompt_handlers(settings: GitMindSettings) -> list[AbstractPromptHandler[Any]]:
+    """Get the prompt handlers whose results are cached with the current settings.
+
+    Notes:
+        - If a triage model is configured, commits are routed to it, so its describe and grade handlers are included,
+            as is the handler of the classifier that routes commits. See ``gitmind.cli.commands.commit.route_commit``.
+
+    Args:
+        settings: The gitmind settings.
+
+    Returns:
+        The prompt handlers.
+    """
+    from gitmind.prompts import DescribeCommitHandler, GradeCommitHandler
+    from gitmind.prompts.classify_commit import ClassifyCommitHandler
+
+    handlers: list[AbstractPromptHandler[Any]] = [
+        DescribeCommitHandler(client=settings.llm_client),
+        GradeCommitHandler(client=settings.llm_client),
+    ]
+    if (triage_client := settings.triage_llm_client) is not None:
+        handlers.extend(
+            handler_class(client=triage_client, model_tier="triage")
+            for handler_class in (DescribeCommitHandler, GradeCommitHandler, ClassifyCommitHandler)
+        )
+    return handlers
+
+
+async def get_range_cache_keys(ctx: Context, revspec: str) -> list[str]:
+    """Get the cache keys of the analyses of the commits in a range.
+
+    Notes:
+        - The keys depend on the prompts, so they are computed with the current settings and models. See
+            ``get_prompt_handlers``.
+
+    Args:
+        ctx: The click context.
+        revspec: The revision range.
+
+    Returns:
+        The cache keys.
+    """
+    from gitmind.prompts import DescribeCommitHandler
+
+    cli_ctx = get_or_set_cli_context(ctx)
+    handlers = get_prompt_handlers(cli_ctx["settings"])
+
+    cache_keys: list[str] = []
+    for record in iter_commits(repo=cli_ctx["repo"], revspec=revspec):
+        try:
+            statistics, metadata, diff = await get_commit_data(cli_ctx, record.hex)
+        except SkippedCommitError:
+            continue
+        for handler in handlers:
+            if isinstance(handler, DescribeCommitHandler):
+                cache_keys.extend(handler.get_cache_keys(statistics=statistics, metadata=metadata, diff=diff))
+            else:
+                cache_keys.extend(handler.get_cache_keys(metadata=metadata, diff=diff))
+    return cache_keys
+
+
+@cache.command()
+@pass_context
+def stats(ctx: Context) -> None:
+    """Show the number of entries and the size of the file cache."""
+    statistics = run_as_sync(get_file_cache(ctx).get_statistics)()
+    echo(dumps({"entries": statistics["entries"], "size_bytes": statistics["size_bytes"]}, indent=2))
+
+
+@cache.command()
+@option(
+    "--max-bytes",
+    type=int,
+    default=None,
+    help="The size to prune the cache to. Defaults to 90% of the configured cache size limit.",
+)
+@pass_context
+def prune(ctx: Context, max_bytes: int | None) -> None:
+    """Evict the least recently used entries of the file cache."""
+    try:
+        evicted = run_as_sync(get_file_cache(ctx).prune)(max_bytes)
+    except ValueError as e:
+        raise UsageError(str(e)) from e
+    echo(f"Evicted {evicted} entries.")
+
+
+async def handle_export(ctx: Context, output: str, revspec: str | None, compression: Compression) -> int:
+    """Export the cache to a bundle file.
+
+    Args:
+        ctx: The click context.
+        output: The path of the bundle file.
+        revspec: An optional revision range to export the analyses of.
+        compression: The compression to use.
+
+    Returns:
+        The number of exported entries.
+    """
+    keys = await get_range_cache_keys(ctx, revspec) if revspec else None
+    bundle = await create_bundle(cache=get_persistent_cache(ctx), keys=keys)
+    await AsyncPath(output).write_bytes(encode_bundle(bundle, compression))
+    return len(bundle["entries"])
+
+
+@cache.command("export")
+@option("--output", required=True, type=PathType(dir_okay=False), help="The path of the bundle file to write.")
+@option("--revspec", type=str, default=None, help="Only export the analyses of the commits in this revision range.")
+@option("--compression", type=Choice(["none", "zlib", "zstd"]), default="zlib", help="The bundle compression.")
+@pass_context
+def export_cache(ctx: Context, output: str, revspec: str | None, compression: Compression) -> None:
+    """Export cached analyses to a bundle file."""
+    exported = run_as_sync(handle_export)(ctx, output, revspec, compression)
+    echo(f"Exported {exported} entries to {output}.")
+
+
+async def handle_import(ctx: Context, input_path: str) -> int:
+    """Import a bundle file into the cache.
+
+    Args:
+        ctx: The click context.
+        input_path: The path of the bundle file.
+
+    Raises:
+        UsageError: If the bundle file is invalid.
+
+    Returns:
+        The number of imported entries.
+    """
+    try:
+        bundle = decode_bundle(await AsyncPath(input_path).read_bytes())
+    except CacheBundleError as e:
+        raise UsageError(str(e)) from e
+    return await import_bundle(cache=get_persistent_cache(ctx), bundle=bundle)
+
+
+@cache.command("import")
+@option(
+    "--input",
+    "input_path",
+    required=True,
+    type=PathType(exists=True, dir_okay=False),
+    help="The path of the bundle file to read.",
+)
+@pass_context
+def import_cache(ctx: Context, input_path: str) -> None:
+    """Import cached analyses from a bundle file."""
+    imported = run_as_sync(handle_import)(ctx, input_path)
+    echo(f"Imported {imported} entries.")
+
+
+async def handle_invalidate(
+    ctx: Context, stale: bool, model: str | None, handler: str | None, invalidate_all: bool
+) -> int:
+    """Delete cache entries.
+
+    Notes:
+        - Deleted analyses are recomputed the next time their commits are analysed.
+        - With ``stale``, entries are checked against the current prompts, models and default grading rules. An entry
+            is current if the handler of any model tier accepts it, see ``get_prompt_handlers``. Entries without
+            metadata, e.g. of an older entry format, are always stale.
+
+    Args:
+        ctx: The click context.
+        stale: Whether to delete stale entries.
+        model: An optional model to delete the entries of.
+        handler: An optional prompt handler to delete the entries of.
+        invalidate_all: Whether to delete all entries.
+
+    Returns:
+        The number of deleted entries.
+    """
+    from gitmind.rules import DEFAULT_GRADING_RULES
+
+    persistent_cache = get_persistent_cache(ctx)
+    handlers: dict[str, list[AbstractPromptHandler[Any]]] = {}
+    for prompt_handler in get_prompt_handlers(get_or_set_cli_context(ctx)["settings"]):
+        handlers.setdefault(prompt_handler.__class__.__name__, []).append(prompt_handler)
+
+    def predicate(metadata: CacheEntryMetadata | None) -> bool:
+        if invalidate_all:
+            return True
+        if metadata is None:
+            return stale
+        if (model is not None and metadata["model"] == model) or (
+            handler is not None and metadata["handler"] == handler
+        ):
+            return True
+        if stale:
+            return not any(
+                prompt_handler.is_current_entry(metadata, DEFAULT_GRADING_RULES)
+                for prompt_handler in handlers.get(metadata["handler"], [])
+            )
+        return False
+
+    return await invalidate_entries(cache=persistent_cache, predicate=predicate)
+
+
+@cache.command()
+@option("--stale", is_flag=True, default=False, help="Delete entries created with a different prompt, model or rule.")
+@option("--model", type=str, default=None, help="Delete the entries created with this model.")
+@option("--handler", type=str, default=None, help="Delete the entries of this prompt handler, e.g. GradeCommitHandler.")
+@option("--all", "invalidate_all", is_flag=True, default=False, help="Delete all entries.")
+@pass_context
+def invalidate(ctx: Context, stale: bool, model: str | None, handler: str | None, invalidate_all: bool) -> None:
+    """Delete cached analyses, so that they are recomputed on the next run."""
+    if not (stale or model or handler or invalidate_all):
+        raise UsageError("Pass at least one of --stale, --model, --handler or --all.")
+    invalidated = run_as_sync(handle_invalidate)(ctx, stale, model, handler, invalidate_all)
+    echo(f"Invalidated {invalidated} entries.")
@@ -1,77 +1,650 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from functools import wraps
 from json import dumps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Literal, TypedDict, TypeVar
 
-from click import option
+from anyio import current_time
+from click import Choice, ClickException, option
+from click import Path as ClickPath
 from rich_click import Context, echo, group, pass_context
+from typing_extensions import ParamSpec
 
 from gitmind.cli._utils import debug_echo, get_or_set_cli_context
-from gitmind.prompts import DescribeCommitHandler
-from gitmind.prompts.describe_commit import CommitDescriptionResult
-from gitmind.prompts.grade_commit import CommitGradingResult, GradeCommitHandler
-from gitmind.utils.commit import extract_commit_data
+from gitmind.exceptions import ConfigurationError, MissingDependencyError, ServerError, SkippedCommitError
+from gitmind.reporting.sinks import OUTPUT_FORMATS
+from gitmind.utils.commit import extract_commit_data, get_commit, get_merged_commits, iter_commits
 from gitmind.utils.sync import run_as_sync
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.llm.base import LLMClient
+    from gitmind.prompts.describe_commit import CommitDescriptionResult
+    from gitmind.prompts.grade_commit import CommitGradingResult
+    from gitmind.reporting.sinks import OutputFormat
+    from gitmind.utils.commit import CommitMetadata, CommitRecord, CommitStatistics
+    from gitmind.utils.journal import Journal
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+Analysis = Literal["describe", "grade"]
+
+
+class RangeResult(TypedDict):
+    """DTO for the analysis result of a commit in a range."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    timestamp: int
+    """The unix UTC timestamp of when the commit was committed."""
+    author_name: str | None
+    """The name of the author of the commit."""
+    author_email: str | None
+    """The email of the author of the commit."""
+    result: Any
+    """The analysis result."""
+
+
+def path_options(fn: Callable[..., T]) -> Callable[..., T]:
+    """Add the pathspec options to a command.
+
+    Args:
+        fn: The command function.
+
+    Returns:
+        The decorated command function.
+    """
+    fn = option(
+        "--exclude-path",
+        "exclude_paths",
+        multiple=True,
+        type=str,
+        help="Exclude changes to this path or glob pattern. Can be given multiple times.",
+    )(fn)
+    return option(
+        "--path",
+        "paths",
+        multiple=True,
+        type=str,
+        help="Only analyse changes to this path or glob pattern. Can be given multiple times.",
+    )(fn)
+
+
+def resume_option(fn: Callable[..., T]) -> Callable[..., T]:
+    """Add the resume option to a command that records its runs in a journal.
+
+    Args:
+        fn: The command function.
+
+    Returns:
+        The decorated command function.
+    """
+    return option(
+        "--resume",
+        is_flag=True,
+        default=False,
+        help="Resume an interrupted run of the same command from its journal, instead of starting over.",
+    )(fn)
+
+
+def output_options(fn: Callable[..., T]) -> Callable[..., T]:
+    """Add the output sink options to a range command.
+
+    Args:
+        fn: The command function.
+
+    Returns:
+        The decorated command function.
+    """
+    fn = option(
+        "--format",
+        "output_format",
+        type=Choice(OUTPUT_FORMATS),
+        default=None,
+        help="Write a flat row per result, e.g. per graded rule, in this format. Defaults to the output suffix.",
+    )(fn)
+    return option(
+        "--output",
+        type=ClickPath(dir_okay=False, path_type=Path),
+        default=None,
+        help="Write flat rows to this file instead of stdout. Parquet and Arrow files require the 'arrow' extra.",
+    )(fn)
+
+
+async def get_merged_commit_summaries(cli_ctx: CLIContext, commit_hash: str) -> dict[str, str]:
+    """Get the summaries of the cached descriptions of the commits a merge commit brings in.
+
+    Notes:
+        - Only merge commits analysed with the ``merged-commits`` strategy are summarised by their merged commits.
+        - The descriptions are only looked up in the cache, under the keys of the provider and the triage model, so
+            no request is made. Merged commits that are not described yet are left out.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_hash: The commit hash.
+
+    Returns:
+        The summaries by the hash of the merged commit.
+    """
+    settings = cli_ctx["settings"]
+    if settings.merge_strategy != "merged-commits":
+        return {}
+    commit = get_commit(repo=cli_ctx["repo"], commit_hex=commit_hash)
+    if not (merged_commits := get_merged_commits(repo=cli_ctx["repo"], commit=commit)):
+        return {}
+
+    from gitmind.prompts.describe_commit import CommitDescriptionResult, DescribeCommitHandler
+
+    handlers = [
+        DescribeCommitHandler(client=client, cache=settings.cache)
+        for client in (settings.llm_client, settings.triage_llm_client)
+        if client is not None
+    ]
+    summaries: dict[str, str] = {}
+    for merged_commit in merged_commits:
+        merged_hex = str(merged_commit.id)
+        try:
+            statistics, metadata, diff = extract_commit_data(
+                repo=cli_ctx["repo"],
+                commit_hex=merged_hex,
+                merge_strategy=settings.merge_strategy,
+                context_lines=settings.diff_context_lines,
+                context_token_budget=settings.diff_token_budget,
+                minify=settings.minify_diff,
+            )
+        except SkippedCommitError:
+            continue
+        for handler in handlers:
+            _, schema, _ = handler.create_prompt(statistics=statistics, metadata=metadata, diff=diff)
+            for cache_key in handler.get_cache_keys(statistics=statistics, metadata=metadata, diff=diff):
+                description = await handler.get_cached_result(
+                    cache_key, response_type=CommitDescriptionResult, schema=schema
+                )
+                if description is not None:
+                    summaries[merged_hex] = description["summary"]
+                    break
+            if merged_hex in summaries:
+                break
+    return summaries
+
+
+async def get_commit_data(
+    cli_ctx: CLIContext, commit_hash: str, paths: tuple[str, ...] = (), exclude_paths: tuple[str, ...] = ()
+) -> tuple[CommitStatistics, CommitMetadata, str]:
+    """Extract the data of a commit as configured in the settings.
+
+    Notes:
+        - With the ``merged-commits`` strategy, merge commits are summarised by the cached descriptions of the
+            commits they bring in. See ``get_merged_commit_summaries``.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_hash: The commit hash.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        A tuple of the commit statistics, metadata and diff.
+    """
+    settings = cli_ctx["settings"]
+    return extract_commit_data(
+        repo=cli_ctx["repo"],
+        commit_hex=commit_hash,
+        merge_strategy=settings.merge_strategy,
+        paths=paths,
+        exclude_paths=exclude_paths,
+        context_lines=settings.diff_context_lines,
+        context_token_budget=settings.diff_token_budget,
+        minify=settings.minify_diff,
+        merged_summaries=await get_merged_commit_summaries(cli_ctx, commit_hash),
+    )
+
+
+async def route_commit(cli_ctx: CLIContext, commit_metadata: CommitMetadata, diff: str) -> tuple[LLMClient, str | None]:
+    """Choose the model that analyses a commit.
+
+    Notes:
+        - Commits are only routed if a triage model is configured. See ``gitmind.prompts.router.ModelRouter``.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_metadata: The metadata of the commit.
+        diff: The diff of the commit.
+
+    Returns:
+        A tuple of the LLM client and its model tier, or of the provider model client and None if routing is disabled.
+    """
+    settings = cli_ctx["settings"]
+    if settings.triage_llm_client is None:
+        return settings.llm_client, None
+
+    from gitmind.prompts.router import ModelRouter
+
+    router = ModelRouter(
+        strong_client=settings.llm_client,
+        triage_client=settings.triage_llm_client,
+        max_simple_lines=settings.routing_max_simple_lines,
+        classify=settings.routing_classifier,
+        cache=settings.cache,
+    )
+    decision = await router.route(metadata=commit_metadata, diff=diff)
+    debug_echo(
+        cli_ctx,
+        f"Routed commit {commit_metadata['hex']} to the {decision['tier']} model by {decision['source']}: "
+        f"{decision['reason']}",
+    )
+    return router.get_client(decision["tier"]), decision["tier"]
+
 
 @group()
 def commit() -> None:
     """Commit commands."""
 
 
-async def handle_describe(ctx: Context, commit_hash: str) -> CommitDescriptionResult:
-    """Describe a commit."""
-    cli_ctx = get_or_set_cli_context(ctx)
-    cli_ctx["commit_hash"] = commit_hash
+async def describe_commit(
+    cli_ctx: CLIContext, commit_hash: str, paths: tuple[str, ...] = (), exclude_paths: tuple[str, ...] = ()
+) -> CommitDescriptionResult:
+    """Describe a commit.
+
+    Notes:
+        - If a triage model is configured, simple commits are described by it. See ``route_commit``.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_hash: The commit hash.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
 
-    commit_statistics, commit_metadata, diff = extract_commit_data(repo=cli_ctx["repo"], commit_hex=commit_hash)
+    Returns:
+        The commit description.
+    """
+    from gitmind.prompts.describe_commit import DescribeCommitHandler
+
+    commit_statistics, commit_metadata, diff = await get_commit_data(cli_ctx, commit_hash, paths, exclude_paths)
     debug_echo(
         cli_ctx,
         f"Retrieved commit {commit_hash}: {commit_metadata['message']}\n\ncommit_data: {dumps(commit_statistics, indent=2)}",
     )
+    client, model_tier = await route_commit(cli_ctx, commit_metadata, diff)
     handler = DescribeCommitHandler(
-        client=cli_ctx["settings"].llm_client,
+        client=client,
+        cache=cli_ctx["settings"].cache,
+        model_tier=model_tier,
     )
-    description = await handler(
+    return await handler(
         statistics=commit_statistics,
         metadata=commit_metadata,
         diff=diff,
     )
+
+
+async def handle_describe(
+    ctx: Context, commit_hash: str, paths: tuple[str, ...] = (), exclude_paths: tuple[str, ...] = ()
+) -> CommitDescriptionResult:
+    """Describe a commit."""
+    cli_ctx = get_or_set_cli_context(ctx)
+    cli_ctx["commit_hash"] = commit_hash
+
+    description = await describe_commit(cli_ctx, commit_hash, paths, exclude_paths)
     cli_ctx["commit_description"] = description
     return description
 
 
 @commit.command()
 @option("--commit-hash", required=True, type=str)
+@path_options
 @pass_context
-def describe(ctx: Context, commit_hash: str) -> None:
+def describe(ctx: Context, commit_hash: str, paths: tuple[str, ...], exclude_paths: tuple[str, ...]) -> None:
     """Describe a commit."""
-    description_result = run_as_sync(handle_describe)(ctx, commit_hash)
+    try:
+        description_result = run_command(handle_analysis)(ctx, "describe", commit_hash, paths, exclude_paths)
+    except SkippedCommitError as e:
+        echo(str(e))
+        return
     echo(dumps(description_result, indent=2))
 
 
-async def handle_grade(ctx: Context, commit_hash: str) -> dict[str, CommitGradingResult]:
-    """Grade a commit."""
-    cli_ctx = get_or_set_cli_context(ctx)
-    cli_ctx["commit_hash"] = commit_hash
+async def grade_commit_data(
+    cli_ctx: CLIContext, commit_metadata: CommitMetadata, diff: str
+) -> dict[str, CommitGradingResult]:
+    """Grade the extracted data of a commit.
+
+    Notes:
+        - If a grading timeout is configured, the rules that are not graded in time are ``NOT_EVALUATED``.
+        - If a triage model is configured, simple commits are graded by it. See ``route_commit``.
+        - If heuristic grading is enabled, the rules determined by local analysis of the diff are not graded by the
+            LLM, and are marked as heuristic. See ``gitmind.prompts.heuristics``.
 
-    commit_statistics, commit_metadata, diff = extract_commit_data(repo=cli_ctx["repo"], commit_hex=commit_hash)
+    Args:
+        cli_ctx: The CLI context.
+        commit_metadata: The metadata of the commit.
+        diff: The diff of the commit.
+
+    Returns:
+        The grading results by rule name.
+    """
+    from gitmind.prompts.grade_commit import GradeCommitHandler
+    from gitmind.prompts.heuristics import pre_grade
+    from gitmind.rules import DEFAULT_GRADING_RULES
+
+    settings = cli_ctx["settings"]
+    pre_grading = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode=settings.heuristic_grading)
+    if not (grading_rules := pre_grading["remaining_rules"]):
+        debug_echo(cli_ctx, f"Graded commit {commit_metadata['hex']} by local heuristics")
+        return dict(sorted(pre_grading["results"].items()))
+
+    client, model_tier = await route_commit(cli_ctx, commit_metadata, diff)
+    handler = GradeCommitHandler(
+        client=client,
+        cache=settings.cache,
+        model_tier=model_tier,
+    )
+
+    if (grading_timeout := settings.grading_timeout) is not None:
+        report = await handler.grade_within_deadline(
+            metadata=commit_metadata,
+            diff=diff,
+            grading_rules=grading_rules,
+            deadline=current_time() + grading_timeout,
+            signals=pre_grading["signals"],
+        )
+        debug_echo(cli_ctx, f"Graded commit {commit_metadata['hex']}: {dumps(report['diagnostics'])}")
+        results = report["results"]
+    else:
+        results = await handler(
+            metadata=commit_metadata,
+            diff=diff,
+            grading_rules=grading_rules,
+            signals=pre_grading["signals"],
+        )
+
+    return dict(sorted((results | pre_grading["results"]).items()))
+
+
+async def grade_commit(
+    cli_ctx: CLIContext, commit_hash: str, paths: tuple[str, ...] = (), exclude_paths: tuple[str, ...] = ()
+) -> dict[str, CommitGradingResult]:
+    """Grade a commit.
+
+    Notes:
+        - See ``grade_commit_data`` for the grading options.
+        - If report rollups are enabled, the grades of commits graded without path filters are recorded in them. See
+            ``gitmind.reporting.rollups``.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_hash: The commit hash.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        The grading results by rule name.
+    """
+    commit_statistics, commit_metadata, diff = await get_commit_data(cli_ctx, commit_hash, paths, exclude_paths)
     debug_echo(
         cli_ctx,
         f"Retrieved commit {commit_hash}: {commit_metadata['message']}\n\ncommit_data: {dumps(commit_statistics, indent=2)}",
     )
 
-    handler = GradeCommitHandler(
-        client=cli_ctx["settings"].llm_client,
-    )
+    results = await grade_commit_data(cli_ctx, commit_metadata, diff)
+    if cli_ctx["settings"].report_rollups and not paths and not exclude_paths:
+        from gitmind.cli.commands.report import record_rollups
 
-    return await handler(
-        metadata=commit_metadata,
-        diff=diff,
-    )
+        await record_rollups(cli_ctx, commit_metadata, diff, results)
+    return results
+
+
+async def handle_grade(
+    ctx: Context, commit_hash: str, paths: tuple[str, ...] = (), exclude_paths: tuple[str, ...] = ()
+) -> dict[str, CommitGradingResult]:
+    """Grade a commit."""
+    cli_ctx = get_or_set_cli_context(ctx)
+    cli_ctx["commit_hash"] = commit_hash
+
+    return await grade_commit(cli_ctx, commit_hash, paths, exclude_paths)
 
 
 @commit.command()
 @option("--commit-hash", required=True, type=str)
+@path_options
 @pass_context
-def grade(ctx: Context, commit_hash: str) -> None:
+def grade(ctx: Context, commit_hash: str, paths: tuple[str, ...], exclude_paths: tuple[str, ...]) -> None:
     """Grade a commit."""
-    grading_results = run_as_sync(handle_grade)(ctx, commit_hash)
+    try:
+        grading_results = run_command(handle_analysis)(ctx, "grade", commit_hash, paths, exclude_paths)
+    except SkippedCommitError as e:
+        echo(str(e))
+        return
     echo(dumps(grading_results, indent=2))
+
+
+ANALYSES: Final[dict[Analysis, Callable[[CLIContext, str, tuple[str, ...], tuple[str, ...]], Awaitable[Any]]]] = {
+    "describe": describe_commit,
+    "grade": grade_commit,
+}
+"""The analyses by name. Shared by the CLI commands and the gitmind server."""
+
+
+def create_range_result(record: CommitRecord, result: Any) -> RangeResult:
+    """Create the range result of a commit.
+
+    Args:
+        record: The commit record.
+        result: The analysis result.
+
+    Returns:
+        The range result.
+    """
+    return RangeResult(
+        commit_hash=record.hex,
+        timestamp=record.timestamp,
+        author_name=record.author_name,
+        author_email=record.author_email,
+        result=result,
+    )
+
+
+async def iter_range_results(
+    cli_ctx: CLIContext,
+    analysis: Analysis,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    journal: Journal | None = None,
+) -> AsyncIterator[RangeResult]:
+    """Analyse every commit in a range that changes the selected paths.
+
+    Notes:
+        - Commits recorded in the journal are not analysed again. Their results are read from the journal.
+
+    Args:
+        cli_ctx: The CLI context.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+        journal: An optional journal to record each analysed commit in.
+
+    Yields:
+        The results of the commits that are not skipped, newest first.
+    """
+    from gitmind.utils.journal import JournalRecord
+
+    analyse = ANALYSES[analysis]
+    for record in iter_commits(repo=cli_ctx["repo"], revspec=revspec, paths=paths, exclude_paths=exclude_paths):
+        if journal is not None and (journal_record := journal.get(record.hex, analysis)) is not None:
+            if journal_record["status"] == "completed":
+                yield create_range_result(record, journal_record["result"])
+            continue
+
+        try:
+            result = await analyse(cli_ctx, record.hex, paths, exclude_paths)
+        except SkippedCommitError:
+            if journal is not None:
+                await journal.append(JournalRecord(commit_hash=record.hex, stage=analysis, status="skipped"))
+            continue
+        if journal is not None:
+            await journal.append(
+                JournalRecord(commit_hash=record.hex, stage=analysis, status="completed", result=result)
+            )
+        yield create_range_result(record, result)
+
+
+async def handle_analysis(
+    ctx: Context, analysis: Analysis, commit_hash: str, paths: tuple[str, ...], exclude_paths: tuple[str, ...]
+) -> Any:
+    """Analyse a commit, forwarding the request to a running gitmind server if there is one.
+
+    Args:
+        ctx: The click context.
+        analysis: The analysis to run.
+        commit_hash: The commit hash.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        The analysis result.
+    """
+    from gitmind.server.client import connect_to_server, request_analysis
+
+    cli_ctx = get_or_set_cli_context(ctx)
+    async with connect_to_server(cli_ctx["settings"]) as client:
+        if client is not None:
+            debug_echo(cli_ctx, f"Forwarding {analysis} of commit {commit_hash} to the gitmind server")
+            return await request_analysis(
+                client, analysis, commit_hash=commit_hash, paths=paths, exclude_paths=exclude_paths
+            )
+
+    handle = handle_describe if analysis == "describe" else handle_grade
+    return await handle(ctx, commit_hash, paths, exclude_paths)
+
+
+async def handle_range(
+    ctx: Context,
+    analysis: Analysis,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    resume: bool = False,
+    output: Path | None = None,
+    output_format: OutputFormat | None = None,
+) -> None:
+    """Analyse every commit in a range, echoing a JSON object per commit or writing flat rows to an output sink.
+
+    Notes:
+        - All commits are handled in a single event loop, so that the cache and its connections are shared.
+        - The range is forwarded to a running gitmind server if there is one.
+        - Local runs are recorded in a journal in the cache directory, which is removed once the run is done. Resuming
+            an interrupted run echoes the results of the journal, and only analyses the commits it does not record.
+        - If an output or format is given, the results are flattened to rows. See ``gitmind.reporting.sinks``.
+
+    Args:
+        ctx: The click context.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+        resume: Whether to resume an interrupted run from its journal.
+        output: The path to write the rows to. Defaults to stdout.
+        output_format: The format of the rows. Defaults to the format of the suffix of the output path, or NDJSON.
+    """
+    from gitmind.reporting.sinks import flatten_range_result, open_sink
+    from gitmind.server.client import connect_to_server, stream_range_analysis
+    from gitmind.utils.journal import Journal, get_journal_path
+
+    cli_ctx = get_or_set_cli_context(ctx)
+    sink = open_sink(analysis, output=output, output_format=output_format) if output or output_format else None
+
+    def emit(range_result: RangeResult) -> None:
+        if sink is None:
+            echo(dumps(range_result))
+        else:
+            sink.write(flatten_range_result(analysis, range_result))
+
+    with sink or nullcontext():
+        async with connect_to_server(cli_ctx["settings"]) as client:
+            if client is not None:
+                debug_echo(cli_ctx, f"Forwarding {analysis} of range {revspec} to the gitmind server")
+                results = stream_range_analysis(
+                    client, analysis, revspec=revspec, paths=paths, exclude_paths=exclude_paths
+                )
+                async for range_result in results:
+                    emit(range_result)
+                return
+
+        settings = cli_ctx["settings"]
+        journal_path = get_journal_path(
+            settings.cache_dir, f"{analysis}-range", settings.target_repo, revspec, paths, exclude_paths
+        )
+        async with Journal(journal_path, resume=resume) as journal:
+            if journal.records:
+                debug_echo(
+                    cli_ctx, f"Resuming {analysis} of range {revspec} from {len(journal.records)} journal records"
+                )
+            async for range_result in iter_range_results(cli_ctx, analysis, revspec, paths, exclude_paths, journal):
+                emit(range_result)
+            await journal.remove()
+
+
+def run_command(handle: Callable[P, Coroutine[None, None, T]]) -> Callable[P, T]:
+    """Run an async command handler, reporting server, configuration and dependency errors as CLI errors.
+
+    Args:
+        handle: The command handler.
+
+    Returns:
+        A synchronous function running the handler.
+    """
+    run = run_as_sync(handle)
+
+    @wraps(handle)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return run(*args, **kwargs)
+        except (ServerError, ConfigurationError, MissingDependencyError) as e:
+            raise ClickException(str(e)) from e
+
+    return wrapper
+
+
+@commit.command()
+@option("--revspec", required=True, type=str, help="The revision range to analyse, e.g. 'main..feature'.")
+@path_options
+@resume_option
+@output_options
+@pass_context
+def describe_range(
+    ctx: Context,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    resume: bool,
+    output: Path | None,
+    output_format: OutputFormat | None,
+) -> None:
+    """Describe every commit in a range. Outputs a JSON object per line, or flat rows to an output sink."""
+    run_command(handle_range)(ctx, "describe", revspec, paths, exclude_paths, resume, output, output_format)
+
+
+@commit.command()
+@option("--revspec", required=True, type=str, help="The revision range to analyse, e.g. 'main..feature'.")
+@path_options
+@resume_option
+@output_options
+@pass_context
+def grade_range(
+    ctx: Context,
+    revspec: str,
+    paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    resume: bool,
+    output: Path | None,
+    output_format: OutputFormat | None,
+) -> None:
+    """Grade every commit in a range. Outputs a JSON object per line, or flat rows to an output sink."""
+    run_command(handle_range)(ctx, "grade", revspec, paths, exclude_paths, resume, output, output_format)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+from json import dumps
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Literal, TypeVar
+
+from anyio import CancelScope, current_time
+from click import Path as ClickPath
+from click import argument, option
+from rich_click import Context, echo, group, pass_context
+
+from gitmind.cli._utils import debug_echo, get_or_set_cli_context
+from gitmind.exceptions import GitMindError, SkippedCommitError
+from gitmind.rules import COMMIT_MSG_GRADING_RULES, PRE_COMMIT_GRADING_RULES
+from gitmind.utils.commit import extract_staged_data, get_head_commit, get_staged_tree
+from gitmind.utils.sync import run_as_sync
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.prompts.grade_commit import GradingReport
+    from gitmind.rules import Rule
+
+T = TypeVar("T")
+
+HookName = Literal["pre-commit", "commit-msg"]
+
+HOOK_GRADING_RULES: Final[dict[HookName, list[Rule]]] = {
+    "pre-commit": PRE_COMMIT_GRADING_RULES,
+    "commit-msg": COMMIT_MSG_GRADING_RULES,
+}
+"""The grading rules of each hook."""
+SCISSORS_LINE: Final[str] = "# ------------------------ >8 ------------------------"
+"""The line below which git ignores the message, e.g. the diff added by ``git commit --verbose``."""
+
+
+def read_commit_message(message_file: Path) -> str:
+    """Read a commit message as git will record it.
+
+    Args:
+        message_file: The message file git passes to the commit-msg hook.
+
+    Returns:
+        The message without comment lines and without anything below the scissors line.
+    """
+    lines: list[str] = []
+    for line in message_file.read_text().splitlines():
+        if line.startswith(SCISSORS_LINE):
+            break
+        if not line.startswith("#"):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+async def grade_staged_changes(
+    cli_ctx: CLIContext, *, grading_rules: list[Rule], message: str = "", deadline: float
+) -> GradingReport:
+    """Grade the staged changes, as if they were committed.
+
+    Notes:
+        - Results are cached by the staged tree, HEAD and the message, so running a hook again on the same staged
+            changes neither diffs nor prompts. Results that are incomplete because of the deadline are not cached.
+        - The rules determined by local analysis of the diff are not graded by the LLM if heuristic grading is enabled.
+
+    Args:
+        cli_ctx: The CLI context.
+        grading_rules: The grading rules to use.
+        message: The message of the commit being made, if it is known yet.
+        deadline: The deadline on the anyio clock, see ``anyio.current_time``.
+
+    Returns:
+        The grading results by rule name, with the rules not graded in time marked ``NOT_EVALUATED``.
+    """
+    from gitmind.prompts.grade_commit import CommitGradingResult, GradeCommitHandler, GradingDiagnostics, GradingReport
+    from gitmind.prompts.heuristics import pre_grade
+
+    started_at = current_time()
+    settings = cli_ctx["settings"]
+    repo = cli_ctx["repo"]
+    tree = get_staged_tree(repo)
+    head = get_head_commit(repo)
+
+    handler = GradeCommitHandler(client=settings.llm_client, cache=settings.cache)
+    cache_key = handler.get_tree_cache_key(
+        tree_hex=str(tree.id),
+        parent_hex=str(head.id) if head is not None else None,
+        message=message,
+        grading_rules=grading_rules,
+        diff_options=[settings.diff_context_lines, settings.diff_token_budget, settings.minify_diff],
+        heuristic_grading=settings.heuristic_grading,
+    )
+    cached = await handler.get_cached_result(
+        cache_key,
+        response_type=dict[str, CommitGradingResult],
+        schema=handler.create_schema(grading_rules),
+        rules=grading_rules,
+    )
+    if cached is not None:
+        debug_echo(cli_ctx, f"Using the cached grades of staged tree {tree.id}")
+        elapsed = current_time() - started_at
+        return GradingReport(
+            results=dict(sorted(cached.items())),
+            diagnostics=GradingDiagnostics(elapsed=elapsed, deadline_exceeded=False, timings={"cache": elapsed}),
+        )
+
+    _, metadata, diff = extract_staged_data(
+        repo=repo,
+        tree=tree,
+        message=message,
+        context_lines=settings.diff_context_lines,
+        context_token_budget=settings.diff_token_budget,
+        minify=settings.minify_diff,
+    )
+    pre_grading = pre_grade(diff, grading_rules=grading_rules, mode=settings.heuristic_grading)
+    if pre_grading["remaining_rules"]:
+        report = await handler.grade_within_deadline(
+            metadata=metadata,
+            diff=diff,
+            grading_rules=pre_grading["remaining_rules"],
+            deadline=deadline,
+            signals=pre_grading["signals"],
+        )
+    else:
+        report = GradingReport(
+            results={}, diagnostics=GradingDiagnostics(elapsed=0, deadline_exceeded=False, timings={})
+        )
+    results = report["results"] | pre_grading["results"]
+    report["results"] = {rule.name: results[rule.name] for rule in grading_rules}
+    if not report["diagnostics"]["deadline_exceeded"]:
+        await handler.set_cached_result(cache_key, report["results"], grading_rules)
+    report["diagnostics"]["elapsed"] = current_time() - started_at
+    return report
+
+
+async def suggest_commit_message(cli_ctx: CLIContext) -> str:
+    """Suggest a commit message for the staged changes.
+
+    Args:
+        cli_ctx: The CLI context.
+
+    Returns:
+        The summary of the staged changes.
+    """
+    from gitmind.prompts.describe_commit import DescribeCommitHandler
+
+    settings = cli_ctx["settings"]
+    statistics, metadata, diff = extract_staged_data(
+        repo=cli_ctx["repo"],
+        context_lines=settings.diff_context_lines,
+        context_token_budget=settings.diff_token_budget,
+        minify=settings.minify_diff,
+    )
+    handler = DescribeCommitHandler(client=settings.llm_client, cache=settings.cache)
+    description = await handler(statistics=statistics, metadata=metadata, diff=diff)
+    return description["summary"]
+
+
+async def handle_hook(
+    ctx: Context,
+    hook_name: HookName,
+    *,
+    message: str = "",
+    latency_budget: float | None = None,
+    min_grade: int | None = None,
+    suggest: bool = False,
+) -> int:
+    """Grade the staged changes from a git hook, echoing the grades.
+
+    Notes:
+        - Hooks fail open: rules that are not graded within the latency budget are not evaluated, and the hook is
+            skipped if there are no staged changes or if grading fails, so that gitmind never blocks a commit because
+            of itself.
+
+    Args:
+        ctx: The click context.
+        hook_name: The name of the git hook.
+        message: The message of the commit being made, if it is known yet.
+        latency_budget: The latency budget in seconds. Defaults to the configured hook timeout.
+        min_grade: The minimum grade of every rule. The commit is rejected if a rule is graded lower.
+        suggest: Whether to also suggest a commit message.
+
+    Returns:
+        The exit code of the hook.
+    """
+    cli_ctx = get_or_set_cli_context(ctx)
+    latency_budget = latency_budget if latency_budget is not None else cli_ctx["settings"].hook_timeout
+    deadline = current_time() + latency_budget
+
+    suggestion: str | None = None
+    try:
+        report = await grade_staged_changes(
+            cli_ctx, grading_rules=HOOK_GRADING_RULES[hook_name], message=message, deadline=deadline
+        )
+        with CancelScope(deadline=deadline) as suggestion_scope:
+            if suggest:
+                suggestion = await suggest_commit_message(cli_ctx)
+    except SkippedCommitError as e:
+        echo(f"gitmind: {e}", err=True)
+        return 0
+    except (GitMindError, ValueError) as e:
+        echo(f"gitmind: skipped {hook_name}, grading failed: {e}", err=True)
+        return 0
+
+    grades = report["results"]
+    debug_echo(cli_ctx, f"Graded the staged changes: {dumps(report['diagnostics'])}")
+    for rule_name, result in grades.items():
+        echo(f"{rule_name}: {result['grade']} - {result['reason']}")
+    if suggestion is not None:
+        echo(f"Suggested commit message: {suggestion}")
+
+    if report["diagnostics"]["deadline_exceeded"]:
+        not_evaluated = sum(result["grade"] == "NOT_EVALUATED" for result in grades.values())
+        echo(
+            f"gitmind: {not_evaluated} rules are not evaluated, grading exceeded the latency budget of "
+            f"{latency_budget:g}s.",
+            err=True,
+        )
+    if suggestion_scope.cancelled_caught:
+        echo(f"gitmind: skipped the suggestion, it exceeded the latency budget of {latency_budget:g}s.", err=True)
+
+    failed_rules = [
+        rule_name
+        for rule_name, result in grades.items()
+        if min_grade is not None and isinstance(result["grade"], int) and result["grade"] < min_grade
+    ]
+    if failed_rules:
+        echo(f"gitmind: {', '.join(failed_rules)} graded below {min_grade}.", err=True)
+        return 1
+    return 0
+
+
+def hook_options(fn: Callable[..., T]) -> Callable[..., T]:
+    """Add the options shared by the hook commands to a command.
+
+    Args:
+        fn: The command function.
+
+    Returns:
+        The decorated command function.
+    """
+    fn = option(
+        "--min-grade",
+        type=int,
+        default=None,
+        help="Reject the commit if a rule is graded lower than this. By default the grades are only reported.",
+    )(fn)
+    return option(
+        "--timeout",
+        type=float,
+        default=None,
+        help="The latency budget in seconds. Defaults to the configured hook timeout.",
+    )(fn)
+
+
+@group()
+def hook() -> None:
+    """Git hook commands, grading the staged changes before they are committed.
+
+    Call them from the hooks of a repository, e.g. 'exec gitmind hook pre-commit' in '.git/hooks/pre-commit' and
+    'exec gitmind hook commit-msg "$1"' in '.git/hooks/commit-msg'.
+    """
+
+
+@hook.command("pre-commit")
+@hook_options
+@pass_context
+def pre_commit(ctx: Context, timeout: float | None, min_grade: int | None) -> None:
+    """Grade the staged changes by a fast subset of the grading rules."""
+    ctx.exit(run_as_sync(handle_hook)(ctx, "pre-commit", latency_budget=timeout, min_grade=min_grade))
+
+
+@hook.command("commit-msg")
+@argument("message_file", type=ClickPath(exists=True, dir_okay=False, path_type=Path))
+@hook_options
+@option("--suggest", is_flag=True, default=False, help="Also suggest a commit message for the staged changes.")
+@pass_context
+def commit_msg(ctx: Context, message_file: Path, timeout: float | None, min_grade: int | None, suggest: bool) -> None:
+    """Grade the message of the commit being made against the staged changes."""
+    if not (message := read_commit_message(message_file)):
+        return
+    ctx.exit(
+        run_as_sync(handle_hook)(
+            ctx, "commit-msg", message=message, latency_budget=timeout, min_grade=min_grade, suggest=suggest
+        )
+    )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from json import dumps
+from typing import TYPE_CHECKING
+
+from click import Choice, option
+from rich_click import Context, command, echo, pass_context
+
+from gitmind.cli._utils import debug_echo, get_or_set_cli_context
+from gitmind.cli.commands.commit import get_commit_data, grade_commit_data, run_command
+from gitmind.exceptions import SkippedCommitError
+from gitmind.reporting.rollups import DIMENSIONS, RollupStore, create_contribution, get_rollups_path
+from gitmind.utils.commit import iter_commits
+from gitmind.utils.sync import run_sync
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.prompts.grade_commit import CommitGradingResult
+    from gitmind.reporting.rollups import CommitContribution, Dimension, RollupReport
+    from gitmind.utils.commit import CommitMetadata
+
+
+def get_rollup_store(cli_ctx: CLIContext) -> RollupStore:
+    """Get the rollups store from the CLI context, opening it on first use.
+
+    Args:
+        cli_ctx: The CLI context.
+
+    Returns:
+        The rollups store.
+    """
+    if "rollups" not in cli_ctx:
+        cli_ctx["rollups"] = RollupStore(get_rollups_path(cli_ctx["settings"].cache_dir))
+    return cli_ctx["rollups"]
+
+
+async def record_rollups(
+    cli_ctx: CLIContext, commit_metadata: CommitMetadata, diff: str, results: Mapping[str, CommitGradingResult]
+) -> CommitContribution:
+    """Record the grades of a commit in the rollups.
+
+    Args:
+        cli_ctx: The CLI context.
+        commit_metadata: The metadata of the commit.
+        diff: The diff of the commit.
+        results: The grading results by rule name.
+
+    Returns:
+        The recorded contribution of the commit.
+    """
+    store = get_rollup_store(cli_ctx)
+    contribution = create_contribution(commit_metadata, diff, results)
+    if await run_sync(store.record, contribution):
+        debug_echo(cli_ctx, f"Recorded the grades of commit {commit_metadata['hex']} in the rollups")
+    return contribution
+
+
+async def update_rollups(cli_ctx: CLIContext, revspec: str) -> int:
+    """Grade and record the commits in a range that are not recorded in the rollups yet.
+
+    Notes:
+        - Recorded commits are not graded again, so an interrupted update resumes where it stopped.
+        - Grades are looked up in the cache first, so commits graded before only cost the diff extraction.
+
+    Args:
+        cli_ctx: The CLI context.
+        revspec: The revision range.
+
+    Returns:
+        The number of recorded commits.
+    """
+    store = get_rollup_store(cli_ctx)
+    commit_hashes = [record.hex for record in iter_commits(repo=cli_ctx["repo"], revspec=revspec)]
+    recorded = await run_sync(store.get_recorded_commits, commit_hashes)
+
+    updated = 0
+    for commit_hash in commit_hashes:
+        if commit_hash in recorded:
+            continue
+        try:
+            _, commit_metadata, diff = await get_commit_data(cli_ctx, commit_hash)
+        except SkippedCommitError:
+            continue
+        results = await grade_commit_data(cli_ctx, commit_metadata, diff)
+        await record_rollups(cli_ctx, commit_metadata, diff, results)
+        updated += 1
+    return updated
+
+
+async def handle_report(
+    ctx: Context, revspec: str | None, dimensions: tuple[Dimension, ...], rules: tuple[str, ...]
+) -> RollupReport:
+    """Create a repository report from the rollups.
+
+    Args:
+        ctx: The click context.
+        revspec: An optional revision range to record in the rollups first.
+        dimensions: The dimensions to report by. Defaults to all dimensions.
+        rules: The rules to report. Defaults to all recorded rules.
+
+    Returns:
+        The report.
+    """
+    cli_ctx = get_or_set_cli_context(ctx)
+    if revspec is not None:
+        updated = await update_rollups(cli_ctx, revspec)
+        debug_echo(cli_ctx, f"Recorded {updated} commits of {revspec} in the rollups")
+
+    store = get_rollup_store(cli_ctx)
+    return await run_sync(lambda: store.report(dimensions=dimensions or DIMENSIONS, rules=rules or None))
+
+
+@command()
+@option(
+    "--revspec",
+    type=str,
+    default=None,
+    help="A revision range to grade and record in the rollups before reporting, e.g. 'main'. Commits recorded "
+    "before are not graded again.",
+)
+@option(
+    "--by",
+    "dimensions",
+    type=Choice(DIMENSIONS),
+    multiple=True,
+    help="A dimension to report by. Can be given multiple times. Defaults to all dimensions.",
+)
+@option("--rule", "rules", type=str, multiple=True, help="A rule to report. Can be given multiple times.")
+@pass_context
+def report(ctx: Context, revspec: str | None, dimensions: tuple[Dimension, ...], rules: tuple[str, ...]) -> None:
+    """Report the grades of the repository by rule, author, ISO week and top-level path.
+
+    The report is derived from incremental rollups of the grades in the cache directory, with the mean, standard
+    deviation and histogram of each rule, its weekly trend and the outlying authors and paths. Grades are recorded in
+    the rollups by --revspec, or as commits are graded when the report rollups setting is enabled.
+    """
+    echo(dumps(run_command(handle_report)(ctx, revspec, dimensions, rules), indent=2))
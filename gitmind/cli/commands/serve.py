@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from click import ClickException, option
+from rich_click import Context, command, echo, pass_context
+
+from gitmind.cli._utils import get_or_set_cli_context
+from gitmind.exceptions import ServerError
+from gitmind.utils.sync import run_as_sync
+
+
+@command()
+@option(
+    "--port",
+    type=int,
+    default=None,
+    help="Also serve HTTP on this localhost port, e.g. for editor integrations. Requests must carry the token written "
+    "next to the socket as an 'Authorization: Bearer <token>' header.",
+)
+@pass_context
+def serve(ctx: Context, port: int | None) -> None:
+    """Run a gitmind server on the configured socket, keeping the repository, LLM client and cache warm.
+
+    CLI commands run with the same settings are forwarded to the server.
+    """
+    from gitmind.server.app import LOCALHOST, run_server
+    from gitmind.server.client import get_socket_path, get_token_path
+
+    cli_ctx = get_or_set_cli_context(ctx)
+    socket_path = get_socket_path(cli_ctx["settings"])
+    echo(f"Serving on {socket_path}")
+    if port is not None:
+        echo(f"Serving on http://{LOCALHOST}:{port} with the token in {get_token_path(cli_ctx['settings'])}")
+    try:
+        run_as_sync(run_server)(cli_ctx=cli_ctx, socket_path=socket_path, port=port)
+    except ServerError as e:
+        raise ClickException(str(e)) from e
+    except KeyboardInterrupt:
+        echo("Server stopped.")
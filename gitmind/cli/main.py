@@ -2,8 +2,7 @@ from typing import Any
 
 from rich_click import Context, echo, group, pass_context, rich_click
 
-from gitmind.cli._utils import get_or_set_cli_context, global_options
-from gitmind.cli.commands import commit
+from gitmind.cli._utils import LazyGroup, get_or_set_cli_context, global_options
 
 rich_click.USE_RICH_MARKUP = True
 rich_click.SHOW_ARGUMENTS = True
@@ -13,7 +12,18 @@ rich_click.SHOW_METAVARS_COLUMN = True
 rich_click.APPEND_METAVARS_HELP = True
 
 
-@group()
+@group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "author": "gitmind.cli.commands.author:author",
+        "batch": "gitmind.cli.commands.batch:batch",
+        "cache": "gitmind.cli.commands.cache:cache",
+        "commit": "gitmind.cli.commands.commit:commit",
+        "hook": "gitmind.cli.commands.hook:hook",
+        "report": "gitmind.cli.commands.report:report",
+        "serve": "gitmind.cli.commands.serve:serve",
+    },
+)
 @global_options()
 @pass_context  # type: ignore[arg-type]
 def cli(*, ctx: Context, **kwargs: Any) -> None:
@@ -21,6 +31,3 @@ def cli(*, ctx: Context, **kwargs: Any) -> None:
     cli_ctx = get_or_set_cli_context(ctx, **kwargs)
     if cli_ctx["settings"].mode == "debug":
         echo("initialized cli context")
-
-
-cli.add_command(commit)
@@ -1,29 +1,63 @@
 from __future__ import annotations
 
+import os
+from contextlib import suppress
+from contextvars import ContextVar
 from functools import cached_property
+from hashlib import sha256
+from json import JSONDecodeError, dumps, loads
 from pathlib import Path
-from typing import Annotated, Any, Final, Literal
+from typing import TYPE_CHECKING, Annotated, Any, Final, Literal
 
-from pydantic import DirectoryPath, Field, SecretStr, field_validator, model_validator
+from pydantic import DirectoryPath, Field, SecretStr, ValidationError, field_validator, model_validator
 from pydantic_core import Url  # noqa: TC002
 from pydantic_settings import (
     BaseSettings,
+    DotEnvSettingsSource,
+    EnvSettingsSource,
+    InitSettingsSource,
     JsonConfigSettingsSource,
     PydanticBaseSettingsSource,
-    PyprojectTomlConfigSettingsSource,
     SettingsConfigDict,
     TomlConfigSettingsSource,
     YamlConfigSettingsSource,
 )
 
 from gitmind.llm.base import LLMClient  # noqa: TC001
+from gitmind.utils.commit import MergeStrategy  # noqa: TC001
+from gitmind.utils.compression import Compression  # noqa: TC001
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from gitmind.caching import CacheBase
 
 CONFIG_FILE_NAME: Final[str] = "gitmind-config"
+JSON_CONFIG_FILES: Final[tuple[str, ...]] = (f"{CONFIG_FILE_NAME}.json",)
+YAML_CONFIG_FILES: Final[tuple[str, ...]] = (f"{CONFIG_FILE_NAME}.yaml", f"{CONFIG_FILE_NAME}.yml")
+TOML_CONFIG_FILES: Final[tuple[str, ...]] = (f"{CONFIG_FILE_NAME}.toml",)
+PYPROJECT_FILE_NAME: Final[str] = "pyproject.toml"
+PYPROJECT_TABLE_HEADER: Final[tuple[str, ...]] = ("tool", "gitmind")
+ENV_PREFIX: Final[str] = "GITMIND_"
+ENV_FILE_NAME: Final[str] = ".env"
+SETTINGS_CACHE_VERSION: Final[int] = 2
+"""The version of the resolved settings cache format. Bump it when the format changes."""
+MEMORY_CACHE_MAX_ENTRIES: Final[int] = 10_000
+"""The default maximum number of entries of the memory cache."""
+MEMORY_CACHE_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+"""The default maximum size of the memory cache in bytes, so that a long-running server stays within bounds."""
+SETTINGS_CACHE_FILE_MODE: Final[int] = 0o600
+"""The permissions of resolved settings cache files. Only the owner may read them, since they describe the
+configuration of the owner's repositories."""
+
+_init_values_only: ContextVar[bool] = ContextVar("_init_values_only", default=False)
+"""Whether to only read the init values, which are the already resolved values of a previous invocation."""
 
 
 SupportedProviders = Literal["openai", "azure-openai", "groq"]
 Verbosity = Literal["silent", "standard", "verbose", "debug"]
-CacheType = Literal["memory", "file"]
+CacheType = Literal["memory", "file", "redis"]
+HeuristicGrading = Literal["off", "signals", "prefill", "offline"]
 
 
 class GitMindSettings(BaseSettings):
@@ -32,16 +66,62 @@ class GitMindSettings(BaseSettings):
     model_config = SettingsConfigDict(
         arbitrary_types_allowed=True,
         regex_engine="python-re",
-        env_prefix="GITMIND_",
-        env_file=".env",
-        json_file=f"{CONFIG_FILE_NAME}.json",
-        pyproject_toml_table_header=("tool", "gitmind"),
-        toml_file=f"{CONFIG_FILE_NAME}.toml",
-        yaml_file=[f"{CONFIG_FILE_NAME}.yaml", f"{CONFIG_FILE_NAME}.yml"],
+        env_prefix=ENV_PREFIX,
+        env_file=ENV_FILE_NAME,
         extra="allow",
     )
 
     cache_type: Annotated[CacheType, Field(description="The cache type to use.")] = "memory"
+    cache_dir: Annotated[
+        str | None,
+        Field(description="The directory of the file cache. Defaults to '.gitmind' in the working directory."),
+    ] = None
+    cache_max_bytes: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            description="The maximum size of the file cache in bytes. The least recently used entries are evicted "
+            "once it is exceeded.",
+        ),
+    ] = None
+    cache_max_entries: Annotated[
+        int,
+        Field(
+            gt=0,
+            description="The maximum number of entries of the memory cache. The least recently used entries are "
+            "evicted once it is exceeded.",
+        ),
+    ] = MEMORY_CACHE_MAX_ENTRIES
+    cache_max_memory_bytes: Annotated[
+        int,
+        Field(
+            gt=0,
+            description="The maximum size of the memory cache in bytes. The least recently used entries are evicted "
+            "once it is exceeded.",
+        ),
+    ] = MEMORY_CACHE_MAX_BYTES
+    cache_url: Annotated[
+        str | None,
+        Field(description="The URL of the redis cache server. Defaults to a server on localhost."),
+    ] = None
+    cache_ttl: Annotated[
+        int | None,
+        Field(
+            gt=0, description="The time to live of cache entries in seconds. Applies to the memory and redis caches."
+        ),
+    ] = None
+    cache_compression: Annotated[
+        Compression,
+        Field(description="The compression of file cache entries. zstd requires the 'zstd' extra."),
+    ] = "zlib"
+    server_socket: Annotated[
+        str | None,
+        Field(description="The Unix socket of the gitmind server. Defaults to 'gitmind.sock' in the cache directory."),
+    ] = None
+    server_forwarding: Annotated[
+        bool,
+        Field(description="Whether to forward commands to a running gitmind server with the same settings."),
+    ] = True
     target_repo: Annotated[
         DirectoryPath | str | None,
         Field(description="The target repository. The value can be either a URL or a directory path."),
@@ -49,6 +129,60 @@ class GitMindSettings(BaseSettings):
     mode: Annotated[
         Verbosity, Field(description="The output level of the gitmind CLI mode to run the application.")
     ] = "standard"
+    merge_strategy: Annotated[
+        MergeStrategy,
+        Field(
+            description="How to analyse merge commits: skip them, diff against the first parent, use the combined diff of "
+            "the merge resolution, or summarise the merged commits by their cached descriptions."
+        ),
+    ] = "first-parent"
+    diff_context_lines: Annotated[
+        int,
+        Field(
+            ge=0,
+            description="The number of unchanged lines to include around each change in a diff. When a diff token "
+            "budget is set, this is the maximum.",
+        ),
+    ] = 0
+    diff_token_budget: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            description="An optional per-commit token budget for diffs. Enables smart context, which gives small "
+            "changes more surrounding lines and trims context from large ones.",
+        ),
+    ] = None
+    minify_diff: Annotated[
+        bool,
+        Field(
+            description="Whether to minify diffs before prompting: compact file headers and collapse whitespace-only "
+            "and reorder-only changes into summaries."
+        ),
+    ] = False
+    heuristic_grading: Annotated[
+        HeuristicGrading,
+        Field(
+            description="How to use local analysis of the diff when grading: not at all, add its signals to the prompt, "
+            "also grade the rules the signals determine without the LLM, or grade offline without the LLM at all, "
+            "leaving the other rules NOT_EVALUATED."
+        ),
+    ] = "off"
+    grading_timeout: Annotated[
+        float | None,
+        Field(
+            gt=0,
+            description="An optional deadline for grading a commit in seconds. Rules that are not graded in time are "
+            "reported as NOT_EVALUATED.",
+        ),
+    ] = None
+    hook_timeout: Annotated[
+        float,
+        Field(
+            gt=0,
+            description="The latency budget of git hook commands in seconds. Hooks that exceed it are skipped, so that "
+            "they never block a commit.",
+        ),
+    ] = 2.0
     max_request_retries: Annotated[int, Field(description="The maximum number of retries for requests.")] = 0
     provider_name: Annotated[SupportedProviders, Field(description="The name of the LLM provider")]
     provider_api_key: Annotated[SecretStr, Field(description="The API key for the provider")]
@@ -58,6 +192,35 @@ class GitMindSettings(BaseSettings):
         Field(description="The endpoint for the provider API."),
     ] = None
     provider_deployment_id: Annotated[str | None, Field(description="The deployment for the provider API")] = None
+    provider_triage_model: Annotated[
+        str | None,
+        Field(
+            description="An optional cheap model of the provider for simple commits. Enables model routing: simple "
+            "commits are analysed by this model and complex ones by the provider model."
+        ),
+    ] = None
+    report_rollups: Annotated[
+        bool,
+        Field(
+            description="Whether to record the grades of graded commits in the rollups of the report command, in the "
+            "cache directory."
+        ),
+    ] = False
+    routing_max_simple_lines: Annotated[
+        int,
+        Field(
+            ge=0,
+            description="The maximum number of changed lines of a commit that is routed to the triage model without "
+            "further classification.",
+        ),
+    ] = 30
+    routing_classifier: Annotated[
+        bool,
+        Field(
+            description="Whether to ask the triage model to classify the commits that the routing heuristics cannot "
+            "classify. Otherwise they are analysed by the provider model."
+        ),
+    ] = False
 
     @classmethod
     def settings_customise_sources(
@@ -70,14 +233,33 @@ class GitMindSettings(BaseSettings):
     ) -> tuple[PydanticBaseSettingsSource, ...]:
         """Customise the settings sources for the GitMindSettings class to load multiple setting types.
 
+        Notes:
+            - File sources are only created for config files that exist, so that their parsers are not imported
+                otherwise.
+            - Only the init values are read when loading the cached resolved settings, see ``load_settings``.
+
         See: https://docs.pydantic.dev/latest/concepts/pydantic_settings/#customise-settings-sources
         """
+        if _init_values_only.get():
+            return (init_settings,)
+
+        file_sources: list[PydanticBaseSettingsSource] = []
+        if _any_file_exists(JSON_CONFIG_FILES):
+            file_sources.append(JsonConfigSettingsSource(settings_cls, json_file=list(JSON_CONFIG_FILES)))
+        if _any_file_exists(YAML_CONFIG_FILES):
+            file_sources.append(YamlConfigSettingsSource(settings_cls, yaml_file=list(YAML_CONFIG_FILES)))
+        if _any_file_exists(TOML_CONFIG_FILES):
+            file_sources.append(TomlConfigSettingsSource(settings_cls, toml_file=list(TOML_CONFIG_FILES)))
+        if _any_file_exists((PYPROJECT_FILE_NAME,)):
+            pyproject = TomlConfigSettingsSource(settings_cls, toml_file=PYPROJECT_FILE_NAME)
+            table = pyproject.toml_data
+            for key in PYPROJECT_TABLE_HEADER:
+                table = table.get(key, {})
+            file_sources.append(InitSettingsSource(settings_cls, init_kwargs=table))
+
         return (
             init_settings,
-            JsonConfigSettingsSource(settings_cls),
-            YamlConfigSettingsSource(settings_cls),
-            TomlConfigSettingsSource(settings_cls),
-            PyprojectTomlConfigSettingsSource(settings_cls),
+            *file_sources,
             env_settings,
             dotenv_settings,
             file_secret_settings,
@@ -132,6 +314,29 @@ class GitMindSettings(BaseSettings):
 
         raise ValueError("Missing required parameter: provider_name")
 
+    @cached_property
+    def cache(self) -> CacheBase:
+        """Get the cache for the configured cache type.
+
+        Returns:
+            The cache instance.
+        """
+        if self.cache_type == "file":
+            from gitmind.caching.file import FileSystemCache
+
+            return FileSystemCache(
+                cache_dir=self.cache_dir, max_bytes=self.cache_max_bytes, compression=self.cache_compression
+            )
+        if self.cache_type == "redis":
+            from gitmind.caching.redis_cache import DEFAULT_URL, RedisCache
+
+            return RedisCache(url=self.cache_url or DEFAULT_URL, ttl=self.cache_ttl)
+        from gitmind.caching.memory import InMemoryCache
+
+        return InMemoryCache(
+            max_entries=self.cache_max_entries, max_bytes=self.cache_max_memory_bytes, ttl=self.cache_ttl
+        )
+
     @cached_property
     def llm_client(self) -> LLMClient:
         """Get the LLM client for the provider.
@@ -139,12 +344,34 @@ class GitMindSettings(BaseSettings):
         Returns:
             The LLM client for the provider.
         """
+        return self.create_llm_client(self.provider_model)
+
+    @cached_property
+    def triage_llm_client(self) -> LLMClient | None:
+        """Get the LLM client for the triage model of the provider.
+
+        Returns:
+            The LLM client for the triage model, or None if model routing is disabled.
+        """
+        if self.provider_triage_model is None:
+            return None
+        return self.create_llm_client(self.provider_triage_model)
+
+    def create_llm_client(self, model_name: str) -> LLMClient:
+        """Create an LLM client for a model of the provider.
+
+        Args:
+            model_name: The name of the model.
+
+        Returns:
+            The LLM client.
+        """
         if self.provider_name == "azure-openai":
             from gitmind.llm.openai_client import OpenAIClient
 
             return OpenAIClient(
                 api_key=self.provider_api_key.get_secret_value(),
-                model_name=self.provider_model,
+                model_name=model_name,
                 endpoint_url=self.provider_endpoint_url,  # type: ignore[arg-type]
                 deployment_id=self.provider_deployment_id,
             )
@@ -153,7 +380,7 @@ class GitMindSettings(BaseSettings):
 
             return GroqClient(
                 api_key=self.provider_api_key.get_secret_value(),
-                model_name=self.provider_model,
+                model_name=model_name,
                 endpoint_url=self.provider_endpoint_url,  # type: ignore[arg-type]
             )
 
@@ -161,6 +388,168 @@ class GitMindSettings(BaseSettings):
 
         return OpenAIClient(
             api_key=self.provider_api_key.get_secret_value(),
-            model_name=self.provider_model,
+            model_name=model_name,
             endpoint_url=self.provider_endpoint_url,  # type: ignore[arg-type]
         )
+
+
+def _any_file_exists(file_names: Iterable[str]) -> bool:
+    return any(Path(file_name).is_file() for file_name in file_names)
+
+
+def get_config_file_names() -> list[str]:
+    """Get the names of the files the settings are read from.
+
+    Returns:
+        The file names, relative to the working directory.
+    """
+    return [*JSON_CONFIG_FILES, *YAML_CONFIG_FILES, *TOML_CONFIG_FILES, PYPROJECT_FILE_NAME, ENV_FILE_NAME]
+
+
+def _get_file_version(file_name: str) -> tuple[int, int] | None:
+    try:
+        stat = Path(file_name).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_settings_cache_key(init_values: dict[str, Any]) -> str:
+    """Get the key of the resolved settings for the current environment.
+
+    Notes:
+        - The key covers the init values, the working directory, the size and modification time of each config file,
+            the gitmind environment variables and the settings fields, so that any change to them is a cache miss.
+
+    Args:
+        init_values: The values passed to the settings, e.g. the CLI options.
+
+    Returns:
+        The cache key.
+    """
+    files = {file_name: _get_file_version(file_name) for file_name in get_config_file_names()}
+
+    env = {key: value for key, value in os.environ.items() if key.upper().startswith(ENV_PREFIX)}
+    payload = {
+        "version": SETTINGS_CACHE_VERSION,
+        "cwd": str(Path.cwd()),
+        "fields": sorted(GitMindSettings.model_fields),
+        "init": init_values,
+        "files": files,
+        "env": env,
+    }
+    return sha256(dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_settings_cache_path() -> Path:
+    """Get the path of the resolved settings cache file of the working directory.
+
+    Notes:
+        - The file is kept in the user cache directory rather than in the repository, so that it is never committed.
+
+    Returns:
+        The cache file path.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cwd_hash = sha256(str(Path.cwd()).encode()).hexdigest()
+    return Path(cache_home) / "gitmind" / "settings" / f"{cwd_hash}.json"
+
+
+def _get_secret_fields() -> list[str]:
+    return [
+        name
+        for name, field in GitMindSettings.model_fields.items()
+        if field.annotation is SecretStr or field.annotation == (SecretStr | None)
+    ]
+
+
+def _read_secret_values(init_values: dict[str, Any]) -> dict[str, Any]:
+    """Read the values of the secret settings from the sources that are cheap to read.
+
+    Notes:
+        - Secrets are never written to the resolved settings cache. They are read from the init values, the
+            environment and the dotenv file on every load instead, in the precedence of the regular resolution.
+
+    Args:
+        init_values: The values passed to the settings, e.g. the CLI options.
+
+    Returns:
+        The values of the secret settings found in these sources.
+    """
+    values: dict[str, Any] = {}
+    for source in (
+        DotEnvSettingsSource(GitMindSettings),
+        EnvSettingsSource(GitMindSettings),
+        InitSettingsSource(GitMindSettings, init_kwargs=init_values),
+    ):
+        values.update(source())
+    return {name: values[name] for name in _get_secret_fields() if name in values}
+
+
+def _read_cached_settings(cache_path: Path, key: str, init_values: dict[str, Any]) -> GitMindSettings | None:
+    try:
+        cached = loads(cache_path.read_bytes())
+    except (OSError, JSONDecodeError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+
+    token = _init_values_only.set(True)
+    try:
+        return GitMindSettings(**{**cached["values"], **_read_secret_values(init_values)})
+    except (ValidationError, KeyError, TypeError):
+        return None
+    finally:
+        _init_values_only.reset(token)
+
+
+def _write_cached_settings(cache_path: Path, key: str, settings: GitMindSettings, init_values: dict[str, Any]) -> None:
+    secret_fields = _get_secret_fields()
+    secret_values = _read_secret_values(init_values)
+    for name in secret_fields:
+        value = getattr(settings, name)
+        expected = value.get_secret_value() if isinstance(value, SecretStr) else value
+        found = secret_values.get(name)
+        if (found.get_secret_value() if isinstance(found, SecretStr) else found) != expected:
+            # the secret comes from a config file, which the cache exists to avoid parsing ~keep
+            with suppress(OSError):
+                cache_path.unlink(missing_ok=True)
+            return
+
+    values = settings.model_dump(mode="json", exclude_unset=True, exclude=set(secret_fields))
+    with suppress(OSError):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SETTINGS_CACHE_FILE_MODE)
+        with os.fdopen(fd, "w") as file:
+            file.write(dumps({"key": key, "values": values}))
+        temp_path.replace(cache_path)
+
+
+def load_settings(**init_values: Any) -> GitMindSettings:
+    """Load the gitmind settings, reusing the resolved settings of a previous invocation if nothing changed.
+
+    Notes:
+        - Resolving the settings reads and parses every config file and the environment. The resolved values are
+            cached per working directory, keyed by the config files' modification times and the gitmind environment
+            variables, so repeat invocations, e.g. from git hooks, only validate them.
+        - Secrets, e.g. the API key, are not cached. They are read from the init values, the environment and the
+            dotenv file on every load. Settings whose secrets come from a config file are not cached at all.
+
+    Args:
+        init_values: The values to initialise the settings with, taking precedence over the other sources.
+
+    Raises:
+        ValidationError: If the settings are invalid.
+
+    Returns:
+        The settings.
+    """
+    cache_path = get_settings_cache_path()
+    key = get_settings_cache_key(init_values)
+    if (settings := _read_cached_settings(cache_path, key, init_values)) is not None:
+        return settings
+
+    settings = GitMindSettings(**init_values)
+    _write_cached_settings(cache_path, key, settings, init_values)
+    return settings
@@ -23,3 +23,19 @@ class MissingDependencyError(GitMindError):
 
 class ConfigurationError(GitMindError):
     """Error that occurs when a configuration is invalid."""
+
+
+class SkippedCommitError(GitMindError):
+    """Error that occurs when a commit is skipped by the configured analysis options."""
+
+
+class CacheBundleError(GitMindError):
+    """Error that occurs when a cache bundle is invalid or has an unsupported version."""
+
+
+class ServerError(GitMindError):
+    """Error that occurs when the gitmind server fails to handle a request."""
+
+
+class DeadlineExceededError(GitMindError):
+    """Error that occurs when an operation does not finish before its deadline."""
@@ -3,14 +3,30 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from pydantic import BaseModel
 
-__all__ = ["LLMClient", "MessageDefinition", "MessageRole", "RetryConfig", "ToolDefinition"]
+from gitmind.exceptions import LLMClientError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = [
+    "BatchRequest",
+    "BatchResult",
+    "BatchState",
+    "BatchStatus",
+    "LLMClient",
+    "MessageDefinition",
+    "MessageRole",
+    "RetryConfig",
+    "ToolDefinition",
+]
 
 
 MessageRole = Literal["system", "user", "tool"]
+BatchStatus = Literal["pending", "completed", "failed"]
 
 
 class MessageDefinition(BaseModel):
@@ -42,6 +58,47 @@ class RetryConfig(BaseModel):
     """Whether to use exponential backoff for retries."""
 
 
+class BatchRequest(BaseModel):
+    """A completion request of a batch."""
+
+    custom_id: str
+    """The ID of the request, used to match it with its result."""
+    messages: list[MessageDefinition]
+    """The messages to generate completions for."""
+    json_response: bool = False
+    """Whether to return the response as a JSON object."""
+    tool: ToolDefinition | None = None
+    """An optional tool call."""
+    max_tokens: int | None = None
+    """The maximum number of tokens in the response."""
+
+
+class BatchState(BaseModel):
+    """The state of a submitted batch."""
+
+    batch_id: str
+    """The ID of the batch."""
+    status: BatchStatus
+    """The status of the batch. Completed and failed batches are done, though failed ones may have partial results."""
+    completed_requests: int = 0
+    """The number of completed requests."""
+    failed_requests: int = 0
+    """The number of failed requests."""
+    total_requests: int = 0
+    """The number of requests."""
+
+
+class BatchResult(BaseModel):
+    """The result of a completion request of a batch."""
+
+    custom_id: str
+    """The ID of the request."""
+    content: str | None = None
+    """The completion, or None if the request failed."""
+    error: str | None = None
+    """The error of a failed request."""
+
+
 class LLMClient(ABC):
     """Base class for LLM clients.
 
@@ -87,3 +144,59 @@ class LLMClient(ABC):
             The completion generated by the client.
         """
         ...
+
+    def create_batch_line(self, request: BatchRequest) -> dict[str, Any]:  # noqa: ARG002
+        """Create the line of a request in a batch file.
+
+        Args:
+            request: The batch request.
+
+        Raises:
+            LLMClientError: If the client does not support batches.
+
+        Returns:
+            The line, as a JSON-serializable object.
+        """
+        raise LLMClientError(f"{self.__class__.__name__} does not support batches")
+
+    async def submit_batch(self, batch_file: Path) -> str:  # noqa: ARG002
+        """Submit a batch file to the batch API of the provider.
+
+        Args:
+            batch_file: The batch file, with a line per request. See ``create_batch_line``.
+
+        Raises:
+            LLMClientError: If the client does not support batches or the batch cannot be submitted.
+
+        Returns:
+            The ID of the batch.
+        """
+        raise LLMClientError(f"{self.__class__.__name__} does not support batches")
+
+    async def get_batch_state(self, batch_id: str) -> BatchState:  # noqa: ARG002
+        """Get the state of a submitted batch.
+
+        Args:
+            batch_id: The ID of the batch.
+
+        Raises:
+            LLMClientError: If the client does not support batches or the batch cannot be retrieved.
+
+        Returns:
+            The batch state.
+        """
+        raise LLMClientError(f"{self.__class__.__name__} does not support batches")
+
+    async def get_batch_results(self, batch_id: str) -> list[BatchResult]:  # noqa: ARG002
+        """Get the results of a done batch.
+
+        Args:
+            batch_id: The ID of the batch.
+
+        Raises:
+            LLMClientError: If the client does not support batches or the results cannot be retrieved.
+
+        Returns:
+            The results of the requests that finished, successfully or not.
+        """
+        raise LLMClientError(f"{self.__class__.__name__} does not support batches")
@@ -1,16 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, cast
+from json import dumps, loads
+from typing import TYPE_CHECKING, Any, Final, cast
+
+from anyio import Path as AsyncPath
+from pydantic import ValidationError
 
 from gitmind.exceptions import EmptyContentError, LLMClientError, MissingDependencyError
-from gitmind.llm.base import LLMClient, MessageDefinition, MessageRole, ToolDefinition
+from gitmind.llm.base import (
+    BatchRequest,
+    BatchResult,
+    BatchState,
+    BatchStatus,
+    LLMClient,
+    MessageDefinition,
+    MessageRole,
+    ToolDefinition,
+)
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from openai.types import ChatModel
 
 try:
-    from openai import NOT_GIVEN, OpenAIError
+    from openai import OpenAIError
     from openai.types.chat import (
+        ChatCompletion,
         ChatCompletionAssistantMessageParam,
         ChatCompletionMessageParam,
         ChatCompletionSystemMessageParam,
@@ -18,7 +34,6 @@ try:
         ChatCompletionToolParam,
         ChatCompletionUserMessageParam,
     )
-    from openai.types.chat.completion_create_params import ResponseFormat
     from openai.types.shared_params import FunctionDefinition
 
     if TYPE_CHECKING:
@@ -29,11 +44,24 @@ except ImportError as e:
 
 __all__ = ["OpenAIClient"]
 
+BATCH_ENDPOINT: Final = "/v1/chat/completions"
+"""The endpoint of batch requests."""
+BATCH_COMPLETION_WINDOW: Final = "24h"
+"""The time frame within which a batch is processed."""
+
 _openai_message_mapping: dict[MessageRole, type[ChatCompletionMessageParam]] = {
     "system": ChatCompletionSystemMessageParam,
     "user": ChatCompletionUserMessageParam,
 }
 
+_batch_status_mapping: dict[str, BatchStatus] = {
+    "completed": "completed",
+    "failed": "failed",
+    "expired": "failed",
+    "cancelled": "failed",
+}
+"""The gitmind status of terminal OpenAI batch statuses. Other statuses are pending."""
+
 
 class OpenAIClient(LLMClient):
     """Wrapper for OpenAI models.
@@ -75,6 +103,66 @@ class OpenAIClient(LLMClient):
             self._client = AsyncClient(api_key=api_key, base_url=endpoint_url, **kwargs)
             self._model = model_name
 
+    def _create_request_body(
+        self,
+        *,
+        messages: list[MessageDefinition],
+        json_response: bool,
+        tool: ToolDefinition | None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Create the body of a chat completions request.
+
+        Args:
+            messages: The messages to generate completions for.
+            json_response: Whether to return the response as a JSON object.
+            tool: An optional tool call.
+            **kwargs: Additional completion options.
+
+        Returns:
+            The request body.
+        """
+        body: dict[str, Any] = {
+            "model": self._model,
+            "messages": [
+                _openai_message_mapping[message.role](role=message.role, content=message.content)
+                for message in messages
+            ],
+            "response_format": {"type": "json_object" if json_response else "text"},
+            **kwargs,
+        }
+        if tool is not None:
+            body["tools"] = [
+                ChatCompletionToolParam(
+                    type="function",
+                    function=FunctionDefinition(
+                        name=tool.name,
+                        parameters=tool.parameters,
+                        description=tool.description or "",
+                    ),
+                )
+            ]
+            body["tool_choice"] = "required"
+        return body
+
+    @staticmethod
+    def _get_content(result: ChatCompletion) -> str:
+        """Get the content of a chat completion.
+
+        Args:
+            result: The chat completion.
+
+        Raises:
+            EmptyContentError: If the completion has empty content.
+
+        Returns:
+            The arguments of the tool call.
+        """
+        if content := result.choices[0].message.tool_calls[0].function.arguments:  # type: ignore[index,union-attr]
+            return cast("str", content)
+
+        raise EmptyContentError("LLM client returned empty content", context=result.model_dump_json())
+
     async def create_completions(
         self,
         *,
@@ -92,40 +180,131 @@ class OpenAIClient(LLMClient):
             **kwargs: Additional completion options.
 
         Raises:
-            LLMClientError: If an error occurs while creating completions.
-            EmptyContentError: If the LLM client returns empty content.
+            LLMClientError: If an error occurs while generating completions.
 
         Returns:
             The completion generated by the client.
         """
         try:
             result = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    _openai_message_mapping[message.role](role=message.role, content=message.content)
-                    for message in messages
-                ],
-                response_format=ResponseFormat(type="json_object" if json_response else "text"),  # type: ignore[operator]
+                **self._create_request_body(messages=messages, json_response=json_response, tool=tool, **kwargs),
                 stream=False,
-                tools=[
-                    ChatCompletionToolParam(
-                        type="function",
-                        function=FunctionDefinition(
-                            name=tool.name,
-                            parameters=tool.parameters,
-                            description=tool.description or "",
-                        ),
-                    )
-                ]
-                if tool is not None
-                else NOT_GIVEN,
-                tool_choice="required" if tool else NOT_GIVEN,
-                **kwargs,
             )
         except OpenAIError as e:
             raise LLMClientError("Failed to generate completion", context=str(e)) from e
 
-        if content := result.choices[0].message.tool_calls[0].function.arguments:
-            return cast("str", content)
+        return self._get_content(result)
 
-        raise EmptyContentError("LLM client returned empty content", context=result.model_dump_json())
+    def create_batch_line(self, request: BatchRequest) -> dict[str, Any]:
+        """Create the line of a request in a batch file.
+
+        Args:
+            request: The batch request.
+
+        Returns:
+            The line, as a JSON-serializable object.
+        """
+        options = {"max_tokens": request.max_tokens} if request.max_tokens is not None else {}
+        return {
+            "custom_id": request.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": self._create_request_body(
+                messages=request.messages, json_response=request.json_response, tool=request.tool, **options
+            ),
+        }
+
+    async def submit_batch(self, batch_file: Path) -> str:
+        """Submit a batch file to the OpenAI batch API.
+
+        Args:
+            batch_file: The batch file, with a line per request. See ``create_batch_line``.
+
+        Raises:
+            LLMClientError: If the batch cannot be submitted.
+
+        Returns:
+            The ID of the batch.
+        """
+        try:
+            input_file = await self._client.files.create(
+                file=(batch_file.name, await AsyncPath(batch_file).read_bytes()), purpose="batch"
+            )
+            batch = await self._client.batches.create(
+                input_file_id=input_file.id, endpoint=BATCH_ENDPOINT, completion_window=BATCH_COMPLETION_WINDOW
+            )
+        except OpenAIError as e:
+            raise LLMClientError("Failed to submit batch", context=str(e)) from e
+        return batch.id
+
+    async def get_batch_state(self, batch_id: str) -> BatchState:
+        """Get the state of a submitted batch.
+
+        Args:
+            batch_id: The ID of the batch.
+
+        Raises:
+            LLMClientError: If the batch cannot be retrieved.
+
+        Returns:
+            The batch state.
+        """
+        try:
+            batch = await self._client.batches.retrieve(batch_id)
+        except OpenAIError as e:
+            raise LLMClientError("Failed to retrieve batch", context=str(e)) from e
+
+        counts = batch.request_counts
+        return BatchState(
+            batch_id=batch.id,
+            status=_batch_status_mapping.get(batch.status, "pending"),
+            completed_requests=counts.completed if counts else 0,
+            failed_requests=counts.failed if counts else 0,
+            total_requests=counts.total if counts else 0,
+        )
+
+    async def get_batch_results(self, batch_id: str) -> list[BatchResult]:
+        """Get the results of a done batch.
+
+        Args:
+            batch_id: The ID of the batch.
+
+        Raises:
+            LLMClientError: If the results cannot be retrieved.
+
+        Returns:
+            The results of the requests that finished, successfully or not.
+        """
+        try:
+            batch = await self._client.batches.retrieve(batch_id)
+            lines = [
+                line
+                for file_id in (batch.output_file_id, batch.error_file_id)
+                if file_id
+                for line in (await self._client.files.content(file_id)).text.splitlines()
+                if line
+            ]
+        except OpenAIError as e:
+            raise LLMClientError("Failed to retrieve batch results", context=str(e)) from e
+
+        return [self._parse_batch_line(line) for line in lines]
+
+    def _parse_batch_line(self, line: str) -> BatchResult:
+        """Parse a line of a batch output or error file.
+
+        Args:
+            line: The line.
+
+        Returns:
+            The batch result.
+        """
+        item = loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:  # noqa: PLR2004
+            return BatchResult(custom_id=item["custom_id"], error=dumps(item.get("error") or response.get("body")))
+
+        try:
+            content = self._get_content(ChatCompletion.model_validate(response.get("body")))
+        except (EmptyContentError, ValidationError, IndexError, TypeError) as e:
+            return BatchResult(custom_id=item["custom_id"], error=str(e))
+        return BatchResult(custom_id=item["custom_id"], content=content)
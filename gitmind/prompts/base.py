@@ -1,16 +1,33 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Final, Generic, TypeVar
+from functools import partial
+from math import inf
+from time import time
+from typing import TYPE_CHECKING, Any, Final, Generic, NamedTuple, TypeVar, cast
 
-from anyio import sleep
+from anyio import CancelScope, sleep
 from jsonschema import ValidationError, validate
-from msgspec import DecodeError
+from msgspec import DecodeError, convert
 
-from gitmind.exceptions import LLMClientError
-from gitmind.llm.base import LLMClient, MessageDefinition, RetryConfig, ToolDefinition
+from gitmind.caching.entry import (
+    CACHE_SCHEMA_VERSION,
+    CacheEntry,
+    CacheEntryMetadata,
+    decode_entry,
+    get_gitmind_version,
+)
+from gitmind.exceptions import DeadlineExceededError, LLMClientError
+from gitmind.llm.base import BatchRequest, LLMClient, MessageDefinition, RetryConfig, ToolDefinition
+from gitmind.utils.commit import CommitMetadata, CommitStatistics
+from gitmind.utils.hashing import get_sha_hash
 from gitmind.utils.logger import get_logger
-from gitmind.utils.serialization import deserialize, serialize
+from gitmind.utils.serialization import decode_hook, deserialize, serialize
+from gitmind.utils.sync import SingleFlight
+
+if TYPE_CHECKING:
+    from gitmind.caching import CacheBase
+    from gitmind.rules import Rule
 
 logger = get_logger(__name__)
 
@@ -25,6 +42,40 @@ Your previous response failed validation. Here is the error:\n{e}\nHere is your
 Generate a new response that fixes the validation error and completely satisfies the tool parameters.
 """
 
+TEMPLATE_METADATA: Final[CommitMetadata] = CommitMetadata(
+    author_email=None,
+    author_name=None,
+    commiter_email=None,
+    commiter_name=None,
+    hex="",
+    message="",
+    parent_hex=None,
+    timestamp=0,
+)
+"""Blank commit metadata, used to render a prompt template without commit data."""
+TEMPLATE_STATISTICS: Final[CommitStatistics] = CommitStatistics(deletions=0, files_changed=0, insertions=0)
+"""Blank commit statistics, used to render a prompt template without commit data."""
+
+_in_flight_completions: SingleFlight[Any] = SingleFlight()
+"""Completions being generated in this process, keyed by cache key. Shared by all handlers."""
+
+
+class BatchPrompt(NamedTuple):
+    """A prompt to submit in a batch, with what is needed to validate and cache its result."""
+
+    cache_key: str
+    """The cache key of the prompt, also used as the ID of its batch request."""
+    messages: list[MessageDefinition]
+    """The messages to generate completions for."""
+    schema: dict[str, Any]
+    """The schema the result must satisfy."""
+    tool: ToolDefinition | None
+    """An optional tool call."""
+    response_type: Any
+    """The type of the result."""
+    rules: list[Rule] | None = None
+    """The grading rules the result covers, if any."""
+
 
 class AbstractPromptHandler(ABC, Generic[T]):
     """Base class for LLM prompt handlers.
@@ -33,19 +84,35 @@ class AbstractPromptHandler(ABC, Generic[T]):
             client: The LLM client to use.
             retry_config: The retry configuration to use.
             max_response_tokens: The maximum number of tokens in the response.
+            cache: An optional cache for completion results.
+            model_tier: The routing tier of the client's model, if the analysis is routed. Recorded in the cache entry
+                metadata. See ``gitmind.prompts.router.ModelRouter``.
     """
 
-    __slots__ = ("_chunk_size", "_client", "_max_response_tokens", "_retry_config")
+    __slots__ = (
+        "_cache",
+        "_chunk_size",
+        "_client",
+        "_max_response_tokens",
+        "_model_tier",
+        "_prompt_hash",
+        "_retry_config",
+    )
 
     def __init__(
         self,
         client: LLMClient,
         retry_config: RetryConfig | None = None,
         max_response_tokens: int | None = None,
+        cache: CacheBase | None = None,
+        model_tier: str | None = None,
     ) -> None:
         self._client = client
+        self._cache = cache
+        self._model_tier = model_tier
         self._retry_config = retry_config if retry_config else RetryConfig()
         self._max_response_tokens = max_response_tokens if max_response_tokens else MAX_TOKENS
+        self._prompt_hash: str | None = None
 
     @abstractmethod
     async def __call__(self, **kwargs: Any) -> T:
@@ -59,6 +126,250 @@ class AbstractPromptHandler(ABC, Generic[T]):
         """
         ...
 
+    @abstractmethod
+    def get_cache_keys(self, **kwargs: Any) -> list[str]:
+        """Get the keys under which the results for the given arguments are cached.
+
+        Args:
+            **kwargs: The arguments the handler is called with.
+
+        Returns:
+            The cache keys.
+        """
+        ...
+
+    @abstractmethod
+    def get_prompt_hash(self) -> str:
+        """Get a hash of the prompt template, i.e. of the prompt without any commit data or grading rules.
+
+        Returns:
+            The prompt hash.
+        """
+        ...
+
+    def get_model_name(self) -> str | None:
+        """Get the name of the model used by the client.
+
+        Returns:
+            The model name, or None if the client does not expose it.
+        """
+        model = getattr(self._client, "_model", None)
+        return model if isinstance(model, str) else None
+
+    def create_entry_metadata(self, rules: list[Rule] | None = None) -> CacheEntryMetadata:
+        """Create the metadata of a cache entry created by this handler.
+
+        Args:
+            rules: The grading rules the cached result covers, if any.
+
+        Returns:
+            The cache entry metadata.
+        """
+        if self._prompt_hash is None:
+            self._prompt_hash = self.get_prompt_hash()
+        metadata = CacheEntryMetadata(
+            handler=self.__class__.__name__,
+            model=self.get_model_name(),
+            prompt_hash=self._prompt_hash,
+            rule_hashes={rule.name: get_sha_hash(serialize(rule).decode()) for rule in rules or []},
+            gitmind_version=get_gitmind_version(),
+            schema_version=CACHE_SCHEMA_VERSION,
+            created_at=int(time()),
+        )
+        if self._model_tier is not None:
+            metadata["model_tier"] = self._model_tier
+        return metadata
+
+    def is_current_entry(self, metadata: CacheEntryMetadata, rules: list[Rule] | None = None) -> bool:
+        """Check whether a cache entry created by this handler is still current.
+
+        Notes:
+            - An entry is stale if it was created with a different model, prompt template or entry format, or if any of
+                the grading rules it covers has changed or is no longer in ``rules``. The gitmind version alone does not
+                make an entry stale.
+
+        Args:
+            metadata: The metadata of the cache entry.
+            rules: The current grading rules.
+
+        Returns:
+            True if the entry is current, else False.
+        """
+        current = self.create_entry_metadata(rules)
+        return (
+            metadata["handler"] == current["handler"]
+            and metadata["model"] == current["model"]
+            and metadata["prompt_hash"] == current["prompt_hash"]
+            and metadata["schema_version"] == current["schema_version"]
+            and all(current["rule_hashes"].get(name) == value for name, value in metadata["rule_hashes"].items())
+        )
+
+    def get_cache_key(
+        self,
+        *,
+        messages: list[MessageDefinition],
+        schema: dict[str, Any],
+        tool: ToolDefinition | None = None,
+    ) -> str:
+        """Get the cache key of a prompt.
+
+        Notes:
+            - The messages contain the commit message and diff, so the key identifies the commit content as well as the
+                handler, model and prompt.
+
+        Args:
+            messages: The messages to generate completions for.
+            schema: The schema to use for the completions.
+            tool: An optional tool call.
+
+        Returns:
+            The cache key.
+        """
+        prompt = serialize(
+            {
+                "messages": messages,
+                "model": self.get_model_name(),
+                "schema": schema,
+                "tool": tool,
+            }
+        )
+        return f"{self.__class__.__name__}-{get_sha_hash(prompt.decode())}"
+
+    def get_patch_cache_key(self, *, fingerprint: str, **kwargs: Any) -> str:
+        """Get the cache key of results that only depend on the changes of a commit.
+
+        Args:
+            fingerprint: The patch fingerprint of the diff. See ``gitmind.utils.diff.get_patch_fingerprint``.
+            **kwargs: Additional values the results depend on, e.g. the grading rules.
+
+        Returns:
+            The cache key.
+        """
+        key = serialize({"fingerprint": fingerprint, "model": self.get_model_name()}, **kwargs)
+        return f"{self.__class__.__name__}-patch-{get_sha_hash(key.decode())}"
+
+    def get_tree_cache_key(self, *, tree_hex: str, **kwargs: Any) -> str:
+        """Get the cache key of results for staged changes, which have no commit yet.
+
+        Notes:
+            - The key is computed before the diff is rendered, so that repeated hook runs on the same staged tree skip
+                diffing and prompting altogether.
+
+        Args:
+            tree_hex: The hash of the staged tree. See ``gitmind.utils.commit.get_staged_tree``.
+            **kwargs: Additional values the results depend on, e.g. the parent commit, the message and the rules.
+
+        Returns:
+            The cache key.
+        """
+        key = serialize({"tree": tree_hex, "model": self.get_model_name()}, **kwargs)
+        return f"{self.__class__.__name__}-tree-{get_sha_hash(key.decode())}"
+
+    async def get_cached_result(
+        self, cache_key: str, *, response_type: type[R], schema: dict[str, Any], rules: list[Rule] | None = None
+    ) -> R | None:
+        """Get a result from the cache.
+
+        Args:
+            cache_key: The cache key.
+            response_type: The type of the result.
+            schema: The schema the result must satisfy.
+            rules: The grading rules the result covers, if any.
+
+        Returns:
+            The cached result, or None if there is no cache, no cached result or the cached result is invalid or stale.
+        """
+        if self._cache is None or (cached := await self._cache.get(cache_key)) is None:
+            return None
+
+        if (entry := decode_entry(cached)) is None or not self.is_current_entry(entry["metadata"], rules):
+            logger.debug("%s: Ignoring stale cached result %s.", self.__class__.__name__, cache_key)
+            return None
+
+        try:
+            result = convert(entry["result"], response_type, dec_hook=decode_hook)
+            validate(instance=result, schema=schema)
+        except (DecodeError, ValidationError) as e:
+            logger.warning("%s: Ignoring invalid cached result %s: %s", self.__class__.__name__, cache_key, e)
+            return None
+
+        logger.debug("%s: Using cached result %s.", self.__class__.__name__, cache_key)
+        return result
+
+    async def set_cached_result(self, cache_key: str, result: Any, rules: list[Rule] | None = None) -> None:
+        """Store a result in the cache, if there is one.
+
+        Args:
+            cache_key: The cache key.
+            result: The result to store.
+            rules: The grading rules the result covers, if any.
+
+        Returns:
+            None
+        """
+        if self._cache is not None:
+            entry = CacheEntry(metadata=self.create_entry_metadata(rules), result=result)
+            await self._cache.set(cache_key, serialize(entry).decode())
+
+    def create_batch_request(self, prompt: BatchPrompt) -> BatchRequest:
+        """Create the batch request of a prompt.
+
+        Args:
+            prompt: The batch prompt.
+
+        Returns:
+            The batch request, identified by the cache key of the prompt.
+        """
+        return BatchRequest(
+            custom_id=prompt.cache_key,
+            messages=prompt.messages,
+            json_response=True,
+            tool=prompt.tool,
+            max_tokens=self._max_response_tokens,
+        )
+
+    async def reconcile_batch_result(self, prompt: BatchPrompt, response: str) -> Any:
+        """Validate the response to a batch request and store the result in the cache.
+
+        Notes:
+            - Invalid responses are repaired as in ``generate_completions``, by asking the LLM client to fix the
+                validation error. The batch response counts as the first attempt.
+
+        Args:
+            prompt: The batch prompt.
+            response: The response to the batch request of the prompt.
+
+        Raises:
+            LLMClientError: If the response is invalid and cannot be repaired.
+
+        Returns:
+            The result.
+        """
+        try:
+            result = deserialize(response, prompt.response_type)
+            validate(instance=result, schema=prompt.schema)
+        except (DecodeError, ValidationError) as e:
+            if not self._retry_config.max_retries:
+                raise LLMClientError("LLM responded with invalid or partial JSON response", context=str(e)) from e
+
+            logger.debug("%s: Repairing invalid batch result %s: %s", self.__class__.__name__, prompt.cache_key, e)
+            messages = [
+                *prompt.messages,
+                MessageDefinition(
+                    role="user", content=VALIDATION_ERROR_MESSAGE_CONTENT.format(e=str(e), response=response)
+                ),
+            ]
+            result = await self._generate_completions(
+                messages=messages,
+                response_type=prompt.response_type,
+                retry_count=1,
+                schema=prompt.schema,
+                tool=prompt.tool,
+            )
+
+        await self.set_cached_result(prompt.cache_key, result, prompt.rules)
+        return result
+
     async def generate_completions(
         self,
         *,
@@ -67,8 +378,86 @@ class AbstractPromptHandler(ABC, Generic[T]):
         retry_count: int = 0,
         schema: dict[str, Any],
         tool: ToolDefinition | None = None,
+        rules: list[Rule] | None = None,
+        deadline: float | None = None,
     ) -> R:
-        """Generate LLM completions.
+        """Generate LLM completions, or return the cached result of an identical prompt.
+
+        Notes:
+            - Concurrent calls with an identical prompt are coalesced, so only one of them calls the LLM client.
+            - The deadline applies to the LLM client calls and the backoff between validation retries. If a coalesced
+                call is cancelled by its deadline, one of the callers waiting for it takes over.
+
+        Args:
+            messages: The messages to generate completions for.
+            response_type: The type of the response.
+            retry_count: The number of retries attempted.
+            schema: The schema to use for the completions.
+            tool: An optional tool call.
+            rules: The grading rules the response covers, if any. Recorded in the cache entry metadata.
+            deadline: An optional deadline on the anyio clock, see ``anyio.current_time``.
+
+        Raises:
+            LLMClientError: If an error occurs while generating completions.
+            DeadlineExceededError: If the completions are not generated before the deadline.
+
+        Returns:
+            The response from the LLM client.
+        """
+        cache_key = self.get_cache_key(messages=messages, schema=schema, tool=tool)
+        with CancelScope(deadline=deadline if deadline is not None else inf):
+            return cast(
+                "R",
+                await _in_flight_completions.do(
+                    cache_key,
+                    partial(
+                        self._get_or_generate_completions,
+                        cache_key=cache_key,
+                        messages=messages,
+                        response_type=response_type,
+                        retry_count=retry_count,
+                        schema=schema,
+                        tool=tool,
+                        rules=rules,
+                    ),
+                ),
+            )
+
+        raise DeadlineExceededError(
+            f"{self.__class__.__name__}: Completions were not generated before the deadline.", context=cache_key
+        )
+
+    async def _get_or_generate_completions(
+        self,
+        *,
+        cache_key: str,
+        messages: list[MessageDefinition],
+        response_type: type[R],
+        retry_count: int,
+        schema: dict[str, Any],
+        tool: ToolDefinition | None,
+        rules: list[Rule] | None,
+    ) -> R:
+        cached = await self.get_cached_result(cache_key, response_type=response_type, schema=schema, rules=rules)
+        if cached is not None:
+            return cached
+
+        result = await self._generate_completions(
+            messages=messages, response_type=response_type, retry_count=retry_count, schema=schema, tool=tool
+        )
+        await self.set_cached_result(cache_key, result, rules)
+        return result
+
+    async def _generate_completions(
+        self,
+        *,
+        messages: list[MessageDefinition],
+        response_type: type[R],
+        retry_count: int = 0,
+        schema: dict[str, Any],
+        tool: ToolDefinition | None = None,
+    ) -> R:
+        """Generate LLM completions, retrying on invalid responses.
 
         Args:
             messages: The messages to generate completions for.
@@ -132,7 +521,7 @@ class AbstractPromptHandler(ABC, Generic[T]):
                     self._retry_config.max_retries,
                 )
                 await sleep((2**retry_count) if self._retry_config.exponential_backoff else 1)
-                return await self.generate_completions(
+                return await self._generate_completions(
                     messages=messages,
                     response_type=response_type,
                     retry_count=retry_count,
@@ -0,0 +1,186 @@
+"""Bulk analysis through the batch API of the provider.
+
+Prompts are written to a JSONL batch file, submitted, and polled until the provider is done. The results are then
+validated, repaired if need be, and stored in the cache, so that the regular analyses find them there.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, TypedDict
+
+from anyio import Path as AsyncPath
+from anyio import sleep
+
+from gitmind.exceptions import LLMClientError
+from gitmind.utils.logger import get_logger
+from gitmind.utils.serialization import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from gitmind.llm.base import BatchState, LLMClient
+    from gitmind.prompts.base import AbstractPromptHandler, BatchPrompt
+
+logger = get_logger(__name__)
+
+DEFAULT_POLL_INTERVAL: Final[float] = 60.0
+"""The default number of seconds between polls of the batch state. Batches take minutes to hours."""
+
+
+class BatchEntry(NamedTuple):
+    """A prompt of a batch, with the handler that validates and caches its result."""
+
+    handler: AbstractPromptHandler[Any]
+    """The prompt handler."""
+    prompt: BatchPrompt
+    """The batch prompt."""
+
+
+class BatchSummary(TypedDict):
+    """DTO for the outcome of a batch."""
+
+    batch_id: str
+    """The ID of the batch."""
+    requests: int
+    """The number of submitted requests."""
+    completed: int
+    """The number of results stored in the cache."""
+    failed: int
+    """The number of requests without a valid result. They are analysed again by the next regular analysis."""
+
+
+async def write_batch_file(batch_file: Path, *, client: LLMClient, entries: Iterable[BatchEntry]) -> int:
+    """Write the batch file of the prompts of a batch.
+
+    Args:
+        batch_file: The path of the batch file.
+        client: The LLM client the batch is submitted with.
+        entries: The batch entries.
+
+    Returns:
+        The number of requests written.
+    """
+    lines = [serialize(client.create_batch_line(entry.handler.create_batch_request(entry.prompt))) for entry in entries]
+    path = AsyncPath(batch_file)
+    await path.parent.mkdir(parents=True, exist_ok=True)
+    await path.write_bytes(b"".join(line + b"\n" for line in lines))
+    return len(lines)
+
+
+async def wait_for_batch(
+    client: LLMClient, batch_id: str, *, poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> BatchState:
+    """Poll the state of a batch until the provider is done with it.
+
+    Args:
+        client: The LLM client the batch was submitted with.
+        batch_id: The ID of the batch.
+        poll_interval: The number of seconds between polls.
+
+    Returns:
+        The final batch state.
+    """
+    while (state := await client.get_batch_state(batch_id)).status == "pending":
+        logger.debug(
+            "Waiting for batch %s: %d of %d requests done.",
+            batch_id,
+            state.completed_requests + state.failed_requests,
+            state.total_requests,
+        )
+        await sleep(poll_interval)
+    return state
+
+
+async def reconcile_batch_results(client: LLMClient, batch_id: str, *, entries: dict[str, BatchEntry]) -> int:
+    """Validate the results of a done batch and store them in the cache.
+
+    Args:
+        client: The LLM client the batch was submitted with.
+        batch_id: The ID of the batch.
+        entries: The batch entries, by the ID of their batch requests.
+
+    Returns:
+        The number of results stored in the cache.
+    """
+    completed = 0
+    for result in await client.get_batch_results(batch_id):
+        if (entry := entries.get(result.custom_id)) is None:
+            continue
+        if result.content is None:
+            logger.debug("Batch request %s failed: %s", result.custom_id, result.error)
+            continue
+        try:
+            await entry.handler.reconcile_batch_result(entry.prompt, result.content)
+        except LLMClientError as e:
+            logger.debug("Discarding the invalid result of batch request %s: %s", result.custom_id, e)
+            continue
+        completed += 1
+    return completed
+
+
+async def submit_batch(*, client: LLMClient, entries: dict[str, BatchEntry], batch_file: Path) -> str:
+    """Write the batch file of the prompts of a batch and submit it.
+
+    Args:
+        client: The LLM client to submit the batch with.
+        entries: The batch entries, by the cache keys of their prompts.
+        batch_file: The path to write the batch file to.
+
+    Raises:
+        LLMClientError: If the client does not support batches or the batch API fails.
+
+    Returns:
+        The ID of the batch.
+    """
+    requests = await write_batch_file(batch_file, client=client, entries=entries.values())
+    batch_id = await client.submit_batch(batch_file)
+    logger.debug("Submitted batch %s with %d requests from %s.", batch_id, requests, batch_file)
+    return batch_id
+
+
+async def complete_batch(
+    client: LLMClient, batch_id: str, *, entries: dict[str, BatchEntry], poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> BatchSummary:
+    """Wait for a submitted batch and store its results in the cache.
+
+    Args:
+        client: The LLM client the batch was submitted with.
+        batch_id: The ID of the batch.
+        entries: The batch entries, by the cache keys of their prompts.
+        poll_interval: The number of seconds between polls of the batch state.
+
+    Raises:
+        LLMClientError: If the batch API fails.
+
+    Returns:
+        The batch summary.
+    """
+    await wait_for_batch(client, batch_id, poll_interval=poll_interval)
+    completed = await reconcile_batch_results(client, batch_id, entries=entries)
+    return BatchSummary(batch_id=batch_id, requests=len(entries), completed=completed, failed=len(entries) - completed)
+
+
+async def run_batch(
+    *,
+    client: LLMClient,
+    entries: dict[str, BatchEntry],
+    batch_file: Path,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> BatchSummary:
+    """Analyse prompts through the batch API of the provider, storing the results in the cache.
+
+    Args:
+        client: The LLM client to submit the batch with.
+        entries: The batch entries, by the cache keys of their prompts.
+        batch_file: The path to write the batch file to.
+        poll_interval: The number of seconds between polls of the batch state.
+
+    Raises:
+        LLMClientError: If the client does not support batches or the batch API fails.
+
+    Returns:
+        The batch summary.
+    """
+    batch_id = await submit_batch(client=client, entries=entries, batch_file=batch_file)
+    return await complete_batch(client, batch_id, entries=entries, poll_interval=poll_interval)
@@ -0,0 +1,151 @@
+from typing import Any, Final, Literal, TypedDict
+
+from typing_extensions import override
+
+from gitmind.llm.base import MessageDefinition, ToolDefinition
+from gitmind.prompts.base import TEMPLATE_METADATA, AbstractPromptHandler
+from gitmind.utils.commit import CommitMetadata
+from gitmind.utils.diff import CHARS_PER_TOKEN
+from gitmind.utils.hashing import get_sha_hash
+from gitmind.utils.serialization import serialize
+
+CommitComplexity = Literal["simple", "complex"]
+
+CLASSIFY_COMMIT_SYSTEM_MESSAGE: Final[str] = """
+You are an assistant that triages git commits before they are analysed.
+
+Classify the provided commit as simple or complex:
+
+- A commit is simple if its changes are small and self-explanatory, e.g. typo fixes, version bumps, renames,
+    formatting, configuration tweaks or straightforward one-place changes.
+- A commit is complex if understanding it requires reasoning about program logic, multiple interacting changes,
+    architecture or behavior.
+
+When in doubt, classify the commit as complex.
+
+Respond by calling the provided tool 'classify_commit' with a JSON object adhering to its parameter definitions.
+"""
+
+CLASSIFY_COMMIT_PROPERTIES: Final[dict[str, Any]] = {
+    "complexity": {
+        "type": "string",
+        "enum": ["simple", "complex"],
+        "description": "The complexity of the commit",
+    },
+    "reason": {"type": "string", "description": "A short reason for the classification"},
+}
+
+CLASSIFY_COMMIT_MAX_DIFF_TOKENS: Final[int] = 2000
+"""The maximum number of tokens of the diff in the classification prompt. Longer diffs are truncated, since the
+classification only needs the gist of the changes."""
+TRUNCATED_DIFF_MARKER: Final[str] = "\n[diff truncated]"
+
+
+class CommitComplexityResult(TypedDict):
+    """The complexity classification of a commit."""
+
+    complexity: CommitComplexity
+    """The complexity of the commit."""
+    reason: str
+    """A short reason for the classification."""
+
+
+class ClassifyCommitHandler(AbstractPromptHandler[CommitComplexityResult]):
+    """Handler for the classify commit prompt, used to route commits to a model tier."""
+
+    @override
+    async def __call__(  # type: ignore[override]
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        **kwargs: Any,
+    ) -> CommitComplexityResult:
+        """Generate completions for the classify commit prompt.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            **kwargs: Additional arguments.
+
+        Returns:
+            The complexity classification of the commit.
+        """
+        messages, schema, tool = self.create_prompt(metadata=metadata, diff=diff)
+        return await self.generate_completions(
+            response_type=CommitComplexityResult,
+            schema=schema,
+            messages=messages,
+            tool=tool,
+        )
+
+    @override
+    def get_cache_keys(  # type: ignore[override]
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        **kwargs: Any,
+    ) -> list[str]:
+        """Get the keys under which the classification of a commit is cached.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            **kwargs: Additional arguments.
+
+        Returns:
+            The cache keys.
+        """
+        messages, schema, tool = self.create_prompt(metadata=metadata, diff=diff)
+        return [self.get_cache_key(messages=messages, schema=schema, tool=tool)]
+
+    @override
+    def get_prompt_hash(self) -> str:
+        """Get a hash of the classify commit prompt template.
+
+        Returns:
+            The prompt hash.
+        """
+        messages, schema, tool = self.create_prompt(metadata=TEMPLATE_METADATA, diff="")
+        return get_sha_hash(serialize({"messages": messages, "schema": schema, "tool": tool}).decode())
+
+    @staticmethod
+    def create_prompt(
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+    ) -> tuple[list[MessageDefinition], dict[str, Any], ToolDefinition]:
+        """Create the prompt for classifying a git commit.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+
+        Returns:
+            A tuple of the messages, the schema of the classification and the tool definition.
+        """
+        max_diff_chars = CLASSIFY_COMMIT_MAX_DIFF_TOKENS * CHARS_PER_TOKEN
+        if len(diff) > max_diff_chars:
+            diff = diff[:max_diff_chars] + TRUNCATED_DIFF_MARKER
+
+        schema = {
+            "type": "object",
+            "properties": CLASSIFY_COMMIT_PROPERTIES,
+            "required": list(CLASSIFY_COMMIT_PROPERTIES.keys()),
+        }
+
+        tool = ToolDefinition(
+            name="classify_commit",
+            description="Returns the complexity classification of a git commit.",
+            parameters=schema,
+        )
+
+        messages = [
+            MessageDefinition(role="system", content=CLASSIFY_COMMIT_SYSTEM_MESSAGE.strip()),
+            MessageDefinition(
+                role="user", content=f"**Commit Message**:{metadata['message']}\n\n**Commit Diff**:\n{diff}"
+            ),
+        ]
+
+        return messages, schema, tool
@@ -4,8 +4,10 @@ from inflection import titleize
 from typing_extensions import override
 
 from gitmind.llm.base import MessageDefinition, ToolDefinition
-from gitmind.prompts.base import AbstractPromptHandler
+from gitmind.prompts.base import TEMPLATE_METADATA, TEMPLATE_STATISTICS, AbstractPromptHandler, BatchPrompt
 from gitmind.utils.commit import CommitMetadata, CommitStatistics
+from gitmind.utils.diff import get_patch_fingerprint
+from gitmind.utils.hashing import get_sha_hash
 from gitmind.utils.logger import get_logger
 from gitmind.utils.serialization import serialize
 
@@ -112,6 +114,10 @@ class DescribeCommitHandler(AbstractPromptHandler[CommitDescriptionResult]):
     ) -> CommitDescriptionResult:
         """Generate completions for the describe commit prompt.
 
+        Notes:
+            - Descriptions only depend on the changes, so they are cached by the patch fingerprint of the diff and
+                reused for cherry-picks and backports of the commit.
+
         Args:
             statistics: The statistics of the commit.
             metadata: The metadata of the commit.
@@ -121,6 +127,109 @@ class DescribeCommitHandler(AbstractPromptHandler[CommitDescriptionResult]):
         Returns:
             Commit description result.
         """
+        messages, schema, tool = self.create_prompt(statistics=statistics, metadata=metadata, diff=diff)
+
+        patch_cache_key: str | None = None
+        if (fingerprint := get_patch_fingerprint(diff)) is not None:
+            patch_cache_key = self.get_patch_cache_key(fingerprint=fingerprint)
+            cached = await self.get_cached_result(patch_cache_key, response_type=CommitDescriptionResult, schema=schema)
+            if cached is not None:
+                return cached
+
+        result = await self.generate_completions(
+            response_type=CommitDescriptionResult,
+            schema=schema,
+            messages=messages,
+            tool=tool,
+        )
+        if patch_cache_key is not None:
+            await self.set_cached_result(patch_cache_key, result)
+
+        return result
+
+    @override
+    def get_cache_keys(  # type: ignore[override]
+        self,
+        *,
+        statistics: CommitStatistics,
+        metadata: CommitMetadata,
+        diff: str,
+        **kwargs: Any,
+    ) -> list[str]:
+        """Get the keys under which the description of a commit is cached.
+
+        Args:
+            statistics: The statistics of the commit.
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            **kwargs: Additional arguments.
+
+        Returns:
+            The cache keys.
+        """
+        messages, schema, tool = self.create_prompt(statistics=statistics, metadata=metadata, diff=diff)
+        cache_keys = [self.get_cache_key(messages=messages, schema=schema, tool=tool)]
+        if (fingerprint := get_patch_fingerprint(diff)) is not None:
+            cache_keys.append(self.get_patch_cache_key(fingerprint=fingerprint))
+        return cache_keys
+
+    def create_batch_prompt(
+        self,
+        *,
+        statistics: CommitStatistics,
+        metadata: CommitMetadata,
+        diff: str,
+    ) -> BatchPrompt:
+        """Create the batch prompt for describing a commit.
+
+        Notes:
+            - The result is cached under the key of the prompt, which the describe commit prompt looks up before
+                generating completions.
+
+        Args:
+            statistics: The statistics of the commit.
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+
+        Returns:
+            The batch prompt.
+        """
+        messages, schema, tool = self.create_prompt(statistics=statistics, metadata=metadata, diff=diff)
+        return BatchPrompt(
+            cache_key=self.get_cache_key(messages=messages, schema=schema, tool=tool),
+            messages=messages,
+            schema=schema,
+            tool=tool,
+            response_type=CommitDescriptionResult,
+        )
+
+    @override
+    def get_prompt_hash(self) -> str:
+        """Get a hash of the describe commit prompt template.
+
+        Returns:
+            The prompt hash.
+        """
+        messages, schema, tool = self.create_prompt(statistics=TEMPLATE_STATISTICS, metadata=TEMPLATE_METADATA, diff="")
+        return get_sha_hash(serialize({"messages": messages, "schema": schema, "tool": tool}).decode())
+
+    @staticmethod
+    def create_prompt(
+        *,
+        statistics: CommitStatistics,
+        metadata: CommitMetadata,
+        diff: str,
+    ) -> tuple[list[MessageDefinition], dict[str, Any], ToolDefinition]:
+        """Create the prompt for describing a git commit.
+
+        Args:
+            statistics: The statistics of the commit.
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+
+        Returns:
+            A tuple of the messages, the schema of the description and the tool definition.
+        """
         describe_commit_prompt = (
             f"**Commit Message**:{metadata['message']}\n\n"
             f"**Commit Statistics**:\n{titleize_commit_statistics(statistics)}\n\n"
@@ -140,12 +249,9 @@ class DescribeCommitHandler(AbstractPromptHandler[CommitDescriptionResult]):
             parameters=schema,
         )
 
-        return await self.generate_completions(
-            response_type=CommitDescriptionResult,
-            schema=schema,
-            messages=[
-                MessageDefinition(role="system", content=DESCRIBE_COMMIT_SYSTEM_MESSAGE.strip()),
-                MessageDefinition(role="user", content=describe_commit_prompt + diff),
-            ],
-            tool=tool,
-        )
+        messages = [
+            MessageDefinition(role="system", content=DESCRIBE_COMMIT_SYSTEM_MESSAGE.strip()),
+            MessageDefinition(role="user", content=describe_commit_prompt + diff),
+        ]
+
+        return messages, schema, tool
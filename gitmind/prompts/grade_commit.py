@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Final, Literal, TypedDict, Union
+from typing import TYPE_CHECKING, Any, Final, Literal, TypedDict, Union
 
-from typing_extensions import override
+from anyio import create_task_group, current_time
+from inflection import titleize
+from typing_extensions import NotRequired, override
 
+from gitmind.exceptions import DeadlineExceededError, GitMindError
 from gitmind.llm.base import MessageDefinition, ToolDefinition
-from gitmind.prompts.base import AbstractPromptHandler
+from gitmind.prompts.base import TEMPLATE_METADATA, AbstractPromptHandler, BatchPrompt
 from gitmind.rules import DEFAULT_GRADING_RULES, Rule
+from gitmind.utils.diff import get_patch_fingerprint
+from gitmind.utils.hashing import get_sha_hash
+from gitmind.utils.logger import get_logger
 from gitmind.utils.serialization import serialize
 
 if TYPE_CHECKING:
+    from gitmind.prompts.heuristics import CommitSignals
     from gitmind.utils.commit import CommitMetadata
 
+logger = get_logger(__name__)
+
 
 class CommitGradingResult(TypedDict):
     """DTO for grading results."""
@@ -20,6 +29,28 @@ class CommitGradingResult(TypedDict):
     """The grade for the commit."""
     reason: str
     """The reason for the grade."""
+    heuristic: NotRequired[bool]
+    """Whether the grade was estimated by local heuristics instead of the LLM. See ``gitmind.prompts.heuristics``."""
+
+
+class GradingDiagnostics(TypedDict):
+    """DTO for the timing diagnostics of a grading run."""
+
+    elapsed: float
+    """The seconds grading took."""
+    deadline_exceeded: bool
+    """Whether the deadline was exceeded before every rule was graded."""
+    timings: dict[str, float]
+    """The seconds each finished step took, by step name, e.g. ``cache``, ``patch_rules`` or ``metadata_rules``."""
+
+
+class GradingReport(TypedDict):
+    """DTO for the results of a grading run with a deadline."""
+
+    results: dict[str, CommitGradingResult]
+    """The grading results by rule name. Rules not graded before the deadline are ``NOT_EVALUATED``."""
+    diagnostics: GradingDiagnostics
+    """The timing diagnostics."""
 
 
 GRADE_COMMIT_SYSTEM_MESSAGE: Final[str] = """
@@ -40,6 +71,8 @@ Respond by calling the provided tool 'grading_results' with a JSON object adhere
 ```
 """
 
+DEADLINE_EXCEEDED_REASON: Final[str] = "The rule was not graded before the grading deadline."
+
 
 class GradeCommitHandler(AbstractPromptHandler[dict[str, CommitGradingResult]]):
     """Handler for grading a git commit."""
@@ -51,25 +84,416 @@ class GradeCommitHandler(AbstractPromptHandler[dict[str, CommitGradingResult]]):
         metadata: CommitMetadata,
         diff: str,
         grading_rules: list[Rule] = DEFAULT_GRADING_RULES,
+        deadline: float | None = None,
+        signals: CommitSignals | None = None,
     ) -> dict[str, CommitGradingResult]:
         """Generate LLM completions for grading a git commit.
 
+        Notes:
+            - Grades of rules that only depend on the changes are cached by the patch fingerprint of the diff, so they
+                are reused for cherry-picks and backports of the commit. Only the metadata dependent rules, such as the
+                message quality, are graded again for those.
+            - With a deadline, the rules that are not graded in time are ``NOT_EVALUATED``, see
+                ``grade_within_deadline``.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use.
+            deadline: An optional deadline on the anyio clock, see ``anyio.current_time``.
+            signals: Optional signals of the commit to add to the prompt. See ``gitmind.prompts.heuristics``.
+
+        Returns:
+            The grading results for the commit.
+        """
+        if deadline is not None:
+            report = await self.grade_within_deadline(
+                metadata=metadata, diff=diff, grading_rules=grading_rules, deadline=deadline, signals=signals
+            )
+            return report["results"]
+
+        messages, schema, tool = self.create_prompt(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, signals=signals
+        )
+        cached = await self.get_cached_result(
+            self.get_cache_key(messages=messages, schema=schema, tool=tool),
+            response_type=dict[str, CommitGradingResult],
+            schema=schema,
+            rules=grading_rules,
+        )
+        if cached is not None:
+            return dict(sorted(cached.items()))
+
+        patch_rules = [rule for rule in grading_rules if not rule.metadata_dependent]
+        metadata_rules = [rule for rule in grading_rules if rule.metadata_dependent]
+
+        patch_cache_key: str | None = None
+        if patch_rules and (fingerprint := get_patch_fingerprint(diff)) is not None:
+            patch_cache_key = self.get_patch_cache_key(fingerprint=fingerprint, grading_rules=patch_rules)
+            cached = await self.get_cached_result(
+                patch_cache_key,
+                response_type=dict[str, CommitGradingResult],
+                schema=self.create_schema(patch_rules),
+                rules=patch_rules,
+            )
+            if cached is not None:
+                if metadata_rules:
+                    graded = await self.grade(
+                        metadata=metadata, diff=diff, grading_rules=metadata_rules, signals=signals
+                    )
+                    cached |= {rule.name: graded[rule.name] for rule in metadata_rules}
+                return dict(sorted(cached.items()))
+
+        result = await self.generate_completions(
+            response_type=dict[str, CommitGradingResult],
+            schema=schema,
+            messages=messages,
+            tool=tool,
+            rules=grading_rules,
+        )
+        if patch_cache_key is not None:
+            await self.set_cached_result(
+                patch_cache_key, {rule.name: result[rule.name] for rule in patch_rules}, patch_rules
+            )
+
+        return dict(sorted(result.items()))
+
+    @override
+    def get_cache_keys(  # type: ignore[override]
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule] = DEFAULT_GRADING_RULES,
+        signals: CommitSignals | None = None,
+    ) -> list[str]:
+        """Get the keys under which the grades of a commit are cached.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use.
+            signals: Optional signals of the commit to add to the prompt.
+
+        Returns:
+            The cache keys.
+        """
+        messages, schema, tool = self.create_prompt(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, signals=signals
+        )
+        cache_keys = [self.get_cache_key(messages=messages, schema=schema, tool=tool)]
+
+        patch_rules = [rule for rule in grading_rules if not rule.metadata_dependent]
+        metadata_rules = [rule for rule in grading_rules if rule.metadata_dependent]
+        if patch_rules and (fingerprint := get_patch_fingerprint(diff)) is not None:
+            cache_keys.append(self.get_patch_cache_key(fingerprint=fingerprint, grading_rules=patch_rules))
+            if metadata_rules:
+                messages, schema, tool = self.create_prompt(
+                    metadata=metadata, diff=diff, grading_rules=metadata_rules, signals=signals
+                )
+                cache_keys.append(self.get_cache_key(messages=messages, schema=schema, tool=tool))
+
+        return cache_keys
+
+    def create_batch_prompt(
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule] = DEFAULT_GRADING_RULES,
+        signals: CommitSignals | None = None,
+    ) -> BatchPrompt:
+        """Create the batch prompt for grading a commit.
+
+        Notes:
+            - The result is cached under the key of the full prompt, which grading looks up first.
+
         Args:
             metadata: The metadata of the commit.
             diff: The diff of the commit.
             grading_rules: The grading rules to use.
+            signals: Optional signals of the commit to add to the prompt.
+
+        Returns:
+            The batch prompt.
+        """
+        messages, schema, tool = self.create_prompt(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, signals=signals
+        )
+        return BatchPrompt(
+            cache_key=self.get_cache_key(messages=messages, schema=schema, tool=tool),
+            messages=messages,
+            schema=schema,
+            tool=tool,
+            response_type=dict[str, CommitGradingResult],
+            rules=grading_rules,
+        )
+
+    @override
+    def get_prompt_hash(self) -> str:
+        """Get a hash of the grading prompt template.
+
+        Notes:
+            - The grading rules are excluded, since entries record the hashes of the rules they cover.
+
+        Returns:
+            The prompt hash.
+        """
+        messages, schema, tool = self.create_prompt(metadata=TEMPLATE_METADATA, diff="", grading_rules=[])
+        return get_sha_hash(serialize({"messages": messages, "schema": schema, "tool": tool}).decode())
+
+    async def grade(
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule],
+        deadline: float | None = None,
+        signals: CommitSignals | None = None,
+    ) -> dict[str, CommitGradingResult]:
+        """Grade a git commit by the given rules, without reusing the grades of commits with the same changes.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use.
+            deadline: An optional deadline on the anyio clock, see ``anyio.current_time``.
+            signals: Optional signals of the commit to add to the prompt.
+
+        Raises:
+            DeadlineExceededError: If the rules are not graded before the deadline.
 
         Returns:
             The grading results for the commit.
         """
+        messages, schema, tool = self.create_prompt(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, signals=signals
+        )
+        return await self.generate_completions(
+            response_type=dict[str, CommitGradingResult],
+            schema=schema,
+            messages=messages,
+            tool=tool,
+            rules=grading_rules,
+            deadline=deadline,
+        )
+
+    async def grade_within_deadline(
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule] = DEFAULT_GRADING_RULES,
+        deadline: float,
+        signals: CommitSignals | None = None,
+    ) -> GradingReport:
+        """Grade a git commit, returning the rules graded before a deadline instead of failing.
+
+        Notes:
+            - The rules that only depend on the changes and the metadata dependent rules are graded concurrently by
+                separate completions, so that a slow completion does not hold back the grades of the other.
+            - The grades are cached as they are by ``__call__``, and a complete result is also cached under the key of
+                the full prompt.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use.
+            deadline: The deadline on the anyio clock, see ``anyio.current_time``.
+            signals: Optional signals of the commit to add to the prompt.
+
+        Raises:
+            GitMindError: If grading fails for any other reason than the deadline.
+
+        Returns:
+            The grading results, with the rules not graded in time marked ``NOT_EVALUATED``, and timing diagnostics.
+        """
+        started_at = current_time()
+        timings: dict[str, float] = {}
+        messages, schema, tool = self.create_prompt(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, signals=signals
+        )
+        cache_key = self.get_cache_key(messages=messages, schema=schema, tool=tool)
+
+        cached = await self.get_cached_result(
+            cache_key, response_type=dict[str, CommitGradingResult], schema=schema, rules=grading_rules
+        )
+        if cached is not None:
+            timings["cache"] = current_time() - started_at
+            return GradingReport(
+                results=dict(sorted(cached.items())),
+                diagnostics=GradingDiagnostics(
+                    elapsed=current_time() - started_at, deadline_exceeded=False, timings=timings
+                ),
+            )
+
+        results: dict[str, CommitGradingResult] = {}
+        errors: list[GitMindError] = []
+        steps = {
+            "patch_rules": [rule for rule in grading_rules if not rule.metadata_dependent],
+            "metadata_rules": [rule for rule in grading_rules if rule.metadata_dependent],
+        }
+
+        async def grade_step(step: str, rules: list[Rule]) -> None:
+            step_started_at = current_time()
+            try:
+                if step == "patch_rules":
+                    graded = await self._grade_patch_rules(
+                        metadata=metadata, diff=diff, grading_rules=rules, deadline=deadline, signals=signals
+                    )
+                else:
+                    graded = await self.grade(
+                        metadata=metadata, diff=diff, grading_rules=rules, deadline=deadline, signals=signals
+                    )
+            except DeadlineExceededError:
+                return
+            except GitMindError as e:
+                errors.append(e)
+                return
+            results.update({rule.name: graded[rule.name] for rule in rules})
+            timings[step] = current_time() - step_started_at
+
+        async with create_task_group() as tg:
+            for step, rules in steps.items():
+                if rules:
+                    tg.start_soon(grade_step, step, rules)
+
+        if errors:
+            raise errors[0]
+
+        deadline_exceeded = len(results) < len(grading_rules)
+        if deadline_exceeded:
+            logger.debug(
+                "%s: Grading exceeded the deadline, %d of %d rules are not evaluated.",
+                self.__class__.__name__,
+                len(grading_rules) - len(results),
+                len(grading_rules),
+            )
+            for rule in grading_rules:
+                results.setdefault(
+                    rule.name, CommitGradingResult(grade="NOT_EVALUATED", reason=DEADLINE_EXCEEDED_REASON)
+                )
+        else:
+            await self.set_cached_result(cache_key, results, grading_rules)
+
+        return GradingReport(
+            results=dict(sorted(results.items())),
+            diagnostics=GradingDiagnostics(
+                elapsed=current_time() - started_at, deadline_exceeded=deadline_exceeded, timings=timings
+            ),
+        )
+
+    async def _grade_patch_rules(
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule],
+        deadline: float | None = None,
+        signals: CommitSignals | None = None,
+    ) -> dict[str, CommitGradingResult]:
+        """Grade the rules that only depend on the changes, reusing the grades of commits with the same changes.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use. None of them may be metadata dependent.
+            deadline: An optional deadline on the anyio clock, see ``anyio.current_time``.
+            signals: Optional signals of the commit to add to the prompt.
+
+        Returns:
+            The grading results for the rules.
+        """
+        patch_cache_key: str | None = None
+        if (fingerprint := get_patch_fingerprint(diff)) is not None:
+            patch_cache_key = self.get_patch_cache_key(fingerprint=fingerprint, grading_rules=grading_rules)
+            cached = await self.get_cached_result(
+                patch_cache_key,
+                response_type=dict[str, CommitGradingResult],
+                schema=self.create_schema(grading_rules),
+                rules=grading_rules,
+            )
+            if cached is not None:
+                return cached
+
+        graded = await self.grade(
+            metadata=metadata, diff=diff, grading_rules=grading_rules, deadline=deadline, signals=signals
+        )
+        result = {rule.name: graded[rule.name] for rule in grading_rules}
+        if patch_cache_key is not None:
+            await self.set_cached_result(patch_cache_key, result, grading_rules)
+        return result
+
+    def create_prompt(
+        self,
+        *,
+        metadata: CommitMetadata,
+        diff: str,
+        grading_rules: list[Rule],
+        signals: CommitSignals | None = None,
+    ) -> tuple[list[MessageDefinition], dict[str, Any], ToolDefinition]:
+        """Create the prompt for grading a git commit.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+            grading_rules: The grading rules to use.
+            signals: Optional signals of the commit, computed by local analysis of the diff.
+
+        Returns:
+            A tuple of the messages, the schema of the grading results and the tool definition.
+        """
         evaluation_instructions = self.create_evaluation_instructions(grading_rules)
 
+        commit_signals = (
+            "**Commit Signals**:\n"
+            + "\n".join(f"- {titleize(key)}: {value}" for key, value in signals.items())
+            + "\n\n"
+            if signals is not None
+            else ""
+        )
         commit_evaluation_prompt = (
             f"Evaluate and grade a git commit based on the following criteria:\n{evaluation_instructions}\n\n"
             f"**Commit Message**:{metadata['message']}\n\n"
+            f"{commit_signals}"
             f"**Commit Diff**:\n{diff}"
         )
 
+        schema = self.create_schema(grading_rules)
+
+        tool = ToolDefinition(
+            name="grading_results",
+            description="Returns the grading results for a git commit.",
+            parameters=schema,
+        )
+
+        messages = [
+            MessageDefinition(
+                role="system",
+                content=GRADE_COMMIT_SYSTEM_MESSAGE.format(
+                    schema=serialize(
+                        {
+                            "$schema": "http://json-schema.org/draft-07/schema#",
+                            **schema,
+                        },
+                    ),
+                ),
+            ),
+            MessageDefinition(role="user", content=commit_evaluation_prompt),
+        ]
+
+        return messages, schema, tool
+
+    @staticmethod
+    def create_schema(grading_rules: list[Rule]) -> dict[str, Any]:
+        """Create the JSON schema of the grading results for the grading rules.
+
+        Args:
+            grading_rules: The grading rules to create the schema for.
+
+        Returns:
+            The JSON schema.
+        """
         object_type = {
             "type": "object",
             "properties": {
@@ -84,40 +508,12 @@ class GradeCommitHandler(AbstractPromptHandler[dict[str, CommitGradingResult]]):
             "required": ["grade", "reason"],
         }
 
-        schema = {
+        return {
             "type": "object",
             "properties": {rule.name: object_type for rule in grading_rules},
             "required": [rule.name for rule in grading_rules],
         }
 
-        tool = ToolDefinition(
-            name="grading_results",
-            description="Returns the grading results for a git commit.",
-            parameters=schema,
-        )
-
-        result = await self.generate_completions(
-            response_type=dict[str, CommitGradingResult],
-            schema=schema,
-            messages=[
-                MessageDefinition(
-                    role="system",
-                    content=GRADE_COMMIT_SYSTEM_MESSAGE.format(
-                        schema=serialize(
-                            {
-                                "$schema": "http://json-schema.org/draft-07/schema#",
-                                **schema,
-                            },
-                        ),
-                    ),
-                ),
-                MessageDefinition(role="user", content=commit_evaluation_prompt),
-            ],
-            tool=tool,
-        )
-
-        return dict(sorted(result.items()))
-
     @staticmethod
     def create_evaluation_instructions(grading_rules: list[Rule]) -> str:
         """Create the evaluation instructions for the grading rules.
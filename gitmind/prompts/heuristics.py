@@ -0,0 +1,196 @@
+"""Deterministic local analysis of commits.
+
+Signals computed from the per file statistics of a diff grade some rules directly, e.g. the test quality of a commit
+that changes no code, and are added to grading prompts so that the LLM has less to derive.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatch
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Final, TypedDict
+
+from gitmind.prompts.grade_commit import CommitGradingResult
+from gitmind.utils.diff import get_file_statistics
+
+if TYPE_CHECKING:
+    from gitmind.config import HeuristicGrading
+    from gitmind.rules import Rule
+
+TRIVIAL_FILE_PATTERNS: Final[tuple[str, ...]] = (
+    "*.lock",
+    "*.md",
+    "*.rst",
+    "*.txt",
+    ".gitignore",
+    ".gitattributes",
+    "AUTHORS*",
+    "CHANGELOG*",
+    "CODEOWNERS",
+    "LICENSE*",
+    "go.sum",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+)
+"""Patterns of file names whose changes are trivial to analyse, i.e. documentation, lockfiles and repository metadata."""
+TEST_FILE_PATTERNS: Final[tuple[str, ...]] = ("test_*", "*_test.*", "*.test.*", "*_spec.*", "*.spec.*", "conftest.py")
+"""Patterns of file names of tests."""
+TEST_DIRECTORY_NAMES: Final[frozenset[str]] = frozenset({"test", "tests", "__tests__", "spec", "e2e"})
+"""Names of directories containing tests."""
+MAX_FOCUSED_FILES: Final[int] = 3
+"""The maximum number of changed files, all in one directory, of a commit whose scope is graded as focused."""
+MAX_FOCUSED_LINES: Final[int] = 200
+"""The maximum number of changed lines of a commit whose scope is graded as focused."""
+OFFLINE_REASON: Final[str] = "The rule cannot be graded by local heuristics, and offline grading is enabled."
+
+
+class CommitSignals(TypedDict):
+    """DTO for the signals of a commit computed by local analysis of its diff."""
+
+    files_changed: int
+    """The number of changed files."""
+    insertions: int
+    """The number of inserted lines."""
+    deletions: int
+    """The number of deleted lines."""
+    directories_changed: int
+    """The number of directories with changed files."""
+    code_files_changed: int
+    """The number of changed files that are neither tests nor trivial files."""
+    test_files_changed: int
+    """The number of changed test files."""
+    trivial_files_changed: int
+    """The number of changed documentation, lockfiles and repository metadata files."""
+
+
+class PreGrading(TypedDict):
+    """DTO for the local pre-grading of a commit."""
+
+    signals: CommitSignals | None
+    """The signals to add to the grading prompt, or None if heuristic grading is disabled."""
+    results: dict[str, CommitGradingResult]
+    """The results of the rules graded locally, by rule name."""
+    remaining_rules: list[Rule]
+    """The rules left to grade by the LLM."""
+
+
+def is_trivial_file(path: str) -> bool:
+    """Check whether the changes of a file are trivial to analyse.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        True if the file name matches one of the trivial file patterns, else False.
+    """
+    name = PurePosixPath(path).name
+    return any(fnmatch(name, pattern) for pattern in TRIVIAL_FILE_PATTERNS)
+
+
+def is_test_file(path: str) -> bool:
+    """Check whether a file is a test.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        True if the file name matches one of the test file patterns or it is in a test directory, else False.
+    """
+    pure_path = PurePosixPath(path)
+    return any(
+        fnmatch(pure_path.name, pattern) for pattern in TEST_FILE_PATTERNS
+    ) or not TEST_DIRECTORY_NAMES.isdisjoint(pure_path.parent.parts)
+
+
+def compute_commit_signals(diff: str) -> CommitSignals:
+    """Compute the signals of a commit from its diff.
+
+    Args:
+        diff: The diff of the commit.
+
+    Returns:
+        The commit signals.
+    """
+    files = get_file_statistics(diff)
+    test_files = sum(is_test_file(file["path"]) for file in files)
+    trivial_files = sum(is_trivial_file(file["path"]) and not is_test_file(file["path"]) for file in files)
+    return CommitSignals(
+        files_changed=len(files),
+        insertions=sum(file["insertions"] for file in files),
+        deletions=sum(file["deletions"] for file in files),
+        directories_changed=len({PurePosixPath(file["path"]).parent for file in files}),
+        code_files_changed=len(files) - test_files - trivial_files,
+        test_files_changed=test_files,
+        trivial_files_changed=trivial_files,
+    )
+
+
+def grade_by_heuristics(signals: CommitSignals, grading_rules: list[Rule]) -> dict[str, CommitGradingResult]:
+    """Grade the rules that the commit signals determine.
+
+    Notes:
+        - Only clear-cut cases are graded, e.g. the triviality of a commit that only changes documentation, the scope
+            of a small commit to a single directory, or the test quality of a commit that changes no code. Every other
+            rule is left to the LLM.
+
+    Args:
+        signals: The commit signals.
+        grading_rules: The grading rules to use.
+
+    Returns:
+        The results of the graded rules, marked as heuristic, by rule name.
+    """
+    results: dict[str, CommitGradingResult] = {}
+    rule_names = {rule.name for rule in grading_rules}
+    files_changed = signals["files_changed"]
+
+    if "triviality" in rule_names and files_changed and signals["trivial_files_changed"] == files_changed:
+        results["triviality"] = CommitGradingResult(
+            grade=2, reason="Only documentation, lockfiles or repository metadata changed.", heuristic=True
+        )
+    if (
+        "changes_scope" in rule_names
+        and 0 < files_changed <= MAX_FOCUSED_FILES
+        and signals["directories_changed"] == 1
+        and signals["insertions"] + signals["deletions"] <= MAX_FOCUSED_LINES
+    ):
+        location = "a single file" if files_changed == 1 else f"{files_changed} files in a single directory"
+        results["changes_scope"] = CommitGradingResult(
+            grade=10 if files_changed == 1 else 9, reason=f"The changes are limited to {location}.", heuristic=True
+        )
+    if "test_quality" in rule_names and not signals["code_files_changed"]:
+        results["test_quality"] = CommitGradingResult(
+            grade="NOT_EVALUATED", reason="No code that should be tested changed.", heuristic=True
+        )
+
+    return results
+
+
+def pre_grade(diff: str, *, grading_rules: list[Rule], mode: HeuristicGrading) -> PreGrading:
+    """Grade a commit locally, before grading the remaining rules by the LLM.
+
+    Args:
+        diff: The diff of the commit.
+        grading_rules: The grading rules to use.
+        mode: The heuristic grading mode. ``signals`` only adds the signals to the prompt, ``prefill`` also grades the
+            rules the signals determine, and ``offline`` grades every other rule as ``NOT_EVALUATED``.
+
+    Returns:
+        The signals for the prompt, the local results and the rules left to grade by the LLM.
+    """
+    if mode == "off":
+        return PreGrading(signals=None, results={}, remaining_rules=grading_rules)
+
+    signals = compute_commit_signals(diff)
+    results = grade_by_heuristics(signals, grading_rules) if mode != "signals" else {}
+    if mode == "offline":
+        for rule in grading_rules:
+            results.setdefault(
+                rule.name, CommitGradingResult(grade="NOT_EVALUATED", reason=OFFLINE_REASON, heuristic=True)
+            )
+
+    return PreGrading(
+        signals=signals,
+        results=results,
+        remaining_rules=[rule for rule in grading_rules if rule.name not in results],
+    )
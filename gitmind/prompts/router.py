@@ -0,0 +1,137 @@
+"""Routing of commits to model tiers.
+
+Simple commits, e.g. typo fixes and version bumps, are analysed by a cheap triage model and complex ones by the strong
+provider model.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final, Literal, TypedDict
+
+from gitmind.exceptions import LLMClientError
+from gitmind.prompts.classify_commit import ClassifyCommitHandler, CommitComplexity
+from gitmind.prompts.heuristics import is_trivial_file
+from gitmind.utils.diff import get_file_statistics
+from gitmind.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from gitmind.caching import CacheBase
+    from gitmind.llm.base import LLMClient
+    from gitmind.utils.commit import CommitMetadata
+
+logger = get_logger(__name__)
+
+ModelTier = Literal["triage", "strong"]
+RoutingSource = Literal["heuristics", "classifier", "default"]
+
+MAX_SIMPLE_FILES: Final[int] = 3
+"""The maximum number of changed files of a commit that is simple by its size."""
+COMPLEX_SIZE_FACTOR: Final[int] = 4
+"""Commits changing more than this factor times the simple lines or files are complex without classification."""
+COMPLEXITY_TIERS: Final[dict[CommitComplexity, ModelTier]] = {"simple": "triage", "complex": "strong"}
+"""The model tier of each commit complexity."""
+
+
+class RoutingDecision(TypedDict):
+    """DTO for the routing decision of a commit."""
+
+    tier: ModelTier
+    """The model tier to analyse the commit with."""
+    reason: str
+    """The reason for the decision."""
+    source: RoutingSource
+    """What made the decision: the local heuristics, the triage model, or the default for unclassified commits."""
+
+
+def classify_by_heuristics(diff: str, *, max_simple_lines: int) -> tuple[CommitComplexity, str] | None:
+    """Classify the complexity of a commit by the per file statistics of its diff.
+
+    Args:
+        diff: The diff of the commit.
+        max_simple_lines: The maximum number of changed lines of a simple commit.
+
+    Returns:
+        A tuple of the complexity and the reason, or None if the heuristics are inconclusive.
+    """
+    files = get_file_statistics(diff)
+    changed_lines = sum(file["insertions"] + file["deletions"] for file in files)
+
+    if files and all(is_trivial_file(file["path"]) for file in files):
+        return "simple", "only documentation, lockfiles or repository metadata changed"
+    if changed_lines <= max_simple_lines and len(files) <= MAX_SIMPLE_FILES:
+        return "simple", f"{changed_lines} lines changed in {len(files)} files"
+    if changed_lines > max_simple_lines * COMPLEX_SIZE_FACTOR or len(files) > MAX_SIMPLE_FILES * COMPLEX_SIZE_FACTOR:
+        return "complex", f"{changed_lines} lines changed in {len(files)} files"
+    return None
+
+
+class ModelRouter:
+    """Router of commits to model tiers.
+
+    Notes:
+        - Commits are classified by local heuristics first. The triage model is only asked to classify the commits the
+            heuristics are inconclusive about, and only if ``classify`` is set. Other inconclusive commits, and commits
+            the triage model fails to classify, are routed to the strong model.
+
+    Args:
+        strong_client: The LLM client of the strong model.
+        triage_client: The LLM client of the cheap triage model.
+        max_simple_lines: The maximum number of changed lines of a commit that is simple by its size.
+        classify: Whether to ask the triage model to classify inconclusive commits.
+        cache: An optional cache for classification results.
+    """
+
+    __slots__ = ("_cache", "_classify", "_max_simple_lines", "_strong_client", "_triage_client")
+
+    def __init__(
+        self,
+        *,
+        strong_client: LLMClient,
+        triage_client: LLMClient,
+        max_simple_lines: int,
+        classify: bool = False,
+        cache: CacheBase | None = None,
+    ) -> None:
+        self._strong_client = strong_client
+        self._triage_client = triage_client
+        self._max_simple_lines = max_simple_lines
+        self._classify = classify
+        self._cache = cache
+
+    def get_client(self, tier: ModelTier) -> LLMClient:
+        """Get the LLM client of a model tier.
+
+        Args:
+            tier: The model tier.
+
+        Returns:
+            The LLM client.
+        """
+        return self._triage_client if tier == "triage" else self._strong_client
+
+    async def route(self, *, metadata: CommitMetadata, diff: str) -> RoutingDecision:
+        """Decide which model tier analyses a commit.
+
+        Args:
+            metadata: The metadata of the commit.
+            diff: The diff of the commit.
+
+        Returns:
+            The routing decision.
+        """
+        if (classification := classify_by_heuristics(diff, max_simple_lines=self._max_simple_lines)) is not None:
+            complexity, reason = classification
+            return RoutingDecision(tier=COMPLEXITY_TIERS[complexity], reason=reason, source="heuristics")
+
+        if self._classify:
+            handler = ClassifyCommitHandler(client=self._triage_client, cache=self._cache, model_tier="triage")
+            try:
+                result = await handler(metadata=metadata, diff=diff)
+            except LLMClientError as e:
+                logger.debug("Failed to classify commit %s, routing it to the strong model: %s", metadata["hex"], e)
+            else:
+                return RoutingDecision(
+                    tier=COMPLEXITY_TIERS[result["complexity"]], reason=result["reason"], source="classifier"
+                )
+
+        return RoutingDecision(tier="strong", reason="the commit could not be classified", source="default")
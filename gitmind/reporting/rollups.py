@@ -0,0 +1,439 @@
+"""Incremental rollups of commit grades, so that repository reports do not re-read every grading result.
+
+The rollups count the grades of each rule per dimension key, e.g. per author, ISO week or top-level path, in a SQLite
+database next to the cache. Counts by grade are enough to derive means, standard deviations and histograms, and are
+updated with a single upsert per grade. The grades recorded for each commit are kept too, so that grading a commit
+again replaces its contribution instead of counting it twice.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from math import sqrt
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import TYPE_CHECKING, Final, Literal, TypedDict, get_args
+
+from typing_extensions import Self
+
+from gitmind.caching.file import DEFAULT_FOLDER_NAME
+from gitmind.utils.diff import get_file_statistics
+from gitmind.utils.serialization import deserialize, serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator, Mapping
+    from types import TracebackType
+
+    from gitmind.prompts.grade_commit import CommitGradingResult
+    from gitmind.utils.commit import CommitMetadata
+
+Dimension = Literal["author", "week", "path"]
+
+ROLLUPS_FILE_NAME: Final[str] = "rollups.sqlite3"
+"""The name of the rollups database in the cache directory."""
+DIMENSIONS: Final[tuple[Dimension, ...]] = get_args(Dimension)
+"""The dimensions grades are rolled up by."""
+TOTAL_DIMENSION: Final[str] = "total"
+"""The dimension of the repository wide rollups, with a single key."""
+TOTAL_KEY: Final[str] = "*"
+"""The key of the repository wide rollups."""
+ROOT_PATH: Final[str] = "."
+"""The path key of files in the root of the repository."""
+OUTLIER_Z_SCORE: Final[float] = 2.0
+"""The minimum absolute z-score of the mean grade of a dimension key to be reported as an outlier."""
+MIN_OUTLIER_COUNT: Final[int] = 5
+"""The minimum number of grades of a dimension key to be reported as an outlier, since few grades say little."""
+MAX_QUERY_VARIABLES: Final[int] = 900
+"""The maximum number of commit hashes per query, below the default SQLite limit of 999 variables."""
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS commits (
+    commit_hash TEXT PRIMARY KEY,
+    contribution TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    rule TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    grade INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (rule, dimension, key, grade)
+);
+"""
+_UPSERT_ROLLUP: Final[str] = """
+INSERT INTO rollups (rule, dimension, key, grade, count) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (rule, dimension, key, grade) DO UPDATE SET count = count + excluded.count
+"""
+
+
+class CommitContribution(TypedDict):
+    """DTO for what a graded commit contributes to the rollups."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    keys: dict[str, list[str]]
+    """The keys of the commit by dimension, e.g. the top-level paths it changes."""
+    grades: dict[str, int]
+    """The evaluated grades by rule name."""
+
+
+class GradeStatistics(TypedDict):
+    """DTO for the statistics of the grades of a rule."""
+
+    count: int
+    """The number of grades."""
+    mean: float
+    """The mean grade."""
+    std: float
+    """The population standard deviation of the grades."""
+    histogram: dict[int, int]
+    """The number of commits by grade."""
+
+
+class Trend(TypedDict):
+    """DTO for the trend of the mean grade of a rule over time."""
+
+    slope: float
+    """The change of the mean grade per week, by least squares over the weekly means."""
+    weeks: dict[str, float]
+    """The mean grade by ISO week."""
+
+
+class Outlier(TypedDict):
+    """DTO for a dimension key whose mean grade of a rule deviates from the repository mean."""
+
+    rule: str
+    """The name of the rule."""
+    dimension: str
+    """The dimension, e.g. ``author``."""
+    key: str
+    """The dimension key, e.g. the email of an author."""
+    count: int
+    """The number of grades of the key."""
+    mean: float
+    """The mean grade of the key."""
+    z_score: float
+    """The deviation of the mean from the repository mean, in standard errors."""
+
+
+class RollupReport(TypedDict):
+    """DTO for a repository report derived from the rollups."""
+
+    commits: int
+    """The number of graded commits."""
+    rules: dict[str, GradeStatistics]
+    """The repository wide statistics by rule name."""
+    dimensions: dict[str, dict[str, dict[str, GradeStatistics]]]
+    """The statistics by dimension, dimension key and rule name."""
+    trends: dict[str, Trend]
+    """The trends by rule name."""
+    outliers: list[Outlier]
+    """The outliers, most deviating first."""
+
+
+def get_rollups_path(cache_dir: str | None) -> Path:
+    """Get the path of the rollups database.
+
+    Args:
+        cache_dir: The cache directory. Defaults to '.gitmind' in the working directory.
+
+    Returns:
+        The path of the database.
+    """
+    return Path(cache_dir or DEFAULT_FOLDER_NAME) / ROLLUPS_FILE_NAME
+
+
+def get_week(timestamp: int) -> str:
+    """Get the ISO week of a timestamp.
+
+    Args:
+        timestamp: A unix UTC timestamp.
+
+    Returns:
+        The ISO week, e.g. ``2024-W05``.
+    """
+    year, week, _ = datetime.fromtimestamp(timestamp, tz=timezone.utc).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def create_contribution(
+    metadata: CommitMetadata, diff: str, results: Mapping[str, CommitGradingResult]
+) -> CommitContribution:
+    """Create the contribution of a graded commit to the rollups.
+
+    Args:
+        metadata: The metadata of the commit.
+        diff: The diff of the commit.
+        results: The grading results by rule name. Rules that are not evaluated are left out.
+
+    Returns:
+        The commit contribution.
+    """
+    paths = sorted(
+        {
+            parts[0] if len(parts := PurePosixPath(file["path"]).parts) > 1 else ROOT_PATH
+            for file in get_file_statistics(diff)
+        }
+    )
+    return CommitContribution(
+        commit_hash=metadata["hex"],
+        keys={
+            "author": [metadata["author_email"] or metadata["author_name"] or "unknown"],
+            "week": [get_week(metadata["timestamp"])],
+            "path": paths,
+        },
+        grades={rule: result["grade"] for rule, result in results.items() if isinstance(result["grade"], int)},
+    )
+
+
+def _create_statistics(histogram: Mapping[int, int]) -> GradeStatistics:
+    """Create the statistics of the grades of a rule from their histogram.
+
+    Args:
+        histogram: The number of commits by grade.
+
+    Returns:
+        The statistics.
+    """
+    count = sum(histogram.values())
+    mean = sum(grade * grade_count for grade, grade_count in histogram.items()) / count
+    variance = sum(grade_count * (grade - mean) ** 2 for grade, grade_count in histogram.items()) / count
+    return GradeStatistics(count=count, mean=mean, std=sqrt(variance), histogram=dict(sorted(histogram.items())))
+
+
+def _create_trend(weeks: Mapping[str, GradeStatistics]) -> Trend:
+    """Create the trend of the mean grade of a rule from its weekly statistics.
+
+    Args:
+        weeks: The statistics by ISO week.
+
+    Returns:
+        The trend.
+    """
+    means = {week: statistics["mean"] for week, statistics in sorted(weeks.items())}
+    starts = [date.fromisocalendar(int(year), int(week), 1) for year, week in (key.split("-W") for key in means)]
+    offsets = [(start - starts[0]).days / 7 for start in starts]
+    mean_offset = sum(offsets) / len(offsets)
+    mean_grade = sum(means.values()) / len(means)
+    spread = sum((offset - mean_offset) ** 2 for offset in offsets)
+    slope = (
+        sum((offset - mean_offset) * (grade - mean_grade) for offset, grade in zip(offsets, means.values())) / spread
+        if spread
+        else 0.0
+    )
+    return Trend(slope=slope, weeks=means)
+
+
+class RollupStore:
+    """A SQLite store of the rollups of commit grades.
+
+    Notes:
+        - The store is synchronous. Async callers run it in a worker thread, so the connection is not bound to the
+            thread that opened it.
+        - Calls are serialised by a lock, since the server grades the commits of concurrent requests with one store.
+            Recording a commit reads its previous contribution and applies the deltas under the same lock, so a
+            commit is never counted twice.
+
+    Args:
+        path: The path of the database. It is created if it does not exist.
+    """
+
+    __slots__ = ("_connection", "_lock")
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        """Enter the store context.
+
+        Returns:
+            The store.
+        """
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Close the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _select_commits(self, column: str, commit_hashes: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Select a column of the recorded commits.
+
+        Args:
+            column: The column to select.
+            commit_hashes: The hashes of the commits to select.
+
+        Yields:
+            The hash and the column value of each recorded commit.
+        """
+        hashes = list(commit_hashes)
+        for start in range(0, len(hashes), MAX_QUERY_VARIABLES):
+            batch = hashes[start : start + MAX_QUERY_VARIABLES]
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT commit_hash, {column} FROM commits WHERE commit_hash IN ({', '.join('?' * len(batch))})",  # noqa: S608
+                    batch,
+                ).fetchall()
+            yield from rows
+
+    def get_recorded_commits(self, commit_hashes: Iterable[str]) -> set[str]:
+        """Get the commits whose grades are recorded.
+
+        Args:
+            commit_hashes: The hashes of the commits to check.
+
+        Returns:
+            The hashes of the recorded commits.
+        """
+        return {commit_hash for commit_hash, _ in self._select_commits("NULL", commit_hashes)}
+
+    def get_recorded_grades(self, commit_hashes: Iterable[str]) -> dict[str, dict[str, int]]:
+        """Get the grades recorded for commits.
+
+        Args:
+            commit_hashes: The hashes of the commits to look up.
+
+        Returns:
+            The evaluated grades by rule name of each recorded commit.
+        """
+        return {
+            commit_hash: deserialize(contribution, CommitContribution)["grades"]
+            for commit_hash, contribution in self._select_commits("contribution", commit_hashes)
+        }
+
+    def record(self, contribution: CommitContribution) -> bool:
+        """Record the grades of a commit, replacing the grades recorded for it before.
+
+        Args:
+            contribution: The commit contribution.
+
+        Returns:
+            True if the rollups changed, False if the same grades were recorded before.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT contribution FROM commits WHERE commit_hash = ?", (contribution["commit_hash"],)
+            ).fetchone()
+            previous = deserialize(row[0], CommitContribution) if row else None
+            if previous == contribution:
+                return False
+
+            with self._connection:
+                if previous is not None:
+                    self._apply(previous, -1)
+                self._apply(contribution, 1)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO commits (commit_hash, contribution) VALUES (?, ?)",
+                    (contribution["commit_hash"], serialize(contribution).decode()),
+                )
+            return True
+
+    def _apply(self, contribution: CommitContribution, sign: int) -> None:
+        """Add the grades of a commit to the rollups, or subtract them.
+
+        Args:
+            contribution: The commit contribution.
+            sign: 1 to add the grades, -1 to subtract them.
+        """
+        keys = [(TOTAL_DIMENSION, TOTAL_KEY)] + [
+            (dimension, key) for dimension, dimension_keys in contribution["keys"].items() for key in dimension_keys
+        ]
+        rows = [
+            (rule, dimension, key, grade) for rule, grade in contribution["grades"].items() for dimension, key in keys
+        ]
+        self._connection.executemany(_UPSERT_ROLLUP, [(*row, sign) for row in rows])
+        if sign < 0:
+            self._connection.executemany(
+                "DELETE FROM rollups WHERE rule = ? AND dimension = ? AND key = ? AND grade = ? AND count = 0", rows
+            )
+
+    def report(
+        self, *, dimensions: Collection[Dimension] = DIMENSIONS, rules: Collection[str] | None = None
+    ) -> RollupReport:
+        """Create a repository report from the rollups.
+
+        Args:
+            dimensions: The dimensions to report statistics and outliers by.
+            rules: The rules to report. Defaults to all recorded rules.
+
+        Returns:
+            The report.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT rule, dimension, key, grade, count FROM rollups").fetchall()
+            commits = self._connection.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+        histograms: dict[tuple[str, str, str], dict[int, int]] = defaultdict(dict)
+        for rule, dimension, key, grade, count in rows:
+            if rules is None or rule in rules:
+                histograms[dimension, key, rule][grade] = count
+
+        statistics: dict[str, dict[str, dict[str, GradeStatistics]]] = defaultdict(lambda: defaultdict(dict))
+        for (dimension, key, rule), histogram in sorted(histograms.items()):
+            statistics[dimension][key][rule] = _create_statistics(histogram)
+
+        totals = statistics.pop(TOTAL_DIMENSION, {}).get(TOTAL_KEY, {})
+        weeks: dict[str, dict[str, GradeStatistics]] = defaultdict(dict)
+        for week, week_statistics in statistics.get("week", {}).items():
+            for rule, rule_statistics in week_statistics.items():
+                weeks[rule][week] = rule_statistics
+
+        return RollupReport(
+            commits=commits,
+            rules=totals,
+            dimensions={
+                dimension: {key: dict(key_statistics) for key, key_statistics in statistics[dimension].items()}
+                for dimension in dimensions
+                if dimension in statistics
+            },
+            trends={rule: _create_trend(rule_weeks) for rule, rule_weeks in sorted(weeks.items())},
+            outliers=self._find_outliers(statistics, totals, dimensions),
+        )
+
+    @staticmethod
+    def _find_outliers(
+        statistics: Mapping[str, Mapping[str, Mapping[str, GradeStatistics]]],
+        totals: Mapping[str, GradeStatistics],
+        dimensions: Collection[str],
+    ) -> list[Outlier]:
+        """Find the dimension keys whose mean grade of a rule deviates from the repository mean.
+
+        Args:
+            statistics: The statistics by dimension, dimension key and rule name.
+            totals: The repository wide statistics by rule name.
+            dimensions: The dimensions to search.
+
+        Returns:
+            The outliers, most deviating first.
+        """
+        outliers: list[Outlier] = []
+        for dimension in dimensions:
+            for key, key_statistics in statistics.get(dimension, {}).items():
+                for rule, rule_statistics in key_statistics.items():
+                    total = totals.get(rule)
+                    if total is None or not total["std"] or rule_statistics["count"] < MIN_OUTLIER_COUNT:
+                        continue
+                    standard_error = total["std"] / sqrt(rule_statistics["count"])
+                    z_score = (rule_statistics["mean"] - total["mean"]) / standard_error
+                    if abs(z_score) >= OUTLIER_Z_SCORE:
+                        outliers.append(
+                            Outlier(
+                                rule=rule,
+                                dimension=dimension,
+                                key=key,
+                                count=rule_statistics["count"],
+                                mean=rule_statistics["mean"],
+                                z_score=z_score,
+                            )
+                        )
+        return sorted(outliers, key=lambda outlier: -abs(outlier["z_score"]))
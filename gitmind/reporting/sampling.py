@@ -0,0 +1,198 @@
+"""Stratified sampling of commits, so that grades of a population of commits are estimated from a fraction of them.
+
+Commits are stratified by time, in periods with the same number of commits, and by size, in buckets of changed files.
+A sample is allocated to the strata in proportion to their size, and the mean grade of the population is estimated by
+weighting the mean of each stratum by its share of the population, with a confidence interval from the variance of
+the stratified estimator.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from math import floor, sqrt
+from random import Random
+from statistics import NormalDist, mean, variance
+from typing import TYPE_CHECKING, Final, TypedDict
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+Stratum = tuple[int, int]
+
+DEFAULT_SAMPLE_RATE: Final[float] = 0.1
+"""The default share of the commits of a population to sample."""
+DEFAULT_MIN_SAMPLE_SIZE: Final[int] = 5
+"""The default minimum number of commits to sample from a population, so that small populations are not estimated
+from one or two grades. Populations below it are graded completely."""
+DEFAULT_TIME_STRATA: Final[int] = 4
+"""The default number of time periods commits are stratified by."""
+DEFAULT_CONFIDENCE: Final[float] = 0.95
+"""The default confidence level of the confidence intervals."""
+SIZE_BOUNDARIES: Final[tuple[int, ...]] = (3, 10)
+"""The lower bounds of the size strata in changed files, after the first one: 1-2, 3-9 and 10 or more files."""
+
+
+class SampleCommit(TypedDict):
+    """DTO for a commit of a population to sample."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    timestamp: int
+    """The unix UTC timestamp of the commit."""
+    changed_files: int
+    """The number of files the commit changes."""
+
+
+class MeanEstimate(TypedDict):
+    """DTO for an estimate of the mean grade of a population of commits."""
+
+    mean: float
+    """The estimated mean grade."""
+    lower: float
+    """The lower bound of the confidence interval."""
+    upper: float
+    """The upper bound of the confidence interval."""
+    count: int
+    """The number of grades the estimate is based on."""
+
+
+def get_sample_size(
+    population: int, *, sample_rate: float = DEFAULT_SAMPLE_RATE, min_sample_size: int = DEFAULT_MIN_SAMPLE_SIZE
+) -> int:
+    """Get the number of commits to sample from a population.
+
+    Args:
+        population: The number of commits of the population.
+        sample_rate: The share of the commits to sample.
+        min_sample_size: The minimum number of commits to sample.
+
+    Returns:
+        The sample size, at most the population size.
+    """
+    return min(population, max(min_sample_size, round(population * sample_rate)))
+
+
+def stratify(
+    commits: Sequence[SampleCommit], *, time_strata: int = DEFAULT_TIME_STRATA
+) -> dict[Stratum, list[SampleCommit]]:
+    """Stratify commits by time and size.
+
+    Args:
+        commits: The commits.
+        time_strata: The number of time periods, each with the same number of commits.
+
+    Returns:
+        The commits by stratum, a tuple of the time period and the size bucket.
+    """
+    strata: dict[Stratum, list[SampleCommit]] = {}
+    chronological = sorted(commits, key=lambda commit: (commit["timestamp"], commit["commit_hash"]))
+    for index, commit in enumerate(chronological):
+        stratum = (index * time_strata // len(chronological), bisect_right(SIZE_BOUNDARIES, commit["changed_files"]))
+        strata.setdefault(stratum, []).append(commit)
+    return strata
+
+
+def allocate_sample(populations: Mapping[Stratum, int], sample_size: int) -> dict[Stratum, int]:
+    """Allocate a sample to strata in proportion to their populations.
+
+    Notes:
+        - The fractional allocations are rounded by largest remainder, preferring strata that are not sampled at all,
+            so that as many strata as the sample size allows are represented.
+
+    Args:
+        populations: The number of commits by stratum.
+        sample_size: The sample size.
+
+    Returns:
+        The number of commits to sample by stratum.
+    """
+    total = sum(populations.values())
+    quotas = {stratum: sample_size * population / total for stratum, population in populations.items()}
+    allocation = {stratum: min(floor(quota), populations[stratum]) for stratum, quota in quotas.items()}
+    remaining = min(sample_size, total) - sum(allocation.values())
+    order = sorted(populations, key=lambda stratum: (allocation[stratum] > 0, allocation[stratum] - quotas[stratum]))
+    while remaining > 0:
+        for stratum in order:
+            if remaining and allocation[stratum] < populations[stratum]:
+                allocation[stratum] += 1
+                remaining -= 1
+    return allocation
+
+
+def select_sample(
+    strata: Mapping[Stratum, Sequence[SampleCommit]],
+    sample_size: int,
+    *,
+    graded: Collection[str] = (),
+    seed: int = 0,
+) -> dict[Stratum, list[str]]:
+    """Select a stratified sample of commits.
+
+    Notes:
+        - Commits that are graded already cost nothing, so all of them are part of the sample, and they count towards
+            the allocation of their stratum before any other commit is drawn.
+        - The other commits are drawn at random, seeded so that the same population yields the same sample.
+
+    Args:
+        strata: The commits by stratum.
+        sample_size: The sample size.
+        graded: The hashes of the commits that are graded already.
+        seed: The seed of the random draws.
+
+    Returns:
+        The hashes of the sampled commits by stratum.
+    """
+    rng = Random(seed)  # noqa: S311
+    allocation = allocate_sample({stratum: len(commits) for stratum, commits in strata.items()}, sample_size)
+    sample: dict[Stratum, list[str]] = {}
+    for stratum, commits in sorted(strata.items()):
+        hashes = [commit["commit_hash"] for commit in commits]
+        selected = [commit_hash for commit_hash in hashes if commit_hash in graded]
+        candidates = [commit_hash for commit_hash in hashes if commit_hash not in graded]
+        selected += rng.sample(candidates, max(0, min(len(candidates), allocation[stratum] - len(selected))))
+        if selected:
+            sample[stratum] = selected
+    return sample
+
+
+def estimate_mean(
+    grades: Mapping[Stratum, Sequence[int]],
+    populations: Mapping[Stratum, int],
+    *,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> MeanEstimate | None:
+    """Estimate the mean grade of a population from the grades of a stratified sample.
+
+    Notes:
+        - The variance of each stratum is corrected for the share of the stratum that is sampled, so that a fully
+            graded population has no uncertainty. Strata with a single grade use the variance of the whole sample.
+        - Strata without grades are left out, and the weights of the others are scaled up to cover the population.
+        - The confidence interval uses the normal approximation of the estimator.
+
+    Args:
+        grades: The grades of the sampled commits by stratum.
+        populations: The number of commits by stratum.
+        confidence: The confidence level of the interval.
+
+    Returns:
+        The estimate, or None if there are no grades.
+    """
+    sampled = {stratum: stratum_grades for stratum, stratum_grades in grades.items() if stratum_grades}
+    if not sampled:
+        return None
+
+    all_grades = [grade for stratum_grades in sampled.values() for grade in stratum_grades]
+    pooled_variance = variance(all_grades) if len(all_grades) > 1 else 0.0
+    total = sum(populations[stratum] for stratum in sampled)
+
+    estimate = 0.0
+    estimator_variance = 0.0
+    for stratum, stratum_grades in sampled.items():
+        weight = populations[stratum] / total
+        sample_variance = variance(stratum_grades) if len(stratum_grades) > 1 else pooled_variance
+        correction = max(0.0, 1 - len(stratum_grades) / populations[stratum])
+        estimate += weight * mean(stratum_grades)
+        estimator_variance += weight**2 * correction * sample_variance / len(stratum_grades)
+
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * sqrt(estimator_variance)
+    return MeanEstimate(mean=estimate, lower=estimate - margin, upper=estimate + margin, count=len(all_grades))
@@ -0,0 +1,398 @@
+"""Output sinks, writing the results of range analyses as flat rows that analytics tools read without loading them.
+
+Grading results are flattened to a row per commit and rule, and descriptions to a row per commit. Rows are streamed
+as NDJSON or CSV, or batched into row groups of a Parquet or Arrow IPC file.
+"""
+
+from __future__ import annotations
+
+import csv
+import sys
+from abc import ABC, abstractmethod
+from typing import IO, TYPE_CHECKING, Any, Final, Literal, TypedDict, cast, get_args
+
+from typing_extensions import Self
+
+from gitmind.exceptions import ConfigurationError, MissingDependencyError
+from gitmind.utils.serialization import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+    from types import TracebackType
+
+    from gitmind.cli.commands.commit import Analysis, RangeResult
+
+OutputFormat = Literal["ndjson", "csv", "parquet", "arrow"]
+ColumnType = Literal["string", "int", "bool"]
+
+OUTPUT_FORMATS: Final[tuple[OutputFormat, ...]] = get_args(OutputFormat)
+"""The supported output formats."""
+OUTPUT_FORMAT_SUFFIXES: Final[dict[str, OutputFormat]] = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+"""The output formats by file suffix."""
+COLUMNAR_FORMATS: Final[frozenset[OutputFormat]] = frozenset({"parquet", "arrow"})
+"""The formats written by pyarrow, which need an output file."""
+DEFAULT_ROW_GROUP_SIZE: Final[int] = 10_000
+"""The default number of rows of a row group of a columnar file."""
+COMMIT_COLUMNS: Final[dict[str, ColumnType]] = {
+    "commit_hash": "string",
+    "timestamp": "int",
+    "author_name": "string",
+    "author_email": "string",
+}
+"""The columns identifying the commit of a row."""
+GRADE_COLUMNS: Final[dict[str, ColumnType]] = {
+    **COMMIT_COLUMNS,
+    "rule": "string",
+    "grade": "int",
+    "reason": "string",
+    "heuristic": "bool",
+}
+"""The columns of grading rows."""
+DESCRIPTION_COLUMNS: Final[dict[str, ColumnType]] = {
+    **COMMIT_COLUMNS,
+    "summary": "string",
+    "purpose": "string",
+    "programming_languages": "string",
+    "files_described": "int",
+    "additional_notes": "string",
+}
+"""The columns of description rows."""
+ANALYSIS_COLUMNS: Final[dict[Analysis, dict[str, ColumnType]]] = {
+    "describe": DESCRIPTION_COLUMNS,
+    "grade": GRADE_COLUMNS,
+}
+"""The columns of the rows of each analysis."""
+
+
+class GradeRow(TypedDict):
+    """DTO for the grade of a rule of a commit."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    timestamp: int | None
+    """The unix UTC timestamp of when the commit was committed."""
+    author_name: str | None
+    """The name of the author of the commit."""
+    author_email: str | None
+    """The email of the author of the commit."""
+    rule: str
+    """The name of the rule."""
+    grade: int | None
+    """The grade, or None if the rule was not evaluated."""
+    reason: str
+    """The reason for the grade."""
+    heuristic: bool
+    """Whether the grade was estimated by local heuristics instead of the LLM."""
+
+
+class DescriptionRow(TypedDict):
+    """DTO for the description of a commit."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    timestamp: int | None
+    """The unix UTC timestamp of when the commit was committed."""
+    author_name: str | None
+    """The name of the author of the commit."""
+    author_email: str | None
+    """The email of the author of the commit."""
+    summary: str
+    """The summary of the commit."""
+    purpose: str
+    """The purpose of the commit."""
+    programming_languages: str
+    """The programming languages used, comma separated."""
+    files_described: int
+    """The number of files in the breakdown of the commit."""
+    additional_notes: str
+    """Additional notes about the commit."""
+
+
+def get_output_format(output: Path | None, output_format: OutputFormat | None) -> OutputFormat:
+    """Get the format of an output.
+
+    Args:
+        output: The output path, or None for stdout.
+        output_format: The requested format, if any.
+
+    Raises:
+        ConfigurationError: If a columnar format is requested without an output path.
+
+    Returns:
+        The requested format, else the format of the suffix of the output path, defaulting to NDJSON.
+    """
+    resolved = output_format or (OUTPUT_FORMAT_SUFFIXES.get(output.suffix.lower()) if output else None) or "ndjson"
+    if resolved in COLUMNAR_FORMATS and output is None:
+        raise ConfigurationError(f"The {resolved} format requires an output path")
+    return resolved
+
+
+def flatten_range_result(analysis: Analysis, range_result: RangeResult) -> list[dict[str, Any]]:
+    """Flatten the result of a commit of a range analysis into rows.
+
+    Args:
+        analysis: The analysis.
+        range_result: The result of the commit.
+
+    Returns:
+        A row per graded rule, or a single row for a description.
+    """
+    commit_hash = range_result["commit_hash"]
+    timestamp = range_result["timestamp"]
+    author_name = range_result["author_name"]
+    author_email = range_result["author_email"]
+    result = range_result["result"]
+    if analysis == "describe":
+        description_row = DescriptionRow(
+            commit_hash=commit_hash,
+            timestamp=timestamp,
+            author_name=author_name,
+            author_email=author_email,
+            summary=result["summary"],
+            purpose=result["purpose"],
+            programming_languages=", ".join(result["programming_languages_used"]),
+            files_described=len(result["breakdown"]),
+            additional_notes=result["additional_notes"],
+        )
+        return [dict(description_row)]
+
+    grade_rows = [
+        GradeRow(
+            commit_hash=commit_hash,
+            timestamp=timestamp,
+            author_name=author_name,
+            author_email=author_email,
+            rule=rule,
+            grade=grading_result["grade"] if isinstance(grading_result["grade"], int) else None,
+            reason=grading_result["reason"],
+            heuristic=grading_result.get("heuristic", False),
+        )
+        for rule, grading_result in result.items()
+    ]
+    return [dict(row) for row in grade_rows]
+
+
+class OutputSink(ABC):
+    """Base class for writers of flat rows.
+
+    Args:
+        columns: The columns of the rows, with their types.
+    """
+
+    __slots__ = ("_columns",)
+
+    def __init__(self, columns: Mapping[str, ColumnType]) -> None:
+        self._columns = columns
+
+    def __enter__(self) -> Self:
+        """Enter the sink context.
+
+        Returns:
+            The sink.
+        """
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Write the buffered rows and close the sink."""
+        self.close()
+
+    @abstractmethod
+    def write(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Write rows.
+
+        Args:
+            rows: The rows, with a value per column.
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Write the buffered rows and release the output."""
+        ...
+
+
+class NDJSONSink(OutputSink):
+    """Streams rows as JSON lines, flushed per write so that consumers read them as they come.
+
+    Args:
+        output: The binary output stream.
+        columns: The columns of the rows.
+        close_output: Whether to close the output stream when the sink is closed.
+    """
+
+    __slots__ = ("_close_output", "_output")
+
+    def __init__(self, output: IO[bytes], columns: Mapping[str, ColumnType], close_output: bool = True) -> None:
+        super().__init__(columns)
+        self._output = output
+        self._close_output = close_output
+
+    def write(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Write rows as JSON lines.
+
+        Args:
+            rows: The rows.
+        """
+        self._output.write(
+            b"".join(serialize({column: row[column] for column in self._columns}) + b"\n" for row in rows)
+        )
+        self._output.flush()
+
+    def close(self) -> None:
+        """Flush and close the output."""
+        self._output.flush()
+        if self._close_output:
+            self._output.close()
+
+
+class CSVSink(OutputSink):
+    """Streams rows as CSV with a header line. Missing values are written as empty cells.
+
+    Args:
+        output: The text output stream, opened with ``newline=""``.
+        columns: The columns of the rows.
+        close_output: Whether to close the output stream when the sink is closed.
+    """
+
+    __slots__ = ("_close_output", "_output", "_writer")
+
+    def __init__(self, output: IO[str], columns: Mapping[str, ColumnType], close_output: bool = True) -> None:
+        super().__init__(columns)
+        self._output = output
+        self._close_output = close_output
+        self._writer = csv.DictWriter(output, fieldnames=list(columns), extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Write rows as CSV lines.
+
+        Args:
+            rows: The rows.
+        """
+        self._writer.writerows(rows)
+        self._output.flush()
+
+    def close(self) -> None:
+        """Flush and close the output."""
+        self._output.flush()
+        if self._close_output:
+            self._output.close()
+
+
+class ArrowSink(OutputSink):
+    """Buffers rows and writes them in row groups to a Parquet or Arrow IPC file.
+
+    Notes:
+        - Only a row group is held in memory, so that files of any size are written in constant memory.
+        - Requires pyarrow, which is installed with the ``arrow`` extra. It is imported when a sink is created, since
+            importing it is slow.
+
+    Args:
+        path: The path of the output file.
+        columns: The columns of the rows.
+        output_format: The file format.
+        row_group_size: The number of rows of a row group.
+
+    Raises:
+        MissingDependencyError: If pyarrow is not installed.
+    """
+
+    __slots__ = ("_chunk_option", "_row_group_size", "_rows", "_schema", "_table_type", "_writer")
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Mapping[str, ColumnType],
+        output_format: Literal["parquet", "arrow"] = "parquet",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        try:
+            import pyarrow as pa
+            from pyarrow import ipc, parquet
+        except ImportError as e:
+            raise MissingDependencyError("pyarrow is not installed") from e
+
+        super().__init__(columns)
+        arrow_types = {"string": pa.string(), "int": pa.int64(), "bool": pa.bool_()}
+        self._table_type = pa.Table
+        self._schema = pa.schema([(name, arrow_types[column_type]) for name, column_type in columns.items()])
+        if output_format == "parquet":
+            self._writer: Any = parquet.ParquetWriter(str(path), self._schema)
+            self._chunk_option = "row_group_size"
+        else:
+            self._writer = ipc.new_file(str(path), self._schema)
+            self._chunk_option = "max_chunksize"
+        self._rows: list[Mapping[str, Any]] = []
+        self._row_group_size = row_group_size
+
+    def write(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Buffer rows, writing a row group whenever the buffer is full.
+
+        Args:
+            rows: The rows.
+        """
+        self._rows.extend(rows)
+        while len(self._rows) >= self._row_group_size:
+            self._write_row_group(self._rows[: self._row_group_size])
+            del self._rows[: self._row_group_size]
+
+    def close(self) -> None:
+        """Write the remaining rows and the file footer."""
+        if self._rows:
+            self._write_row_group(self._rows)
+            self._rows = []
+        self._writer.close()
+
+    def _write_row_group(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Write rows as a row group.
+
+        Args:
+            rows: The rows.
+        """
+        table = self._table_type.from_pylist(list(rows), schema=self._schema)
+        self._writer.write_table(table, **{self._chunk_option: len(rows)})
+
+
+def open_sink(
+    analysis: Analysis,
+    *,
+    output: Path | None = None,
+    output_format: OutputFormat | None = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> OutputSink:
+    """Open a sink for the rows of an analysis.
+
+    Args:
+        analysis: The analysis whose results are written.
+        output: The output path. Defaults to stdout.
+        output_format: The output format. Defaults to the format of the suffix of the output path, or NDJSON.
+        row_group_size: The number of rows of a row group of a columnar file.
+
+    Raises:
+        ConfigurationError: If a columnar format is requested without an output path.
+        MissingDependencyError: If a columnar format is requested and pyarrow is not installed.
+
+    Returns:
+        The sink. It is a context manager, that must be closed to write the buffered rows.
+    """
+    columns = ANALYSIS_COLUMNS[analysis]
+    resolved = get_output_format(output, output_format)
+    if resolved in COLUMNAR_FORMATS and output is not None:
+        return ArrowSink(output, columns, cast("Literal['parquet', 'arrow']", resolved), row_group_size)
+    if resolved == "csv":
+        if output is None:
+            return CSVSink(sys.stdout, columns, close_output=False)
+        return CSVSink(output.open("w", newline="", encoding="utf-8"), columns)
+    if output is None:
+        return NDJSONSink(sys.stdout.buffer, columns, close_output=False)
+    return NDJSONSink(output.open("wb"), columns)
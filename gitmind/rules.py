@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Final
+
 from pydantic import BaseModel
 
 
@@ -10,6 +12,8 @@ class Rule(BaseModel):
     """Conditions for the rule."""
     evaluation_guidelines: str
     """The description of the rule."""
+    metadata_dependent: bool = False
+    """Whether the rule depends on the commit metadata, e.g. the message, rather than only on the changes."""
     name: str
     """The name of the rule."""
     title: str
@@ -44,6 +48,7 @@ DEFAULT_GRADING_RULES = [
         name="message_quality",
         title="Commit Message Quality",
         evaluation_guidelines="Evaluate the quality of the commit message.",
+        metadata_dependent=True,
         conditions=[
             "The commit message should fit the changes made in the commit. It should be relevant and accurate. It should not be misleading.",
         ],
@@ -89,3 +94,10 @@ DEFAULT_GRADING_RULES = [
         ],
     ),
 ]
+
+PRE_COMMIT_GRADING_RULES: Final[list[Rule]] = [
+    rule for rule in DEFAULT_GRADING_RULES if rule.name in {"commit_atomicity", "code_quality", "changes_scope"}
+]
+"""A fast subset of the grading rules for pre-commit hooks. They only depend on the staged changes."""
+COMMIT_MSG_GRADING_RULES: Final[list[Rule]] = [rule for rule in DEFAULT_GRADING_RULES if rule.metadata_dependent]
+"""The grading rules for commit-msg hooks, which grade the message of the commit being made."""
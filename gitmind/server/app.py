@@ -0,0 +1,378 @@
+"""A long-running analysis server.
+
+The server keeps the settings, the repository, the LLM client and the cache warm between requests, and serves the
+analyses over HTTP on a Unix socket or a localhost TCP port.
+
+The Unix socket is only accessible to its owner. The TCP port is reachable by any local process and by web pages open in
+a browser, so requests to it must carry the token of the server and a localhost ``Host`` header, which rejects DNS
+rebinding. Analysis requests must have a JSON content type, so that browsers cannot send them without a CORS preflight.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import suppress
+from functools import partial
+from hmac import compare_digest
+from secrets import token_urlsafe
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, TypedDict
+
+import h11
+from anyio import (
+    TASK_STATUS_IGNORED,
+    BrokenResourceError,
+    CancelScope,
+    EndOfStream,
+    connect_unix,
+    create_task_group,
+    create_tcp_listener,
+    create_unix_listener,
+)
+from anyio import Path as AsyncPath
+from msgspec import DecodeError
+from typing_extensions import NotRequired
+
+from gitmind.cli.commands.commit import ANALYSES, iter_range_results
+from gitmind.exceptions import GitMindError, ServerError, SkippedCommitError
+from gitmind.server.client import get_settings_fingerprint, get_token_path
+from gitmind.utils.logger import get_logger
+from gitmind.utils.serialization import deserialize, serialize
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+    from anyio.abc import ByteStream, Listener, TaskStatus
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.cli.commands.commit import Analysis
+
+logger = get_logger(__name__)
+
+LOCALHOST: Final[str] = "127.0.0.1"
+ALLOWED_HOSTS: Final[frozenset[str]] = frozenset((LOCALHOST, "localhost"))
+"""The hosts accepted in the ``Host`` header of TCP requests."""
+RECEIVE_BUFFER_SIZE: Final[int] = 65536
+MAX_REQUEST_BYTES: Final[int] = 1024 * 1024
+"""The maximum size of a request body."""
+SOCKET_MODE: Final[int] = 0o600
+"""The permissions of the Unix socket. Only the owner may connect, since requests are made with their API key."""
+TOKEN_MODE: Final[int] = 0o600
+"""The permissions of the token file. Only the owner may read it, since the token authorizes TCP requests."""
+JSON_CONTENT_TYPE: Final[bytes] = b"application/json"
+NDJSON_CONTENT_TYPE: Final[bytes] = b"application/x-ndjson"
+
+
+class CommitRequest(TypedDict):
+    """DTO for the body of a commit analysis request."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    paths: NotRequired[list[str]]
+    """Paths or glob patterns to include."""
+    exclude_paths: NotRequired[list[str]]
+    """Paths or glob patterns to exclude."""
+
+
+class RangeRequest(TypedDict):
+    """DTO for the body of a range analysis request."""
+
+    revspec: str
+    """The revision range."""
+    paths: NotRequired[list[str]]
+    """Paths or glob patterns to include."""
+    exclude_paths: NotRequired[list[str]]
+    """Paths or glob patterns to exclude."""
+
+
+class ServerResponse(NamedTuple):
+    """A response of the server."""
+
+    status: int
+    """The HTTP status code."""
+    body: bytes | AsyncIterator[bytes]
+    """The body, or an iterator of body chunks for streamed responses."""
+    content_type: bytes = JSON_CONTENT_TYPE
+    """The content type of the body."""
+
+
+def _json_response(status: int, payload: Any) -> ServerResponse:
+    return ServerResponse(status=status, body=serialize(payload))
+
+
+class AnalysisServer:
+    """Server for commit analyses.
+
+    Notes:
+        - Routes: ``GET /health``, ``POST /describe`` and ``POST /grade`` with a ``CommitRequest`` body, and
+            ``POST /describe-range`` and ``POST /grade-range`` with a ``RangeRequest`` body. Range results are streamed
+            as a JSON object per line.
+        - Concurrent requests share the cache, so identical analyses are only generated once.
+        - ``POST`` requests must have a JSON content type. Listeners served with a token additionally require a
+            localhost ``Host`` header and an ``Authorization: Bearer <token>`` header on every request.
+
+    Args:
+        cli_ctx: The CLI context, holding the settings and the repository to serve.
+    """
+
+    __slots__ = ("_cli_ctx", "_settings_fingerprint")
+
+    def __init__(self, cli_ctx: CLIContext) -> None:
+        self._cli_ctx = cli_ctx
+        self._settings_fingerprint = get_settings_fingerprint(cli_ctx["settings"])
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> ServerResponse:
+        """Handle a request.
+
+        Args:
+            method: The HTTP method.
+            path: The request path.
+            body: The request body.
+
+        Returns:
+            The response.
+        """
+        route = path.split("?", 1)[0].strip("/")
+        if route == "health":
+            return _json_response(
+                200, {"status": "ok", "pid": os.getpid(), "settings_fingerprint": self._settings_fingerprint}
+            )
+
+        analysis, _, suffix = route.partition("-")
+        if analysis not in ANALYSES or suffix not in ("", "range"):
+            return _json_response(404, {"error": f"Not found: {path}"})
+        if method != "POST":
+            return _json_response(405, {"error": f"Method not allowed: {method}"})
+
+        try:
+            if suffix:
+                return self._handle_range(analysis, deserialize(body, RangeRequest))
+            return await self._handle_commit(analysis, deserialize(body, CommitRequest))
+        except DecodeError as e:
+            return _json_response(400, {"error": f"Invalid request body: {e}"})
+
+    async def _handle_commit(self, analysis: Analysis, request: CommitRequest) -> ServerResponse:
+        try:
+            result = await ANALYSES[analysis](
+                self._cli_ctx,
+                request["commit_hash"],
+                tuple(request.get("paths", ())),
+                tuple(request.get("exclude_paths", ())),
+            )
+        except SkippedCommitError as e:
+            return _json_response(200, {"skipped": str(e)})
+        except ValueError as e:
+            return _json_response(404, {"error": str(e)})
+        except GitMindError as e:
+            logger.exception("Failed to %s commit %s", analysis, request["commit_hash"])
+            return _json_response(500, {"error": str(e)})
+        return _json_response(200, {"result": result})
+
+    def _handle_range(self, analysis: Analysis, request: RangeRequest) -> ServerResponse:
+        async def stream() -> AsyncIterator[bytes]:
+            results = iter_range_results(
+                self._cli_ctx,
+                analysis,
+                request["revspec"],
+                tuple(request.get("paths", ())),
+                tuple(request.get("exclude_paths", ())),
+            )
+            try:
+                async for range_result in results:
+                    yield serialize(range_result) + b"\n"
+            except (GitMindError, ValueError, KeyError) as e:
+                # the status is already sent, so errors are reported in the stream ~keep
+                logger.exception("Failed to %s range %s", analysis, request["revspec"])
+                yield serialize({"error": str(e)}) + b"\n"
+
+        return ServerResponse(status=200, body=stream(), content_type=NDJSON_CONTENT_TYPE)
+
+    async def serve(self, listener: Listener[Any], *, token: str | None = None) -> None:
+        """Serve requests until cancelled.
+
+        Args:
+            listener: The listener to accept connections from.
+            token: The token that requests must carry. Requests are not authenticated if not given.
+        """
+        await listener.serve(partial(self._serve_connection, token=token))
+
+    @staticmethod
+    def check_request(method: str, headers: dict[bytes, bytes], token: str | None) -> ServerResponse | None:
+        """Check that a request is allowed.
+
+        Args:
+            method: The HTTP method.
+            headers: The request headers, with lowercase names.
+            token: The token that the request must carry, if any.
+
+        Returns:
+            An error response if the request is not allowed, otherwise None.
+        """
+        if token is not None:
+            host = headers.get(b"host", b"").decode(errors="replace").rsplit(":", 1)[0]
+            if host not in ALLOWED_HOSTS:
+                return _json_response(403, {"error": f"Invalid host: {host}"})
+            if not compare_digest(headers.get(b"authorization", b""), f"Bearer {token}".encode()):
+                return _json_response(401, {"error": "Missing or invalid token"})
+
+        content_type = headers.get(b"content-type", b"").split(b";", 1)[0].strip().lower()
+        if method == "POST" and content_type != JSON_CONTENT_TYPE:
+            return _json_response(415, {"error": f"Unsupported content type: {content_type.decode(errors='replace')}"})
+        return None
+
+    async def _serve_connection(self, stream: ByteStream, *, token: str | None) -> None:
+        connection = h11.Connection(h11.SERVER, max_incomplete_event_size=MAX_REQUEST_BYTES)
+        async with stream:
+            while True:
+                try:
+                    request = await self._receive_request(connection, stream)
+                except h11.RemoteProtocolError as e:
+                    with suppress(h11.LocalProtocolError, BrokenResourceError):
+                        await self._send_response(
+                            connection, stream, _json_response(e.error_status_hint, {"error": str(e)})
+                        )
+                    return
+                if request is None:
+                    return
+
+                method, target, headers, body = request
+                response = self.check_request(method, headers, token) or await self.handle_request(method, target, body)
+                try:
+                    await self._send_response(connection, stream, response)
+                except BrokenResourceError:
+                    return
+
+                if connection.our_state is not h11.DONE or connection.their_state is not h11.DONE:
+                    return
+                connection.start_next_cycle()
+
+    @staticmethod
+    async def _receive_event(connection: h11.Connection, stream: ByteStream) -> Any:
+        while (event := connection.next_event()) is h11.NEED_DATA:
+            try:
+                data = await stream.receive(RECEIVE_BUFFER_SIZE)
+            except (EndOfStream, BrokenResourceError):
+                data = b""
+            connection.receive_data(data)
+        return event
+
+    async def _receive_request(
+        self, connection: h11.Connection, stream: ByteStream
+    ) -> tuple[str, str, dict[bytes, bytes], bytes] | None:
+        event = await self._receive_event(connection, stream)
+        if isinstance(event, h11.ConnectionClosed):
+            return None
+        if not isinstance(event, h11.Request):
+            raise h11.RemoteProtocolError(f"Unexpected event {event!r}", error_status_hint=400)
+
+        body = bytearray()
+        while not isinstance(data := await self._receive_event(connection, stream), h11.EndOfMessage):
+            if isinstance(data, h11.ConnectionClosed):
+                return None
+            body += data.data
+            if len(body) > MAX_REQUEST_BYTES:
+                raise h11.RemoteProtocolError("Request body too large", error_status_hint=413)
+
+        return event.method.decode(), event.target.decode(), dict(event.headers), bytes(body)
+
+    @staticmethod
+    async def _send_response(connection: h11.Connection, stream: ByteStream, response: ServerResponse) -> None:
+        headers = [(b"content-type", response.content_type)]
+        if isinstance(response.body, bytes):
+            headers.append((b"content-length", str(len(response.body)).encode()))
+
+        await stream.send(connection.send(h11.Response(status_code=response.status, headers=headers)) or b"")
+        if isinstance(response.body, bytes):
+            await stream.send(connection.send(h11.Data(data=response.body)) or b"")
+        else:
+            async for chunk in response.body:
+                await stream.send(connection.send(h11.Data(data=chunk)) or b"")
+        await stream.send(connection.send(h11.EndOfMessage()) or b"")
+
+
+async def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove the socket of a server that is no longer running.
+
+    Args:
+        socket_path: The socket path.
+
+    Raises:
+        ServerError: If a server is listening on the socket.
+    """
+    if not await AsyncPath(socket_path).exists():
+        return
+    try:
+        stream = await connect_unix(socket_path)
+    except OSError:
+        await AsyncPath(socket_path).unlink(missing_ok=True)
+        return
+    await stream.aclose()
+    raise ServerError(f"A gitmind server is already listening on {socket_path}")
+
+
+async def _write_token(token_path: Path) -> str:
+    """Write a new random token that only the owner can read.
+
+    Args:
+        token_path: The token path.
+
+    Returns:
+        The token.
+    """
+    token = token_urlsafe(32)
+    await AsyncPath(token_path).parent.mkdir(parents=True, exist_ok=True)
+    await AsyncPath(token_path).unlink(missing_ok=True)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, TOKEN_MODE)
+    with os.fdopen(fd, "w") as token_file:
+        token_file.write(token)
+    return token
+
+
+async def run_server(
+    *,
+    cli_ctx: CLIContext,
+    socket_path: Path | None = None,
+    port: int | None = None,
+    task_status: TaskStatus[None] = TASK_STATUS_IGNORED,
+) -> None:
+    """Run the analysis server until cancelled.
+
+    Notes:
+        - When serving on a TCP port, a random token is written to the token file next to the socket, see
+            ``gitmind.server.client.get_token_path``, and TCP requests must carry it. The file is removed on shutdown.
+
+    Args:
+        cli_ctx: The CLI context, holding the settings and the repository to serve.
+        socket_path: The Unix socket to listen on.
+        port: The localhost TCP port to listen on.
+        task_status: The task status, set to started once the server is listening.
+
+    Raises:
+        ServerError: If neither a socket path nor a port is given, or a server is already listening on the socket.
+    """
+    if socket_path is None and port is None:
+        raise ServerError("A socket path or a port is required")
+
+    listeners: list[tuple[Listener[Any], str | None]] = []
+    if socket_path is not None:
+        await _remove_stale_socket(socket_path)
+        await AsyncPath(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        listeners.append((await create_unix_listener(socket_path, mode=SOCKET_MODE), None))
+
+    token_path = get_token_path(cli_ctx["settings"]) if port is not None else None
+    try:
+        if port is not None and token_path is not None:
+            token = await _write_token(token_path)
+            listeners.append((await create_tcp_listener(local_host=LOCALHOST, local_port=port), token))
+
+        server = AnalysisServer(cli_ctx)
+        async with create_task_group() as tg:
+            for listener, listener_token in listeners:
+                tg.start_soon(partial(server.serve, listener, token=listener_token))
+            task_status.started()
+    finally:
+        with CancelScope(shield=True):
+            if socket_path is not None:
+                await AsyncPath(socket_path).unlink(missing_ok=True)
+            if token_path is not None:
+                await AsyncPath(token_path).unlink(missing_ok=True)
@@ -0,0 +1,214 @@
+"""Client of the gitmind server, used by the CLI to forward commands."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from httpx import AsyncClient, AsyncHTTPTransport, HTTPError, Response, Timeout
+from msgspec import DecodeError
+from msgspec.json import decode
+
+from gitmind.caching.file import DEFAULT_FOLDER_NAME
+from gitmind.exceptions import ServerError, SkippedCommitError
+from gitmind.utils.hashing import get_sha_hash
+from gitmind.utils.serialization import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from gitmind.cli.commands.commit import Analysis, RangeResult
+    from gitmind.config import GitMindSettings
+
+DEFAULT_SOCKET_NAME: Final[str] = "gitmind.sock"
+TOKEN_SUFFIX: Final[str] = ".token"  # noqa: S105
+"""The suffix of the token file, which is stored next to the socket."""
+REQUEST_HEADERS: Final[dict[str, str]] = {"content-type": "application/json"}
+"""The headers of analysis requests. The server rejects requests without a JSON content type."""
+SERVER_BASE_URL: Final[str] = "http://gitmind"
+"""The base URL of requests over the Unix socket. The host is ignored."""
+HEALTH_CHECK_TIMEOUT: Final[float] = 0.5
+"""The timeout of the health check in seconds. A server that does not answer in time is treated as not running."""
+SERVER_TIMEOUT: Final[Timeout] = Timeout(None, connect=HEALTH_CHECK_TIMEOUT)
+"""The timeout of analysis requests. Only connecting is limited, since analyses wait for the LLM provider."""
+
+
+def get_socket_path(settings: GitMindSettings) -> Path:
+    """Get the path of the Unix socket of the gitmind server.
+
+    Args:
+        settings: The gitmind settings.
+
+    Returns:
+        The socket path.
+    """
+    if settings.server_socket:
+        return Path(settings.server_socket)
+    return Path(settings.cache_dir or DEFAULT_FOLDER_NAME) / DEFAULT_SOCKET_NAME
+
+
+def get_token_path(settings: GitMindSettings) -> Path:
+    """Get the path of the file holding the token of the TCP port of the gitmind server.
+
+    Notes:
+        - The file is only readable by its owner. Clients of the TCP port send the token as an
+            ``Authorization: Bearer <token>`` header.
+
+    Args:
+        settings: The gitmind settings.
+
+    Returns:
+        The token path.
+    """
+    return get_socket_path(settings).with_suffix(TOKEN_SUFFIX)
+
+
+def get_settings_fingerprint(settings: GitMindSettings) -> str:
+    """Get a fingerprint of the settings that affect analyses.
+
+    Notes:
+        - The CLI only forwards commands to a server with the same fingerprint, so that the results do not depend on
+            whether a server is running.
+
+    Args:
+        settings: The gitmind settings.
+
+    Returns:
+        The fingerprint.
+    """
+    values = settings.model_dump(mode="json", exclude={"hook_timeout", "mode", "server_forwarding", "server_socket"})
+    values["provider_api_key"] = settings.provider_api_key.get_secret_value()
+    return get_sha_hash(serialize(values).decode())
+
+
+@asynccontextmanager
+async def connect_to_server(settings: GitMindSettings) -> AsyncIterator[AsyncClient | None]:
+    """Connect to a running gitmind server.
+
+    Args:
+        settings: The gitmind settings.
+
+    Yields:
+        A client for the server, or None if forwarding is disabled, or no server with the same settings is running.
+    """
+    socket_path = get_socket_path(settings)
+    if not settings.server_forwarding or not socket_path.exists():
+        yield None
+        return
+
+    transport = AsyncHTTPTransport(uds=str(socket_path))
+    async with AsyncClient(transport=transport, base_url=SERVER_BASE_URL, timeout=SERVER_TIMEOUT) as client:
+        try:
+            response = await client.get("/health", timeout=HEALTH_CHECK_TIMEOUT)
+            health = decode(response.content)
+        except (HTTPError, DecodeError):
+            health = None
+
+        compatible = isinstance(health, dict) and health.get("settings_fingerprint") == get_settings_fingerprint(
+            settings
+        )
+        yield client if compatible else None
+
+
+def _get_payload(response: Response) -> Any:
+    """Get the payload of a server response.
+
+    Args:
+        response: The response.
+
+    Raises:
+        ServerError: If the response is an error response.
+
+    Returns:
+        The decoded payload.
+    """
+    try:
+        payload = decode(response.content)
+    except DecodeError as e:
+        raise ServerError("Invalid response from the gitmind server", context=response.text) from e
+
+    if response.is_error:
+        message = payload.get("error") if isinstance(payload, dict) else None
+        raise ServerError(message or f"gitmind server responded with status {response.status_code}")
+    return payload
+
+
+async def request_analysis(
+    client: AsyncClient,
+    analysis: Analysis,
+    *,
+    commit_hash: str,
+    paths: tuple[str, ...] = (),
+    exclude_paths: tuple[str, ...] = (),
+) -> Any:
+    """Request the analysis of a commit from the gitmind server.
+
+    Args:
+        client: The server client.
+        analysis: The analysis to run.
+        commit_hash: The commit hash.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Raises:
+        ServerError: If the request fails.
+        SkippedCommitError: If the commit is skipped by the configured analysis options.
+
+    Returns:
+        The analysis result.
+    """
+    body = serialize({"commit_hash": commit_hash, "paths": paths, "exclude_paths": exclude_paths})
+    try:
+        response = await client.post(f"/{analysis}", content=body, headers=REQUEST_HEADERS)
+    except HTTPError as e:
+        raise ServerError(f"Request to the gitmind server failed: {e}") from e
+
+    payload = _get_payload(response)
+    if "skipped" in payload:
+        raise SkippedCommitError(payload["skipped"])
+    return payload["result"]
+
+
+async def stream_range_analysis(
+    client: AsyncClient,
+    analysis: Analysis,
+    *,
+    revspec: str,
+    paths: tuple[str, ...] = (),
+    exclude_paths: tuple[str, ...] = (),
+) -> AsyncIterator[RangeResult]:
+    """Request the analysis of a range of commits from the gitmind server.
+
+    Args:
+        client: The server client.
+        analysis: The analysis to run.
+        revspec: The revision range.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Raises:
+        ServerError: If the request fails.
+
+    Yields:
+        The results of the commits that are not skipped, as the server streams them.
+    """
+    body = serialize({"revspec": revspec, "paths": paths, "exclude_paths": exclude_paths})
+    try:
+        async with client.stream("POST", f"/{analysis}-range", content=body, headers=REQUEST_HEADERS) as response:
+            if response.is_error:
+                await response.aread()
+                _get_payload(response)
+
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    item = decode(line)
+                except DecodeError as e:
+                    raise ServerError("Invalid response from the gitmind server", context=line) from e
+                if "error" in item:
+                    raise ServerError(item["error"])
+                yield item
+    except HTTPError as e:
+        raise ServerError(f"Request to the gitmind server failed: {e}") from e
@@ -1,8 +1,30 @@
 from __future__ import annotations
 
-from typing import TypedDict
+import os
+from fnmatch import fnmatchcase
+from glob import has_magic
+from time import time
+from typing import TYPE_CHECKING, Final, Literal, TypedDict, cast
 
-from pygit2 import Commit, Repository
+from pygit2 import Commit, GitError, Index, Repository
+from pygit2.enums import RevSpecFlag, SortMode
+
+from gitmind.exceptions import SkippedCommitError
+from gitmind.utils.diff import render_patches
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Generator, Mapping
+    from datetime import datetime
+
+    from pygit2 import Diff, Oid, Patch, Tree
+
+MergeStrategy = Literal["skip", "first-parent", "combined", "merged-commits"]
+
+SINCE_SLOP: Final[int] = 5
+"""The number of consecutive commits older than ``since`` after which a walk stops, as in git.
+
+Commit times are not monotonic, e.g. because of clock skew, so a newer commit may follow an older one in the walk.
+"""
 
 
 class CommitMetadata(TypedDict):
@@ -17,7 +39,7 @@ class CommitMetadata(TypedDict):
     commiter_name: str | None
     """The name of the committer of the commit."""
     hex: str
-    """The hash of the commit."""
+    """The hash of the commit, or of the staged tree for changes that are not committed yet."""
     message: str
     """The message of the commit."""
     parent_hex: str | None
@@ -59,12 +81,226 @@ def get_commit(*, repo: Repository, commit_hex: str) -> Commit:
         raise ValueError(f"Commit with SHA hex {commit_hex} not found.") from e
 
 
-def extract_commit_data(*, repo: Repository, commit_hex: str) -> tuple[CommitStatistics, CommitMetadata, str]:
+def get_merged_commits(*, repo: Repository, commit: Commit) -> list[Commit]:
+    """Get the commits a merge commit brings into its first parent.
+
+    Args:
+        repo: The repository object.
+        commit: The merge commit.
+
+    Returns:
+        The merged commits, newest first. An empty list if the commit is not a merge commit.
+    """
+    if len(commit.parents) < 2:  # noqa: PLR2004
+        return []
+
+    walker = repo.walk(commit.parents[1].id, SortMode.TOPOLOGICAL | SortMode.TIME)
+    for parent in commit.parents[2:]:
+        walker.push(parent.id)
+    walker.hide(commit.parents[0].id)
+
+    return list(walker)
+
+
+def _diff_against(*, commit: Commit, parent: Commit | None, context_lines: int = 0) -> Diff:
+    """Diff a commit against one of its parents, or against the empty tree for root commits.
+
+    Args:
+        commit: The commit to diff.
+        parent: The parent to diff against.
+        context_lines: The number of unchanged lines to include around each change.
+
+    Returns:
+        The diff object.
+    """
+    if parent is None:
+        return commit.tree.diff_to_tree(context_lines=context_lines, interhunk_lines=0, swap=True)
+    return parent.tree.diff_to_tree(commit.tree, context_lines=context_lines, interhunk_lines=0)
+
+
+def _matches_path(path: str, pattern: str) -> bool:
+    """Check whether a path matches a single pathspec pattern.
+
+    Args:
+        path: The path, relative to the repository root.
+        pattern: A file or directory path, or a glob pattern.
+
+    Returns:
+        True if the path is the pattern, is nested under it, or matches it as a glob.
+    """
+    pattern = pattern.strip("/")
+    return path == pattern or path.startswith(f"{pattern}/") or fnmatchcase(path, pattern)
+
+
+def matches_pathspec(
+    path: str, paths: Collection[str] | None = None, exclude_paths: Collection[str] | None = None
+) -> bool:
+    """Check whether a path is selected by a set of include and exclude pathspecs.
+
+    Args:
+        path: The path, relative to the repository root.
+        paths: Paths or glob patterns to include. All paths are included if empty.
+        exclude_paths: Paths or glob patterns to exclude. Exclusions take precedence over inclusions.
+
+    Returns:
+        True if the path is selected, else False.
+    """
+    if paths and not any(_matches_path(path, pattern) for pattern in paths):
+        return False
+    return not (exclude_paths and any(_matches_path(path, pattern) for pattern in exclude_paths))
+
+
+def _get_patches(
+    diff: Diff, paths: Collection[str] | None = None, exclude_paths: Collection[str] | None = None
+) -> list[Patch]:
+    """Get the patches of a diff for the selected paths, skipping deltas that produce no patch.
+
+    Notes:
+        - Deltas are filtered before their patches are generated, so out of scope files are never rendered.
+
+    Args:
+        diff: The diff object.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        The list of patches.
+    """
+    if not paths and not exclude_paths:
+        return [patch for patch in diff if patch is not None]
+
+    patches: list[Patch] = []
+    for index, delta in enumerate(diff.deltas):
+        if (
+            matches_pathspec(delta.new_file.path, paths, exclude_paths)
+            or matches_pathspec(delta.old_file.path, paths, exclude_paths)
+        ) and (patch := diff[index]) is not None:
+            patches.append(patch)
+    return patches
+
+
+def _get_combined_patches(
+    *,
+    commit: Commit,
+    paths: Collection[str] | None = None,
+    exclude_paths: Collection[str] | None = None,
+    context_lines: int = 0,
+) -> list[Patch]:
+    """Get the patches of a merge commit that differ from every one of its parents.
+
+    Notes:
+        - Files that match one of the parents were merged cleanly and carry no information about the merge itself.
+            What remains are the conflict resolutions and the changes made while merging.
+
+    Args:
+        commit: The merge commit.
+        paths: Paths or glob patterns to include.
+        exclude_paths: Paths or glob patterns to exclude.
+        context_lines: The number of unchanged lines to include around each change.
+
+    Returns:
+        The first-parent patches of the files that differ from all parents.
+    """
+    first_parent_patches = _get_patches(
+        _diff_against(commit=commit, parent=commit.parents[0], context_lines=context_lines), paths, exclude_paths
+    )
+    changed_paths = {patch.delta.new_file.path for patch in first_parent_patches}
+    for parent in commit.parents[1:]:
+        changed_paths &= {delta.new_file.path for delta in parent.tree.diff_to_tree(commit.tree).deltas}
+
+    return [patch for patch in first_parent_patches if patch.delta.new_file.path in changed_paths]
+
+
+def _render_merged_commits(merged_commits: list[Commit], summaries: Mapping[str, str] | None = None) -> str:
+    """Render the merged commits of a merge commit as a summary.
+
+    Args:
+        merged_commits: The merged commits.
+        summaries: The summaries of the analyses of merged commits by hash, e.g. their cached descriptions.
+
+    Returns:
+        A line per merged commit with its short hash and message subject, followed by the summary of its analysis if
+        there is one.
+    """
+    lines = []
+    for merged_commit in merged_commits:
+        subject = next(iter(merged_commit.message.strip().splitlines()), "")
+        lines.append(f"- {str(merged_commit.id)[:7]} {subject}")
+        if summaries and (summary := summaries.get(str(merged_commit.id))):
+            lines.append(f"  {summary}")
+
+    return "\n".join(lines)
+
+
+def _render_patches_with_statistics(
+    patches: list[Patch], *, context_lines: int, context_token_budget: int | None, minify: bool
+) -> tuple[CommitStatistics, str]:
+    """Count the changes of a list of patches and render them as a diff.
+
+    Args:
+        patches: The patches.
+        context_lines: The number of unchanged lines to include around each change.
+        context_token_budget: An optional token budget for the diff, enabling smart context.
+        minify: Whether to minify the diff.
+
+    Returns:
+        A tuple of the statistics and the diff.
+    """
+    statistics = CommitStatistics(insertions=0, deletions=0, files_changed=len(patches))
+    for patch in patches:
+        _, insertions, deletions = patch.line_stats
+        statistics["insertions"] += insertions
+        statistics["deletions"] += deletions
+
+    if context_token_budget is not None or minify:
+        return statistics, render_patches(
+            patches, max_context_lines=context_lines, token_budget=context_token_budget, minify=minify
+        )
+
+    return statistics, "".join(patch.text or "" for patch in patches)
+
+
+def extract_commit_data(
+    *,
+    repo: Repository,
+    commit_hex: str,
+    merge_strategy: MergeStrategy = "first-parent",
+    paths: Collection[str] | None = None,
+    exclude_paths: Collection[str] | None = None,
+    context_lines: int = 0,
+    context_token_budget: int | None = None,
+    minify: bool = False,
+    merged_summaries: Mapping[str, str] | None = None,
+) -> tuple[CommitStatistics, CommitMetadata, str]:
     """Extract information from a commit.
 
+    Notes:
+        - The merge strategy only applies to merge commits:
+            - ``skip``: raise a ``SkippedCommitError``.
+            - ``first-parent``: diff against the first parent, i.e. the full changes the merge brings in.
+            - ``combined``: only include the files the merge resolved differently from all of its parents.
+            - ``merged-commits``: summarise the merge as the commits it brings in instead of a diff, with the
+                summaries of their analyses if given in ``merged_summaries``.
+        - When ``context_token_budget`` is set, ``context_lines`` is the maximum context per change and the budget is
+            spent adaptively, see ``render_patches``.
+        - When ``minify`` is set, diff headers are compacted and whitespace-only and reorder-only hunks are collapsed
+            into summaries, see ``render_patches``.
+
     Args:
         repo: The repository object.
         commit_hex: The SHA hex of the commit to extract information from.
+        merge_strategy: The strategy to use for merge commits.
+        paths: Only include changes to these paths or glob patterns.
+        exclude_paths: Exclude changes to these paths or glob patterns.
+        context_lines: The number of unchanged lines to include around each change.
+        context_token_budget: An optional token budget for the diff, enabling smart context.
+        minify: Whether to minify the diff.
+        merged_summaries: The summaries of the analyses of the commits a merge brings in by hash, used by the
+            ``merged-commits`` strategy. Merged commits without a summary are listed by their message subject.
+
+    Raises:
+        SkippedCommitError: If the commit is a merge commit and the merge strategy is ``skip``, or if the commit does
+            not change any of the selected paths.
 
     Returns:
         A tuple containing the commit statistics, metadata, and parsed diff contents.
@@ -72,16 +308,13 @@ def extract_commit_data(*, repo: Repository, commit_hex: str) -> tuple[CommitSta
     commit = get_commit(repo=repo, commit_hex=commit_hex)
     commit_message = commit.message.strip()
     parent_commit = commit.parents[0] if commit.parents else None
+    is_merge = len(commit.parents) > 1
 
-    diff = repo.diff(
-        a=commit.tree, b=parent_commit.tree if parent_commit is not None else None, context_lines=0, interhunk_lines=0
-    )
+    if is_merge and merge_strategy == "skip":
+        raise SkippedCommitError(f"Skipping merge commit {commit.id}.", context=str(commit.id))
 
-    statistics = CommitStatistics(
-        insertions=diff.stats.insertions,
-        deletions=diff.stats.deletions,
-        files_changed=diff.stats.files_changed,
-    )
+    if (paths or exclude_paths) and not touches_paths(commit, paths, exclude_paths):
+        raise SkippedCommitError(f"Skipping commit {commit.id}, it does not change the selected paths.")
 
     metadata = CommitMetadata(
         author_email=commit.author.email,
@@ -94,4 +327,358 @@ def extract_commit_data(*, repo: Repository, commit_hex: str) -> tuple[CommitSta
         message=commit_message,
     )
 
-    return statistics, metadata, diff.patch or ""
+    if is_merge and merge_strategy == "merged-commits":
+        merged_commits = get_merged_commits(repo=repo, commit=commit)
+        statistics = CommitStatistics(insertions=0, deletions=0, files_changed=0)
+        return statistics, metadata, _render_merged_commits(merged_commits, merged_summaries)
+
+    patches = (
+        _get_combined_patches(commit=commit, paths=paths, exclude_paths=exclude_paths, context_lines=context_lines)
+        if is_merge and merge_strategy == "combined"
+        else _get_patches(
+            _diff_against(commit=commit, parent=parent_commit, context_lines=context_lines), paths, exclude_paths
+        )
+    )
+
+    statistics, diff = _render_patches_with_statistics(
+        patches, context_lines=context_lines, context_token_budget=context_token_budget, minify=minify
+    )
+    return statistics, metadata, diff
+
+
+def get_staged_tree(repo: Repository) -> Tree:
+    """Get the tree of the staged changes, i.e. the tree the next commit will have.
+
+    Notes:
+        - Git runs hooks with ``GIT_INDEX_FILE`` set when a commit is made from a temporary index, e.g. by
+            ``git commit -a``. That index is used if it is set.
+        - The tree objects are written to the object database, which git does anyway when committing. Their id
+            identifies the staged content, so it can be used as a cache key before a commit exists.
+
+    Args:
+        repo: The repository object.
+
+    Raises:
+        ValueError: If the index cannot be written as a tree, e.g. because it has unresolved conflicts.
+
+    Returns:
+        The staged tree.
+    """
+    index_path = os.environ.get("GIT_INDEX_FILE")
+    index = Index(index_path) if index_path else repo.index
+    try:
+        tree_id = index.write_tree(repo)
+    except GitError as e:
+        raise ValueError(f"The staged changes cannot be written as a tree: {e}") from e
+    return cast("Tree", repo[tree_id])
+
+
+def get_head_commit(repo: Repository) -> Commit | None:
+    """Get the commit HEAD points to.
+
+    Args:
+        repo: The repository object.
+
+    Returns:
+        The HEAD commit, or None if HEAD is unborn, i.e. there are no commits yet.
+    """
+    if repo.head_is_unborn:
+        return None
+    return repo.head.peel(Commit)
+
+
+def extract_staged_data(
+    *,
+    repo: Repository,
+    tree: Tree | None = None,
+    message: str = "",
+    paths: Collection[str] | None = None,
+    exclude_paths: Collection[str] | None = None,
+    context_lines: int = 0,
+    context_token_budget: int | None = None,
+    minify: bool = False,
+) -> tuple[CommitStatistics, CommitMetadata, str]:
+    """Extract information from the staged changes, as if they were committed.
+
+    Notes:
+        - The staged tree is diffed against HEAD, so no commit object is needed. This is what pre-commit and
+            commit-msg hooks analyse.
+        - The metadata is that of the commit git would create: the author is the configured user, the hash is the
+            hash of the staged tree and the parent is HEAD.
+
+    Args:
+        repo: The repository object.
+        tree: The staged tree, see ``get_staged_tree``. It is written from the index if not given.
+        message: The message of the commit being made, if it is known yet.
+        paths: Only include changes to these paths or glob patterns.
+        exclude_paths: Exclude changes to these paths or glob patterns.
+        context_lines: The number of unchanged lines to include around each change.
+        context_token_budget: An optional token budget for the diff, enabling smart context.
+        minify: Whether to minify the diff.
+
+    Raises:
+        SkippedCommitError: If there are no staged changes to the selected paths.
+
+    Returns:
+        A tuple containing the statistics, metadata, and parsed diff contents of the staged changes.
+    """
+    tree = tree if tree is not None else get_staged_tree(repo)
+    head = get_head_commit(repo)
+    diff = (
+        head.tree.diff_to_tree(tree, context_lines=context_lines, interhunk_lines=0)
+        if head is not None
+        else tree.diff_to_tree(context_lines=context_lines, interhunk_lines=0, swap=True)
+    )
+
+    patches = _get_patches(diff, paths, exclude_paths)
+    if not patches:
+        raise SkippedCommitError("Skipping the staged changes, there are no staged changes to the selected paths.")
+
+    try:
+        signature = repo.default_signature
+    except (GitError, KeyError):
+        signature = None
+
+    metadata = CommitMetadata(
+        author_email=signature.email if signature else None,
+        author_name=signature.name if signature else None,
+        timestamp=int(time()),
+        commiter_email=signature.email if signature else None,
+        commiter_name=signature.name if signature else None,
+        hex=str(tree.id),
+        parent_hex=str(head.id) if head is not None else None,
+        message=message.strip(),
+    )
+
+    statistics, rendered_diff = _render_patches_with_statistics(
+        patches, context_lines=context_lines, context_token_budget=context_token_budget, minify=minify
+    )
+    return statistics, metadata, rendered_diff
+
+
+class CommitRecord:
+    """A compact record of a commit, as yielded by ``iter_commits``.
+
+    Notes:
+        - The record only holds the commit's identity and metadata. The diff is computed on demand by calling
+            ``extract_data``, so walking a long history does not keep patches in memory.
+
+    Args:
+        repo: The repository the commit belongs to.
+        commit: The commit object.
+    """
+
+    __slots__ = ("_repo", "author_email", "author_name", "hex", "message", "parent_hexes", "timestamp")
+
+    author_email: str | None
+    """The email of the author of the commit."""
+    author_name: str | None
+    """The name of the author of the commit."""
+    hex: str
+    """The hash of the commit."""
+    message: str
+    """The message of the commit."""
+    parent_hexes: tuple[str, ...]
+    """The hashes of the parents of the commit."""
+    timestamp: int
+    """The unix UTC timestamp of when the commit was committed."""
+
+    def __init__(self, repo: Repository, commit: Commit) -> None:
+        self._repo = repo
+        self.author_email = commit.author.email
+        self.author_name = commit.author.name
+        self.hex = str(commit.id)
+        self.message = commit.message.strip()
+        self.parent_hexes = tuple(str(parent_id) for parent_id in commit.parent_ids)
+        self.timestamp = commit.commit_time
+
+    @property
+    def is_merge(self) -> bool:
+        """Whether the commit is a merge commit.
+
+        Returns:
+            True if the commit has more than one parent, else False.
+        """
+        return len(self.parent_hexes) > 1
+
+    def count_changed_files(self) -> int:
+        """Count the files the commit changes relative to its first parent.
+
+        Notes:
+            - The count comes from a tree diff without patches, so it is a cheap measure of the size of a commit
+                that does not read the contents of the files.
+
+        Returns:
+            The number of changed files.
+        """
+        commit = get_commit(repo=self._repo, commit_hex=self.hex)
+        return len(_diff_against(commit=commit, parent=commit.parents[0] if commit.parents else None))
+
+    def extract_data(
+        self,
+        merge_strategy: MergeStrategy = "first-parent",
+        paths: Collection[str] | None = None,
+        exclude_paths: Collection[str] | None = None,
+        context_lines: int = 0,
+        context_token_budget: int | None = None,
+        minify: bool = False,
+        merged_summaries: Mapping[str, str] | None = None,
+    ) -> tuple[CommitStatistics, CommitMetadata, str]:
+        """Compute the statistics, metadata and diff of the commit.
+
+        Args:
+            merge_strategy: The strategy to use for merge commits.
+            paths: Only include changes to these paths or glob patterns.
+            exclude_paths: Exclude changes to these paths or glob patterns.
+            context_lines: The number of unchanged lines to include around each change.
+            context_token_budget: An optional token budget for the diff, enabling smart context.
+            minify: Whether to minify the diff.
+            merged_summaries: The summaries of the analyses of the commits a merge brings in by hash, used by the
+                ``merged-commits`` strategy. Merged commits without a summary are listed by their message subject.
+
+        Returns:
+            A tuple containing the commit statistics, metadata, and parsed diff contents.
+        """
+        return extract_commit_data(
+            repo=self._repo,
+            commit_hex=self.hex,
+            merge_strategy=merge_strategy,
+            paths=paths,
+            exclude_paths=exclude_paths,
+            context_lines=context_lines,
+            context_token_budget=context_token_budget,
+            minify=minify,
+            merged_summaries=merged_summaries,
+        )
+
+
+def _get_entry_id(tree: Tree, path: str) -> Oid | None:
+    """Get the id of the object at a path in a tree.
+
+    Args:
+        tree: The tree to look in.
+        path: The path of the object.
+
+    Returns:
+        The object id, or None if the path does not exist in the tree.
+    """
+    try:
+        return tree[path].id
+    except KeyError:
+        return None
+
+
+def touches_paths(
+    commit: Commit, paths: Collection[str] | None = None, exclude_paths: Collection[str] | None = None
+) -> bool:
+    """Check whether a commit changes any selected path relative to its first parent.
+
+    Notes:
+        - Literal include paths are checked first by comparing their tree entry ids, so commits that leave them
+            untouched are rejected without diffing. A tree diff without patches is only computed for glob patterns
+            and exclusions.
+
+    Args:
+        commit: The commit to check.
+        paths: Paths or glob patterns to include, relative to the repository root.
+        exclude_paths: Paths or glob patterns to exclude.
+
+    Returns:
+        True if the commit changes at least one selected path, else False.
+    """
+    parent_tree = commit.parents[0].tree if commit.parents else None
+    if paths and not any(has_magic(path) for path in paths):
+        changed = False
+        for path in paths:
+            entry_id = _get_entry_id(commit.tree, path.strip("/"))
+            parent_entry_id = _get_entry_id(parent_tree, path.strip("/")) if parent_tree is not None else None
+            if entry_id != parent_entry_id:
+                changed = True
+                break
+        if not changed or not exclude_paths:
+            return changed
+
+    diff = parent_tree.diff_to_tree(commit.tree) if parent_tree is not None else commit.tree.diff_to_tree(swap=True)
+    return any(
+        matches_pathspec(delta.new_file.path, paths, exclude_paths)
+        or matches_pathspec(delta.old_file.path, paths, exclude_paths)
+        for delta in diff.deltas
+    )
+
+
+def iter_commits(
+    *,
+    repo: Repository,
+    revspec: str = "HEAD",
+    paths: Collection[str] | None = None,
+    exclude_paths: Collection[str] | None = None,
+    authors: Collection[str] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    first_parent: bool = False,
+) -> Generator[CommitRecord, None, None]:
+    """Lazily walk the history of a repository, newest commits first.
+
+    Notes:
+        - ``revspec`` accepts anything git does, including ranges such as ``main..feature`` and ``main...feature``.
+        - All filters are applied inside the walk before a record is created. No diffs are computed.
+        - The walk is sorted by commit time, so it stops once it reaches ``SINCE_SLOP`` consecutive commits older than
+            ``since``. Older commits are skipped, so newer commits that follow them because of clock skew are kept.
+
+    Args:
+        repo: The repository object.
+        revspec: The revision or revision range to walk.
+        paths: Only yield commits that change one of these paths or glob patterns.
+        exclude_paths: Skip commits that only change these paths or glob patterns.
+        authors: Only yield commits whose author name or email is one of these values.
+        since: Only yield commits committed at or after this time.
+        until: Only yield commits committed at or before this time.
+        first_parent: Only follow the first parent of merge commits.
+
+    Raises:
+        ValueError: If the revspec cannot be resolved.
+
+    Yields:
+        A ``CommitRecord`` for every matching commit.
+    """
+    try:
+        rev = repo.revparse(revspec)
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Revision {revspec} not found.") from e
+
+    if rev.flags & RevSpecFlag.SINGLE:
+        walker = repo.walk(rev.from_object.id, SortMode.TIME)
+    else:
+        walker = repo.walk(rev.to_object.id, SortMode.TIME)
+        if rev.flags & RevSpecFlag.MERGE_BASE:
+            walker.push(rev.from_object.id)
+            if merge_base := repo.merge_base(rev.from_object.id, rev.to_object.id):
+                walker.hide(merge_base)
+        else:
+            walker.hide(rev.from_object.id)
+
+    if first_parent:
+        walker.simplify_first_parent()
+
+    author_filter = {author.lower() for author in authors} if authors else None
+    since_timestamp = int(since.timestamp()) if since else None
+    until_timestamp = int(until.timestamp()) if until else None
+
+    older_commits = 0
+    for commit in walker:
+        if since_timestamp is not None and commit.commit_time < since_timestamp:
+            older_commits += 1
+            if older_commits >= SINCE_SLOP:
+                return
+            continue
+        older_commits = 0
+        if until_timestamp is not None and commit.commit_time > until_timestamp:
+            continue
+        if author_filter is not None and not (
+            (commit.author.name or "").lower() in author_filter or (commit.author.email or "").lower() in author_filter
+        ):
+            continue
+        if (paths or exclude_paths) and not touches_paths(commit, paths, exclude_paths):
+            continue
+
+        yield CommitRecord(repo, commit)
@@ -0,0 +1,66 @@
+"""Compression utils."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Final, Literal
+
+from gitmind.exceptions import MissingDependencyError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+Compression = Literal["none", "zlib", "zstd"]
+
+_COMPRESSION_HEADERS: Final[dict[Compression, bytes]] = {"none": b"0", "zlib": b"1", "zstd": b"2"}
+
+
+def ensure_compression_available(compression: Compression) -> None:
+    """Ensure the dependencies of a compression are installed.
+
+    Args:
+        compression: The compression.
+
+    Raises:
+        MissingDependencyError: If zstd compression is requested but zstandard is not installed.
+    """
+    if compression == "zstd" and zstandard is None:
+        raise MissingDependencyError("zstandard is not installed")
+
+
+def compress(data: bytes, compression: Compression) -> bytes:
+    """Compress data and prefix it with a header identifying the compression.
+
+    Args:
+        data: The data to compress.
+        compression: The compression to use.
+
+    Returns:
+        The header followed by the compressed data.
+    """
+    ensure_compression_available(compression)
+    if compression == "zlib":
+        data = zlib.compress(data)
+    elif compression == "zstd":
+        data = zstandard.compress(data)
+    return _COMPRESSION_HEADERS[compression] + data
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress data written by ``compress``.
+
+    Args:
+        data: The header followed by the compressed data.
+
+    Returns:
+        The decompressed data.
+    """
+    header, payload = data[:1], data[1:]
+    if header == _COMPRESSION_HEADERS["zlib"]:
+        return zlib.decompress(payload)
+    if header == _COMPRESSION_HEADERS["zstd"]:
+        ensure_compression_available("zstd")
+        return zstandard.decompress(payload)
+    return payload
@@ -0,0 +1,397 @@
+"""Diff rendering utils."""
+
+from __future__ import annotations
+
+from hashlib import sha256
+from typing import TYPE_CHECKING, Final, Literal, TypedDict
+
+from pygit2.enums import DeltaStatus
+
+if TYPE_CHECKING:
+    from pygit2 import DiffHunk, Patch
+
+CHARS_PER_TOKEN: Final[int] = 4
+"""A rough estimate of the number of characters per token, used to estimate prompt sizes without a tokenizer."""
+
+CHANGE_ORIGINS: Final[frozenset[str]] = frozenset(("+", "-"))
+CONTEXT_ORIGIN: Final[str] = " "
+LINE_ORIGINS: Final[frozenset[str]] = frozenset((" ", "+", "-"))
+
+HunkKind = Literal["whitespace", "reorder"]
+
+
+class FileStatistics(TypedDict):
+    """DTO for the changes of a file in a rendered diff."""
+
+    path: str
+    """The path of the file. The new path for renamed files."""
+    insertions: int
+    """The number of inserted lines."""
+    deletions: int
+    """The number of deleted lines."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text.
+
+    Args:
+        text: The text to estimate.
+
+    Returns:
+        The estimated number of tokens.
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def get_patch_fingerprint(diff: str) -> str | None:
+    """Get a fingerprint of a diff that is identical for commits applying the same change.
+
+    Notes:
+        - This is similar to ``git patch-id``. Only the file paths and the changed lines are hashed, with whitespace
+            removed. Hunk line numbers, context lines and index hashes are ignored, so a cherry-pick or backport of a
+            commit onto a different base has the same fingerprint as the original.
+        - Diffs rendered in the regular and in the minified format have different fingerprints.
+
+    Args:
+        diff: The rendered diff.
+
+    Returns:
+        The fingerprint, or None if the diff has no changes.
+    """
+    hasher = sha256()
+    has_changes = in_file_header = False
+    for line in diff.splitlines():
+        if in_file_header and line.startswith(("+++ ", "--- ")):
+            continue
+        if line[:1] in CHANGE_ORIGINS:
+            normalized = f"{line[0]}{_normalize_whitespace(line[1:])}"
+        elif line.startswith("@@"):
+            in_file_header = False
+            # only keep the summaries of collapsed hunks, dropping the line numbers ~keep
+            _, _, summary = line[2:].partition("@@")
+            if not summary.strip().startswith("["):
+                continue
+            normalized = summary.strip()
+        elif line.startswith(("diff --git ", "### ", "Binary files ")):
+            hasher.update(line.encode() + b"\n")
+            in_file_header = line.startswith("diff --git ")
+            # minified file headers with labels summarise changes, e.g. of binary or whitespace-only files ~keep
+            has_changes = has_changes or line.startswith("Binary files ") or line.endswith(")")
+            continue
+        else:
+            continue
+
+        has_changes = True
+        hasher.update(normalized.encode() + b"\n")
+
+    return hasher.hexdigest() if has_changes else None
+
+
+def get_file_statistics(diff: str) -> list[FileStatistics]:
+    """Get per file statistics from a rendered diff.
+
+    Notes:
+        - Both the regular and the minified diff format are supported. Changes collapsed into summaries by minifying
+            are not counted.
+
+    Args:
+        diff: The rendered diff.
+
+    Returns:
+        The statistics of each file, in the order of the diff.
+    """
+    files: list[FileStatistics] = []
+    in_file_header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            _, _, path = line.rpartition(" b/")
+            files.append(FileStatistics(path=path, insertions=0, deletions=0))
+            in_file_header = True
+        elif line.startswith("### "):
+            path, _, _ = line[4:].partition(" (")
+            files.append(FileStatistics(path=path.rpartition(" -> ")[2], insertions=0, deletions=0))
+            in_file_header = False
+        elif line.startswith("@@"):
+            in_file_header = False
+        elif files and not (in_file_header and line.startswith(("+++ ", "--- "))):
+            if line.startswith("+"):
+                files[-1]["insertions"] += 1
+            elif line.startswith("-"):
+                files[-1]["deletions"] += 1
+
+    return files
+
+
+def get_patch_header(patch: Patch) -> str:
+    """Get the file header of a patch, i.e. everything before the first hunk.
+
+    Args:
+        patch: The patch.
+
+    Returns:
+        The header lines of the patch.
+    """
+    text = patch.text or ""
+    hunk_start = text.find("\n@@")
+    return text if hunk_start == -1 else text[: hunk_start + 1]
+
+
+def _get_hunk_function_context(hunk: DiffHunk) -> str:
+    """Get the enclosing function signature git detected for a hunk, if any.
+
+    Args:
+        hunk: The hunk.
+
+    Returns:
+        The text following the hunk range in the hunk header, e.g. ``def foo():``.
+    """
+    _, _, rest = hunk.header.strip().partition("@@ ")
+    _, _, function_context = rest.partition(" @@")
+    return function_context.strip()
+
+
+def render_hunk(hunk: DiffHunk, context_lines: int) -> str:
+    """Render a hunk, keeping only the context lines within ``context_lines`` of a change.
+
+    Notes:
+        - Trimming context can split a hunk in two. Each resulting section gets its own header with correct line
+            ranges, and keeps the enclosing function signature from the original header.
+
+    Args:
+        hunk: The hunk to render.
+        context_lines: The number of context lines to keep around each change.
+
+    Returns:
+        The rendered hunk.
+    """
+    lines = hunk.lines
+    change_indices = [index for index, line in enumerate(lines) if line.origin in CHANGE_ORIGINS]
+
+    keep = [line.origin in CHANGE_ORIGINS for line in lines]
+    for change_index in change_indices:
+        for index in range(max(0, change_index - context_lines), min(len(lines), change_index + context_lines + 1)):
+            keep[index] = True
+    for index, line in enumerate(lines):
+        # "No newline at end of file" markers belong to the line before them ~keep
+        if index and line.origin not in LINE_ORIGINS:
+            keep[index] = keep[index - 1]
+
+    function_context = _get_hunk_function_context(hunk)
+    sections: list[str] = []
+    section_lines: list[str] = []
+    old_start = new_start = old_count = new_count = 0
+    old_position, new_position = hunk.old_start, hunk.new_start
+
+    def close_section() -> None:
+        if section_lines:
+            header = f"@@ -{old_start},{old_count} +{new_start},{new_count} @@"
+            sections.append(f"{header} {function_context}\n" if function_context else f"{header}\n")
+            sections.extend(section_lines)
+            section_lines.clear()
+
+    for index, line in enumerate(lines):
+        if not keep[index]:
+            close_section()
+        else:
+            if not section_lines:
+                old_start, new_start, old_count, new_count = old_position, new_position, 0, 0
+            if line.origin in LINE_ORIGINS:
+                content = line.content if line.content.endswith("\n") else f"{line.content}\n"
+                section_lines.append(f"{line.origin}{content}")
+            else:
+                section_lines.append(line.content.lstrip("\n"))
+            old_count += line.origin in (CONTEXT_ORIGIN, "-")
+            new_count += line.origin in (CONTEXT_ORIGIN, "+")
+
+        old_position += line.origin in (CONTEXT_ORIGIN, "-")
+        new_position += line.origin in (CONTEXT_ORIGIN, "+")
+
+    close_section()
+    return "".join(sections)
+
+
+def _render_compact_header(patch: Patch, whitespace_only: bool) -> str:
+    """Render a compact, single line file header for a patch.
+
+    Args:
+        patch: The patch.
+        whitespace_only: Whether all changes in the patch are whitespace changes.
+
+    Returns:
+        The header, e.g. ``### src/main.py (new file)``.
+    """
+    delta = patch.delta
+    path = delta.new_file.path
+    labels: list[str] = []
+
+    if delta.status == DeltaStatus.ADDED:
+        labels.append("new file")
+    elif delta.status == DeltaStatus.DELETED:
+        path = delta.old_file.path
+        labels.append("deleted")
+    elif delta.status in (DeltaStatus.RENAMED, DeltaStatus.COPIED):
+        path = f"{delta.old_file.path} -> {delta.new_file.path}"
+        labels.append("renamed" if delta.status == DeltaStatus.RENAMED else "copied")
+
+    if delta.is_binary:
+        labels.append("binary")
+    if whitespace_only:
+        _, insertions, deletions = patch.line_stats
+        labels.append(f"whitespace-only changes, +{insertions} -{deletions}")
+
+    return f"### {path} ({', '.join(labels)})\n" if labels else f"### {path}\n"
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Remove all whitespace from a text.
+
+    Args:
+        text: The text to normalize.
+
+    Returns:
+        The text without whitespace.
+    """
+    return "".join(text.split())
+
+
+def _get_normalized_changes(hunks: list[DiffHunk]) -> tuple[list[str], list[str]]:
+    """Get the removed and added lines of hunks, with whitespace removed and blank lines dropped.
+
+    Args:
+        hunks: The hunks.
+
+    Returns:
+        A tuple of the normalized removed and added lines.
+    """
+    removed: list[str] = []
+    added: list[str] = []
+    for hunk in hunks:
+        for line in hunk.lines:
+            if line.origin in CHANGE_ORIGINS and (normalized := _normalize_whitespace(line.content)):
+                (removed if line.origin == "-" else added).append(normalized)
+    return removed, added
+
+
+def classify_hunks(hunks: list[DiffHunk]) -> list[HunkKind | None]:
+    """Classify the hunks of a patch whose changes carry no semantic content.
+
+    Notes:
+        - Lines are compared with all whitespace removed and blank lines ignored, which matches diffing with git's
+            ignore-whitespace and ignore-blank-lines options.
+        - A moved block usually produces two hunks, one removing and one adding the lines. Hunks that do not qualify
+            on their own are therefore also checked together.
+
+    Args:
+        hunks: The hunks of a patch.
+
+    Returns:
+        For each hunk, ``whitespace`` if it only changes whitespace, ``reorder`` if it only reorders lines, else None.
+    """
+    kinds: list[HunkKind | None] = []
+    for hunk in hunks:
+        removed, added = _get_normalized_changes([hunk])
+        if removed == added:
+            kinds.append("whitespace")
+        elif sorted(removed) == sorted(added):
+            kinds.append("reorder")
+        else:
+            kinds.append(None)
+
+    unclassified = [hunk for hunk, kind in zip(hunks, kinds) if kind is None]
+    if len(unclassified) > 1:
+        removed, added = _get_normalized_changes(unclassified)
+        if sorted(removed) == sorted(added):
+            return [kind or "reorder" for kind in kinds]
+
+    return kinds
+
+
+def _render_hunk_summary(hunk: DiffHunk, kind: HunkKind) -> str:
+    """Render a one line summary in place of a hunk.
+
+    Args:
+        hunk: The hunk.
+        kind: The kind of the hunk.
+
+    Returns:
+        The hunk header followed by a description of the change.
+    """
+    description = "whitespace-only change" if kind == "whitespace" else "lines reordered"
+    changed_lines = sum(line.origin in CHANGE_ORIGINS for line in hunk.lines)
+    header = f"@@ -{hunk.old_start},{hunk.old_lines} +{hunk.new_start},{hunk.new_lines} @@"
+    return f"{header} [{description}, {changed_lines} lines]\n"
+
+
+def render_patches(
+    patches: list[Patch],
+    *,
+    max_context_lines: int,
+    token_budget: int | None = None,
+    minify: bool = False,
+) -> str:
+    """Render patches for a prompt.
+
+    Notes:
+        - When ``token_budget`` is set, the budget is spent on context lines where they are most useful. Changed lines,
+            file headers and hunk headers are always included, along with the enclosing function signature git
+            detects for each hunk. The remaining budget is spent one context line at a time, round-robin over the
+            hunks ordered from smallest to largest, so small hunks get the most context and large hunks, whose changes
+            speak for themselves, are trimmed first.
+        - When ``minify`` is set, file headers are reduced to a single line without the ``diff --git`` and ``index``
+            lines, and hunks that only change whitespace or only reorder lines are collapsed into one line summaries.
+            Files with only whitespace changes are collapsed into their header.
+        - The patches must have been generated with at least ``max_context_lines`` context lines.
+
+    Args:
+        patches: The patches to render.
+        max_context_lines: The maximum number of context lines around each change.
+        token_budget: An optional token budget for the rendered diff.
+        minify: Whether to minify the diff.
+
+    Returns:
+        The rendered diff.
+    """
+    headers: list[str] = []
+    hunks: list[tuple[int, DiffHunk]] = []
+    rendered: list[str] = []
+    adjustable: list[int] = []
+
+    for patch_index, patch in enumerate(patches):
+        kinds = classify_hunks(patch.hunks) if minify else [None] * len(patch.hunks)
+        whitespace_only = bool(kinds) and all(kind == "whitespace" for kind in kinds)
+        headers.append(_render_compact_header(patch, whitespace_only) if minify else get_patch_header(patch))
+        if whitespace_only:
+            continue
+
+        for hunk, kind in zip(patch.hunks, kinds):
+            if kind is not None:
+                rendered.append(_render_hunk_summary(hunk, kind))
+            else:
+                adjustable.append(len(hunks))
+                rendered.append(render_hunk(hunk, max_context_lines if token_budget is None else 0))
+            hunks.append((patch_index, hunk))
+
+    if token_budget is not None:
+        remaining_budget = token_budget - sum(estimate_tokens(header) for header in headers)
+        remaining_budget -= sum(estimate_tokens(text) for text in rendered)
+        context_levels = dict.fromkeys(adjustable, 0)
+
+        by_size = sorted(
+            adjustable,
+            key=lambda index: sum(line.origin in CHANGE_ORIGINS for line in hunks[index][1].lines),
+        )
+        for level in range(1, max_context_lines + 1):
+            for index in by_size:
+                if context_levels[index] != level - 1:
+                    continue
+                candidate = render_hunk(hunks[index][1], level)
+                cost = estimate_tokens(candidate) - estimate_tokens(rendered[index])
+                if cost <= remaining_budget:
+                    remaining_budget -= cost
+                    rendered[index] = candidate
+                    context_levels[index] = level
+
+    for (patch_index, _), text in zip(hunks, rendered):
+        headers[patch_index] += text
+
+    return "".join(headers)
@@ -0,0 +1,171 @@
+"""Append-only journals of long-running commands, so that an interrupted run resumes where it stopped."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Literal, TypedDict
+
+from anyio import CancelScope, open_file
+from anyio import Path as AsyncPath
+from msgspec import DecodeError, ValidationError
+from typing_extensions import NotRequired, Self
+
+from gitmind.caching.file import DEFAULT_FOLDER_NAME
+from gitmind.utils.hashing import get_sha_hash
+from gitmind.utils.logger import get_logger
+from gitmind.utils.serialization import deserialize, serialize
+from gitmind.utils.sync import run_sync
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from anyio import AsyncFile
+
+logger = get_logger(__name__)
+
+JOURNAL_FOLDER_NAME: Final[str] = "journals"
+"""The folder of journals in the cache directory."""
+DEFAULT_SYNC_INTERVAL: Final[int] = 32
+"""The number of records between fsyncs of a journal. Every record is flushed when written, so only a crash of the
+operating system loses the records written since the last fsync."""
+
+JournalStatus = Literal["completed", "skipped", "submitted"]
+
+
+class JournalRecord(TypedDict):
+    """DTO for a record of a journal."""
+
+    commit_hash: str
+    """The hash of the commit."""
+    stage: str
+    """The stage of the command the commit went through, e.g. ``grade`` or ``batch-grade``."""
+    status: JournalStatus
+    """The status of the commit after the stage."""
+    result: NotRequired[Any]
+    """The result of the stage, or a pointer to it, e.g. the ID of a submitted batch."""
+
+
+def get_journal_path(cache_dir: str | None, command: str, *arguments: Any) -> Path:
+    """Get the path of the journal of a command run.
+
+    Args:
+        cache_dir: The cache directory. Defaults to '.gitmind' in the working directory.
+        command: The name of the command.
+        *arguments: The arguments that identify the run, e.g. the repository and the revision range. Paths are
+            identified by their string form.
+
+    Returns:
+        The journal path. Runs of the same command with the same arguments share it.
+    """
+    key = get_sha_hash(
+        serialize(
+            [
+                command,
+                *(os.fspath(argument) if isinstance(argument, os.PathLike) else argument for argument in arguments),
+            ]
+        ).decode()
+    )
+    return Path(cache_dir or DEFAULT_FOLDER_NAME) / JOURNAL_FOLDER_NAME / f"{command}-{key[:16]}.jsonl"
+
+
+class Journal:
+    """An append-only journal of the commits a command run has processed.
+
+    Notes:
+        - Records are written as JSON lines, flushed when written and fsynced every ``sync_interval`` records.
+        - A truncated last line, left by a crash while writing, is ignored when the journal is resumed.
+
+    Args:
+        path: The path of the journal file.
+        resume: Whether to load and append to an existing journal, instead of starting a new one.
+        sync_interval: The number of records between fsyncs.
+    """
+
+    __slots__ = ("_file", "_path", "_resume", "_sync_interval", "_unsynced", "records")
+
+    def __init__(self, path: Path, *, resume: bool = False, sync_interval: int = DEFAULT_SYNC_INTERVAL) -> None:
+        self._file: AsyncFile[bytes] | None = None
+        self._path = AsyncPath(path)
+        self._resume = resume
+        self._sync_interval = sync_interval
+        self._unsynced = 0
+        self.records: dict[tuple[str, str], JournalRecord] = {}
+        """The latest record of each commit and stage."""
+
+    async def __aenter__(self) -> Self:
+        """Open the journal, loading its records when resuming.
+
+        Returns:
+            The open journal.
+        """
+        await self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = await self._path.read_bytes() if self._resume and await self._path.exists() else b""
+        for line in data.splitlines():
+            try:
+                record = deserialize(line, JournalRecord)
+            except (DecodeError, ValidationError):
+                logger.debug("Ignoring the invalid journal line %r of %s", line, self._path)
+                continue
+            self.records[record["commit_hash"], record["stage"]] = record
+
+        self._file = await open_file(self._path, "ab" if self._resume else "wb")
+        if data and not data.endswith(b"\n"):
+            await self._file.write(b"\n")
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Sync and close the journal, even if the run is cancelled."""
+        with CancelScope(shield=True):
+            await self.close()
+
+    def get(self, commit_hash: str, stage: str) -> JournalRecord | None:
+        """Get the latest record of a commit and stage.
+
+        Args:
+            commit_hash: The hash of the commit.
+            stage: The stage.
+
+        Returns:
+            The record, or None if the commit did not go through the stage.
+        """
+        return self.records.get((commit_hash, stage))
+
+    async def append(self, record: JournalRecord) -> None:
+        """Append a record to the journal.
+
+        Args:
+            record: The record.
+
+        Raises:
+            RuntimeError: If the journal is not open.
+        """
+        if self._file is None:
+            raise RuntimeError("The journal is not open")
+
+        await self._file.write(serialize(record) + b"\n")
+        await self._file.flush()
+        self.records[record["commit_hash"], record["stage"]] = record
+        self._unsynced += 1
+        if self._unsynced >= self._sync_interval:
+            await self.sync()
+
+    async def sync(self) -> None:
+        """Fsync the records written to the journal."""
+        if self._file is not None and self._unsynced:
+            await run_sync(os.fsync, self._file.wrapped.fileno())
+            self._unsynced = 0
+
+    async def close(self) -> None:
+        """Sync and close the journal."""
+        if self._file is not None:
+            await self.sync()
+            await self._file.aclose()
+            self._file = None
+
+    async def remove(self) -> None:
+        """Close and delete the journal, once the run it records is done."""
+        await self.close()
+        await self._path.unlink(missing_ok=True)
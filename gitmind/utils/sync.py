@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from asyncio import run as run_async
 from functools import partial, wraps
-from typing import TYPE_CHECKING, TypeVar, cast
+from typing import TYPE_CHECKING, Generic, TypeVar, cast
 
+from anyio import Event, get_cancelled_exc_class
 from anyio.to_thread import run_sync as anyio_run_sync
 from typing_extensions import ParamSpec
 
@@ -52,3 +53,65 @@ def run_as_sync(async_fn: Callable[P, Coroutine[None, None, T]]) -> Callable[P,
         return run_async(async_fn(*args, **kwargs))
 
     return wrapper
+
+
+class _Call(Generic[T]):
+    """An in-flight call of a ``SingleFlight``."""
+
+    __slots__ = ("cancelled", "done", "exception", "result")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.cancelled = False
+        self.exception: BaseException | None = None
+        self.result: T | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls for the same key into a single call.
+
+    Notes:
+        - The first caller for a key runs the function. Callers arriving while it runs wait for it and receive the same
+            result or exception.
+        - If the first caller is cancelled, one of the waiting callers runs the function instead.
+    """
+
+    __slots__ = ("_calls",)
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run a function, or wait for the in-flight call with the same key.
+
+        Args:
+            key: The key identifying the call.
+            fn: The function to run.
+
+        Raises:
+            BaseException: Any exception raised by the function.
+
+        Returns:
+            The return value of the function.
+        """
+        while (call := self._calls.get(key)) is not None:
+            await call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            if not call.cancelled:
+                return cast("T", call.result)
+
+        call = self._calls[key] = _Call()
+        try:
+            call.result = await fn()
+        except get_cancelled_exc_class():
+            call.cancelled = True
+            raise
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+from msgspec.msgpack import encode
+
+from gitmind.caching import FileSystemCache, InMemoryCache
+from gitmind.caching.bundle import BUNDLE_MAGIC, create_bundle, decode_bundle, encode_bundle, import_bundle
+from gitmind.exceptions import CacheBundleError
+from gitmind.utils.compression import compress
+
+
+@pytest.fixture
+async def source_cache() -> InMemoryCache:
+    cache = InMemoryCache()
+    await cache.set_many({f"key{index}": f'{{"grade": {index}}}' for index in range(10)})
+    return cache
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+async def test_bundle_round_trip(source_cache: InMemoryCache, tmp_path: Path, compression: str) -> None:
+    bundle = await create_bundle(cache=source_cache)
+    data = encode_bundle(bundle, compression)  # type: ignore[arg-type]
+    target_cache = FileSystemCache(cache_dir=tmp_path)
+
+    assert await import_bundle(cache=target_cache, bundle=decode_bundle(data)) == 10
+    assert await target_cache.get_many([f"key{index}" for index in range(10)]) == bundle["entries"]
+
+
+async def test_create_bundle_with_keys(source_cache: InMemoryCache) -> None:
+    bundle = await create_bundle(cache=source_cache, keys=["key1", "key2", "missing"])
+
+    assert bundle["entries"] == {"key1": '{"grade": 1}', "key2": '{"grade": 2}'}
+
+
+async def test_bundle_is_compact(source_cache: InMemoryCache) -> None:
+    await source_cache.set_many({f"large{index}": '{"reason": "The commit is fine."}' * 100 for index in range(10)})
+    bundle = await create_bundle(cache=source_cache)
+
+    assert len(encode_bundle(bundle)) < sum(len(value) for value in bundle["entries"].values()) / 10
+
+
+def test_decode_bundle_rejects_invalid_data() -> None:
+    with pytest.raises(CacheBundleError, match="not a gitmind cache bundle"):
+        decode_bundle(b"{}")
+
+    with pytest.raises(CacheBundleError, match="corrupt"):
+        decode_bundle(BUNDLE_MAGIC + b"1garbage")
+
+    with pytest.raises(CacheBundleError, match="Unsupported cache bundle version 2"):
+        decode_bundle(BUNDLE_MAGIC + compress(encode({"version": 2, "created_at": 0, "entries": {}}), "zlib"))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from msgspec.json import encode
+
+from gitmind.caching import InMemoryCache
+from gitmind.caching.entry import CACHE_SCHEMA_VERSION, CacheEntry, CacheEntryMetadata, decode_entry, invalidate_entries
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def create_entry(handler: str = "GradeCommitHandler", model: str | None = "gpt-4o", schema_version: int = 1) -> str:
+    metadata = CacheEntryMetadata(
+        handler=handler,
+        model=model,
+        prompt_hash="abc",
+        rule_hashes={},
+        gitmind_version="0.1.0",
+        schema_version=schema_version,
+        created_at=0,
+    )
+    return encode(CacheEntry(metadata=metadata, result={"grade": 1})).decode()
+
+
+def test_decode_entry() -> None:
+    entry = decode_entry(create_entry())
+
+    assert entry is not None
+    assert entry["metadata"]["model"] == "gpt-4o"
+    assert entry["result"] == {"grade": 1}
+    assert decode_entry(create_entry(schema_version=CACHE_SCHEMA_VERSION + 1)) is None
+    assert decode_entry('{"grade": 1}') is None
+    assert decode_entry("not json") is None
+
+
+async def test_invalidate_entries() -> None:
+    cache = InMemoryCache()
+    await cache.set_many(
+        {
+            "old-model": create_entry(model="gpt-3.5-turbo"),
+            "current": create_entry(),
+            "describe": create_entry(handler="DescribeCommitHandler"),
+            "legacy": '{"grade": 1}',
+        }
+    )
+    predicate: Callable[[CacheEntryMetadata | None], bool] = lambda metadata: (  # noqa: E731
+        metadata is None or metadata["model"] != "gpt-4o"
+    )
+
+    assert await invalidate_entries(cache=cache, predicate=predicate) == 2
+    assert sorted([key async for key in cache.iter_keys()]) == ["current", "describe"]
+    assert await invalidate_entries(cache=cache, predicate=lambda _: False) == 0
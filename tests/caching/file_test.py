@@ -1,9 +1,11 @@
+import os
 from collections.abc import Generator
 from pathlib import Path as SyncPath
 
 import pytest
 from anyio import Path as AsyncPath
 from anyio import create_task_group
+from pytest_mock import MockerFixture
 
 from gitmind.caching.file import DEFAULT_FOLDER_NAME, FileSystemCache, get_or_create_cache_dir
 
@@ -97,3 +99,113 @@ async def test_get_or_create_cache_dir_with_none(default_cache_dir: SyncPath) ->
 def test_is_idempotent() -> None:
     path = get_or_create_cache_dir(None)
     assert path == get_or_create_cache_dir(None)
+
+
+async def test_file_system_cache_shards_entries(file_system_cache: FileSystemCache) -> None:
+    await file_system_cache.set("test_key", "test_value")
+    (entry,) = [path async for path in file_system_cache._cache_dir.rglob("*") if await path.is_file()]
+    assert entry.name == "test_key"
+    assert len(entry.parent.name) == 2
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+async def test_file_system_cache_compression(tmp_path: SyncPath, compression: str) -> None:
+    value = '{"grade": "good"}' * 100
+    cache = FileSystemCache(cache_dir=tmp_path, compression=compression)  # type: ignore[arg-type]
+    await cache.set("test_key", value)
+
+    assert await cache.get("test_key") == value
+    assert await FileSystemCache(cache_dir=tmp_path, compression="none").get("test_key") == value
+    if compression != "none":
+        assert cache._get_path("test_key").stat().st_size < len(value) / 10
+
+
+async def test_file_system_cache_write_is_atomic(file_system_cache: FileSystemCache, mocker: MockerFixture) -> None:
+    await file_system_cache.set("test_key", "test_value")
+    mocker.patch("pathlib.Path.replace", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        await file_system_cache.set("test_key", "updated_value")
+
+    assert await file_system_cache.get("test_key") == "test_value"
+    assert [path.name for path in file_system_cache._get_path("test_key").parent.iterdir()] == ["test_key"]
+
+
+async def test_file_system_cache_evicts_least_recently_accessed(tmp_path: SyncPath) -> None:
+    cache = FileSystemCache(cache_dir=tmp_path, compression="none")
+    for index in range(3):
+        await cache.set(f"key{index}", "x" * 99)
+        os.utime(cache._get_path(f"key{index}"), ns=(index, index))
+    await cache.get("key0")
+
+    cache = FileSystemCache(cache_dir=tmp_path, max_bytes=350, compression="none")
+    await cache.set("key3", "x" * 99)
+
+    assert not await cache.exists("key1")
+    assert await cache.exists("key0")
+    assert await cache.exists("key2")
+    assert await cache.exists("key3")
+    statistics = await cache.get_statistics()
+    assert statistics["entries"] == 3
+    assert statistics["size_bytes"] == 300
+    assert statistics["evictions"] == 1
+
+
+async def test_file_system_cache_prune(file_system_cache: FileSystemCache) -> None:
+    await file_system_cache.set("key1", "value1")
+    await file_system_cache.set("key2", "value2")
+
+    assert await file_system_cache.prune(max_bytes=0) == 2
+    assert (await file_system_cache.get_statistics())["entries"] == 0
+
+    with pytest.raises(ValueError):
+        await file_system_cache.prune()
+
+
+async def test_file_system_cache_bulk_operations(file_system_cache: FileSystemCache) -> None:
+    items = {f"key{index}": f"value{index}" for index in range(50)}
+    await file_system_cache.set_many(items)
+    assert await file_system_cache.get_many([*items, "missing"]) == items
+
+    await file_system_cache.delete_many(list(items)[:25])
+    assert await file_system_cache.get_many(items) == dict(list(items.items())[25:])
+
+
+async def test_file_system_cache_set_many_evicts(tmp_path: SyncPath) -> None:
+    cache = FileSystemCache(cache_dir=tmp_path, max_bytes=500, compression="none")
+    await cache.set_many({f"key{index}": "x" * 99 for index in range(10)})
+
+    statistics = await cache.get_statistics()
+    assert statistics["size_bytes"] <= 500
+    assert statistics["evictions"] == 6
+
+
+async def test_file_system_cache_iter_keys(file_system_cache: FileSystemCache) -> None:
+    await file_system_cache.set_many({"key1": "value1", "key2": "value2"})
+    assert sorted([key async for key in file_system_cache.iter_keys()]) == ["key1", "key2"]
+
+
+async def test_file_system_cache_ignores_other_state(tmp_path: SyncPath) -> None:
+    cache = FileSystemCache(cache_dir=tmp_path, compression="none")
+    await cache.set("key1", "value1")
+    (tmp_path / "journals").mkdir()
+    (tmp_path / "journals" / "grade-range-abc.jsonl").write_text("{}\n")
+    (tmp_path / "repositories" / "repo").mkdir(parents=True)
+    (tmp_path / "rollups.sqlite3").write_bytes(b"data")
+
+    assert [key async for key in cache.iter_keys()] == ["key1"]
+    assert await cache.prune(max_bytes=0) == 1
+    assert (tmp_path / "journals" / "grade-range-abc.jsonl").exists()
+    assert (tmp_path / "repositories" / "repo").exists()
+    assert (tmp_path / "rollups.sqlite3").exists()
+
+
+async def test_file_system_cache_migrates_flat_entries(tmp_path: SyncPath) -> None:
+    key = f"GradeCommitHandler-patch-{'a' * 64}"
+    (tmp_path / key).write_text('{"grade": 7}')
+
+    cache = FileSystemCache(cache_dir=tmp_path)
+
+    assert not (tmp_path / key).exists()
+    assert await cache.get(key) == '{"grade": 7}'
+    assert [key async for key in cache.iter_keys()] == [key]
@@ -44,3 +44,84 @@ async def test_overwrite_existing_key(in_memory_cache: InMemoryCache) -> None:
     await in_memory_cache.set("key4", "initial")
     await in_memory_cache.set("key4", "updated")
     assert await in_memory_cache.get("key4") == "updated", "Key should hold the updated value."
+
+
+async def test_evicts_least_recently_used_entry() -> None:
+    cache = InMemoryCache(max_entries=2)
+    await cache.set("key1", "value1")
+    await cache.set("key2", "value2")
+    assert await cache.get("key1") == "value1"
+    await cache.set("key3", "value3")
+
+    assert await cache.get("key2") is None, "The least recently used key should be evicted."
+    assert await cache.get("key1") == "value1"
+    assert await cache.get("key3") == "value3"
+    assert cache.statistics["evictions"] == 1
+
+
+async def test_evicts_to_stay_within_max_bytes() -> None:
+    cache = InMemoryCache(max_bytes=10)
+    await cache.set("key1", "12345")
+    await cache.set("key2", "12345")
+    await cache.set("key3", "123")
+
+    assert not await cache.exists("key1")
+    assert await cache.exists("key2")
+    assert await cache.exists("key3")
+    assert cache.statistics["size_bytes"] == 8
+
+    await cache.set("key4", "12345678901")
+    assert not await cache.exists("key4"), "Values larger than max_bytes should not be cached."
+    assert cache.statistics["size_bytes"] == 8
+
+
+async def test_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("gitmind.caching.memory.monotonic", lambda: now)
+    cache = InMemoryCache(ttl=10)
+    await cache.set("key1", "value1")
+    await cache.set("key2", "value2", ttl=100)
+
+    now += 50
+    assert await cache.get("key1") is None, "Entries should expire after the default ttl."
+    assert await cache.get("key2") == "value2", "Per entry ttl should override the default."
+    assert cache.statistics["expirations"] == 1
+    assert cache.statistics["entries"] == 1
+
+
+async def test_statistics(in_memory_cache: InMemoryCache) -> None:
+    await in_memory_cache.set("key1", "value1")
+    await in_memory_cache.get("key1")
+    await in_memory_cache.get("key1")
+    await in_memory_cache.get("key2")
+
+    assert in_memory_cache.statistics == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+        "entries": 1,
+        "size_bytes": 6,
+    }
+
+
+async def test_bulk_operations(in_memory_cache: InMemoryCache) -> None:
+    await in_memory_cache.set_many({"key1": "value1", "key2": "value2", "key3": "value3"})
+    assert await in_memory_cache.get_many(["key1", "key2", "missing"]) == {"key1": "value1", "key2": "value2"}
+
+    await in_memory_cache.delete_many(["key1", "key3"])
+    assert await in_memory_cache.get_many(["key1", "key2", "key3"]) == {"key2": "value2"}
+    assert in_memory_cache.statistics["hits"] == 3
+    assert in_memory_cache.statistics["misses"] == 3
+
+
+async def test_set_many_evicts_least_recently_used_entries() -> None:
+    cache = InMemoryCache(max_entries=2)
+    await cache.set_many({"key1": "value1", "key2": "value2", "key3": "value3"})
+
+    assert await cache.get_many(["key1", "key2", "key3"]) == {"key2": "value2", "key3": "value3"}
+
+
+async def test_iter_keys(in_memory_cache: InMemoryCache) -> None:
+    await in_memory_cache.set_many({"key1": "value1", "key2": "value2"})
+    assert [key async for key in in_memory_cache.iter_keys()] == ["key1", "key2"]
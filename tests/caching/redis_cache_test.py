@@ -0,0 +1,81 @@
+import pytest
+from anyio import create_task_group
+from fakeredis import FakeAsyncRedis
+
+from gitmind.caching.redis_cache import RedisCache
+
+
+@pytest.fixture
+def redis_client() -> FakeAsyncRedis:
+    return FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def redis_cache(redis_client: FakeAsyncRedis) -> RedisCache:
+    return RedisCache(client=redis_client)
+
+
+async def test_redis_cache_set_get(redis_cache: RedisCache, redis_client: FakeAsyncRedis) -> None:
+    await redis_cache.set("test_key", "test_value")
+    assert await redis_cache.get("test_key") == "test_value"
+    assert await redis_client.get("gitmind:test_key") == "test_value", "Keys should be prefixed."
+
+
+async def test_redis_cache_non_existent_get(redis_cache: RedisCache) -> None:
+    assert await redis_cache.get("non_existent_key") is None
+
+
+async def test_redis_cache_delete_and_exists(redis_cache: RedisCache) -> None:
+    await redis_cache.set("test_key", "test_value")
+    assert await redis_cache.exists("test_key") is True
+    await redis_cache.delete("test_key")
+    assert await redis_cache.exists("test_key") is False
+
+
+async def test_redis_cache_ttl(redis_client: FakeAsyncRedis) -> None:
+    redis_cache = RedisCache(client=redis_client, ttl=60)
+    await redis_cache.set("default_ttl", "value")
+    await redis_cache.set("entry_ttl", "value", ttl=0.5)
+    await redis_cache.set_many({"bulk_ttl": "value"})
+
+    assert 59_000 < await redis_client.pttl("gitmind:default_ttl") <= 60_000
+    assert 0 < await redis_client.pttl("gitmind:entry_ttl") <= 500
+    assert 59_000 < await redis_client.pttl("gitmind:bulk_ttl") <= 60_000
+
+
+async def test_redis_cache_no_ttl(redis_cache: RedisCache, redis_client: FakeAsyncRedis) -> None:
+    await redis_cache.set("test_key", "test_value")
+    assert await redis_client.pttl("gitmind:test_key") == -1
+
+
+async def test_redis_cache_bulk_operations(redis_cache: RedisCache) -> None:
+    items = {f"key{index}": f"value{index}" for index in range(50)}
+    await redis_cache.set_many(items)
+    assert await redis_cache.get_many([*items, "missing"]) == items
+
+    await redis_cache.delete_many(list(items)[:25])
+    assert await redis_cache.get_many(items) == dict(list(items.items())[25:])
+
+    assert await redis_cache.get_many([]) == {}
+    await redis_cache.set_many({})
+    await redis_cache.delete_many([])
+
+
+async def test_redis_cache_shared_between_instances(redis_client: FakeAsyncRedis) -> None:
+    await RedisCache(client=redis_client).set("test_key", "test_value")
+    assert await RedisCache(client=redis_client).get("test_key") == "test_value"
+    assert await RedisCache(client=redis_client, key_prefix="other:").get("test_key") is None
+
+
+async def test_redis_cache_concurrent_access(redis_cache: RedisCache) -> None:
+    async with create_task_group() as tg:
+        for index in range(20):
+            tg.start_soon(redis_cache.set, f"key{index}", f"value{index}")
+
+    assert len(await redis_cache.get_many(f"key{index}" for index in range(20))) == 20
+
+
+async def test_redis_cache_iter_keys(redis_cache: RedisCache, redis_client: FakeAsyncRedis) -> None:
+    await redis_cache.set_many({"key1": "value1", "key2": "value2"})
+    await redis_client.set("other:key3", "value3")
+    assert sorted([key async for key in redis_cache.iter_keys()]) == ["key1", "key2"]
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import Context
+
+from gitmind.cli.commands.author import author, handle_author
+from tests.cli.commands.commit_test import create_cli_context
+from tests.data_fixtures import grade_commit_response
+from tests.helpers import create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+async def test_handle_author_grades_sample_and_reuses_recorded_grades(tmp_path: Path) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+    ctx = Context(author, obj=cli_ctx)
+
+    (profile,) = await handle_author(ctx, "main", (), 0.1, 2, 0.95, 0)
+    assert profile["author"] == "jeronimo@example.com"
+    assert (profile["commits"], profile["sampled"], profile["graded"]) == (4, 2, 2)
+    assert profile["rules"]["code_quality"] == {"mean": 8.0, "lower": 8.0, "upper": 8.0, "count": 2}
+
+    (profile,) = await handle_author(ctx, "main", ("jeronimo",), 0.1, 3, 0.95, 0)
+    assert (profile["sampled"], profile["graded"]) == (3, 1), "Recorded commits should be sampled without grading."
+    assert mock_client.create_completions.call_count == 3
+
+    assert await handle_author(ctx, "main", ("someone-else",), 0.1, 2, 0.95, 0) == []
+    cli_ctx["rollups"].close()
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from gitmind.cli.commands.batch import get_submitted_batches
+from gitmind.utils.journal import Journal, JournalRecord
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+async def test_get_submitted_batches_resumes_pending_subsets(tmp_path: Path) -> None:
+    stage = "batch-grade"
+    async with Journal(tmp_path / "journal.jsonl") as journal:
+        for commit_hash in ("a", "b", "c"):
+            await journal.append(JournalRecord(commit_hash=commit_hash, stage=stage, status="submitted", result="one"))
+        await journal.append(JournalRecord(commit_hash="d", stage=stage, status="submitted", result="two"))
+        await journal.append(JournalRecord(commit_hash="e", stage=stage, status="completed", result="two"))
+
+        assert get_submitted_batches(journal, stage, ["b", "c"]) == ({"one": ["b", "c"]}, []), (
+            "Commits whose results were cached since should not cause the rest of their batch to be submitted again."
+        )
+        assert get_submitted_batches(journal, stage, ["a", "d", "e", "f"]) == ({"one": ["a"], "two": ["d"]}, ["e", "f"])
+        assert get_submitted_batches(journal, "batch-describe", ["a"]) == ({}, ["a"])
+        await journal.remove()
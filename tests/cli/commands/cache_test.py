@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import Context
+
+from gitmind.caching.entry import CacheEntry
+from gitmind.cli.commands.cache import cache, get_range_cache_keys, handle_invalidate
+from gitmind.cli.commands.commit import get_commit_data
+from gitmind.prompts import DescribeCommitHandler, GradeCommitHandler
+from gitmind.prompts.classify_commit import ClassifyCommitHandler
+from gitmind.rules import DEFAULT_GRADING_RULES
+from gitmind.utils.serialization import serialize
+from tests.cli.commands.commit_test import create_cli_context
+from tests.helpers import create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from gitmind.cli._utils import CLIContext
+    from gitmind.prompts.base import AbstractPromptHandler
+
+
+def create_routed_cli_context(tmp_path: Path) -> CLIContext:
+    strong_client = create_mock_client()
+    strong_client._model = "gpt-4o"
+    triage_client = create_mock_client()
+    triage_client._model = "gpt-4o-mini"
+    cli_ctx = create_cli_context(tmp_path, strong_client)
+    settings = cli_ctx["settings"]
+    settings.__dict__.update(cache_type="file", provider_triage_model="gpt-4o-mini", triage_llm_client=triage_client)
+    return cli_ctx
+
+
+async def test_handle_invalidate_stale_keeps_entries_of_all_model_tiers(tmp_path: Path) -> None:
+    cli_ctx = create_routed_cli_context(tmp_path)
+    settings = cli_ctx["settings"]
+    triage_client = settings.triage_llm_client
+    assert triage_client is not None
+    current: dict[str, AbstractPromptHandler[Any]] = {
+        "describe-strong": DescribeCommitHandler(client=settings.llm_client),
+        "grade-triage": GradeCommitHandler(client=triage_client, model_tier="triage"),
+        "classify-triage": ClassifyCommitHandler(client=triage_client, model_tier="triage"),
+    }
+    for key, handler in current.items():
+        rules = DEFAULT_GRADING_RULES if isinstance(handler, GradeCommitHandler) else None
+        entry = CacheEntry(metadata=handler.create_entry_metadata(rules), result={})
+        await settings.cache.set(key, serialize(entry).decode())
+    stale_metadata = current["classify-triage"].create_entry_metadata()
+    stale_metadata["model"] = "gpt-3.5-turbo"
+    await settings.cache.set("classify-old", serialize(CacheEntry(metadata=stale_metadata, result={})).decode())
+
+    assert await handle_invalidate(Context(cache, obj=cli_ctx), True, None, None, False) == 1
+    assert sorted([key async for key in settings.cache.iter_keys()]) == sorted(current)
+
+
+async def test_get_range_cache_keys_includes_routed_analyses(tmp_path: Path) -> None:
+    cli_ctx = create_routed_cli_context(tmp_path)
+    triage_client = cli_ctx["settings"].triage_llm_client
+    assert triage_client is not None
+
+    cache_keys = await get_range_cache_keys(Context(cache, obj=cli_ctx), "main")
+
+    _, metadata, diff = await get_commit_data(cli_ctx, "main")
+    for handler in (
+        GradeCommitHandler(client=triage_client, model_tier="triage"),
+        ClassifyCommitHandler(client=triage_client, model_tier="triage"),
+    ):
+        assert set(handler.get_cache_keys(metadata=metadata, diff=diff)) <= set(cache_keys)
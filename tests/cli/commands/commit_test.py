@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from csv import DictReader
+from json import loads
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from click import Context
+from pygit2 import Commit, init_repository
+
+from gitmind.cli._utils import CLIContext
+from gitmind.cli.commands.commit import commit, describe_commit, get_commit_data, handle_range
+from gitmind.config import GitMindSettings
+from gitmind.utils.journal import JOURNAL_FOLDER_NAME
+from tests.data_fixtures import describe_commit_response, grade_commit_response
+from tests.helpers import create_commit, create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import AsyncMock
+
+
+def capture_results(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    monkeypatch.setattr("gitmind.cli.commands.commit.echo", lambda line: results.append(loads(line)))
+    return results
+
+
+def create_cli_context(tmp_path: Path, mock_client: AsyncMock) -> CLIContext:
+    repo = init_repository(str(tmp_path / "repo"))
+    head = create_commit(repo, {"a.py": "a = 1\n"}, "feat: add a")
+    for i in range(2, 5):
+        head = create_commit(repo, {"a.py": f"a = {i}\n"}, f"fix: change a to {i}", parents=[head])
+    repo.references.create("refs/heads/main", head)
+
+    settings = GitMindSettings(
+        target_repo=str(tmp_path / "repo"),
+        provider_name="openai",
+        provider_api_key="abc-jeronimo",  # type: ignore[arg-type]
+        provider_model="gpt-4o",
+        cache_dir=str(tmp_path / "cache"),
+        server_forwarding=False,
+    )
+    settings.__dict__["llm_client"] = mock_client
+    return CLIContext(settings=settings, repo=repo)
+
+
+async def test_handle_range_resumes_from_journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_client = create_mock_client()
+    mock_client.create_completions.side_effect = [grade_commit_response, RuntimeError("interrupted")]
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+    ctx = Context(commit, obj=cli_ctx)
+    results = capture_results(monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        await handle_range(ctx, "grade", "main~3..main", (), ())
+    interrupted = results.copy()
+    results.clear()
+    assert len(interrupted) == 1
+    assert len(list((tmp_path / "cache" / JOURNAL_FOLDER_NAME).iterdir())) == 1
+
+    mock_client.create_completions.side_effect = None
+    mock_client.create_completions.return_value = grade_commit_response
+    await handle_range(ctx, "grade", "main~3..main", (), (), resume=True)
+    resumed = results
+
+    assert len(resumed) == 3
+    assert resumed[0] == interrupted[0]
+    assert mock_client.create_completions.call_count == 4, "The journaled commit should not be graded again."
+    assert not list((tmp_path / "cache" / JOURNAL_FOLDER_NAME).iterdir()), "A finished run should remove its journal."
+
+
+async def test_handle_range_writes_rows_to_output(tmp_path: Path) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client(return_value=grade_commit_response))
+    output = tmp_path / "grades.csv"
+
+    await handle_range(Context(commit, obj=cli_ctx), "grade", "main~2..main", (), (), output=output)
+
+    with output.open(newline="") as f:
+        rows = list(DictReader(f))
+    assert len(rows) == 2 * len(loads(grade_commit_response))
+    assert {row["author_name"] for row in rows} == {"Jeronimo"}
+
+
+async def test_handle_range_with_path_target_repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client(return_value=grade_commit_response))
+    cli_ctx["settings"].__dict__["target_repo"] = tmp_path / "repo"
+    results = capture_results(monkeypatch)
+
+    await handle_range(Context(commit, obj=cli_ctx), "grade", "main~1..main", (), ())
+
+    assert len(results) == 1
+
+
+async def test_get_commit_data_summarises_merges_by_cached_descriptions(tmp_path: Path) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client(return_value=describe_commit_response))
+    cli_ctx["settings"].__dict__["merge_strategy"] = "merged-commits"
+    repo = cli_ctx["repo"]
+    main = repo.revparse_single("main").peel(Commit)
+    feature_one = create_commit(repo, {"a.py": "a = 2\n", "b.py": "b = 1\n"}, "add b", parents=[main.parents[0].id])
+    feature_two = create_commit(repo, {"a.py": "a = 2\n", "b.py": "b = 2\n"}, "change b", parents=[feature_one])
+    merge = create_commit(repo, {"a.py": "a = 4\n", "b.py": "b = 2\n"}, "merge feature", parents=[main.id, feature_two])
+
+    await describe_commit(cli_ctx, str(feature_two))
+    _, _, diff = await get_commit_data(cli_ctx, str(merge))
+
+    summary = loads(describe_commit_response)["summary"]
+    assert diff.splitlines() == [
+        f"- {str(feature_two)[:7]} change b",
+        f"  {summary}",
+        f"- {str(feature_one)[:7]} add b",
+    ]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from math import inf
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from anyio import sleep
+from click import Context
+from pygit2 import init_repository
+from pygit2.enums import ResetMode
+
+from gitmind.cli._utils import CLIContext
+from gitmind.cli.commands.hook import grade_staged_changes, handle_hook, hook, read_commit_message
+from gitmind.config import GitMindSettings
+from gitmind.rules import PRE_COMMIT_GRADING_RULES
+from tests.data_fixtures import grade_commit_response
+from tests.helpers import create_commit, create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import AsyncMock
+
+
+def create_cli_context(tmp_path: Path, mock_client: AsyncMock) -> CLIContext:
+    repo = init_repository(str(tmp_path))
+    head = create_commit(repo, {"a.py": "a = 1\n"}, "feat: add a")
+    repo.set_head(head)
+    repo.reset(head, ResetMode.HARD)
+    (tmp_path / "a.py").write_text("a = 2\n")
+    repo.index.add("a.py")
+    repo.index.write()
+
+    settings = GitMindSettings(
+        target_repo=str(tmp_path),
+        provider_name="openai",
+        provider_api_key="abc-jeronimo",  # type: ignore[arg-type]
+        provider_model="gpt-4o",
+    )
+    settings.__dict__["llm_client"] = mock_client
+    return CLIContext(settings=settings, repo=repo)
+
+
+def test_read_commit_message(tmp_path: Path) -> None:
+    message_file = tmp_path / "COMMIT_EDITMSG"
+    message_file.write_text(
+        "fix: change a\n\nBody.\n# Please enter the commit message.\n"
+        "# ------------------------ >8 ------------------------\ndiff --git a/a.py b/a.py\n"
+    )
+
+    assert read_commit_message(message_file) == "fix: change a\n\nBody."
+
+
+async def test_grade_staged_changes_caches_by_staged_tree(tmp_path: Path) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+
+    first = await grade_staged_changes(cli_ctx, grading_rules=PRE_COMMIT_GRADING_RULES, deadline=inf)
+    second = await grade_staged_changes(cli_ctx, grading_rules=PRE_COMMIT_GRADING_RULES, deadline=inf)
+
+    assert first["results"] == second["results"]
+    assert set(first["results"]) == {rule.name for rule in PRE_COMMIT_GRADING_RULES}
+    assert list(second["diagnostics"]["timings"]) == ["cache"]
+    assert mock_client.create_completions.call_count == 1
+
+
+@pytest.mark.parametrize(("min_grade", "exit_code"), ((None, 0), (6, 0), (7, 1)))
+async def test_handle_hook_min_grade(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], min_grade: int | None, exit_code: int
+) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client(return_value=grade_commit_response))
+
+    assert await handle_hook(Context(hook, obj=cli_ctx), "pre-commit", min_grade=min_grade) == exit_code
+    assert "changes_scope: 6" in capsys.readouterr().out
+
+
+async def test_handle_hook_exceeding_latency_budget(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    mock_client = create_mock_client()
+
+    async def create_completions(**_: Any) -> str:
+        await sleep(10)
+        return grade_commit_response
+
+    mock_client.create_completions.side_effect = create_completions
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+
+    assert await handle_hook(Context(hook, obj=cli_ctx), "pre-commit", latency_budget=0.05, min_grade=10) == 0
+    output = capsys.readouterr()
+    assert "commit_atomicity: NOT_EVALUATED" in output.out
+    assert "exceeded the latency budget" in output.err
+
+
+async def test_handle_hook_without_staged_changes(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client(return_value=grade_commit_response))
+    cli_ctx["repo"].reset(cli_ctx["repo"].head.target, ResetMode.HARD)
+
+    assert await handle_hook(Context(hook, obj=cli_ctx), "pre-commit", min_grade=10) == 0
+    assert "no staged changes" in capsys.readouterr().err
+
+
+async def test_grade_staged_changes_with_heuristics(tmp_path: Path) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+
+    cli_ctx["settings"].heuristic_grading = "prefill"
+    prefilled = await grade_staged_changes(cli_ctx, grading_rules=PRE_COMMIT_GRADING_RULES, deadline=inf)
+    cli_ctx["settings"].heuristic_grading = "offline"
+    offline = await grade_staged_changes(cli_ctx, grading_rules=PRE_COMMIT_GRADING_RULES, deadline=inf)
+
+    assert prefilled["results"]["changes_scope"]["heuristic"]
+    assert "heuristic" not in prefilled["results"]["code_quality"]
+    assert all(result["heuristic"] for result in offline["results"].values())
+    assert offline["results"]["code_quality"]["grade"] == "NOT_EVALUATED"
+    assert mock_client.create_completions.call_count == 1
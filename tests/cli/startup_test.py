@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Final
+
+STARTUP_BUDGET_US: Final[int] = 1_000_000
+"""A generous budget for importing the CLI. It currently takes about a third of it on a developer machine."""
+LAZY_MODULES: Final[tuple[str, ...]] = (
+    "gitmind.prompts",
+    "gitmind.server.app",
+    "groq",
+    "h11",
+    "httpx",
+    "inflection",
+    "jsonschema",
+    "openai",
+    "redis",
+    "rich",
+    "structlog",
+)
+"""Modules that must only be imported when a command runs."""
+
+
+def get_import_times(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_startup_imports() -> None:
+    import_times = get_import_times(
+        "import gitmind.cli, gitmind.cli.commands.cache, gitmind.cli.commands.commit, gitmind.cli.commands.hook, "
+        "gitmind.cli.commands.serve"
+    )
+
+    eager_modules = [
+        name for name in import_times if any(name == module or name.startswith(f"{module}.") for module in LAZY_MODULES)
+    ]
+    assert not eager_modules
+    assert import_times["gitmind.cli"] < STARTUP_BUDGET_US
@@ -1,9 +1,14 @@
+import os
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic_settings import JsonConfigSettingsSource, PydanticBaseSettingsSource
+from pygit2 import init_repository
 from tomllib import loads  # type: ignore[import-not-found]
 
-from gitmind.config import GitMindSettings
+from gitmind.caching.memory import InMemoryCache
+from gitmind.config import MEMORY_CACHE_MAX_BYTES, GitMindSettings, get_settings_cache_path, load_settings
 
 
 @pytest.fixture
@@ -39,3 +44,84 @@ def test_reading_pyproject_correctly(pyproject_file: Path, test_settings: GitMin
             continue
 
         assert getattr(settings, k) == getattr(test_settings, k)
+
+
+@pytest.fixture
+def settings_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    init_repository(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("GITMIND_PROVIDER_NAME", "openai")
+    monkeypatch.setenv("GITMIND_PROVIDER_API_KEY", "abc-jeronimo")
+    (tmp_path / "gitmind-config.json").write_text('{"provider_model": "gpt-4o"}')
+    return tmp_path
+
+
+def test_settings_sources_skip_missing_files(settings_env: Path) -> None:
+    sources = GitMindSettings.settings_customise_sources(
+        GitMindSettings, MagicMock(), MagicMock(), MagicMock(), MagicMock()
+    )
+
+    assert [type(source) for source in sources if isinstance(source, PydanticBaseSettingsSource)] == [
+        JsonConfigSettingsSource
+    ]
+
+
+def test_load_settings_reuses_resolved_settings(settings_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = load_settings(mode="debug")
+    cache_path = get_settings_cache_path()
+
+    assert settings.provider_model == "gpt-4o"
+    assert settings.mode == "debug"
+    assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    with patch("gitmind.config.JsonConfigSettingsSource", side_effect=AssertionError("the config file was read")):
+        cached = load_settings(mode="debug")
+    assert cached.model_dump() == settings.model_dump()
+    assert cached.provider_api_key.get_secret_value() == "abc-jeronimo"
+
+    config_file = settings_env / "gitmind-config.json"
+    config_file.write_text('{"provider_model": "gpt-4o-mini"}')
+    os.utime(config_file, ns=(0, 0))
+    assert load_settings(mode="debug").provider_model == "gpt-4o-mini"
+
+    monkeypatch.setenv("GITMIND_MAX_REQUEST_RETRIES", "3")
+    assert load_settings(mode="debug").max_request_retries == 3
+    assert load_settings().mode == "standard"
+
+
+def test_load_settings_does_not_cache_secrets(settings_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    load_settings()
+    cache_path = get_settings_cache_path()
+    assert "abc-jeronimo" not in cache_path.read_text()
+
+    with patch("gitmind.config.JsonConfigSettingsSource", side_effect=AssertionError("the config file was read")):
+        assert load_settings().provider_api_key.get_secret_value() == "abc-jeronimo"
+
+    monkeypatch.delenv("GITMIND_PROVIDER_API_KEY")
+    (settings_env / ".env").write_text("GITMIND_PROVIDER_API_KEY=def-jeronimo\n")
+    assert load_settings().provider_api_key.get_secret_value() == "def-jeronimo"
+    assert "def-jeronimo" not in cache_path.read_text()
+
+
+def test_load_settings_skips_cache_for_secrets_in_config_files(
+    settings_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("GITMIND_PROVIDER_API_KEY")
+    (settings_env / "gitmind-config.json").write_text('{"provider_model": "gpt-4o", "provider_api_key": "abc-file"}')
+
+    assert load_settings().provider_api_key.get_secret_value() == "abc-file"
+    assert not get_settings_cache_path().exists()
+
+
+async def test_memory_cache_is_bounded(settings_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITMIND_CACHE_MAX_ENTRIES", "2")
+    cache = GitMindSettings().cache  # type: ignore[call-arg]
+    assert isinstance(cache, InMemoryCache)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+
+    assert await cache.get("a") is None, "The settings-built memory cache should evict its least recently used entry."
+    assert await cache.get("c") == "c"
+    assert cache.statistics["evictions"] == 1
+    assert GitMindSettings().cache_max_memory_bytes == MEMORY_CACHE_MAX_BYTES  # type: ignore[call-arg]
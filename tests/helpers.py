@@ -1,7 +1,20 @@
 from __future__ import annotations
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from threading import Thread
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock
 
+from pygit2 import Signature
+from pygit2.enums import FileMode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+    from pygit2 import Oid, Repository
+
 
 def create_mock_client(return_value: str = "", exc: Exception | None = None) -> AsyncMock:
     mock_create_completions = AsyncMock()
@@ -19,3 +32,139 @@ def create_mock_client(return_value: str = "", exc: Exception | None = None) ->
         ),
         create_completions=mock_create_completions,
     )
+
+
+def _write_tree(repo: Repository, files: dict[str, str]) -> Oid:
+    builder = repo.TreeBuilder()
+    subtrees: dict[str, dict[str, str]] = {}
+    for path, content in files.items():
+        name, _, rest = path.partition("/")
+        if rest:
+            subtrees.setdefault(name, {})[rest] = content
+        else:
+            builder.insert(name, repo.create_blob(content.encode()), FileMode.BLOB)
+    for name, subtree_files in subtrees.items():
+        builder.insert(name, _write_tree(repo, subtree_files), FileMode.TREE)
+    return builder.write()
+
+
+def create_commit(
+    repo: Repository,
+    files: dict[str, str],
+    message: str,
+    parents: list[Oid] | None = None,
+    author: str = "Jeronimo",
+    timestamp: int = 1700000000,
+) -> Oid:
+    """Create a commit whose tree is exactly ``files``, without touching HEAD."""
+    signature = Signature(author, f"{author.lower()}@example.com", timestamp, 0)
+    return repo.create_commit(None, signature, signature, message, _write_tree(repo, files), parents or [])
+
+
+class BatchAPIStub:
+    """A local stub of the OpenAI files and batches API, serving one batch.
+
+    Each request of the uploaded batch file is answered with the tool call arguments ``respond`` returns for its body,
+    or fails if it returns None. The batch is in progress on its first retrieval, and completed afterwards.
+    """
+
+    def __init__(self, respond: Callable[[dict[str, Any]], str | None]) -> None:
+        self.respond = respond
+        self.requests: list[dict[str, Any]] = []
+        self.retrievals = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self) -> BatchAPIStub:  # noqa: PYI034
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _batch(self) -> dict[str, Any]:
+        self.retrievals += 1
+        completed = self.retrievals > 1
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file_input",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": "completed" if completed else "in_progress",
+            "output_file_id": "file_output" if completed else None,
+            "request_counts": {
+                "completed": len(self.requests) if completed else 0,
+                "failed": 0,
+                "total": len(self.requests),
+            },
+        }
+
+    def _output(self) -> str:
+        lines = []
+        for request in self.requests:
+            if (arguments := self.respond(request["body"])) is None:
+                response = {"status_code": 500, "request_id": "req", "body": {"error": {"message": "failed"}}}
+            else:
+                message = {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {"id": "call", "type": "function", "function": {"name": "tool", "arguments": arguments}}
+                    ],
+                }
+                body = {
+                    "id": "completion",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": request["body"]["model"],
+                    "choices": [{"index": 0, "finish_reason": "tool_calls", "message": message}],
+                }
+                response = {"status_code": 200, "request_id": "req", "body": body}
+            lines.append(dumps({"id": "line", "custom_id": request["custom_id"], "response": response, "error": None}))
+        return "\n".join(lines)
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, payload: dict[str, Any] | str) -> None:
+                data = (payload if isinstance(payload, str) else dumps(payload)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/v1/files":
+                    stub.requests = [loads(line) for line in body.splitlines() if b'"custom_id"' in line]
+                    self._send(
+                        {
+                            "id": "file_input",
+                            "object": "file",
+                            "bytes": len(body),
+                            "created_at": 0,
+                            "filename": "batch.jsonl",
+                            "purpose": "batch",
+                            "status": "processed",
+                        }
+                    )
+                else:
+                    self._send(stub._batch())
+
+            def do_GET(self) -> None:
+                if self.path.startswith("/v1/files/"):
+                    self._send(stub._output())
+                else:
+                    self._send(stub._batch())
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+        return Handler
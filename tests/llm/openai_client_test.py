@@ -1,3 +1,4 @@
+from json import dumps
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -138,3 +139,25 @@ async def test_create_completions_failure(
     openai_client._client.chat.completions.create = AsyncMock(side_effect=OpenAIError("API error"))  # type: ignore
     with pytest.raises(LLMClientError):
         await openai_client.create_completions(messages=describe_commit_message_definitions, json_response=True)
+
+
+async def test_get_batch_results_with_malformed_line(
+    openai_client: OpenAIClient, describe_commit_chat_completion: ChatCompletion
+) -> None:
+    lines = [
+        dumps(
+            {"custom_id": "a", "response": {"status_code": 200, "body": describe_commit_chat_completion.model_dump()}}
+        ),
+        dumps({"custom_id": "b", "response": {"status_code": 200}}),
+        dumps({"custom_id": "c", "response": {"status_code": 500, "body": {"error": "server error"}}}),
+    ]
+    openai_client._client.batches.retrieve = AsyncMock(return_value=Mock(output_file_id="output", error_file_id=None))
+    openai_client._client.files.content = AsyncMock(return_value=Mock(text="\n".join(lines)))
+
+    results = await openai_client.get_batch_results("batch")
+
+    assert [result.custom_id for result in results] == ["a", "b", "c"]
+    assert results[0].content is not None
+    assert results[1].content is None
+    assert results[1].error, "A line without a body should only fail its own request."
+    assert results[2].content is None
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from anyio import create_task_group, sleep
+
+from gitmind.caching import InMemoryCache
+from gitmind.prompts import GradeCommitHandler
+from tests.data_fixtures import commit_metadata, grade_commit_response
+from tests.helpers import create_mock_client
+
+if TYPE_CHECKING:
+    from gitmind.prompts.grade_commit import CommitGradingResult
+
+
+async def test_generate_completions_uses_cache() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cache = InMemoryCache()
+
+    first = await GradeCommitHandler(mock_client, cache=cache)(metadata=commit_metadata, diff="+a = 1\n")
+    second = await GradeCommitHandler(mock_client, cache=cache)(metadata=commit_metadata, diff="+a = 1\n")
+    assert first == second
+    assert mock_client.create_completions.call_count == 1
+
+    await GradeCommitHandler(mock_client, cache=cache)(metadata=commit_metadata, diff="+a = 2\n")
+    assert mock_client.create_completions.call_count == 2, "A different prompt should not hit the cache."
+
+
+async def test_generate_completions_ignores_invalid_cache_entries() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cache = InMemoryCache()
+    handler = GradeCommitHandler(mock_client, cache=cache)
+
+    await handler(metadata=commit_metadata, diff="+a = 1\n")
+    await cache.set_many(dict.fromkeys(cache._store, '{"key": "value"}'))
+
+    await handler(metadata=commit_metadata, diff="+a = 1\n")
+    assert mock_client.create_completions.call_count == 2
+    assert '{"key": "value"}' not in (await cache.get_many(list(cache._store))).values()
+
+
+async def test_generate_completions_coalesces_concurrent_calls() -> None:
+    mock_client = create_mock_client()
+
+    async def create_completions(**_: object) -> str:
+        await sleep(0.01)
+        return grade_commit_response
+
+    mock_client.create_completions.side_effect = create_completions
+    results: list[dict[str, CommitGradingResult]] = []
+
+    async def grade() -> None:
+        results.append(await GradeCommitHandler(mock_client)(metadata=commit_metadata, diff="+a = 1\n"))
+
+    async with create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(grade)
+
+    assert mock_client.create_completions.call_count == 1
+    assert len(results) == 5
+    assert all(result == results[0] for result in results)
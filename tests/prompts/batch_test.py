@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from json import loads
+from typing import TYPE_CHECKING, Any
+
+from gitmind.caching import InMemoryCache
+from gitmind.llm.base import RetryConfig
+from gitmind.llm.openai_client import OpenAIClient
+from gitmind.prompts import DescribeCommitHandler, GradeCommitHandler
+from gitmind.prompts.batch import BatchEntry, run_batch
+from gitmind.utils.commit import CommitStatistics
+from tests.data_fixtures import commit_metadata, describe_commit_response, grade_commit_response
+from tests.helpers import BatchAPIStub, create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+commit_statistics = CommitStatistics(deletions=0, files_changed=1, insertions=1)
+
+
+def respond(body: dict[str, Any]) -> str | None:
+    prompt = body["messages"][-1]["content"]
+    if "+fail\n" in prompt:
+        return None
+    if "+invalid\n" in prompt:
+        return '{"key": "value"}'
+    return grade_commit_response
+
+
+async def test_run_batch(tmp_path: Path) -> None:
+    cache = InMemoryCache()
+    entries: dict[str, BatchEntry] = {}
+    for diff in ("+a = 1\n", "+fail\n", "+invalid\n"):
+        handler = GradeCommitHandler(create_mock_client(), retry_config=RetryConfig(max_retries=0), cache=cache)
+        prompt = handler.create_batch_prompt(metadata=commit_metadata, diff=diff)
+        entries[prompt.cache_key] = BatchEntry(handler, prompt)
+
+    with BatchAPIStub(respond) as stub:
+        client = OpenAIClient(api_key="fake_token", model_name="gpt-4o", endpoint_url=stub.url)
+        summary = await run_batch(
+            client=client, entries=entries, batch_file=tmp_path / "batches" / "grade.jsonl", poll_interval=0
+        )
+
+    assert summary == {"batch_id": "batch_1", "requests": 3, "completed": 1, "failed": 2}
+    assert [request["custom_id"] for request in stub.requests] == list(entries)
+    assert stub.requests[0]["body"]["tool_choice"] == "required"
+    assert len((tmp_path / "batches" / "grade.jsonl").read_text().splitlines()) == 3
+
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    result = await GradeCommitHandler(mock_client, cache=cache)(metadata=commit_metadata, diff="+a = 1\n")
+    assert result == loads(grade_commit_response)
+    assert mock_client.create_completions.call_count == 0, "The batch result should be cached."
+
+
+async def test_run_batch_repairs_invalid_results(tmp_path: Path) -> None:
+    cache = InMemoryCache()
+    mock_client = create_mock_client(return_value=describe_commit_response)
+    handler = DescribeCommitHandler(mock_client, cache=cache)
+    prompt = handler.create_batch_prompt(statistics=commit_statistics, metadata=commit_metadata, diff="+a = 1\n")
+
+    with BatchAPIStub(lambda _: '{"summary": "incomplete"}') as stub:
+        client = OpenAIClient(api_key="fake_token", model_name="gpt-4o", endpoint_url=stub.url)
+        summary = await run_batch(
+            client=client,
+            entries={prompt.cache_key: BatchEntry(handler, prompt)},
+            batch_file=tmp_path / "describe.jsonl",
+            poll_interval=0,
+        )
+
+    assert summary["completed"] == 1
+    assert mock_client.create_completions.call_count == 1
+    assert "incomplete" in mock_client.create_completions.call_args.kwargs["messages"][-1].content
+    assert await handler(statistics=commit_statistics, metadata=commit_metadata, diff="+a = 1\n") == loads(
+        describe_commit_response
+    )
+    assert mock_client.create_completions.call_count == 1
@@ -4,12 +4,13 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from gitmind.caching import InMemoryCache
 from gitmind.exceptions import LLMClientError
 from gitmind.llm.base import RetryConfig
 from gitmind.prompts import DescribeCommitHandler
 from gitmind.prompts.describe_commit import CommitDescriptionResult
 from gitmind.utils.serialization import deserialize
-from tests.data_fixtures import describe_commit_response
+from tests.data_fixtures import commit_metadata, describe_commit_response
 from tests.helpers import create_mock_client
 
 if TYPE_CHECKING:
@@ -67,3 +68,33 @@ async def test_describe_commit_contents_failure_path_decode_error(
         )
 
     assert mock_client.create_completions.call_count == 2
+
+
+async def test_describe_commit_reuses_descriptions_for_the_same_changes() -> None:
+    mock_client = create_mock_client(return_value=describe_commit_response)
+    cache = InMemoryCache()
+    statistics: CommitStatistics = {"files_changed": 1, "insertions": 1, "deletions": 1}
+    diff = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n-a = 1\n+a = 2\n"
+    backport_diff = diff.replace("@@ -1,1 +1,1 @@", "@@ -10,1 +12,1 @@")
+
+    original = await DescribeCommitHandler(mock_client, cache=cache)(
+        statistics=statistics, metadata=commit_metadata, diff=diff
+    )
+    backport = await DescribeCommitHandler(mock_client, cache=cache)(
+        statistics=statistics, metadata={**commit_metadata, "message": "fix: backport"}, diff=backport_diff
+    )
+
+    assert mock_client.create_completions.call_count == 1
+    assert backport == original
+
+
+async def test_describe_commit_get_cache_keys() -> None:
+    mock_client = create_mock_client(return_value=describe_commit_response)
+    cache = InMemoryCache()
+    statistics: CommitStatistics = {"files_changed": 1, "insertions": 1, "deletions": 1}
+    diff = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n-a = 1\n+a = 2\n"
+    handler = DescribeCommitHandler(mock_client, cache=cache)
+
+    await handler(statistics=statistics, metadata=commit_metadata, diff=diff)
+
+    assert set(cache._store) == set(handler.get_cache_keys(statistics=statistics, metadata=commit_metadata, diff=diff))
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pytest
+from anyio import current_time, sleep
 
-from gitmind.exceptions import LLMClientError
-from gitmind.llm.base import RetryConfig
+from gitmind.caching import InMemoryCache
+from gitmind.caching.entry import decode_entry
+from gitmind.exceptions import DeadlineExceededError, LLMClientError
+from gitmind.llm.base import MessageDefinition, RetryConfig
 from gitmind.prompts import GradeCommitHandler
 from gitmind.prompts.grade_commit import CommitGradingResult
 from gitmind.rules import DEFAULT_GRADING_RULES
-from tests.data_fixtures import grade_commit_response
+from gitmind.utils.commit import CommitMetadata
+from tests.data_fixtures import commit_metadata, grade_commit_response
 from tests.helpers import create_mock_client
 
+DIFF = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-a = 1\n+a = 2\n"
+
 if TYPE_CHECKING:
-    from gitmind.utils.commit import CommitMetadata, CommitStatistics
+    from gitmind.utils.commit import CommitStatistics
 
 
 async def test_grade_commit_success_path(commit_data: tuple[CommitStatistics, CommitMetadata, str]) -> None:
@@ -71,3 +77,107 @@ async def test_grade_commit_failure_path_decode_error(
         await handler(metadata=metadata, diff=diff, grading_rules=DEFAULT_GRADING_RULES)
 
     assert mock_client.create_completions.call_count == 2
+
+
+async def test_grade_commit_reuses_grades_for_the_same_changes() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cache = InMemoryCache()
+    diff = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n-a = 1\n+a = 2\n"
+    backport_diff = diff.replace("@@ -1,1 +1,1 @@", "@@ -10,1 +12,1 @@")
+    backport_metadata = CommitMetadata(**{**commit_metadata, "hex": "1" * 40, "message": "fix: backport"})
+
+    original = await GradeCommitHandler(mock_client, cache=cache)(metadata=commit_metadata, diff=diff)
+    backport = await GradeCommitHandler(mock_client, cache=cache)(metadata=backport_metadata, diff=backport_diff)
+
+    assert mock_client.create_completions.call_count == 2
+    tool = mock_client.create_completions.call_args.kwargs["tool"]
+    assert list(tool.parameters["properties"]) == ["message_quality"], "Only the message should be graded again."
+    assert backport == original
+
+    await GradeCommitHandler(mock_client, cache=cache)(metadata=backport_metadata, diff=backport_diff)
+    assert mock_client.create_completions.call_count == 2
+
+
+async def test_grade_commit_get_cache_keys() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cache = InMemoryCache()
+    diff = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n-a = 1\n+a = 2\n"
+    handler = GradeCommitHandler(mock_client, cache=cache)
+
+    await handler(metadata=commit_metadata, diff=diff)
+
+    cache_keys = handler.get_cache_keys(metadata=commit_metadata, diff=diff)
+    assert len(cache_keys) == 3
+    assert set(cache._store) < set(cache_keys)
+
+
+async def test_grade_commit_records_cache_entry_metadata() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cache = InMemoryCache()
+    handler = GradeCommitHandler(mock_client, cache=cache)
+
+    await handler(metadata=commit_metadata, diff="+a = 1\n")
+
+    value = await cache.get(handler.get_cache_keys(metadata=commit_metadata, diff="+a = 1\n")[0])
+    entry = decode_entry(value or "")
+    assert entry is not None
+    assert entry["metadata"]["handler"] == "GradeCommitHandler"
+    assert entry["metadata"]["prompt_hash"] == handler.get_prompt_hash()
+    assert set(entry["metadata"]["rule_hashes"]) == {rule.name for rule in DEFAULT_GRADING_RULES}
+    assert handler.is_current_entry(entry["metadata"], DEFAULT_GRADING_RULES)
+
+    changed_rules = [
+        rule.model_copy(update={"evaluation_guidelines": "Changed."}) if rule.name == "code_quality" else rule
+        for rule in DEFAULT_GRADING_RULES
+    ]
+    assert not handler.is_current_entry(entry["metadata"], changed_rules)
+    assert not handler.is_current_entry(entry["metadata"], DEFAULT_GRADING_RULES[1:])
+    assert handler.is_current_entry({**entry["metadata"], "rule_hashes": {}}, DEFAULT_GRADING_RULES[1:])
+    assert not handler.is_current_entry({**entry["metadata"], "prompt_hash": "changed"}, DEFAULT_GRADING_RULES)
+
+
+async def test_grade_commit_within_deadline_returns_partial_results() -> None:
+    mock_client = create_mock_client()
+
+    async def create_completions(*, messages: list[MessageDefinition], **_: Any) -> str:
+        if "Commit Message Quality" in messages[-1].content:
+            await sleep(10)
+        return grade_commit_response
+
+    mock_client.create_completions.side_effect = create_completions
+    handler = GradeCommitHandler(mock_client, cache=InMemoryCache())
+
+    report = await handler.grade_within_deadline(
+        metadata=commit_metadata, diff=DIFF, grading_rules=DEFAULT_GRADING_RULES, deadline=current_time() + 0.1
+    )
+
+    assert report["diagnostics"]["deadline_exceeded"]
+    assert list(report["diagnostics"]["timings"]) == ["patch_rules"]
+    assert report["results"]["message_quality"]["grade"] == "NOT_EVALUATED"
+    assert report["results"]["code_quality"]["grade"] == 8
+    assert list(report["results"]) == sorted(rule.name for rule in DEFAULT_GRADING_RULES)
+
+
+async def test_grade_commit_within_deadline_caches_complete_results() -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    handler = GradeCommitHandler(mock_client, cache=InMemoryCache())
+
+    report = await handler.grade_within_deadline(
+        metadata=commit_metadata, diff=DIFF, grading_rules=DEFAULT_GRADING_RULES, deadline=current_time() + 10
+    )
+    assert not report["diagnostics"]["deadline_exceeded"]
+    assert mock_client.create_completions.call_count == 2
+
+    assert await handler(metadata=commit_metadata, diff=DIFF, grading_rules=DEFAULT_GRADING_RULES) == report["results"]
+    assert mock_client.create_completions.call_count == 2
+
+
+async def test_generate_completions_deadline_exceeded() -> None:
+    handler = GradeCommitHandler(
+        create_mock_client(return_value='{"key": value}'), retry_config=RetryConfig(max_retries=3)
+    )
+
+    with pytest.raises(DeadlineExceededError):
+        await handler.grade(
+            metadata=commit_metadata, diff=DIFF, grading_rules=DEFAULT_GRADING_RULES, deadline=current_time() + 0.1
+        )
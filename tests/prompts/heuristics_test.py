@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import pytest
+
+from gitmind.prompts.grade_commit import GradeCommitHandler
+from gitmind.prompts.heuristics import (
+    OFFLINE_REASON,
+    CommitSignals,
+    compute_commit_signals,
+    grade_by_heuristics,
+    is_test_file,
+    is_trivial_file,
+    pre_grade,
+)
+from gitmind.rules import DEFAULT_GRADING_RULES
+from tests.data_fixtures import commit_metadata
+from tests.helpers import create_mock_client
+
+
+def create_diff(files: dict[str, int]) -> str:
+    return "".join(
+        f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1,{lines} +1,{lines} @@\n"
+        + "-old\n+new\n" * lines
+        for path, lines in files.items()
+    )
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("README.md", True),
+        ("docs/index.rst", True),
+        ("uv.lock", True),
+        ("LICENSE", True),
+        ("CHANGELOG.md", True),
+        ("src/main.py", False),
+        ("Makefile", False),
+    ],
+)
+def test_is_trivial_file(path: str, expected: bool) -> None:
+    assert is_trivial_file(path) is expected
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("tests/utils/diff_test.py", True),
+        ("test_main.py", True),
+        ("src/app.spec.ts", True),
+        ("src/__tests__/app.js", True),
+        ("conftest.py", True),
+        ("src/main.py", False),
+        ("src/testing.py", False),
+    ],
+)
+def test_is_test_file(path: str, expected: bool) -> None:
+    assert is_test_file(path) is expected
+
+
+def test_compute_commit_signals() -> None:
+    signals = compute_commit_signals(create_diff({"src/a.py": 3, "src/b.py": 1, "tests/a_test.py": 2, "README.md": 1}))
+
+    assert signals == CommitSignals(
+        files_changed=4,
+        insertions=7,
+        deletions=7,
+        directories_changed=3,
+        code_files_changed=2,
+        test_files_changed=1,
+        trivial_files_changed=1,
+    )
+
+
+def test_grade_by_heuristics() -> None:
+    docs_only = grade_by_heuristics(compute_commit_signals(create_diff({"README.md": 1})), DEFAULT_GRADING_RULES)
+    assert sorted(docs_only) == ["changes_scope", "test_quality", "triviality"]
+    assert docs_only["changes_scope"]["grade"] == 10
+    assert docs_only["test_quality"]["grade"] == "NOT_EVALUATED"
+    assert all(result["heuristic"] for result in docs_only.values())
+
+    focused = grade_by_heuristics(compute_commit_signals(create_diff({"a.py": 5, "b.py": 5})), DEFAULT_GRADING_RULES)
+    assert list(focused) == ["changes_scope"]
+    assert focused["changes_scope"]["grade"] == 9
+
+    spread = compute_commit_signals(create_diff({"src/a.py": 5, "lib/b.py": 5, "tests/a_test.py": 5}))
+    assert grade_by_heuristics(spread, DEFAULT_GRADING_RULES) == {}
+    assert grade_by_heuristics(compute_commit_signals(create_diff({"a.py": 500})), DEFAULT_GRADING_RULES) == {}
+
+
+def test_pre_grade() -> None:
+    diff = create_diff({"README.md": 1})
+
+    off = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode="off")
+    signals = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode="signals")
+    prefill = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode="prefill")
+    offline = pre_grade(diff, grading_rules=DEFAULT_GRADING_RULES, mode="offline")
+
+    assert off == {"signals": None, "results": {}, "remaining_rules": DEFAULT_GRADING_RULES}
+    assert signals["signals"] == compute_commit_signals(diff)
+    assert signals["results"] == {}
+    assert sorted(prefill["results"]) == ["changes_scope", "test_quality", "triviality"]
+    assert len(prefill["remaining_rules"]) == len(DEFAULT_GRADING_RULES) - 3
+    assert not offline["remaining_rules"]
+    assert offline["results"]["code_quality"] == {"grade": "NOT_EVALUATED", "reason": OFFLINE_REASON, "heuristic": True}
+
+
+def test_grading_prompt_signals() -> None:
+    handler = GradeCommitHandler(create_mock_client())
+    diff = create_diff({"a.py": 1})
+
+    messages, _, _ = handler.create_prompt(
+        metadata=commit_metadata, diff=diff, grading_rules=DEFAULT_GRADING_RULES, signals=compute_commit_signals(diff)
+    )
+    plain_messages, _, _ = handler.create_prompt(
+        metadata=commit_metadata, diff=diff, grading_rules=DEFAULT_GRADING_RULES
+    )
+
+    assert "**Commit Signals**:\n- Files Changed: 1\n" in messages[1].content
+    assert "**Commit Signals**" not in plain_messages[1].content
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from json import dumps
+
+from gitmind.caching import InMemoryCache
+from gitmind.caching.entry import decode_entry
+from gitmind.exceptions import LLMClientError
+from gitmind.prompts.router import ModelRouter, classify_by_heuristics
+from tests.data_fixtures import commit_metadata
+from tests.helpers import create_mock_client
+
+
+def create_diff(files: dict[str, int]) -> str:
+    return "".join(
+        f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1,{lines} +1,{lines} @@\n"
+        + "-old\n+new\n" * lines
+        for path, lines in files.items()
+    )
+
+
+def test_classify_by_heuristics() -> None:
+    assert classify_by_heuristics(create_diff({"README.md": 500, "uv.lock": 2000}), max_simple_lines=30) == (
+        "simple",
+        "only documentation, lockfiles or repository metadata changed",
+    )
+    assert classify_by_heuristics(create_diff({"a.py": 5, "b.py": 5}), max_simple_lines=30) == (
+        "simple",
+        "20 lines changed in 2 files",
+    )
+    assert classify_by_heuristics(create_diff({"a.py": 100}), max_simple_lines=30) == (
+        "complex",
+        "200 lines changed in 1 files",
+    )
+    assert classify_by_heuristics(create_diff({f"{name}.py": 1 for name in "abcdefghijklm"}), max_simple_lines=30) == (
+        "complex",
+        "26 lines changed in 13 files",
+    )
+    assert classify_by_heuristics(create_diff({"a.py": 20}), max_simple_lines=30) is None
+
+
+async def test_model_router_heuristics() -> None:
+    strong_client = create_mock_client()
+    triage_client = create_mock_client()
+    router = ModelRouter(strong_client=strong_client, triage_client=triage_client, max_simple_lines=30, classify=True)
+
+    simple = await router.route(metadata=commit_metadata, diff=create_diff({"a.py": 1}))
+    complex_ = await router.route(metadata=commit_metadata, diff=create_diff({"a.py": 100}))
+
+    assert simple["tier"] == "triage"
+    assert simple["source"] == "heuristics"
+    assert complex_["tier"] == "strong"
+    assert router.get_client("triage") is triage_client
+    assert router.get_client("strong") is strong_client
+    assert triage_client.create_completions.call_count == 0
+
+
+async def test_model_router_classifier() -> None:
+    cache = InMemoryCache()
+    triage_client = create_mock_client(return_value=dumps({"complexity": "simple", "reason": "a rename"}))
+    router = ModelRouter(
+        strong_client=create_mock_client(), triage_client=triage_client, max_simple_lines=30, classify=True, cache=cache
+    )
+
+    decision = await router.route(metadata=commit_metadata, diff=create_diff({"a.py": 20}))
+    assert decision == {"tier": "triage", "reason": "a rename", "source": "classifier"}
+
+    assert await router.route(metadata=commit_metadata, diff=create_diff({"a.py": 20})) == decision
+    assert triage_client.create_completions.call_count == 1, "The classification should be cached."
+    entries = [
+        decode_entry(value) for value in (await cache.get_many([key async for key in cache.iter_keys()])).values()
+    ]
+    assert [entry["metadata"]["model_tier"] for entry in entries if entry is not None] == ["triage"]
+
+
+async def test_model_router_falls_back_to_the_strong_model() -> None:
+    failing_client = create_mock_client(exc=LLMClientError("test"))
+    diff = create_diff({"a.py": 20})
+
+    with_classifier = ModelRouter(
+        strong_client=create_mock_client(), triage_client=failing_client, max_simple_lines=30, classify=True
+    )
+    without_classifier = ModelRouter(
+        strong_client=create_mock_client(), triage_client=failing_client, max_simple_lines=30
+    )
+
+    assert (await with_classifier.route(metadata=commit_metadata, diff=diff))["source"] == "default"
+    assert (await without_classifier.route(metadata=commit_metadata, diff=diff))["tier"] == "strong"
+    assert failing_client.create_completions.call_count == 1
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import TYPE_CHECKING
+
+import pytest
+from click import Context
+
+from gitmind.cli.commands.report import handle_report, report
+from gitmind.reporting.rollups import ROOT_PATH, RollupStore, create_contribution, get_week
+from tests.cli.commands.commit_test import create_cli_context
+from tests.data_fixtures import grade_commit_response
+from tests.helpers import create_mock_client
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from gitmind.prompts.grade_commit import CommitGradingResult
+    from gitmind.reporting.rollups import CommitContribution
+    from gitmind.utils.commit import CommitMetadata
+
+WEEK = 7 * 24 * 60 * 60
+
+
+def create_metadata(commit_hash: str, author_email: str = "jeronimo@example.com", week: int = 0) -> CommitMetadata:
+    return {
+        "author_email": author_email,
+        "author_name": "Jeronimo",
+        "commiter_email": author_email,
+        "commiter_name": "Jeronimo",
+        "hex": commit_hash,
+        "message": "fix: change a",
+        "parent_hex": None,
+        "timestamp": 1704067200 + week * WEEK,
+    }
+
+
+def create_results(grade: int) -> dict[str, CommitGradingResult]:
+    return {
+        "code_quality": {"grade": grade, "reason": "Readable."},
+        "test_quality": {"grade": "NOT_EVALUATED", "reason": "No code changed."},
+    }
+
+
+def contribute(
+    commit_hash: str, grade: int, author_email: str = "jeronimo@example.com", week: int = 0
+) -> CommitContribution:
+    diff = "diff --git a/src/a.py b/src/a.py\n+a = 1\ndiff --git a/setup.py b/setup.py\n+b = 2\n"
+    return create_contribution(create_metadata(commit_hash, author_email, week), diff, create_results(grade))
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[RollupStore]:
+    with RollupStore(tmp_path / "rollups.sqlite3") as rollup_store:
+        yield rollup_store
+
+
+def test_create_contribution() -> None:
+    contribution = contribute("abc", 7)
+
+    assert contribution == {
+        "commit_hash": "abc",
+        "keys": {"author": ["jeronimo@example.com"], "week": ["2024-W01"], "path": [ROOT_PATH, "src"]},
+        "grades": {"code_quality": 7},
+    }
+    assert get_week(1704067200 - 1) == "2023-W52"
+
+
+def test_record_is_idempotent(store: RollupStore) -> None:
+    assert store.record(contribute("abc", 6))
+    assert not store.record(contribute("abc", 6)), "Recording the same grades again should change nothing."
+    assert store.record(contribute("abc", 8)), "Grading a commit again should replace its grades."
+    assert store.record(contribute("def", 4))
+
+    result = store.report()
+
+    assert result["commits"] == 2
+    assert result["rules"] == {"code_quality": {"count": 2, "mean": 6.0, "std": 2.0, "histogram": {4: 1, 8: 1}}}
+    assert set(result["dimensions"]["path"]) == {ROOT_PATH, "src"}
+    assert store.get_recorded_commits(["abc", "def", "ghi"]) == {"abc", "def"}
+    assert store.get_recorded_grades(["abc", "ghi"]) == {"abc": {"code_quality": 8}}
+
+
+def test_concurrent_records_count_a_commit_once(store: RollupStore) -> None:
+    contributions = [contribute("abc", 1 + index % 10) for index in range(64)]
+    barrier = Barrier(8)
+
+    def record(contribution: CommitContribution) -> bool:
+        barrier.wait()
+        return store.record(contribution)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(record, contributions))
+
+    result = store.report()
+    assert result["commits"] == 1
+    assert result["rules"]["code_quality"]["count"] == 1, "Concurrent records of a commit should replace each other."
+    assert all(
+        statistics["code_quality"]["count"] == 1
+        for dimension in result["dimensions"].values()
+        for statistics in dimension.values()
+    )
+
+
+def test_report_trends_and_outliers(store: RollupStore) -> None:
+    for week in range(4):
+        for index in range(5):
+            store.record(contribute(f"{week}-{index}", 4 + week, week=week))
+    for index in range(5):
+        store.record(contribute(f"outlier-{index}", 1, author_email="outlier@example.com"))
+
+    result = store.report(dimensions=["author"])
+
+    assert set(result["dimensions"]) == {"author"}
+    trend = result["trends"]["code_quality"]
+    assert list(trend["weeks"]) == ["2024-W01", "2024-W02", "2024-W03", "2024-W04"]
+    assert trend["slope"] > 0
+    assert [(outlier["key"], outlier["z_score"] < 0) for outlier in result["outliers"]] == [
+        ("outlier@example.com", True)
+    ]
+    assert store.report(rules=("test_quality",))["rules"] == {}
+
+
+async def test_handle_report_records_range(tmp_path: Path) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+    ctx = Context(report, obj=cli_ctx)
+
+    result = await handle_report(ctx, "main~2..main", (), ())
+    assert result["commits"] == 2
+    assert set(result["dimensions"]) == {"author", "week", "path"}
+
+    result = await handle_report(ctx, "main", ("path",), ())
+    assert result["commits"] == 4
+    assert set(result["dimensions"]) == {"path"}
+    assert mock_client.create_completions.call_count == 4, "Recorded commits should not be graded again."
+    cli_ctx["rollups"].close()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from gitmind.reporting.sampling import (
+    SampleCommit,
+    allocate_sample,
+    estimate_mean,
+    get_sample_size,
+    select_sample,
+    stratify,
+)
+
+
+def create_commits(count: int) -> list[SampleCommit]:
+    return [
+        SampleCommit(commit_hash=f"{index:04d}", timestamp=1700000000 + index, changed_files=1 + (index % 3) * 5)
+        for index in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("population", "expected"),
+    [(3, 3), (20, 5), (200, 20)],
+)
+def test_get_sample_size(population: int, expected: int) -> None:
+    assert get_sample_size(population) == expected
+
+
+def test_stratify() -> None:
+    strata = stratify(create_commits(12))
+
+    assert set(strata) == {(period, size) for period in range(4) for size in range(3)}
+    assert [commit["commit_hash"] for commit in strata[0, 0]] == ["0000"]
+    assert [commit["commit_hash"] for commit in strata[3, 2]] == ["0011"]
+
+
+def test_allocate_sample() -> None:
+    assert allocate_sample({(0, 0): 80, (0, 1): 15, (1, 0): 5}, 10) == {(0, 0): 8, (0, 1): 1, (1, 0): 1}
+    assert allocate_sample({(0, 0): 1, (0, 1): 1, (1, 0): 1}, 2) == {(0, 0): 1, (0, 1): 1, (1, 0): 0}
+    assert allocate_sample({(0, 0): 2, (0, 1): 1}, 5) == {(0, 0): 2, (0, 1): 1}
+
+
+def test_select_sample_prefers_graded_commits() -> None:
+    strata = stratify(create_commits(40))
+
+    sample = select_sample(strata, 12, graded={"0000", "0003", "0006"})
+    selected = [commit_hash for commit_hashes in sample.values() for commit_hash in commit_hashes]
+
+    assert len(selected) == 14, "Graded commits should be added on top of the allocation of their stratum."
+    assert {"0000", "0003", "0006"} <= set(selected)
+    assert len(sample) == len(strata)
+    assert select_sample(strata, 12, graded={"0000", "0003", "0006"}) == sample
+
+
+def test_estimate_mean() -> None:
+    populations = {(0, 0): 10, (0, 1): 30}
+
+    estimate = estimate_mean({(0, 0): [2, 4], (0, 1): [8, 8, 6]}, populations)
+
+    assert estimate is not None
+    assert estimate["count"] == 5
+    assert estimate["mean"] == pytest.approx(0.25 * 3 + 0.75 * 22 / 3)
+    assert estimate["lower"] < estimate["mean"] < estimate["upper"]
+
+
+def test_estimate_mean_of_complete_population() -> None:
+    estimate = estimate_mean({(0, 0): [5, 7], (1, 0): [9]}, {(0, 0): 2, (1, 0): 1})
+
+    assert estimate == {"mean": 7.0, "lower": 7.0, "upper": 7.0, "count": 3}
+    assert estimate_mean({(0, 0): []}, {(0, 0): 4}) is None
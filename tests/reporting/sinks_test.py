@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from csv import DictReader
+from io import BytesIO
+from json import loads
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from gitmind.exceptions import ConfigurationError
+from gitmind.reporting.sinks import (
+    GRADE_COLUMNS,
+    ArrowSink,
+    NDJSONSink,
+    flatten_range_result,
+    get_output_format,
+    open_sink,
+)
+from tests.data_fixtures import describe_commit_response, grade_commit_response
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from gitmind.cli.commands.commit import RangeResult
+
+
+def create_range_result(result: Any, commit_hash: str = "abc") -> RangeResult:
+    return {
+        "commit_hash": commit_hash,
+        "timestamp": 1700000000,
+        "author_name": "Jeronimo",
+        "author_email": "jeronimo@example.com",
+        "result": result,
+    }
+
+
+grading_result = {
+    "code_quality": {"grade": 7, "reason": "Readable."},
+    "test_quality": {"grade": "NOT_EVALUATED", "reason": "No code changed.", "heuristic": True},
+}
+
+
+@pytest.mark.parametrize(
+    ("output", "output_format", "expected"),
+    [
+        (None, None, "ndjson"),
+        (None, "csv", "csv"),
+        ("grades.parquet", None, "parquet"),
+        ("grades.feather", None, "arrow"),
+        ("grades.csv", "ndjson", "ndjson"),
+        ("grades.txt", None, "ndjson"),
+    ],
+)
+def test_get_output_format(tmp_path: Path, output: str | None, output_format: Any, expected: str) -> None:
+    assert get_output_format(tmp_path / output if output else None, output_format) == expected
+
+
+def test_get_output_format_requires_a_path_for_columnar_formats() -> None:
+    with pytest.raises(ConfigurationError):
+        get_output_format(None, "parquet")
+
+
+def test_flatten_range_result() -> None:
+    grade_rows = flatten_range_result("grade", create_range_result(grading_result))
+    description_rows = flatten_range_result("describe", create_range_result(loads(describe_commit_response)))
+
+    assert grade_rows == [
+        {
+            "commit_hash": "abc",
+            "timestamp": 1700000000,
+            "author_name": "Jeronimo",
+            "author_email": "jeronimo@example.com",
+            "rule": "code_quality",
+            "grade": 7,
+            "reason": "Readable.",
+            "heuristic": False,
+        },
+        {
+            "commit_hash": "abc",
+            "timestamp": 1700000000,
+            "author_name": "Jeronimo",
+            "author_email": "jeronimo@example.com",
+            "rule": "test_quality",
+            "grade": None,
+            "reason": "No code changed.",
+            "heuristic": True,
+        },
+    ]
+    assert len(description_rows) == 1
+    assert description_rows[0]["programming_languages"] == "Python"
+    assert description_rows[0]["files_described"] == 14
+
+
+def test_ndjson_sink() -> None:
+    output = BytesIO()
+    with NDJSONSink(output, GRADE_COLUMNS, close_output=False) as sink:
+        sink.write(flatten_range_result("grade", create_range_result(grading_result)))
+
+    lines = [loads(line) for line in output.getvalue().splitlines()]
+    assert [line["rule"] for line in lines] == ["code_quality", "test_quality"]
+    assert list(lines[0]) == sorted(GRADE_COLUMNS)
+
+
+def test_csv_sink(tmp_path: Path) -> None:
+    output = tmp_path / "grades.csv"
+    with open_sink("grade", output=output) as sink:
+        sink.write(flatten_range_result("grade", create_range_result(loads(grade_commit_response))))
+
+    with output.open(newline="") as f:
+        rows = list(DictReader(f))
+    assert len(rows) == len(loads(grade_commit_response))
+    assert list(rows[0]) == list(GRADE_COLUMNS)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_arrow_sink_writes_row_groups(tmp_path: Path, output_format: Any) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+    ipc = pytest.importorskip("pyarrow.ipc")
+
+    output = tmp_path / f"grades.{output_format}"
+    with ArrowSink(output, GRADE_COLUMNS, output_format, row_group_size=3) as sink:
+        for i in range(4):
+            sink.write(flatten_range_result("grade", create_range_result(grading_result, commit_hash=str(i))))
+
+    if output_format == "parquet":
+        parquet_file = parquet.ParquetFile(output)
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+    else:
+        reader = ipc.open_file(output)
+        assert reader.num_record_batches == 3
+        table = reader.read_all()
+
+    assert table.num_rows == 8
+    assert table.column_names == list(GRADE_COLUMNS)
+    assert table.column("grade").to_pylist()[:2] == [7, None]
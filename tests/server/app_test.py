@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import socket
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+from anyio import Path as AsyncPath
+from anyio import create_task_group
+from httpx import AsyncClient
+from pygit2 import init_repository
+
+from gitmind.cli._utils import CLIContext
+from gitmind.config import GitMindSettings
+from gitmind.exceptions import ServerError
+from gitmind.server.app import AnalysisServer, run_server
+from gitmind.server.client import connect_to_server, get_token_path, request_analysis, stream_range_analysis
+from gitmind.utils.serialization import deserialize
+from tests.data_fixtures import grade_commit_response
+from tests.helpers import create_commit, create_mock_client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import AsyncMock
+
+    from pygit2 import Oid
+
+
+def create_cli_context(tmp_path: Path, mock_client: AsyncMock, provider_model: str = "gpt-4o") -> CLIContext:
+    settings = GitMindSettings(
+        target_repo=str(tmp_path),
+        server_socket=str(tmp_path / "gitmind.sock"),
+        provider_name="openai",
+        provider_api_key="abc-jeronimo",  # type: ignore[arg-type]
+        provider_model=provider_model,
+    )
+    settings.__dict__["llm_client"] = mock_client
+    return CLIContext(settings=settings, repo=init_repository(str(tmp_path)))
+
+
+@pytest.fixture
+def commits(tmp_path: Path) -> tuple[Oid, Oid]:
+    repo = init_repository(str(tmp_path))
+    first = create_commit(repo, {"a.py": "a = 1\n"}, "feat: add a")
+    second = create_commit(repo, {"a.py": "a = 2\n"}, "fix: change a", [first])
+    return first, second
+
+
+async def test_handle_request_routes(tmp_path: Path) -> None:
+    server = AnalysisServer(create_cli_context(tmp_path, create_mock_client()))
+
+    health = await server.handle_request("GET", "/health", b"")
+    assert health.status == 200
+    assert deserialize(health.body, dict)["status"] == "ok"  # type: ignore[arg-type]
+
+    assert (await server.handle_request("POST", "/unknown", b"")).status == 404
+    assert (await server.handle_request("GET", "/grade", b"")).status == 405
+    assert (await server.handle_request("POST", "/grade", b'{"revspec": "main"}')).status == 400
+    assert (await server.handle_request("POST", "/grade", b'{"commit_hash": "0000000"}')).status == 404
+
+
+async def test_server_round_trip(tmp_path: Path, commits: tuple[Oid, Oid]) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+    socket_path = tmp_path / "gitmind.sock"
+
+    async with create_task_group() as tg:
+        await tg.start(partial(run_server, cli_ctx=cli_ctx, socket_path=socket_path))
+
+        async with connect_to_server(cli_ctx["settings"]) as client:
+            assert client is not None
+            first = await request_analysis(client, "grade", commit_hash=str(commits[1]))
+            second = await request_analysis(client, "grade", commit_hash=str(commits[1]))
+            assert first == second
+            assert mock_client.create_completions.call_count == 1, "The server cache should be warm."
+
+            results = [item async for item in stream_range_analysis(client, "grade", revspec=str(commits[1]))]
+            assert [item["commit_hash"] for item in results] == [str(commits[1]), str(commits[0])]
+
+            with pytest.raises(ServerError):
+                await request_analysis(client, "grade", commit_hash="0" * 40)
+
+        other_ctx = create_cli_context(tmp_path, mock_client, provider_model="gpt-4o-mini")
+        async with connect_to_server(other_ctx["settings"]) as client:
+            assert client is None, "Commands should not be forwarded to a server with different settings."
+
+        tg.cancel_scope.cancel()
+
+    assert not await AsyncPath(socket_path).exists()
+
+
+async def test_connect_to_server_without_server(tmp_path: Path) -> None:
+    cli_ctx = create_cli_context(tmp_path, create_mock_client())
+
+    async with connect_to_server(cli_ctx["settings"]) as client:
+        assert client is None
+
+    await AsyncPath(tmp_path / "gitmind.sock").touch()
+    async with connect_to_server(cli_ctx["settings"]) as client:
+        assert client is None
+
+
+def test_check_request() -> None:
+    json_headers = {b"content-type": b"application/json; charset=utf-8"}
+    assert AnalysisServer.check_request("POST", json_headers, None) is None
+    assert AnalysisServer.check_request("GET", {}, None) is None
+    response = AnalysisServer.check_request("POST", {b"content-type": b"text/plain"}, None)
+    assert response is not None
+    assert response.status == 415
+
+    authorized = {**json_headers, b"host": b"127.0.0.1:8000", b"authorization": b"Bearer jeronimo"}
+    assert AnalysisServer.check_request("POST", authorized, "jeronimo") is None
+    assert AnalysisServer.check_request("GET", {**authorized, b"host": b"localhost"}, "jeronimo") is None
+    for headers, status in (
+        ({**authorized, b"host": b"attacker.example:8000"}, 403),
+        ({**authorized, b"authorization": b"Bearer wrong"}, 401),
+        ({**json_headers, b"host": b"127.0.0.1:8000"}, 401),
+    ):
+        response = AnalysisServer.check_request("POST", headers, "jeronimo")
+        assert response is not None
+        assert response.status == status
+
+
+async def test_tcp_requests_require_token(tmp_path: Path, commits: tuple[Oid, Oid]) -> None:
+    mock_client = create_mock_client(return_value=grade_commit_response)
+    cli_ctx = create_cli_context(tmp_path, mock_client)
+    token_path = get_token_path(cli_ctx["settings"])
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async with create_task_group() as tg:
+        await tg.start(partial(run_server, cli_ctx=cli_ctx, port=port))
+        assert token_path.stat().st_mode & 0o777 == 0o600
+        token = token_path.read_text()
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            body = f'{{"commit_hash": "{commits[1]}"}}'
+            assert (
+                await client.post("/grade", content=body, headers={"content-type": "text/plain"})
+            ).status_code == 401
+            assert (await client.get("/health")).status_code == 401
+
+            headers = {"authorization": f"Bearer {token}"}
+            response = await client.post("/grade", content=body, headers={**headers, "content-type": "text/plain"})
+            assert response.status_code == 415
+            response = await client.post(
+                "/grade", content=body, headers={**headers, "content-type": "application/json", "host": "evil.test"}
+            )
+            assert response.status_code == 403
+            assert mock_client.create_completions.call_count == 0
+
+            response = await client.post(
+                "/grade", content=body, headers={**headers, "content-type": "application/json"}
+            )
+            assert response.status_code == 200
+            assert mock_client.create_completions.call_count == 1
+
+        tg.cancel_scope.cancel()
+
+    assert not token_path.exists()
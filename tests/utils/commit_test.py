@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from pygit2 import Index, IndexEntry, init_repository
+from pygit2.enums import FileMode, ResetMode, SortMode
+
+from gitmind.exceptions import SkippedCommitError
+from gitmind.utils.commit import (
+    CommitRecord,
+    extract_commit_data,
+    extract_staged_data,
+    get_commit,
+    get_merged_commits,
+    get_staged_tree,
+    iter_commits,
+    matches_pathspec,
+    touches_paths,
+)
+from tests.helpers import create_commit
+
+if TYPE_CHECKING:
+    from pygit2 import Oid, Repository
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Repository:
+    return init_repository(str(tmp_path))
+
+
+@pytest.fixture
+def merge_commit(repo: Repository) -> Oid:
+    base = create_commit(repo, {"a.py": "a = 1\n", "b.py": "b = 1\n"}, "base")
+    main = create_commit(repo, {"a.py": "a = 2\n", "b.py": "b = 1\n"}, "change a on main", [base])
+    feature_one = create_commit(repo, {"a.py": "a = 1\n", "b.py": "b = 2\n"}, "change b on feature", [base])
+    feature_two = create_commit(
+        repo, {"a.py": "a = 3\n", "b.py": "b = 2\n", "c.py": "c = 1\n"}, "add c on feature", [feature_one]
+    )
+    return create_commit(
+        repo,
+        {"a.py": "a = 4\n", "b.py": "b = 2\n", "c.py": "c = 1\n"},
+        "merge feature",
+        [main, feature_two],
+    )
+
+
+def test_extract_commit_data_diffs_parent_to_commit(repo: Repository) -> None:
+    first = create_commit(repo, {"a.py": "a = 1\n"}, "first")
+    second = create_commit(repo, {"a.py": "a = 1\nb = 2\n"}, "second", [first])
+
+    statistics, metadata, diff = extract_commit_data(repo=repo, commit_hex=str(second))
+
+    assert statistics == {"insertions": 1, "deletions": 0, "files_changed": 1}
+    assert metadata["parent_hex"] == str(first)
+    assert metadata["message"] == "second"
+    assert "+b = 2" in diff
+
+
+def test_extract_commit_data_root_commit(repo: Repository) -> None:
+    root = create_commit(repo, {"a.py": "a = 1\n"}, "root")
+
+    statistics, metadata, diff = extract_commit_data(repo=repo, commit_hex=str(root))
+
+    assert statistics == {"insertions": 1, "deletions": 0, "files_changed": 1}
+    assert metadata["parent_hex"] is None
+    assert "+a = 1" in diff
+
+
+def test_extract_commit_data_merge_first_parent(repo: Repository, merge_commit: Oid) -> None:
+    statistics, _, diff = extract_commit_data(repo=repo, commit_hex=str(merge_commit))
+
+    assert statistics["files_changed"] == 3
+    assert "b.py" in diff
+    assert "c.py" in diff
+
+
+def test_extract_commit_data_merge_combined(repo: Repository, merge_commit: Oid) -> None:
+    statistics, _, diff = extract_commit_data(repo=repo, commit_hex=str(merge_commit), merge_strategy="combined")
+
+    assert statistics == {"insertions": 1, "deletions": 1, "files_changed": 1}
+    assert "+a = 4" in diff
+    assert "b.py" not in diff
+    assert "c.py" not in diff
+
+
+def test_extract_commit_data_merge_merged_commits(repo: Repository, merge_commit: Oid) -> None:
+    statistics, _, diff = extract_commit_data(repo=repo, commit_hex=str(merge_commit), merge_strategy="merged-commits")
+
+    assert statistics == {"insertions": 0, "deletions": 0, "files_changed": 0}
+    assert diff.splitlines() == [
+        f"- {str(commit.id)[:7]} {commit.message}"
+        for commit in get_merged_commits(repo=repo, commit=get_commit(repo=repo, commit_hex=str(merge_commit)))
+    ]
+    assert "add c on feature" in diff
+    assert "change b on feature" in diff
+    assert "change a on main" not in diff
+
+
+def test_extract_commit_data_merged_commits_with_summaries(repo: Repository, merge_commit: Oid) -> None:
+    merged = get_merged_commits(repo=repo, commit=get_commit(repo=repo, commit_hex=str(merge_commit)))
+    summarised = next(commit for commit in merged if commit.message == "add c on feature")
+
+    _, _, diff = extract_commit_data(
+        repo=repo,
+        commit_hex=str(merge_commit),
+        merge_strategy="merged-commits",
+        merged_summaries={str(summarised.id): "Adds the c module."},
+    )
+
+    assert f"- {str(summarised.id)[:7]} add c on feature\n  Adds the c module." in diff
+    assert diff.count("\n  ") == 1, "Merged commits without a summary should be listed by their subject only."
+    record = CommitRecord(repo, get_commit(repo=repo, commit_hex=str(merge_commit)))
+    assert record.extract_data(
+        merge_strategy="merged-commits", merged_summaries={str(summarised.id): "Adds the c module."}
+    ) == extract_commit_data(
+        repo=repo,
+        commit_hex=str(merge_commit),
+        merge_strategy="merged-commits",
+        merged_summaries={str(summarised.id): "Adds the c module."},
+    )
+
+
+def test_extract_commit_data_merge_skip(repo: Repository, merge_commit: Oid) -> None:
+    with pytest.raises(SkippedCommitError):
+        extract_commit_data(repo=repo, commit_hex=str(merge_commit), merge_strategy="skip")
+
+
+def test_extract_commit_data_skip_does_not_apply_to_regular_commits(repo: Repository) -> None:
+    root = create_commit(repo, {"a.py": "a = 1\n"}, "root")
+    statistics, _, _ = extract_commit_data(repo=repo, commit_hex=str(root), merge_strategy="skip")
+    assert statistics["files_changed"] == 1
+
+
+def test_get_merged_commits_for_regular_commit(repo: Repository) -> None:
+    root = create_commit(repo, {"a.py": "a = 1\n"}, "root")
+    assert get_merged_commits(repo=repo, commit=get_commit(repo=repo, commit_hex=str(root))) == []
+
+
+def test_get_commit_not_found(repo: Repository) -> None:
+    with pytest.raises(ValueError):
+        get_commit(repo=repo, commit_hex="0" * 40)
+
+
+@pytest.fixture
+def history(repo: Repository) -> list[Oid]:
+    first = create_commit(repo, {"src/a.py": "a = 1\n"}, "first", author="Alice", timestamp=1000)
+    second = create_commit(
+        repo, {"src/a.py": "a = 1\n", "docs/a.md": "# A\n"}, "second", [first], author="Bob", timestamp=2000
+    )
+    third = create_commit(
+        repo, {"src/a.py": "a = 2\n", "docs/a.md": "# A\n"}, "third", [second], author="Alice", timestamp=3000
+    )
+    repo.references.create("refs/heads/main", third)
+    repo.set_head("refs/heads/main")
+    return [first, second, third]
+
+
+def test_iter_commits_yields_records_newest_first(repo: Repository, history: list[Oid]) -> None:
+    records = list(iter_commits(repo=repo))
+
+    assert [record.hex for record in records] == [str(oid) for oid in reversed(history)]
+    assert all(isinstance(record, CommitRecord) for record in records)
+    assert records[0].parent_hexes == (str(history[1]),)
+    assert records[0].author_name == "Alice"
+    assert records[0].timestamp == 3000
+    assert records[0].message == "third"
+    assert not records[0].is_merge
+    assert not hasattr(records[0], "__dict__")
+
+
+def test_iter_commits_range(repo: Repository, history: list[Oid]) -> None:
+    records = list(iter_commits(repo=repo, revspec=f"{history[0]}..main"))
+    assert [record.hex for record in records] == [str(history[2]), str(history[1])]
+
+
+def test_iter_commits_merge_base_range(repo: Repository, history: list[Oid]) -> None:
+    branch = create_commit(repo, {"src/a.py": "a = 1\n", "b.py": "b = 1\n"}, "branch", [history[0]], timestamp=1500)
+    repo.references.create("refs/heads/branch", branch)
+
+    records = list(iter_commits(repo=repo, revspec="main...branch"))
+
+    assert {record.hex for record in records} == {str(branch), str(history[1]), str(history[2])}
+
+
+def test_iter_commits_filters(repo: Repository, history: list[Oid]) -> None:
+    assert [record.message for record in iter_commits(repo=repo, authors=["alice"])] == ["third", "first"]
+    assert [record.message for record in iter_commits(repo=repo, authors=["bob@example.com"])] == ["second"]
+    assert [record.message for record in iter_commits(repo=repo, paths=["docs"])] == ["second"]
+    assert [record.message for record in iter_commits(repo=repo, paths=["src/a.py"])] == ["third", "first"]
+    assert [
+        record.message
+        for record in iter_commits(
+            repo=repo,
+            since=datetime.fromtimestamp(1500, tz=timezone.utc),
+            until=datetime.fromtimestamp(2500, tz=timezone.utc),
+        )
+    ] == ["second"]
+
+
+def test_iter_commits_since_with_clock_skew(
+    repo: Repository, history: list[Oid], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    skewed = create_commit(repo, {"src/a.py": "a = 3\n"}, "skewed", [history[2]], timestamp=500)
+    newest = create_commit(repo, {"src/a.py": "a = 4\n"}, "newest", [skewed], timestamp=4000)
+    repo.references["refs/heads/main"].set_target(newest)
+    walk = repo.walk
+    # walk children before parents, so that the skewed commit precedes older ancestors with newer commit times
+    monkeypatch.setattr(repo, "walk", lambda oid, _: walk(oid, SortMode.TOPOLOGICAL))
+
+    messages = [
+        record.message for record in iter_commits(repo=repo, since=datetime.fromtimestamp(1500, tz=timezone.utc))
+    ]
+
+    assert messages == ["newest", "third", "second"], "Commits after a skewed commit should not be dropped."
+
+
+def test_iter_commits_first_parent(repo: Repository, merge_commit: Oid) -> None:
+    repo.references.create("refs/heads/main", merge_commit)
+
+    messages = {record.message for record in iter_commits(repo=repo, revspec="main", first_parent=True)}
+
+    assert messages == {"merge feature", "change a on main", "base"}
+
+
+def test_iter_commits_unknown_revspec(repo: Repository, history: list[Oid]) -> None:
+    with pytest.raises(ValueError):
+        next(iter_commits(repo=repo, revspec="does-not-exist"))
+
+
+def test_commit_record_extract_data(repo: Repository, history: list[Oid]) -> None:
+    record = next(iter_commits(repo=repo))
+    statistics, metadata, diff = record.extract_data()
+
+    assert statistics == {"insertions": 1, "deletions": 1, "files_changed": 1}
+    assert metadata["hex"] == record.hex
+    assert "+a = 2" in diff
+
+
+def test_commit_record_count_changed_files(repo: Repository, history: list[Oid]) -> None:
+    assert [record.count_changed_files() for record in iter_commits(repo=repo)] == [1, 1, 1]
+    branch = create_commit(
+        repo, {"src/a.py": "a = 3\n", "docs/a.md": "# A\n", "b.py": "b = 1\n"}, "branch", [history[2]]
+    )
+    repo.references.create("refs/heads/branch", branch)
+    assert next(iter_commits(repo=repo, revspec="branch")).count_changed_files() == 2
+
+
+@pytest.mark.parametrize(
+    "path, paths, exclude_paths, expected",
+    (
+        ("src/a.py", None, None, True),
+        ("src/a.py", ["src"], None, True),
+        ("src/a.py", ["src/"], None, True),
+        ("srcs/a.py", ["src"], None, False),
+        ("src/a.py", ["*.py"], None, True),
+        ("src/a.py", ["src"], ["src/a.py"], False),
+        ("src/a.py", None, ["*.md"], True),
+        ("docs/a.md", None, ["*.md"], False),
+    ),
+)
+def test_matches_pathspec(path: str, paths: list[str] | None, exclude_paths: list[str] | None, expected: bool) -> None:
+    assert matches_pathspec(path, paths, exclude_paths) is expected
+
+
+def test_touches_paths(repo: Repository, history: list[Oid]) -> None:
+    third = get_commit(repo=repo, commit_hex=str(history[2]))
+    first = get_commit(repo=repo, commit_hex=str(history[0]))
+
+    assert touches_paths(third, ["src"])
+    assert not touches_paths(third, ["docs"])
+    assert touches_paths(third, ["src/*.py"])
+    assert not touches_paths(third, None, ["src"])
+    assert not touches_paths(third, ["src"], ["src/a.py"])
+    assert touches_paths(first, ["src"])
+    assert touches_paths(first, None, ["docs"])
+
+
+def test_iter_commits_exclude_paths(repo: Repository, history: list[Oid]) -> None:
+    assert [record.message for record in iter_commits(repo=repo, exclude_paths=["src"])] == ["second"]
+
+
+def test_extract_commit_data_with_paths(repo: Repository, history: list[Oid]) -> None:
+    second = create_commit(
+        repo,
+        {"src/a.py": "a = 3\n", "src/b.py": "b = 1\n", "docs/a.md": "# B\n"},
+        "fourth",
+        [history[2]],
+    )
+
+    statistics, _, diff = extract_commit_data(
+        repo=repo, commit_hex=str(second), paths=["src"], exclude_paths=["*/b.py"]
+    )
+
+    assert statistics == {"insertions": 1, "deletions": 1, "files_changed": 1}
+    assert "src/a.py" in diff
+    assert "src/b.py" not in diff
+    assert "docs/a.md" not in diff
+
+
+def test_extract_commit_data_skips_commits_outside_paths(repo: Repository, history: list[Oid]) -> None:
+    with pytest.raises(SkippedCommitError):
+        extract_commit_data(repo=repo, commit_hex=str(history[2]), paths=["docs"])
+
+
+def stage_files(repo: Repository, files: dict[str, str]) -> None:
+    for path, content in files.items():
+        (Path(repo.workdir) / path).write_text(content)
+        repo.index.add(path)
+    repo.index.write()
+
+
+def test_extract_staged_data_diffs_index_to_head(repo: Repository) -> None:
+    head = create_commit(repo, {"a.py": "a = 1\n"}, "first")
+    repo.set_head(head)
+    repo.reset(head, ResetMode.HARD)
+    stage_files(repo, {"a.py": "a = 2\n", "b.py": "b = 1\n"})
+    (Path(repo.workdir) / "c.py").write_text("c = 1\n")
+
+    tree = get_staged_tree(repo)
+    statistics, metadata, diff = extract_staged_data(repo=repo, tree=tree, message="change a\n")
+
+    assert statistics == {"insertions": 2, "deletions": 1, "files_changed": 2}
+    assert metadata["hex"] == str(tree.id)
+    assert metadata["parent_hex"] == str(head)
+    assert metadata["message"] == "change a"
+    assert "+a = 2" in diff
+    assert "c.py" not in diff, "Unstaged files are not part of the commit."
+    assert get_staged_tree(repo).id == tree.id
+
+
+def test_extract_staged_data_unborn_head(repo: Repository) -> None:
+    stage_files(repo, {"a.py": "a = 1\n"})
+
+    statistics, metadata, diff = extract_staged_data(repo=repo)
+
+    assert statistics == {"insertions": 1, "deletions": 0, "files_changed": 1}
+    assert metadata["parent_hex"] is None
+    assert "+a = 1" in diff
+
+
+def test_extract_staged_data_without_changes(repo: Repository) -> None:
+    head = create_commit(repo, {"a.py": "a = 1\n"}, "first")
+    repo.set_head(head)
+    repo.reset(head, ResetMode.HARD)
+
+    with pytest.raises(SkippedCommitError):
+        extract_staged_data(repo=repo)
+
+
+def test_get_staged_tree_uses_git_index_file(repo: Repository, monkeypatch: pytest.MonkeyPatch) -> None:
+    stage_files(repo, {"a.py": "a = 1\n"})
+    index_path = Path(repo.path) / "index.tmp"
+    temporary_index = Index(str(index_path))
+    temporary_index.add(IndexEntry("b.py", repo.create_blob(b"b = 1\n"), FileMode.BLOB))
+    temporary_index.write()
+    monkeypatch.setenv("GIT_INDEX_FILE", str(index_path))
+
+    assert [entry.name for entry in get_staged_tree(repo)] == ["b.py"]
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pygit2 import init_repository
+
+from gitmind.utils.commit import extract_commit_data, get_commit
+from gitmind.utils.diff import (
+    classify_hunks,
+    estimate_tokens,
+    get_file_statistics,
+    get_patch_fingerprint,
+    get_patch_header,
+    render_hunk,
+    render_patches,
+)
+from tests.helpers import create_commit
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pygit2 import Patch, Repository
+
+BEFORE = "".join(f"    line_{index} = {index}\n" for index in range(40))
+SMALL_CHANGE = BEFORE.replace("line_5 = 5\n", "line_5 = 500\n")
+LARGE_CHANGE = BEFORE.replace(
+    "".join(f"    line_{i} = {i}\n" for i in range(20, 30)), "".join(f"    x_{i} = {i}\n" for i in range(20, 30))
+)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Repository:
+    return init_repository(str(tmp_path))
+
+
+def get_patches(
+    repo: Repository, files_before: dict[str, str], files_after: dict[str, str], context_lines: int
+) -> list[Patch]:
+    before = create_commit(repo, files_before, "before")
+    after = create_commit(repo, files_after, "after", [before])
+    commit = get_commit(repo=repo, commit_hex=str(after))
+    return [patch for patch in commit.parents[0].tree.diff_to_tree(commit.tree, context_lines=context_lines) if patch]
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_render_hunk_trims_context(repo: Repository) -> None:
+    (patch,) = get_patches(repo, {"a.py": BEFORE}, {"a.py": SMALL_CHANGE}, context_lines=5)
+    (hunk,) = patch.hunks
+
+    assert render_hunk(hunk, 0) == "@@ -6,1 +6,1 @@\n-    line_5 = 5\n+    line_5 = 500\n"
+    assert render_hunk(hunk, 1) == (
+        "@@ -5,3 +5,3 @@\n     line_4 = 4\n-    line_5 = 5\n+    line_5 = 500\n     line_6 = 6\n"
+    )
+    assert render_hunk(hunk, 5) == (patch.text or "")[len(get_patch_header(patch)) :]
+
+
+def test_render_hunk_splits_sections(repo: Repository) -> None:
+    after = BEFORE.replace("line_5 = 5\n", "line_5 = 500\n").replace("line_12 = 12\n", "line_12 = 1200\n")
+    (patch,) = get_patches(repo, {"a.py": BEFORE}, {"a.py": after}, context_lines=5)
+    (hunk,) = patch.hunks
+
+    assert render_hunk(hunk, 1).count("@@ -") == 2
+    assert "@@ -12,3 +12,3 @@\n     line_11 = 11\n-    line_12 = 12\n+    line_12 = 1200\n" in render_hunk(hunk, 1)
+
+
+def test_render_hunk_keeps_function_context(repo: Repository) -> None:
+    before = "def foo():\n" + "".join(f"    x_{i} = {i}\n" for i in range(10))
+    after = before.replace("x_8 = 8", "x_8 = 800")
+    (patch,) = get_patches(repo, {"a.py": before}, {"a.py": after}, context_lines=1)
+
+    assert render_hunk(patch.hunks[0], 0).startswith("@@ -10,1 +10,1 @@ def foo():\n")
+
+
+def test_render_hunk_no_newline_at_end_of_file(repo: Repository) -> None:
+    (patch,) = get_patches(repo, {"a.py": " a\n b\nc"}, {"a.py": " a\n b\nd"}, context_lines=1)
+
+    assert render_hunk(patch.hunks[0], 0) == (
+        "@@ -3,1 +3,1 @@\n-c\n\\ No newline at end of file\n+d\n\\ No newline at end of file\n"
+    )
+
+
+def test_render_patches_with_budget_prefers_small_hunks(repo: Repository) -> None:
+    patches = get_patches(
+        repo, {"a.py": BEFORE, "b.py": BEFORE}, {"a.py": SMALL_CHANGE, "b.py": LARGE_CHANGE}, context_lines=3
+    )
+    (small_hunk,) = patches[0].hunks
+    minimal_cost = sum(estimate_tokens(get_patch_header(patch)) for patch in patches)
+    minimal_cost += sum(estimate_tokens(render_hunk(hunk, 0)) for patch in patches for hunk in patch.hunks)
+    small_hunk_cost = estimate_tokens(render_hunk(small_hunk, 1)) - estimate_tokens(render_hunk(small_hunk, 0))
+
+    rendered = render_patches(patches, token_budget=minimal_cost + small_hunk_cost, max_context_lines=3)
+    small_section, large_section = rendered.split("diff --git")[1:]
+
+    assert "     line_4 = 4\n-    line_5 = 5\n+    line_5 = 500\n     line_6 = 6\n" in small_section
+    assert "+    x_29 = 29\n" in large_section
+    assert "line_19" not in large_section
+    assert "line_30" not in large_section
+
+
+def test_render_patches_with_budget_includes_all_context_when_affordable(repo: Repository) -> None:
+    patches = get_patches(repo, {"a.py": BEFORE}, {"a.py": SMALL_CHANGE}, context_lines=3)
+
+    assert render_patches(patches, token_budget=10_000, max_context_lines=3) == patches[0].text
+
+
+def test_extract_commit_data_context_lines(repo: Repository) -> None:
+    before = create_commit(repo, {"a.py": BEFORE}, "before")
+    after = create_commit(repo, {"a.py": SMALL_CHANGE}, "after", [before])
+
+    _, _, no_context = extract_commit_data(repo=repo, commit_hex=str(after))
+    _, _, with_context = extract_commit_data(repo=repo, commit_hex=str(after), context_lines=2)
+    _, _, smart = extract_commit_data(repo=repo, commit_hex=str(after), context_lines=2, context_token_budget=10_000)
+
+    assert "line_4 = 4\n" not in no_context
+    assert "     line_3 = 3\n     line_4 = 4\n" in with_context
+    assert smart == with_context
+
+
+def test_classify_hunks(repo: Repository) -> None:
+    before = "".join(f"x_{i} = {i}\n" for i in range(10))
+    patches = get_patches(
+        repo,
+        {"whitespace.py": before, "swap.py": before, "move.py": before, "change.py": before},
+        {
+            "whitespace.py": before.replace("x_1 = 1", "x_1  =  1\n"),
+            "swap.py": before.replace("x_1 = 1\nx_2 = 2", "x_2 = 2\nx_1 = 1"),
+            "move.py": before.replace("x_1 = 1\n", "").replace("x_8 = 8\n", "x_8 = 8\nx_1 = 1\n"),
+            "change.py": before.replace("x_1 = 1\n", "").replace("x_8 = 8", "x_8 = 800"),
+        },
+        context_lines=0,
+    )
+    kinds = {patch.delta.new_file.path: classify_hunks(patch.hunks) for patch in patches}
+
+    assert kinds == {
+        "whitespace.py": ["whitespace"],
+        "swap.py": ["reorder", "reorder"],
+        "move.py": ["reorder", "reorder"],
+        "change.py": [None, None],
+    }
+
+
+def test_render_patches_minify(repo: Repository) -> None:
+    source = "".join(f"def f_{i}(x):\n    return x + {i}\n" for i in range(50))
+    reformatted = source.replace("    return", "        return")
+    patches = get_patches(
+        repo,
+        {"formatted.py": source, "mixed.py": "a = 1\nb = 2\n\n\nc = 3\n", "removed.py": "x = 1\n"},
+        {"formatted.py": reformatted, "mixed.py": "a  = 1\nb = 2\n\n\nc = 4\n", "added.py": "y = 1\n"},
+        context_lines=0,
+    )
+    full = "".join(patch.text or "" for patch in patches)
+
+    minified = render_patches(patches, max_context_lines=0, minify=True)
+
+    assert minified == (
+        "### added.py (new file)\n"
+        "@@ -0,0 +1,1 @@\n"
+        "+y = 1\n"
+        "### formatted.py (whitespace-only changes, +50 -50)\n"
+        "### mixed.py\n"
+        "@@ -1,1 +1,1 @@ [whitespace-only change, 2 lines]\n"
+        "@@ -5,1 +5,1 @@ b = 2\n"
+        "-c = 3\n"
+        "+c = 4\n"
+        "### removed.py (deleted)\n"
+        "@@ -1,1 +0,0 @@\n"
+        "-x = 1\n"
+    )
+    assert estimate_tokens(minified) < estimate_tokens(full) / 10
+
+
+def test_extract_commit_data_minify(repo: Repository) -> None:
+    before = create_commit(repo, {"a.py": BEFORE}, "before")
+    after = create_commit(repo, {"a.py": BEFORE.replace("    ", "  ")}, "reformat", [before])
+
+    statistics, _, diff = extract_commit_data(repo=repo, commit_hex=str(after), minify=True)
+
+    assert statistics == {"insertions": 40, "deletions": 40, "files_changed": 1}
+    assert diff == "### a.py (whitespace-only changes, +40 -40)\n"
+
+
+def test_get_patch_fingerprint_matches_cherry_picks(repo: Repository) -> None:
+    base = create_commit(repo, {"a.py": BEFORE}, "base")
+    original = create_commit(repo, {"a.py": SMALL_CHANGE}, "change", [base])
+    backport_base = create_commit(
+        repo, {"a.py": "import os\n\n" + BEFORE.replace("line_30 = 30", "line_30 = 3")}, "base"
+    )
+    backport = create_commit(
+        repo,
+        {"a.py": "import os\n\n" + SMALL_CHANGE.replace("line_30 = 30", "line_30 = 3")},
+        "change (backport)",
+        [backport_base],
+        author="Bob",
+    )
+    other = create_commit(repo, {"a.py": LARGE_CHANGE}, "other change", [base])
+
+    fingerprints = {
+        name: get_patch_fingerprint(extract_commit_data(repo=repo, commit_hex=str(oid), context_lines=3)[2])
+        for name, oid in (("original", original), ("backport", backport), ("other", other))
+    }
+
+    assert fingerprints["original"] is not None
+    assert fingerprints["original"] == fingerprints["backport"]
+    assert fingerprints["original"] != fingerprints["other"]
+
+
+def test_get_patch_fingerprint() -> None:
+    diff = "diff --git a/a.py b/a.py\nindex 1..2 100644\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n--- x\n+x\n"
+
+    assert get_patch_fingerprint(diff) == get_patch_fingerprint(diff.replace("@@ -1,1 +1,1 @@", "@@ -9,1 +9,1 @@"))
+    assert get_patch_fingerprint(diff) == get_patch_fingerprint(diff.replace("+x", "+ x"))
+    assert get_patch_fingerprint(diff) != get_patch_fingerprint(diff.replace("--- x", "-x"))
+    assert get_patch_fingerprint(diff) != get_patch_fingerprint(diff.replace("a.py", "b.py"))
+    assert get_patch_fingerprint("### a.py (whitespace-only changes, +1 -1)\n") is not None
+    assert get_patch_fingerprint("diff --git a/a.py b/a.py\nold mode 100644\nnew mode 100755\n") is None
+
+
+def test_get_file_statistics(repo: Repository) -> None:
+    diff = "diff --git a/a.py b/a.py\nindex 1..2 100644\n--- a/a.py\n+++ b/a.py\n@@ -1,2 +1,1 @@\n--- x\n-y\n+x\n"
+
+    assert get_file_statistics(diff) == [{"path": "a.py", "insertions": 1, "deletions": 2}]
+    assert get_file_statistics("### a.py -> b.py (renamed)\n### c.py (whitespace-only changes, +1 -1)\n") == [
+        {"path": "b.py", "insertions": 0, "deletions": 0},
+        {"path": "c.py", "insertions": 0, "deletions": 0},
+    ]
+
+    before = create_commit(repo, {"a.py": BEFORE, "b.md": "b\n"}, "before")
+    after = create_commit(repo, {"a.py": LARGE_CHANGE, "c.md": "c\n"}, "after", [before])
+    for minify in (False, True):
+        _, _, diff = extract_commit_data(repo=repo, commit_hex=str(after), minify=minify)
+        assert get_file_statistics(diff) == [
+            {"path": "a.py", "insertions": 10, "deletions": 10},
+            {"path": "b.md", "insertions": 0, "deletions": 1},
+            {"path": "c.md", "insertions": 1, "deletions": 0},
+        ]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from gitmind.utils.journal import Journal, JournalRecord, get_journal_path
+
+
+def test_get_journal_path(tmp_path: Path) -> None:
+    path = get_journal_path(str(tmp_path), "grade-range", "repo", "main..feature", ())
+
+    assert path.parent == tmp_path / "journals"
+    assert path.name.startswith("grade-range-")
+    assert path == get_journal_path(str(tmp_path), "grade-range", "repo", "main..feature", ())
+    assert path != get_journal_path(str(tmp_path), "grade-range", "repo", "main..other", ())
+
+
+def test_get_journal_path_with_path_argument(tmp_path: Path) -> None:
+    path = get_journal_path(str(tmp_path), "grade-range", Path("repo"), "main..feature", ())
+
+    assert path == get_journal_path(str(tmp_path), "grade-range", "repo", "main..feature", ())
+
+
+async def test_journal_resume(tmp_path: Path) -> None:
+    path = tmp_path / "journals" / "journal.jsonl"
+    async with Journal(path, sync_interval=2) as journal:
+        await journal.append(JournalRecord(commit_hash="a", stage="grade", status="completed", result={"grade": 1}))
+        await journal.append(JournalRecord(commit_hash="b", stage="grade", status="skipped"))
+        await journal.append(JournalRecord(commit_hash="a", stage="batch-grade", status="submitted", result="batch"))
+
+    with path.open("ab") as f:
+        f.write(b'{"commit_hash": "c", "sta')
+
+    async with Journal(path, resume=True) as journal:
+        assert journal.get("a", "grade") == {
+            "commit_hash": "a",
+            "stage": "grade",
+            "status": "completed",
+            "result": {"grade": 1},
+        }
+        assert journal.get("b", "grade") == {"commit_hash": "b", "stage": "grade", "status": "skipped"}
+        assert journal.get("a", "batch-grade") is not None
+        assert journal.get("c", "grade") is None, "A truncated line should be ignored."
+        await journal.append(JournalRecord(commit_hash="a", stage="batch-grade", status="completed", result="batch"))
+
+    async with Journal(path, resume=True) as journal:
+        assert len(journal.records) == 3
+        assert journal.get("a", "batch-grade") == {
+            "commit_hash": "a",
+            "stage": "batch-grade",
+            "status": "completed",
+            "result": "batch",
+        }
+
+    async with Journal(path) as journal:
+        assert not journal.records, "A run that does not resume should start a new journal."
+        await journal.remove()
+    assert not path.exists()
@@ -1,6 +1,7 @@
 import pytest
+from anyio import CancelScope, create_task_group, sleep, wait_all_tasks_blocked
 
-from gitmind.utils.sync import run_sync
+from gitmind.utils.sync import SingleFlight, run_sync
 
 
 def no_args() -> str:
@@ -38,3 +39,77 @@ async def test_running_sync_function_that_raises_exception_propagates_exception(
     with pytest.raises(ValueError) as exc_info:
         await run_sync(raises_exception)
     assert str(exc_info.value) == "Error"
+
+
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    single_flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+    results: list[int] = []
+
+    async def fn() -> int:
+        nonlocal calls
+        calls += 1
+        await sleep(0.01)
+        return calls
+
+    async def call() -> None:
+        results.append(await single_flight.do("key", fn))
+
+    async with create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(call)
+
+    assert calls == 1
+    assert results == [1] * 5
+    assert not single_flight._calls
+    assert await single_flight.do("key", fn) == 2, "Completed calls should not be reused."
+
+
+async def test_single_flight_propagates_exceptions_to_waiters() -> None:
+    single_flight: SingleFlight[None] = SingleFlight()
+    errors: list[Exception] = []
+
+    async def fn() -> None:
+        await sleep(0.01)
+        raise ValueError("Error")
+
+    async def call() -> None:
+        try:
+            await single_flight.do("key", fn)
+        except ValueError as e:
+            errors.append(e)
+
+    async with create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(call)
+
+    assert len(errors) == 3
+
+
+async def test_single_flight_waiter_takes_over_cancelled_call() -> None:
+    single_flight: SingleFlight[int] = SingleFlight()
+    leader_scope = CancelScope()
+    calls = 0
+    results: list[int] = []
+
+    async def fn() -> int:
+        nonlocal calls
+        calls += 1
+        await sleep(0.01 if calls > 1 else 10)
+        return calls
+
+    async def leader() -> None:
+        with leader_scope:
+            await single_flight.do("key", fn)
+
+    async def waiter() -> None:
+        results.append(await single_flight.do("key", fn))
+
+    async with create_task_group() as tg:
+        tg.start_soon(leader)
+        await wait_all_tasks_blocked()
+        tg.start_soon(waiter)
+        await wait_all_tasks_blocked()
+        leader_scope.cancel()
+
+    assert results == [2]